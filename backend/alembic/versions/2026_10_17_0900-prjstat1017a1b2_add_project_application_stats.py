@@ -0,0 +1,49 @@
+"""add project_application_stats counter table
+
+Revision ID: prjstat1017a1b2
+Revises: dispord0207a1b2
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'prjstat1017a1b2'
+down_revision: Union[str, None] = 'dispord0207a1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 과제별 응모 집계 (응모/제출/선발 수)
+    op.create_table(
+        'project_application_stats',
+        sa.Column('project_id', sa.Integer(), sa.ForeignKey('projects.project_id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('application_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('submitted_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('selected_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+    # 기존 데이터로 초기 집계
+    op.execute("""
+        INSERT INTO project_application_stats
+            (project_id, application_count, submitted_count, selected_count, updated_at)
+        SELECT
+            p.project_id,
+            COUNT(a.application_id),
+            COUNT(a.application_id) FILTER (WHERE a.status <> 'DRAFT'),
+            COUNT(a.application_id) FILTER (WHERE a.selection_result = 'SELECTED'),
+            now()
+        FROM projects p
+        LEFT JOIN applications a ON a.project_id = p.project_id
+        GROUP BY p.project_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('project_application_stats')
@@ -0,0 +1,50 @@
+"""add pending verification queue indexes
+
+Revision ID: pendvq1017b1c2
+Revises: prjstat1017a1b2
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'pendvq1017b1c2'
+down_revision: Union[str, None] = 'prjstat1017a1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 검증 대기열 부분 인덱스
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_coach_competencies_pending_verification
+        ON coach_competencies (competency_id)
+        WHERE is_globally_verified = false AND file_id IS NOT NULL
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_application_data_pending_verification
+        ON application_data (data_id)
+        WHERE verification_status <> 'approved' AND submitted_file_id IS NOT NULL
+    """)
+
+    # Verifier별 유효 컨펌 (본인 컨펌 여부 / 컨펌 가능 항목)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_verification_records_verifier_competency
+        ON verification_records (verifier_id, competency_id)
+        WHERE is_valid = true AND competency_id IS NOT NULL
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_verification_records_verifier_application_data
+        ON verification_records (verifier_id, application_data_id)
+        WHERE is_valid = true AND application_data_id IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_verification_records_verifier_application_data")
+    op.execute("DROP INDEX IF EXISTS ix_verification_records_verifier_competency")
+    op.execute("DROP INDEX IF EXISTS ix_application_data_pending_verification")
+    op.execute("DROP INDEX IF EXISTS ix_coach_competencies_pending_verification")
@@ -0,0 +1,40 @@
+"""add content-addressed file blobs
+
+Revision ID: fileblob1017c1d2
+Revises: pendvq1017b1c2
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fileblob1017c1d2'
+down_revision: Union[str, None] = 'pendvq1017b1c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 파일 내용 해시 (기존 파일은 NULL - 중복제거 대상 아님)
+    op.add_column('files', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.create_index('ix_files_content_hash', 'files', ['content_hash'])
+
+    # 내용 기반 저장 객체 (참조 카운트)
+    op.create_table(
+        'file_blobs',
+        sa.Column('content_hash', sa.String(64), primary_key=True),
+        sa.Column('file_path', sa.String(1000), nullable=False),
+        sa.Column('file_size', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('file_blobs')
+    op.drop_index('ix_files_content_hash', table_name='files')
+    op.drop_column('files', 'content_hash')
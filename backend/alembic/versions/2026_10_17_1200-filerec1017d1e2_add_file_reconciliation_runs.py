@@ -0,0 +1,65 @@
+"""add file reconciliation runs and issues
+
+Revision ID: filerec1017d1e2
+Revises: fileblob1017c1d2
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'filerec1017d1e2'
+down_revision: Union[str, None] = 'fileblob1017c1d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 스토리지 ↔ files 테이블 정합성 점검 실행 기록
+    op.create_table(
+        'file_reconciliation_runs',
+        sa.Column('run_id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('mode', sa.String(20), nullable=False, server_default='full'),
+        sa.Column('status', sa.String(20), nullable=False, server_default='running'),
+        sa.Column('since', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('started_by', sa.BigInteger(), sa.ForeignKey('users.user_id', ondelete='SET NULL'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('objects_scanned', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rows_scanned', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('matched', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('missing_in_storage', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('orphan_objects', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('size_mismatches', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('error', sa.Text(), nullable=True),
+    )
+    op.create_index('ix_file_reconciliation_runs_run_id', 'file_reconciliation_runs', ['run_id'])
+
+    # 점검 결과 (불일치 항목)
+    op.create_table(
+        'file_reconciliation_issues',
+        sa.Column('issue_id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('run_id', sa.BigInteger(), sa.ForeignKey('file_reconciliation_runs.run_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('kind', sa.String(30), nullable=False),
+        sa.Column('file_path', sa.String(1000), nullable=False),
+        sa.Column('file_id', sa.BigInteger(), nullable=True),
+        sa.Column('db_size', sa.BigInteger(), nullable=True),
+        sa.Column('storage_size', sa.BigInteger(), nullable=True),
+        sa.Column('last_modified', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_file_reconciliation_issues_issue_id', 'file_reconciliation_issues', ['issue_id'])
+    op.create_index('ix_file_reconciliation_issues_run_id', 'file_reconciliation_issues', ['run_id'])
+
+    # 경로 순 스트리밍 (바이트 순서 = 스토리지 목록 순서)
+    op.execute('CREATE INDEX IF NOT EXISTS ix_files_file_path_c ON files (file_path COLLATE "C", file_id)')
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_files_file_path_c')
+    op.drop_table('file_reconciliation_issues')
+    op.drop_table('file_reconciliation_runs')
@@ -0,0 +1,33 @@
+"""add file preview status
+
+Revision ID: fileprev1017e1f2
+Revises: filerec1017d1e2
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fileprev1017e1f2'
+down_revision: Union[str, None] = 'filerec1017d1e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 미리보기/썸네일 생성 상태 (기존 파일은 NULL - 미리보기 없음)
+    op.add_column('files', sa.Column('preview_status', sa.String(20), nullable=True))
+    # 재시작 시 미처리 대기분만 조회
+    op.create_index(
+        'ix_files_preview_pending', 'files', ['file_id'],
+        postgresql_where=sa.text("preview_status = 'pending'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_files_preview_pending', table_name='files')
+    op.drop_column('files', 'preview_status')
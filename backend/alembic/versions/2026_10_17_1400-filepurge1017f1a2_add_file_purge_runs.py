@@ -0,0 +1,62 @@
+"""add file purge runs
+
+Revision ID: filepurge1017f1a2
+Revises: fileprev1017e1f2
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'filepurge1017f1a2'
+down_revision: Union[str, None] = 'fileprev1017e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 파일을 참조하는 컬럼 (보존기간 만료 파일의 사용 여부 확인용 인덱스)
+FILE_REFERENCES = [
+    ('coach_competencies', 'file_id'),
+    ('application_data', 'submitted_file_id'),
+    ('custom_question_answers', 'answer_file_id'),
+    ('certifications', 'certificate_file_id'),
+    ('coach_education_history', 'certificate_file_id'),
+]
+
+
+def upgrade() -> None:
+    # 보존기간 만료 파일 삭제 실행 기록
+    op.create_table(
+        'file_purge_runs',
+        sa.Column('run_id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('dry_run', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('status', sa.String(20), nullable=False, server_default='running'),
+        sa.Column('cutoff_date', sa.Date(), nullable=False),
+        sa.Column('started_by', sa.BigInteger(), sa.ForeignKey('users.user_id', ondelete='SET NULL'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('files_scanned', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('files_referenced', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('files_purged', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('bytes_purged', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('objects_deleted', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('object_errors', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('error', sa.Text(), nullable=True),
+    )
+    op.create_index('ix_file_purge_runs_run_id', 'file_purge_runs', ['run_id'])
+
+    # 만료 파일을 (날짜, ID) 순으로 조회
+    op.create_index('ix_files_scheduled_deletion', 'files', ['scheduled_deletion_date', 'file_id'])
+    for table, column in FILE_REFERENCES:
+        op.execute(f'CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})')
+
+
+def downgrade() -> None:
+    for table, column in FILE_REFERENCES:
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_{column}')
+    op.drop_index('ix_files_scheduled_deletion', table_name='files')
+    op.drop_table('file_purge_runs')
@@ -0,0 +1,46 @@
+"""add email outbox
+
+Revision ID: emailout1017a1b3
+Revises: filepurge1017f1a2
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'emailout1017a1b3'
+down_revision: Union[str, None] = 'filepurge1017f1a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 알림 메일 발송 대기열 (요청 트랜잭션에서 기록, 백그라운드에서 발송)
+    op.create_table(
+        'email_outbox',
+        sa.Column('outbox_id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('notification_id', sa.BigInteger(), sa.ForeignKey('notifications.notification_id', ondelete='SET NULL'), nullable=True),
+        sa.Column('to_email', sa.String(255), nullable=False),
+        sa.Column('user_name', sa.String(100), nullable=True),
+        sa.Column('notification_type', sa.String(50), nullable=False),
+        sa.Column('title', sa.String(200), nullable=False),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('context', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_email_outbox_outbox_id', 'email_outbox', ['outbox_id'])
+    op.create_index('ix_email_outbox_notification_id', 'email_outbox', ['notification_id'])
+    op.create_index('ix_email_outbox_due', 'email_outbox', ['status', 'next_attempt_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('email_outbox')
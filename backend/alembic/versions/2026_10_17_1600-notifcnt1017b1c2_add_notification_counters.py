@@ -0,0 +1,46 @@
+"""add notification counters
+
+Revision ID: notifcnt1017b1c2
+Revises: emailout1017a1b3
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'notifcnt1017b1c2'
+down_revision: Union[str, None] = 'emailout1017a1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 사용자별 안 읽은 알림 수
+    op.create_table(
+        'notification_counters',
+        sa.Column('user_id', sa.BigInteger(), sa.ForeignKey('users.user_id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        'ix_notifications_unread', 'notifications', ['user_id'],
+        postgresql_where=sa.text('is_read = false')
+    )
+
+    # 기존 데이터로 초기 집계
+    op.execute("""
+        INSERT INTO notification_counters (user_id, unread_count, updated_at)
+        SELECT user_id, COUNT(*), now()
+        FROM notifications
+        WHERE is_read = false
+        GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_unread', table_name='notifications')
+    op.drop_table('notification_counters')
@@ -7,13 +7,20 @@ import json
 from pydantic import BaseModel
 
 from app.core.database import get_db
-from app.core.security import get_current_user, require_role, get_password_hash
+from app.core.security import get_current_user, require_role, get_password_hash_async
+from app.core.principal_cache import get_principal_cache_stats
+from app.core.password_pool import get_password_pool_stats
+from app.services.file_blob_service import delete_files, delete_released_objects
+from app.services.file_preview_service import delete_previews
+from app.services.project_stats_service import recount_project_stats
+from app.services.storage import get_storage_stats
 from app.core.utils import get_user_roles
 from app.models.user import User, UserRole, UserStatus
 from app.models.project import Project
 from app.models.application import Application
 from app.models.system_config import SystemConfig, ConfigKeys
 from app.models.role_request import RoleRequest, RoleRequestStatus
+from app.models.file import File
 from app.schemas.admin import (
     SystemConfigResponse,
     SystemConfigUpdate,
@@ -42,6 +49,18 @@ class DashboardStatsResponse(BaseModel):
     pending_review_count: int  # 심사 대기 (제출됨 + 선발 대기)
 
 
+@router.get("/runtime-stats")
+async def get_runtime_stats(
+    current_user: User = Depends(require_role(["SUPER_ADMIN"]))
+):
+    """In-process cache counters of this worker (Super Admin only)"""
+    return {
+        "principal_cache": get_principal_cache_stats(),
+        "password_pool": get_password_pool_stats(),
+        "storage": get_storage_stats(),
+    }
+
+
 @router.get("/stats", response_model=DashboardStatsResponse)
 async def get_dashboard_stats(
     db: AsyncSession = Depends(get_db),
@@ -958,22 +977,29 @@ async def reset_project_data(
             all_files = files_result.scalars().all()
             file_count = len(all_files)
 
-            # Clean R2 storage
+            # Clean R2 storage (shared blobs appear once)
             if settings.FILE_STORAGE_TYPE == "r2" and all_files:
                 try:
-                    from app.api.endpoints.files import get_r2_client
-                    r2_client = get_r2_client()
+                    from app.services.storage import get_storage
+                    storage = get_storage()
 
-                    for db_file in all_files:
+                    for file_path in {db_file.file_path for db_file in all_files}:
                         try:
-                            r2_client.remove_object(settings.R2_BUCKET, db_file.file_path)
+                            await storage.delete(file_path)
                         except Exception:
                             pass  # Ignore individual file deletion errors
+                    for db_file in all_files:
+                        if db_file.preview_status:
+                            try:
+                                await delete_previews(storage, db_file.file_id)
+                            except Exception:
+                                pass
                 except Exception as e:
                     errors.append(f"R2 cleanup error: {str(e)}")
 
-            # Delete file records
+            # Delete file records (and their now unreferenced blobs)
             await db.execute(text("DELETE FROM files"))
+            await db.execute(text("DELETE FROM file_blobs"))
             deleted_counts["files"] = file_count
 
         except Exception as e:
@@ -1087,17 +1113,24 @@ async def reset_project_only(
             files_to_delete = [f for f in all_files if f.id not in competency_file_ids]
             files_to_keep = [f for f in all_files if f.id in competency_file_ids]
 
-            # Clean R2 storage for files to delete
+            # Clean R2 storage for files to delete (skip blobs shared with kept files)
+            kept_paths = {f.file_path for f in files_to_keep}
             if settings.FILE_STORAGE_TYPE == "r2" and files_to_delete:
                 try:
-                    from app.api.endpoints.files import get_r2_client
-                    r2_client = get_r2_client()
+                    from app.services.storage import get_storage
+                    storage = get_storage()
 
-                    for db_file in files_to_delete:
+                    for file_path in {f.file_path for f in files_to_delete} - kept_paths:
                         try:
-                            r2_client.remove_object(settings.R2_BUCKET, db_file.file_path)
+                            await storage.delete(file_path)
                         except Exception:
                             pass
+                    for f in files_to_delete:
+                        if f.preview_status:
+                            try:
+                                await delete_previews(storage, f.file_id)
+                            except Exception:
+                                pass
                 except Exception as e:
                     errors.append(f"R2 cleanup error: {str(e)}")
 
@@ -1105,6 +1138,10 @@ async def reset_project_only(
             for f in files_to_delete:
                 await db.execute(text(f"DELETE FROM files WHERE id = {f.id}"))
 
+            # Recount shared blob references after the bulk delete
+            from app.services.file_blob_service import reconcile_blob_refcounts
+            await reconcile_blob_refcounts(db)
+
             deleted_counts["files"] = len(files_to_delete)
             deleted_counts["files_kept (competency)"] = len(files_to_keep)
 
@@ -1214,18 +1251,25 @@ async def reset_full(
 
             if settings.FILE_STORAGE_TYPE == "r2" and all_files:
                 try:
-                    from app.api.endpoints.files import get_r2_client
-                    r2_client = get_r2_client()
+                    from app.services.storage import get_storage
+                    storage = get_storage()
 
-                    for db_file in all_files:
+                    for file_path in {db_file.file_path for db_file in all_files}:
                         try:
-                            r2_client.remove_object(settings.R2_BUCKET, db_file.file_path)
+                            await storage.delete(file_path)
                         except Exception:
                             pass
+                    for db_file in all_files:
+                        if db_file.preview_status:
+                            try:
+                                await delete_previews(storage, db_file.file_id)
+                            except Exception:
+                                pass
                 except Exception as e:
                     errors.append(f"R2 cleanup error: {str(e)}")
 
             await db.execute(text("DELETE FROM files"))
+            await db.execute(text("DELETE FROM file_blobs"))
             deleted_counts["files"] = file_count
 
         except Exception as e:
@@ -1355,6 +1399,23 @@ async def run_migrations(
 # ============================================================================
 # User Bulk Delete
 # ============================================================================
+async def _delete_storage_objects(db: AsyncSession, keys: List[str], tag: str) -> None:
+    """
+    Delete objects released by delete_files() once the caller has committed;
+    failures are left for reconciliation
+    """
+    if not keys:
+        return
+    from app.services.storage import get_storage
+    try:
+        failed = await delete_released_objects(db, get_storage(), keys)
+    except Exception as e:
+        print(f"{tag} Storage cleanup error: {str(e)}")
+        return
+    if failed:
+        print(f"{tag} {len(failed)} storage objects not deleted: {failed[:10]}")
+
+
 @router.delete("/users/bulk-delete")
 async def bulk_delete_users(
     user_ids: List[int] = Body(..., embed=False),
@@ -1390,6 +1451,8 @@ async def bulk_delete_users(
 
     deleted_count = 0
     skipped_users = []
+    storage_keys = []
+    affected_project_ids = set()
 
     try:
         for user_id in user_ids:
@@ -1504,10 +1567,11 @@ async def bulk_delete_users(
                 WHERE application_id IN (SELECT application_id FROM applications WHERE user_id = :user_id)
             """), {"user_id": user_id})
 
-            # 6. Applications 삭제
-            await db.execute(text("""
-                DELETE FROM applications WHERE user_id = :user_id
+            # 6. Applications 삭제 (ORM 이벤트를 거치지 않으므로 과제별 집계는 커밋 전에 재집계)
+            result = await db.execute(text("""
+                DELETE FROM applications WHERE user_id = :user_id RETURNING project_id
             """), {"user_id": user_id})
+            affected_project_ids.update(result.scalars().all())
 
             # 7. 파일 참조 테이블 먼저 삭제 (Files FK 참조 순서 중요!)
             # 7-1. Coach Competencies 삭제
@@ -1526,9 +1590,9 @@ async def bulk_delete_users(
             """), {"user_id": user_id})
 
             # 7-4. Files 삭제 (사용자가 업로드한 모든 파일 - FK 참조 해제 후)
-            await db.execute(text("""
-                DELETE FROM files WHERE uploaded_by = :user_id
-            """), {"user_id": user_id})
+            # 공유 blob은 참조 수만 줄이고, 더 이상 참조되지 않는 객체는 커밋 후에 삭제
+            _, keys = await delete_files(db, File.uploaded_by == user_id)
+            storage_keys.extend(keys)
 
             # 11. Coach Profile 삭제
             await db.execute(text("""
@@ -1554,7 +1618,9 @@ async def bulk_delete_users(
             await db.delete(user)
             deleted_count += 1
 
+        await recount_project_stats(db, affected_project_ids)
         await db.commit()
+        await _delete_storage_objects(db, storage_keys, "[BULK DELETE USERS]")
         print(f"[BULK DELETE USERS] Completed: deleted {deleted_count} users")
 
         return {
@@ -1627,7 +1693,7 @@ async def admin_reset_password(
         )
 
     # 비밀번호 해시 및 저장
-    user.hashed_password = get_password_hash(password_data.new_password)
+    user.hashed_password = await get_password_hash_async(password_data.new_password)
     await db.commit()
 
     print(f"[ADMIN RESET PASSWORD] User {user.email} password reset by admin {current_user.user_id}")
@@ -1711,6 +1777,8 @@ async def delete_users_by_email_pattern(
 
         deleted_emails = []
         skipped_emails = []
+        storage_keys = []
+        affected_project_ids = set()
 
         for user in users_to_delete:
             # Skip SUPER_ADMIN
@@ -1734,11 +1802,13 @@ async def delete_users_by_email_pattern(
             await db.execute(text("DELETE FROM reviewer_evaluations WHERE reviewer_id = :uid"), {"uid": user_id})
             await db.execute(text("DELETE FROM review_locks WHERE reviewer_id = :uid"), {"uid": user_id})
             await db.execute(text("DELETE FROM notifications WHERE user_id = :uid"), {"uid": user_id})
-            await db.execute(text("DELETE FROM applications WHERE user_id = :uid"), {"uid": user_id})
+            result = await db.execute(text("DELETE FROM applications WHERE user_id = :uid RETURNING project_id"), {"uid": user_id})
+            affected_project_ids.update(result.scalars().all())
             await db.execute(text("DELETE FROM coach_competencies WHERE user_id = :uid"), {"uid": user_id})
             await db.execute(text("DELETE FROM coach_education_history WHERE user_id = :uid"), {"uid": user_id})
             await db.execute(text("DELETE FROM certifications WHERE user_id = :uid"), {"uid": user_id})
-            await db.execute(text("DELETE FROM files WHERE uploaded_by = :uid"), {"uid": user_id})
+            _, keys = await delete_files(db, File.uploaded_by == user_id)
+            storage_keys.extend(keys)
             await db.execute(text("DELETE FROM coach_profiles WHERE user_id = :uid"), {"uid": user_id})
             await db.execute(text("DELETE FROM competency_reminders WHERE user_id = :uid"), {"uid": user_id})
             await db.execute(text("DELETE FROM role_requests WHERE user_id = :uid"), {"uid": user_id})
@@ -1748,7 +1818,9 @@ async def delete_users_by_email_pattern(
             await db.delete(user)
             deleted_emails.append(user.email)
 
+        await recount_project_stats(db, affected_project_ids)
         await db.commit()
+        await _delete_storage_objects(db, storage_keys, "[DELETE BY PATTERN]")
 
         return {
             "message": f"Deleted {len(deleted_emails)} users matching pattern '{pattern}%'",
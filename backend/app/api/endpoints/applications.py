@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
 import logging
 
@@ -12,11 +12,19 @@ from app.core.database import get_db
 from app.core.security import get_current_user
 from app.core.utils import get_user_roles
 from app.models.user import User, UserRole
-from app.models.application import Application, ApplicationData
-from app.models.competency import CoachCompetency, CompetencyItem, ProjectItem, ProofRequiredLevel
+from app.models.application import Application, ApplicationData, ApplicationStatus, SelectionResult
+from app.models.competency import CoachCompetency, CompetencyItem
 from app.models.project import Project, ProjectStatus
 from app.models.custom_question import CustomQuestion, CustomQuestionAnswer
 from app.models.notification import Notification, NotificationType
+from app.services.scoring_service import (
+    mark_answer_dirty,
+    mark_application_dirty,
+    mark_score_dirty,
+    recompute_dirty_scores,
+    apply_item_score_delta
+)
+from app.services.application_service import DocumentVerificationSummary, get_document_verification_summaries
 from app.services.notification_service import (
     send_supplement_request_notification,
     send_application_draft_notification,
@@ -41,6 +49,20 @@ from app.schemas.competency import FileBasicInfo
 router = APIRouter(prefix="/applications", tags=["applications"])
 
 
+def _submitted_data_changed(
+    existing_data: Optional[ApplicationData],
+    submitted_value: Optional[str],
+    submitted_file_id: Optional[int]
+) -> bool:
+    """Whether a write changes the value or file an item is scored on"""
+    if existing_data is None:
+        return bool(submitted_value) or submitted_file_id is not None
+    return (
+        existing_data.submitted_value != submitted_value
+        or existing_data.submitted_file_id != submitted_file_id
+    )
+
+
 # ============================================================================
 # Migration Endpoint - 기존 응모 데이터를 세부정보로 마이그레이션
 # ============================================================================
@@ -123,55 +145,46 @@ async def get_my_stats(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get current user's application statistics for coach dashboard"""
-    from sqlalchemy import func
-    from app.schemas.application import CoachStats
+    """
+    Get current user's application statistics for coach dashboard
 
-    # 전체 지원서 수
-    total_result = await db.execute(
-        select(func.count(Application.application_id)).where(
-            Application.user_id == current_user.user_id
-        )
-    )
-    total_applications = total_result.scalar() or 0
+    One query: the user's applications outer-joined to their
+    supplement-requested items, counted with per-statistic filters.
+    """
+    from sqlalchemy import and_, distinct, func
+    from app.schemas.application import CoachStats
 
-    # 선발된 과제 수
-    selected_result = await db.execute(
-        select(func.count(Application.application_id)).where(
-            Application.user_id == current_user.user_id,
-            Application.selection_result == "selected"
-        )
-    )
-    selected_count = selected_result.scalar() or 0
-
-    # 심사 대기중 (submitted 상태이면서 selection_result가 pending인 것)
-    pending_result = await db.execute(
-        select(func.count(Application.application_id)).where(
-            Application.user_id == current_user.user_id,
-            Application.status == "submitted",
-            Application.selection_result == "pending"
+    application_id = Application.application_id
+    result = await db.execute(
+        select(
+            # 전체 지원서 수
+            func.count(distinct(application_id)).label("total_applications"),
+            # 선발된 과제 수
+            func.count(distinct(application_id)).filter(
+                Application.selection_result == SelectionResult.SELECTED
+            ).label("selected_count"),
+            # 심사 대기중 (submitted 상태이면서 selection_result가 pending인 것)
+            func.count(distinct(application_id)).filter(
+                Application.status == ApplicationStatus.SUBMITTED,
+                Application.selection_result == SelectionResult.PENDING
+            ).label("pending_count"),
+            # 보완 필요 항목 수 (ApplicationData에서 supplement_requested 상태인 것)
+            func.count(ApplicationData.data_id).label("supplement_count"),
         )
-    )
-    pending_count = pending_result.scalar() or 0
-
-    # 보완 필요 항목 수 (ApplicationData에서 supplement_requested 상태인 것)
-    supplement_result = await db.execute(
-        select(func.count(ApplicationData.data_id)).where(
-            ApplicationData.application_id.in_(
-                select(Application.application_id).where(
-                    Application.user_id == current_user.user_id
-                )
-            ),
+        .select_from(Application)
+        .outerjoin(ApplicationData, and_(
+            ApplicationData.application_id == application_id,
             ApplicationData.verification_status == "supplement_requested"
-        )
+        ))
+        .where(Application.user_id == current_user.user_id)
     )
-    supplement_count = supplement_result.scalar() or 0
+    stats = result.one()
 
     return CoachStats(
-        total_applications=total_applications,
-        selected_count=selected_count,
-        pending_count=pending_count,
-        supplement_count=supplement_count
+        total_applications=stats.total_applications or 0,
+        selected_count=stats.selected_count or 0,
+        pending_count=stats.pending_count or 0,
+        supplement_count=stats.supplement_count or 0
     )
 
 
@@ -180,86 +193,47 @@ async def get_my_applications(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get current user's participation project list"""
-    # Get all applications for the current user
+    """
+    Get current user's participation project list
+
+    Two round trips regardless of how many projects the coach applied to:
+    applications joined to their projects, then the batched document
+    verification rollup shared with GET /projects/{id}/applications.
+    """
+    # Applications with their project (applications of deleted projects are skipped)
     result = await db.execute(
-        select(Application)
+        select(
+            Application,
+            Project.project_name,
+            Project.recruitment_start_date,
+            Project.recruitment_end_date,
+        )
+        .join(Project, Project.project_id == Application.project_id)
         .where(Application.user_id == current_user.user_id)
         .order_by(Application.submitted_at.desc().nullslast(),
                   Application.last_updated.desc().nullslast(),
                   Application.application_id.desc())
     )
-    applications = result.scalars().all()
+    rows = result.all()
+
+    # Document verification status (증빙검토 상태): one batch load of
+    # ApplicationData + project items for all applications
+    summaries = await get_document_verification_summaries(
+        db, [row.Application.application_id for row in rows]
+    )
 
     # Build response list
     response_list = []
-    for application in applications:
-        # Get project info
-        project_result = await db.execute(
-            select(Project).where(Project.project_id == application.project_id)
-        )
-        project = project_result.scalar_one_or_none()
-
-        if not project:
-            continue
-
-        # Get all application data items for document verification status
-        app_data_result = await db.execute(
-            select(ApplicationData).where(
-                ApplicationData.application_id == application.application_id
-            )
-        )
-        app_data_items = app_data_result.scalars().all()
-
-        # Get project items for proof_required_level check
-        project_items_result = await db.execute(
-            select(ProjectItem).where(ProjectItem.project_id == project.project_id)
-        )
-        project_items = {pi.item_id: pi for pi in project_items_result.scalars().all()}
-
-        # Calculate document verification status (증빙검토 상태)
-        # - NOT_REQUIRED 또는 (OPTIONAL + 파일 없음) → 검토 불필요 (approved로 취급)
-        # - 파일 첨부된 항목만 실제 검토 상태 확인
-        supplement_count = 0
-        if not app_data_items:
-            doc_verification_status = "approved"  # 항목 없으면 검토 완료로 처리
-        else:
-            effective_statuses = []
-            for item in app_data_items:
-                pi = project_items.get(item.item_id)
-                proof_level = pi.proof_required_level if pi else None
-
-                # 증빙 불필요 항목은 approved로 취급
-                if proof_level == ProofRequiredLevel.NOT_REQUIRED:
-                    effective_statuses.append("approved")
-                elif proof_level == ProofRequiredLevel.OPTIONAL and item.submitted_file_id is None:
-                    effective_statuses.append("approved")
-                else:
-                    # 실제 검토 상태 사용
-                    effective_statuses.append(item.verification_status)
-                    if item.verification_status == "supplement_requested":
-                        supplement_count += 1
-
-            if supplement_count > 0:
-                doc_verification_status = "supplement_requested"
-            elif all(s == "approved" for s in effective_statuses):
-                doc_verification_status = "approved"
-            elif any(s == "rejected" for s in effective_statuses):
-                doc_verification_status = "rejected"
-            elif any(s == "approved" for s in effective_statuses):
-                doc_verification_status = "partial"
-            else:
-                doc_verification_status = "pending"
-
-        # Create response item
+    for application, project_name, recruitment_start_date, recruitment_end_date in rows:
+        summary = summaries.get(application.application_id, DocumentVerificationSummary())
         response_item = ParticipationProjectResponse(
             application_id=application.application_id,
-            project_id=project.project_id,
-            project_name=project.project_name,
-            recruitment_start_date=project.recruitment_start_date,
-            recruitment_end_date=project.recruitment_end_date,
+            project_id=application.project_id,
+            project_name=project_name,
+            recruitment_start_date=recruitment_start_date,
+            recruitment_end_date=recruitment_end_date,
             application_status=application.status.value,
-            document_verification_status=doc_verification_status,
+            document_verification_status=summary.status,
             review_score=float(application.final_score) if application.final_score else (
                 float(application.auto_score) if application.auto_score else None
             ),
@@ -267,8 +241,8 @@ async def get_my_applications(
             submitted_at=application.submitted_at,
             motivation=application.motivation,
             applied_role=application.applied_role.value if application.applied_role else None,
-            has_supplement_request=supplement_count > 0,
-            supplement_count=supplement_count
+            has_supplement_request=summary.supplement_count > 0,
+            supplement_count=summary.supplement_count
         )
         response_list.append(response_item)
 
@@ -504,14 +478,18 @@ async def save_custom_answer(
         select(CustomQuestionAnswer).where(
             CustomQuestionAnswer.application_id == application_id,
             CustomQuestionAnswer.question_id == answer_data.question_id
-        )
+        ).with_for_update()  # previous_text must be the committed answer
     )
     existing_answer = existing_result.scalar_one_or_none()
+    previous_text = existing_answer.answer_text if existing_answer else None
+    if application.status != ApplicationStatus.DRAFT and previous_text != answer_data.answer_text:
+        mark_answer_dirty(db, application_id, answer_data.question_id, previous_text)
 
     if existing_answer:
         # Update existing answer
         existing_answer.answer_text = answer_data.answer_text
         existing_answer.answer_file_id = answer_data.answer_file_id
+        await recompute_dirty_scores(db)
         await db.commit()
         await db.refresh(existing_answer)
         return CustomQuestionAnswerResponse(
@@ -532,6 +510,7 @@ async def save_custom_answer(
             answer_file_id=answer_data.answer_file_id
         )
         db.add(new_answer)
+        await recompute_dirty_scores(db)
         await db.commit()
         await db.refresh(new_answer)
         return CustomQuestionAnswerResponse(
@@ -634,6 +613,10 @@ async def submit_application(
             detail="Not enough permissions"
         )
 
+    # 임시저장 중에는 채점하지 않으므로 제출 시 전체 채점
+    if application.status == ApplicationStatus.DRAFT or application.auto_score is None:
+        mark_application_dirty(db, application_id)
+
     # Update motivation and role
     application.motivation = submit_data.motivation
     application.applied_role = submit_data.applied_role
@@ -647,9 +630,12 @@ async def submit_application(
             select(CustomQuestionAnswer).where(
                 CustomQuestionAnswer.application_id == application_id,
                 CustomQuestionAnswer.question_id == answer_data.question_id
-            )
+            ).with_for_update()  # previous_text must be the committed answer
         )
         existing_answer = existing_result.scalar_one_or_none()
+        previous_text = existing_answer.answer_text if existing_answer else None
+        if previous_text != answer_data.answer_text:
+            mark_answer_dirty(db, application_id, answer_data.question_id, previous_text)
 
         if existing_answer:
             existing_answer.answer_text = answer_data.answer_text
@@ -745,6 +731,8 @@ async def submit_application(
             )
         )
         existing_data = existing_result.scalar_one_or_none()
+        if _submitted_data_changed(existing_data, data_item.submitted_value, data_item.submitted_file_id):
+            mark_score_dirty(db, application_id, data_item.item_id)
 
         if existing_data:
             existing_data.submitted_value = data_item.submitted_value
@@ -761,6 +749,9 @@ async def submit_application(
             )
             db.add(new_data)
 
+    # 변경된 항목만 재채점하여 auto_score 반영
+    await recompute_dirty_scores(db)
+
     print(f"[Auto-sync] About to commit changes for application {application_id}...")
     await db.commit()
     print(f"[Auto-sync] Commit successful for application {application_id}!")
@@ -1105,6 +1096,11 @@ async def save_application_data(
         )
     )
     existing_data = existing_result.scalar_one_or_none()
+    # 임시저장(DRAFT)은 채점하지 않고, 제출된 지원서의 값/파일 변경만 재채점
+    if application.status != ApplicationStatus.DRAFT and _submitted_data_changed(
+        existing_data, data_item.submitted_value, data_item.submitted_file_id
+    ):
+        mark_score_dirty(db, application_id, data_item.item_id)
 
     if existing_data:
         # Update existing data
@@ -1190,6 +1186,9 @@ async def save_application_data(
             saved_data.competency_id = new_comp.competency_id
             logger.info(f"[save_application_data] Created new CoachCompetency {new_comp.competency_id}")
 
+    # 변경된 항목만 재채점하여 auto_score 반영
+    await recompute_dirty_scores(db)
+
     await db.commit()
     await db.refresh(saved_data)
 
@@ -1410,6 +1409,12 @@ async def submit_supplement(
         )
 
     # Update application data
+    if _submitted_data_changed(
+        app_data,
+        request.submitted_value if request.submitted_value is not None else app_data.submitted_value,
+        request.submitted_file_id if request.submitted_file_id is not None else app_data.submitted_file_id
+    ):
+        mark_score_dirty(db, application_id, app_data.item_id)
     if request.submitted_value is not None:
         app_data.submitted_value = request.submitted_value
     if request.submitted_file_id is not None:
@@ -1437,6 +1442,9 @@ async def submit_supplement(
         existing_competency.globally_verified_at = None
         logger.info(f"Auto-synced supplement to CoachCompetency {existing_competency.competency_id}")
 
+    # 보완된 항목만 재채점하여 auto_score 반영
+    await recompute_dirty_scores(db)
+
     await db.commit()
 
     # Reload with file info
@@ -1523,7 +1531,10 @@ async def verify_application_data(
     app_data.reviewed_by = current_user.user_id
     app_data.reviewed_at = datetime.now()
     if item_score is not None:
+        # 수동 점수는 재채점하지 않고 차이만 auto_score에 반영
+        previous_score = app_data.item_score
         app_data.item_score = item_score
+        await apply_item_score_delta(db, application_id, previous_score, item_score)
     if rejection_reason is not None:
         app_data.rejection_reason = rejection_reason
 
@@ -8,10 +8,12 @@ from jose import jwt, JWTError
 from app.core.database import get_db
 from app.core.config import settings
 from app.core.email import send_password_reset_email, send_email
+from app.core.principal_cache import invalidate_principal
 from app.core.config import settings as app_settings
 from app.core.security import (
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token,
     get_current_user,
@@ -56,7 +58,7 @@ async def register(
         )
 
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
 
     # Separate roles that require approval from those that don't
     # COACH is always granted immediately
@@ -156,7 +158,7 @@ async def login(
     user = result.scalar_one_or_none()
 
     # Verify user exists and password is correct
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user or not await verify_password_async(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -170,6 +172,15 @@ async def login(
             detail="User account is not active"
         )
 
+    # BCRYPT_ROUNDS가 바뀌었으면 로그인 시 새 cost로 재해시
+    if password_needs_rehash(user.hashed_password):
+        try:
+            user.hashed_password = await get_password_hash_async(credentials.password)
+            await db.commit()
+            await db.refresh(user)  # updated_at (onupdate) expired by the UPDATE
+        except HTTPException:
+            pass  # 해시 풀 포화 시 다음 로그인에서 재시도
+
     # Generate tokens
     from app.core.utils import get_user_roles
     user_roles = get_user_roles(user)
@@ -264,7 +275,7 @@ async def change_password(
     Simple version: no current password verification required.
     """
     # Hash the new password
-    new_hashed_password = get_password_hash(password_data.new_password)
+    new_hashed_password = await get_password_hash_async(password_data.new_password)
 
     # Update user's password
     current_user.hashed_password = new_hashed_password
@@ -435,7 +446,7 @@ async def reset_password(
         )
 
     # Update password
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await get_password_hash_async(new_password)
     await db.commit()
 
     return {"message": "비밀번호가 성공적으로 변경되었습니다."}
@@ -493,6 +504,9 @@ async def delete_wrong_users(
             errors.append({"email": email, "error": str(e)})
 
     await db.commit()
+    if deleted_emails:
+        # Bulk DELETE bypasses the ORM events that evict cached principals
+        invalidate_principal()
     return {
         "message": f"Deleted {len(deleted_emails)} wrong users",
         "deleted": deleted_emails,
@@ -514,7 +528,7 @@ async def set_admin_user(
     result = await db.execute(select(User).where(User.email == email))
     user = result.scalar_one_or_none()
 
-    hashed_pw = get_password_hash(password)
+    hashed_pw = await get_password_hash_async(password)
     admin_roles = json.dumps(["SUPER_ADMIN", "PROJECT_MANAGER", "VERIFIER", "COACH"])
 
     if not user:
@@ -559,7 +573,7 @@ async def preregister_users(
 
     password = "pmstest1"
     roles = json.dumps(["PROJECT_MANAGER", "VERIFIER", "COACH"])
-    hashed_password = get_password_hash(password)
+    hashed_password = await get_password_hash_async(password)
 
     created_count = 0
     updated_count = 0
@@ -1,62 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, UploadFile, File
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+import asyncio
 import os
 import uuid
-from datetime import datetime, timedelta
-from minio import Minio
-from minio.error import S3Error
-from io import BytesIO
+from datetime import date, datetime, timedelta
+from typing import List, Literal, Optional
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_principal_roles
+from app.core.file_delivery import (
+    LocalFileResponse, RangeNotSatisfiable, file_etag, http_date, is_not_modified, parse_range, range_applies
+)
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 from app.core.utils import get_user_roles
 from app.models.user import User
 from app.models.file import File as FileModel, UploadPurpose
-from app.schemas.file import FileUploadResponse, FileInfo
+from app.models.file_purge import FilePurgeRun
+from app.models.file_reconciliation import FileReconciliationIssue, FileReconciliationRun
+from app.schemas.file import (
+    FileUploadResponse, FileInfo, FileDownloadUrl, FileDownloadUrlsRequest, FileDownloadUrlsResponse,
+    FilePurgeRunResponse, FileReconciliationRunResponse, FileReconciliationIssueResponse
+)
+from app.services.file_blob_service import delete_released_objects, release_file, store_upload
+from app.services.file_preview_service import (
+    PREVIEW_MIME_TYPE, PREVIEW_PENDING, PREVIEW_READY, PREVIEW_VARIANTS,
+    enqueue_preview, is_previewable, preview_key
+)
+from app.services.file_retention_service import PurgeInProgress, start_purge
+from app.services.file_reconciliation_service import (
+    ISSUE_MISSING_IN_STORAGE, ReconciliationInProgress, start_reconciliation
+)
+from app.services.storage import (
+    get_storage, PresignedUrl, StorageError, StorageObjectNotFound, StorageSizeLimitExceeded
+)
 
 router = APIRouter(prefix="/files", tags=["files"])
 
 
-# MinIO client initialization
-def get_minio_client():
-    """Get MinIO client instance"""
-    if settings.FILE_STORAGE_TYPE != "minio":
-        return None
-
-    return Minio(
-        settings.MINIO_ENDPOINT,
-        access_key=settings.MINIO_ACCESS_KEY,
-        secret_key=settings.MINIO_SECRET_KEY,
-        secure=settings.MINIO_SECURE
-    )
-
-
-def ensure_bucket_exists(client: Minio, bucket_name: str):
-    """Ensure bucket exists"""
-    try:
-        if not client.bucket_exists(bucket_name):
-            client.make_bucket(bucket_name)
-    except S3Error as e:
-        print(f"Error creating bucket: {e}")
-
-
-# Cloudflare R2 client initialization
-def get_r2_client():
-    """Get R2 client instance (S3 compatible)"""
-    if settings.FILE_STORAGE_TYPE != "r2":
-        return None
-
-    return Minio(
-        settings.r2_endpoint_url,
-        access_key=settings.R2_ACCESS_KEY_ID,
-        secret_key=settings.R2_SECRET_ACCESS_KEY,
-        secure=True
-    )
-
-
 @router.post("/upload", response_model=FileUploadResponse)
 async def upload_file(
     file: UploadFile = File(...),
@@ -69,19 +52,12 @@ async def upload_file(
 
     - **file**: The file to upload
     - **purpose**: Upload purpose (proof, profile, other)
-    """
-    # Validate file size
-    file.file.seek(0, 2)  # Seek to end
-    file_size = file.file.tell()
-    file.file.seek(0)  # Reset to beginning
-
-    max_size = settings.FILE_MAX_SIZE_MB * 1024 * 1024  # Convert to bytes
-    if file_size > max_size:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File size exceeds maximum allowed size of {settings.FILE_MAX_SIZE_MB}MB"
-        )
 
+    Content is stored once per SHA-256: re-uploading known content only adds
+    a File row referencing the existing object. The response does not say
+    whether content was reused, since content is shared across users. Images
+    and PDFs get preview/thumbnail derivatives rendered in the background.
+    """
     # Validate file type
     file_ext = os.path.splitext(file.filename)[1].lower()
     # 차단된 파일 형식 확인 (실행 파일 등)
@@ -97,87 +73,38 @@ async def upload_file(
             detail=f"File type {file_ext} not allowed. Allowed types: {settings.FILE_ALLOWED_TYPES}"
         )
 
-    # Generate unique filename
+    # Generate unique filename (the stored object is keyed by content hash)
     stored_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = f"uploads/{purpose.value}/{datetime.now().strftime('%Y/%m')}/{stored_filename}"
 
-    try:
-        # Read file content once for all storage types
-        file_content = await file.read()
-
-        # Upload to storage
-        if settings.FILE_STORAGE_TYPE == "r2":
-            # Cloudflare R2
-            r2_client = get_r2_client()
-            ensure_bucket_exists(r2_client, settings.R2_BUCKET)
-
-            file_stream = BytesIO(file_content)
-            r2_client.put_object(
-                settings.R2_BUCKET,
-                file_path,
-                file_stream,
-                length=len(file_content),
-                content_type=file.content_type
-            )
-
-            # Verify upload was successful
-            try:
-                r2_client.stat_object(settings.R2_BUCKET, file_path)
-            except S3Error as verify_error:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"파일 업로드 검증 실패: 파일이 스토리지에 저장되지 않았습니다. ({verify_error.code})"
-                )
-        elif settings.FILE_STORAGE_TYPE == "minio":
-            # MinIO
-            minio_client = get_minio_client()
-            ensure_bucket_exists(minio_client, settings.MINIO_BUCKET)
-
-            file_stream = BytesIO(file_content)
-            minio_client.put_object(
-                settings.MINIO_BUCKET,
-                file_path,
-                file_stream,
-                length=len(file_content),
-                content_type=file.content_type
-            )
-
-            # Verify upload was successful
-            try:
-                minio_client.stat_object(settings.MINIO_BUCKET, file_path)
-            except S3Error as verify_error:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"파일 업로드 검증 실패: 파일이 스토리지에 저장되지 않았습니다. ({verify_error.code})"
-                )
-        else:
-            # Local file storage
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, "wb") as f:
-                f.write(file_content)
+    storage = get_storage()
+    max_size = settings.FILE_MAX_SIZE_MB * 1024 * 1024  # Convert to bytes
 
-            # Verify upload was successful
-            if not os.path.exists(file_path):
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="파일 업로드 검증 실패: 파일이 로컬 스토리지에 저장되지 않았습니다."
-                )
+    try:
+        # Hash the upload spool, then reuse known content or stream it to
+        # storage part by part (size limit enforced, ETag verifies the write)
+        await file.seek(0)
+        await db.commit()  # End the auth lookup's transaction: none stays open during the upload
+        stored = await store_upload(db, storage, file.file, file.content_type, max_size=max_size)
 
         # Save file metadata to database
         db_file = FileModel(
             original_filename=file.filename,
             stored_filename=stored_filename,
-            file_path=file_path,
-            file_size=file_size,
+            file_path=stored.file_path,
+            file_size=stored.size,
+            content_hash=stored.content_hash,
             mime_type=file.content_type,
             uploaded_by=current_user.user_id,
             upload_purpose=purpose,
-            scheduled_deletion_date=datetime.now().date() + timedelta(days=365 * settings.FILE_RETENTION_YEARS)
+            scheduled_deletion_date=datetime.now().date() + timedelta(days=365 * settings.FILE_RETENTION_YEARS),
+            preview_status=PREVIEW_PENDING if is_previewable(file.content_type) else None
         )
 
         db.add(db_file)
         await db.commit()
         await db.refresh(db_file)
+        if db_file.preview_status == PREVIEW_PENDING:
+            enqueue_preview(db_file.file_id)
 
         return FileUploadResponse(
             file_id=db_file.file_id,
@@ -186,10 +113,18 @@ async def upload_file(
             file_size=db_file.file_size,
             mime_type=db_file.mime_type,
             upload_purpose=db_file.upload_purpose.value,
-            uploaded_at=db_file.uploaded_at
+            uploaded_at=db_file.uploaded_at,
+            content_hash=db_file.content_hash
         )
 
-    except S3Error as e:
+    except HTTPException:
+        raise
+    except StorageSizeLimitExceeded:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File size exceeds maximum allowed size of {settings.FILE_MAX_SIZE_MB}MB"
+        )
+    except StorageError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload file to storage: {str(e)}"
@@ -201,9 +136,14 @@ async def upload_file(
         )
 
 
+# 다운로드 허용 역할: staff, admin (레거시) + VERIFIER, REVIEWER, PROJECT_MANAGER, SUPER_ADMIN
+FILE_READER_ROLES = frozenset({'staff', 'admin', 'VERIFIER', 'REVIEWER', 'PROJECT_MANAGER', 'SUPER_ADMIN'})
+
+
 @router.get("/{file_id}", response_class=StreamingResponse)
 async def download_file(
     file_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -211,6 +151,10 @@ async def download_file(
     Download a file from storage
 
     - **file_id**: The ID of the file to download
+
+    Supports single byte ranges (206 Partial Content, If-Range) for PDF
+    viewers, and conditional requests (If-None-Match / If-Modified-Since → 304)
+    against a strong ETag derived from file_id and size.
     """
     # Get file metadata from database
     result = await db.execute(
@@ -226,82 +170,75 @@ async def download_file(
 
     # Check permission: user can only download their own files
     # or staff/admin/verifier can download any file
-    from app.models.user import User as UserModel
-    result = await db.execute(
-        select(UserModel).where(UserModel.user_id == current_user.user_id)
-    )
-    user = result.scalar_one()
-    user_roles = get_user_roles(user)
-
-    # 허용된 역할: staff, admin (레거시) + VERIFIER, REVIEWER, PROJECT_MANAGER, SUPER_ADMIN
-    allowed_roles = ['staff', 'admin', 'VERIFIER', 'REVIEWER', 'PROJECT_MANAGER', 'SUPER_ADMIN']
-    if db_file.uploaded_by != current_user.user_id and not any(role in allowed_roles for role in user_roles):
+    if db_file.uploaded_by != current_user.user_id and not (get_principal_roles(current_user) & FILE_READER_ROLES):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to access this file"
         )
 
-    try:
-        # Download from storage
-        if settings.FILE_STORAGE_TYPE == "r2":
-            # Cloudflare R2
-            r2_client = get_r2_client()
-
-            response = r2_client.get_object(
-                settings.R2_BUCKET,
-                db_file.file_path
-            )
-
-            return StreamingResponse(
-                response,
-                media_type=db_file.mime_type,
-                headers={
-                    "Content-Disposition": f"attachment; filename={db_file.original_filename}"
-                }
-            )
-        elif settings.FILE_STORAGE_TYPE == "minio":
-            # MinIO
-            minio_client = get_minio_client()
-
-            response = minio_client.get_object(
-                settings.MINIO_BUCKET,
-                db_file.file_path
+    # Files are immutable, so validators come from metadata (no storage round trip)
+    size = db_file.file_size
+    etag = file_etag(db_file.file_id, size)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+    }
+    last_modified = http_date(db_file.uploaded_at)
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+
+    if is_not_modified(request, etag, db_file.uploaded_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = None
+    if range_applies(request, etag, db_file.uploaded_at):
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{size}"}
             )
 
-            return StreamingResponse(
-                response,
-                media_type=db_file.mime_type,
-                headers={
-                    "Content-Disposition": f"attachment; filename={db_file.original_filename}"
-                }
+    status_code = status.HTTP_200_OK
+    offset, length = 0, size
+    if byte_range is not None:
+        start, end = byte_range
+        offset, length = start, end - start + 1
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(length)
+    headers["Content-Disposition"] = f"attachment; filename={db_file.original_filename}"
+
+    storage = get_storage()
+    try:
+        local_path = storage.local_path(db_file.file_path)
+        if local_path is not None:
+            # Local disk: sendfile when the server supports it
+            await storage.stat(db_file.file_path)
+            return LocalFileResponse(
+                local_path, offset, length,
+                status_code=status_code, headers=headers, media_type=db_file.mime_type
             )
-        else:
-            # Local file storage
-            if not os.path.exists(db_file.file_path):
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="File not found in storage"
-                )
 
-            def file_iterator():
-                with open(db_file.file_path, "rb") as f:
-                    yield from f
-
-            return StreamingResponse(
-                file_iterator(),
-                media_type=db_file.mime_type,
-                headers={
-                    "Content-Disposition": f"attachment; filename={db_file.original_filename}"
-                }
-            )
+        # Object store: the range is passed through to get_object
+        stream = await storage.open_stream(
+            db_file.file_path, offset=offset, length=length if byte_range is not None else None
+        )
+        return StreamingResponse(
+            stream,
+            status_code=status_code,
+            media_type=db_file.mime_type,
+            headers=headers
+        )
 
-    except S3Error as e:
-        # NoSuchKey means the file doesn't exist in storage
-        if e.code == "NoSuchKey":
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"File not found in storage: {db_file.file_path}"
-            )
+    except StorageObjectNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"File not found in storage: {db_file.file_path}"
+        )
+    except StorageError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to download file from storage: {str(e)}"
@@ -313,6 +250,77 @@ async def download_file(
         )
 
 
+@router.get("/{file_id}/preview", response_class=StreamingResponse)
+async def get_file_preview(
+    file_id: int,
+    request: Request,
+    variant: Literal["preview", "thumb"] = Query("preview", description="preview (1024px) or thumb (256px)"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    First-page JPEG preview or thumbnail of an image/PDF file
+
+    Derivatives never change once rendered, so responses are cacheable and
+    revalidated with an ETag (304). 404 while the preview is not ready.
+    """
+    result = await db.execute(
+        select(FileModel).where(FileModel.file_id == file_id)
+    )
+    db_file = result.scalar_one_or_none()
+
+    if not db_file:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+
+    if db_file.uploaded_by != current_user.user_id and not (get_principal_roles(current_user) & FILE_READER_ROLES):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to access this file"
+        )
+
+    if db_file.preview_status != PREVIEW_READY:
+        if db_file.preview_status == PREVIEW_PENDING:
+            # Lost from the queue (restart, full queue): queue it again
+            enqueue_preview(db_file.file_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Preview not available ({db_file.preview_status or 'not previewable'})"
+        )
+
+    etag = f'"{db_file.file_id}-{variant}-{PREVIEW_VARIANTS[variant]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=86400",
+    }
+    if is_not_modified(request, etag, None):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    storage = get_storage()
+    key = preview_key(db_file.file_id, variant)
+    try:
+        local_path = storage.local_path(key)
+        if local_path is not None:
+            stat = await storage.stat(key)
+            return LocalFileResponse(local_path, 0, stat.size, headers=headers, media_type=PREVIEW_MIME_TYPE)
+
+        stream = await storage.open_stream(key)
+        return StreamingResponse(stream, media_type=PREVIEW_MIME_TYPE, headers=headers)
+
+    except StorageObjectNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Preview not found in storage"
+        )
+    except StorageError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to read preview from storage: {str(e)}"
+        )
+
+
 @router.get("/{file_id}/info", response_model=FileInfo)
 async def get_file_info(
     file_id: int,
@@ -341,11 +349,30 @@ async def get_file_info(
         file_size=db_file.file_size,
         mime_type=db_file.mime_type,
         uploaded_at=db_file.uploaded_at,
-        uploaded_by=db_file.uploaded_by
+        uploaded_by=db_file.uploaded_by,
+        content_hash=db_file.content_hash
     )
 
 
-@router.get("/{file_id}/download-url")
+def _download_url_entry(db_file: FileModel, presigned: Optional[PresignedUrl]) -> FileDownloadUrl:
+    if presigned is not None:
+        return FileDownloadUrl(
+            file_id=db_file.file_id,
+            download_url=presigned.url,
+            filename=db_file.original_filename,
+            expires_in=presigned.expires_in
+        )
+    # Local storage - return the direct download endpoint
+    return FileDownloadUrl(
+        file_id=db_file.file_id,
+        download_url=f"/api/files/{db_file.file_id}",
+        filename=db_file.original_filename,
+        expires_in=None,
+        is_local=True
+    )
+
+
+@router.get("/{file_id}/download-url", response_model=FileDownloadUrl)
 async def get_download_url(
     file_id: int,
     db: AsyncSession = Depends(get_db),
@@ -357,7 +384,8 @@ async def get_download_url(
 
     - **file_id**: The ID of the file
 
-    Returns a presigned URL valid for 1 hour.
+    Returns a presigned URL valid for up to PRESIGNED_URL_TTL_SECONDS
+    (cached URLs are reused until shortly before they expire).
     """
     # Get file metadata from database
     result = await db.execute(
@@ -372,82 +400,20 @@ async def get_download_url(
         )
 
     # Check permission
-    from app.models.user import User as UserModel
-    result = await db.execute(
-        select(UserModel).where(UserModel.user_id == current_user.user_id)
-    )
-    user = result.scalar_one()
-    user_roles = get_user_roles(user)
-
-    allowed_roles = ['staff', 'admin', 'VERIFIER', 'REVIEWER', 'PROJECT_MANAGER', 'SUPER_ADMIN']
-    if db_file.uploaded_by != current_user.user_id and not any(role in allowed_roles for role in user_roles):
+    if db_file.uploaded_by != current_user.user_id and not (get_principal_roles(current_user) & FILE_READER_ROLES):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to access this file"
         )
 
     try:
-        if settings.FILE_STORAGE_TYPE == "r2":
-            r2_client = get_r2_client()
-            # Check if file exists before generating presigned URL
-            try:
-                r2_client.stat_object(settings.R2_BUCKET, db_file.file_path)
-            except S3Error as stat_error:
-                if stat_error.code == "NoSuchKey":
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"File not found in storage: {db_file.file_path}"
-                    )
-                raise
-            # Generate presigned URL valid for 1 hour
-            url = r2_client.presigned_get_object(
-                settings.R2_BUCKET,
-                db_file.file_path,
-                expires=timedelta(hours=1)
-            )
-            return {
-                "download_url": url,
-                "filename": db_file.original_filename,
-                "expires_in": 3600  # seconds
-            }
-        elif settings.FILE_STORAGE_TYPE == "minio":
-            minio_client = get_minio_client()
-            # Check if file exists before generating presigned URL
-            try:
-                minio_client.stat_object(settings.MINIO_BUCKET, db_file.file_path)
-            except S3Error as stat_error:
-                if stat_error.code == "NoSuchKey":
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"File not found in storage: {db_file.file_path}"
-                    )
-                raise
-            url = minio_client.presigned_get_object(
-                settings.MINIO_BUCKET,
-                db_file.file_path,
-                expires=timedelta(hours=1)
-            )
-            return {
-                "download_url": url,
-                "filename": db_file.original_filename,
-                "expires_in": 3600
-            }
-        else:
-            # Local storage - check if file exists and return the direct download endpoint
-            if not os.path.exists(db_file.file_path):
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"File not found in storage: {db_file.file_path}"
-                )
-            return {
-                "download_url": f"/api/files/{file_id}",
-                "filename": db_file.original_filename,
-                "expires_in": None,
-                "is_local": True
-            }
-    except HTTPException:
-        raise
-    except S3Error as e:
+        presigned = await get_storage().get_download_url(db_file.file_path)
+    except StorageObjectNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"File not found in storage: {db_file.file_path}"
+        )
+    except StorageError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate download URL: {str(e)}"
@@ -458,6 +424,65 @@ async def get_download_url(
             detail=f"Failed to generate download URL: {str(e)}"
         )
 
+    return _download_url_entry(db_file, presigned)
+
+
+@router.post("/download-urls", response_model=FileDownloadUrlsResponse)
+async def get_download_urls(
+    request: FileDownloadUrlsRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Presigned download URLs for many files at once
+
+    One metadata query and one permission check for the whole batch; URLs
+    come from the presigned URL cache where possible. Unknown ids and files
+    missing from storage are listed in not_found. Any file the user may not
+    read fails the whole request with 403.
+    """
+    file_ids = list(dict.fromkeys(request.file_ids))
+    if len(file_ids) > settings.DOWNLOAD_URL_BATCH_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.DOWNLOAD_URL_BATCH_MAX} files per request"
+        )
+
+    result = await db.execute(
+        select(FileModel).where(FileModel.file_id.in_(file_ids))
+    )
+    files_by_id = {f.file_id: f for f in result.scalars().all()}
+
+    if not (get_principal_roles(current_user) & FILE_READER_ROLES):
+        if any(f.uploaded_by != current_user.user_id for f in files_by_id.values()):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to access one or more of these files"
+            )
+
+    storage = get_storage()
+    db_files = [files_by_id[file_id] for file_id in file_ids if file_id in files_by_id]
+    # Cache misses stat + sign concurrently (bounded by the storage executor)
+    presigned = await asyncio.gather(
+        *(storage.get_download_url(f.file_path) for f in db_files),
+        return_exceptions=True
+    )
+
+    response = FileDownloadUrlsResponse(
+        not_found=[file_id for file_id in file_ids if file_id not in files_by_id]
+    )
+    for db_file, outcome in zip(db_files, presigned):
+        if isinstance(outcome, StorageObjectNotFound):
+            response.not_found.append(db_file.file_id)
+        elif isinstance(outcome, Exception):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to generate download URL: {str(outcome)}"
+            )
+        else:
+            response.urls.append(_download_url_entry(db_file, outcome))
+    return response
+
 
 @router.delete("/{file_id}")
 async def delete_file(
@@ -501,42 +526,196 @@ async def delete_file(
             )
 
     try:
-        # Delete from storage
-        if settings.FILE_STORAGE_TYPE == "r2":
-            # Cloudflare R2
-            r2_client = get_r2_client()
-            r2_client.remove_object(
-                settings.R2_BUCKET,
-                db_file.file_path
-            )
-        elif settings.FILE_STORAGE_TYPE == "minio":
-            # MinIO
-            minio_client = get_minio_client()
-            minio_client.remove_object(
-                settings.MINIO_BUCKET,
-                db_file.file_path
-            )
-        else:
-            # Local file storage
-            if os.path.exists(db_file.file_path):
-                os.remove(db_file.file_path)
+        # Release the content (shared blobs only with their last reference)
+        keys = await release_file(db, db_file)
 
         # Delete from database
         await db.delete(db_file)
         await db.commit()
 
-        return {"message": "File deleted successfully"}
-
-    except S3Error as e:
+    except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete file from storage: {str(e)}"
+            detail=f"Failed to delete file: {str(e)}"
         )
+
+    # Objects go only once the rows are gone for good; leftovers are orphans
+    # for reconciliation to report
+    try:
+        failed = await delete_released_objects(db, get_storage(), keys)
+        if failed:
+            print(f"[FILE DELETE] {len(failed)} storage objects not deleted: {failed[:10]}")
     except Exception as e:
+        print(f"[FILE DELETE] Storage cleanup error: {str(e)}")
+
+    return {"message": "File deleted successfully"}
+
+
+FILE_ADMIN_ROLES = frozenset({'SUPER_ADMIN', 'PROJECT_MANAGER'})
+
+
+def _require_file_admin(current_user: User) -> None:
+    if not (get_principal_roles(current_user) & FILE_ADMIN_ROLES):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete file: {str(e)}"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자만 접근할 수 있습니다."
+        )
+
+
+async def _get_reconciliation_run(db: AsyncSession, run_id: int) -> FileReconciliationRun:
+    run = await db.get(FileReconciliationRun, run_id)
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reconciliation run not found"
+        )
+    return run
+
+
+@router.post(
+    "/admin/reconciliations",
+    response_model=FileReconciliationRunResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def start_file_reconciliation(
+    incremental: bool = Query(False, description="Only check changes since the last completed run"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start a storage ↔ files table reconciliation in the background
+
+    Merge-joins the bucket listing with the files table (both sorted by key)
+    and records DB rows without an object, objects without a row, and size
+    mismatches. Poll GET /files/admin/reconciliations/{run_id} for progress.
+    Only accessible by SUPER_ADMIN or PROJECT_MANAGER.
+    """
+    _require_file_admin(current_user)
+    try:
+        return await start_reconciliation(db, incremental=incremental, started_by=current_user.user_id)
+    except ReconciliationInProgress as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"정합성 점검이 이미 진행 중입니다. (run_id={e.run_id})"
+        )
+
+
+@router.get("/admin/reconciliations", response_model=List[FileReconciliationRunResponse])
+async def list_file_reconciliations(
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Recent reconciliation runs, newest first"""
+    _require_file_admin(current_user)
+    result = await db.execute(
+        select(FileReconciliationRun).order_by(FileReconciliationRun.run_id.desc()).limit(limit)
+    )
+    return result.scalars().all()
+
+
+@router.get("/admin/reconciliations/{run_id}", response_model=FileReconciliationRunResponse)
+async def get_file_reconciliation(
+    run_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Progress and totals of a reconciliation run"""
+    _require_file_admin(current_user)
+    return await _get_reconciliation_run(db, run_id)
+
+
+@router.get("/admin/reconciliations/{run_id}/issues", response_model=List[FileReconciliationIssueResponse])
+async def get_file_reconciliation_issues(
+    run_id: int,
+    response: Response,
+    kind: Optional[Literal['missing_in_storage', 'orphan_object', 'size_mismatch']] = Query(None),
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Mismatches found by a run, in discovery order (keyset paginated)"""
+    _require_file_admin(current_user)
+    await _get_reconciliation_run(db, run_id)
+
+    query = (
+        select(FileReconciliationIssue)
+        .where(FileReconciliationIssue.run_id == run_id)
+        .order_by(FileReconciliationIssue.issue_id)
+        .limit(limit)
+    )
+    if kind:
+        query = query.where(FileReconciliationIssue.kind == kind)
+    if cursor:
+        (last_issue_id,) = decode_cursor(cursor, expected_length=1)
+        query = query.where(FileReconciliationIssue.issue_id > last_issue_id)
+
+    issues = (await db.execute(query)).scalars().all()
+    if len(issues) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(issues[-1].issue_id)
+    return issues
+
+
+@router.post("/admin/purges", response_model=FilePurgeRunResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_file_purge(
+    dry_run: bool = Query(True, description="Only count what would be purged"),
+    cutoff_date: Optional[date] = Query(None, description="Purge files due on or before this date (default/max: today)"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start a retention purge of files past scheduled_deletion_date in the background
+
+    Files still referenced (competencies, application items, custom question
+    answers, certificates) are kept. Deletes run in throttled chunks; poll
+    GET /files/admin/purges/{run_id} for progress. Dry runs are open to
+    SUPER_ADMIN or PROJECT_MANAGER, actual purges to SUPER_ADMIN only.
+    """
+    _require_file_admin(current_user)
+    if not dry_run and 'SUPER_ADMIN' not in get_principal_roles(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="파일 삭제는 SUPER_ADMIN만 실행할 수 있습니다."
+        )
+    try:
+        return await start_purge(db, dry_run=dry_run, cutoff=cutoff_date, started_by=current_user.user_id)
+    except PurgeInProgress as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"보존기간 만료 파일 삭제가 이미 진행 중입니다. (run_id={e.run_id})"
+        )
+
+
+@router.get("/admin/purges", response_model=List[FilePurgeRunResponse])
+async def list_file_purges(
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Recent purge runs, newest first"""
+    _require_file_admin(current_user)
+    result = await db.execute(
+        select(FilePurgeRun).order_by(FilePurgeRun.run_id.desc()).limit(limit)
+    )
+    return result.scalars().all()
+
+
+@router.get("/admin/purges/{run_id}", response_model=FilePurgeRunResponse)
+async def get_file_purge(
+    run_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Progress and totals of a purge run"""
+    _require_file_admin(current_user)
+    run = await db.get(FilePurgeRun, run_id)
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Purge run not found"
         )
+    return run
 
 
 @router.get("/admin/check-orphans")
@@ -548,70 +727,48 @@ async def check_orphan_files(
     Check for orphan files - files that exist in database but not in storage.
     Only accessible by SUPER_ADMIN or PROJECT_MANAGER.
 
-    Returns a list of file records that have missing files in storage.
+    Returns the file records found missing by the latest completed
+    reconciliation run (start one with POST /files/admin/reconciliations).
     """
-    # Check permission
-    from app.models.user import User as UserModel
+    _require_file_admin(current_user)
+
     result = await db.execute(
-        select(UserModel).where(UserModel.user_id == current_user.user_id)
+        select(FileReconciliationRun)
+        .where(FileReconciliationRun.status == "completed")
+        .order_by(FileReconciliationRun.run_id.desc())
+        .limit(1)
     )
-    user = result.scalar_one()
-    user_roles = get_user_roles(user)
-
-    allowed_roles = ['SUPER_ADMIN', 'PROJECT_MANAGER']
-    if not any(role in allowed_roles for role in user_roles):
+    run = result.scalar_one_or_none()
+    if not run:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="관리자만 접근할 수 있습니다."
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="완료된 정합성 점검이 없습니다. POST /files/admin/reconciliations 로 점검을 시작하세요."
         )
 
-    # Get all files from database
-    result = await db.execute(select(FileModel))
-    all_files = result.scalars().all()
-
-    orphan_files = []
-
-    if settings.FILE_STORAGE_TYPE == "r2":
-        r2_client = get_r2_client()
-        for db_file in all_files:
-            try:
-                r2_client.stat_object(settings.R2_BUCKET, db_file.file_path)
-            except S3Error as e:
-                if e.code == "NoSuchKey":
-                    orphan_files.append({
-                        "file_id": db_file.file_id,
-                        "original_filename": db_file.original_filename,
-                        "file_path": db_file.file_path,
-                        "uploaded_at": db_file.uploaded_at.isoformat() if db_file.uploaded_at else None,
-                        "uploaded_by": db_file.uploaded_by
-                    })
-    elif settings.FILE_STORAGE_TYPE == "minio":
-        minio_client = get_minio_client()
-        for db_file in all_files:
-            try:
-                minio_client.stat_object(settings.MINIO_BUCKET, db_file.file_path)
-            except S3Error as e:
-                if e.code == "NoSuchKey":
-                    orphan_files.append({
-                        "file_id": db_file.file_id,
-                        "original_filename": db_file.original_filename,
-                        "file_path": db_file.file_path,
-                        "uploaded_at": db_file.uploaded_at.isoformat() if db_file.uploaded_at else None,
-                        "uploaded_by": db_file.uploaded_by
-                    })
-    else:
-        for db_file in all_files:
-            if not os.path.exists(db_file.file_path):
-                orphan_files.append({
-                    "file_id": db_file.file_id,
-                    "original_filename": db_file.original_filename,
-                    "file_path": db_file.file_path,
-                    "uploaded_at": db_file.uploaded_at.isoformat() if db_file.uploaded_at else None,
-                    "uploaded_by": db_file.uploaded_by
-                })
+    result = await db.execute(
+        select(FileReconciliationIssue, FileModel)
+        .outerjoin(FileModel, FileModel.file_id == FileReconciliationIssue.file_id)
+        .where(
+            FileReconciliationIssue.run_id == run.run_id,
+            FileReconciliationIssue.kind == ISSUE_MISSING_IN_STORAGE
+        )
+        .order_by(FileReconciliationIssue.issue_id)
+    )
+    orphan_files = [
+        {
+            "file_id": issue.file_id,
+            "original_filename": db_file.original_filename if db_file else None,
+            "file_path": issue.file_path,
+            "uploaded_at": db_file.uploaded_at.isoformat() if db_file and db_file.uploaded_at else None,
+            "uploaded_by": db_file.uploaded_by if db_file else None
+        }
+        for issue, db_file in result.all()
+    ]
 
     return {
-        "total_files": len(all_files),
+        "run_id": run.run_id,
+        "checked_at": run.finished_at.isoformat() if run.finished_at else None,
+        "total_files": run.rows_scanned,
         "orphan_count": len(orphan_files),
         "orphan_files": orphan_files
     }
@@ -660,52 +817,26 @@ async def check_orphan_competencies(
 
     orphan_competencies = []
 
-    if settings.FILE_STORAGE_TYPE == "r2":
-        r2_client = get_r2_client()
-        for comp in competencies:
-            if comp.file:
-                try:
-                    r2_client.stat_object(settings.R2_BUCKET, comp.file.file_path)
-                except S3Error as e:
-                    if e.code == "NoSuchKey":
-                        orphan_competencies.append({
-                            "competency_id": comp.competency_id,
-                            "user_id": comp.user_id,
-                            "user_name": comp.user.name if comp.user else None,
-                            "user_email": comp.user.email if comp.user else None,
-                            "item_id": comp.item_id,
-                            "item_name": comp.competency_item.item_name if comp.competency_item else None,
-                            "item_code": comp.competency_item.item_code if comp.competency_item else None,
-                            "file_id": comp.file_id,
-                            "original_filename": comp.file.original_filename if comp.file else None,
-                            "file_path": comp.file.file_path if comp.file else None,
-                            "verification_status": comp.verification_status.value if comp.verification_status else None,
-                            "is_globally_verified": comp.is_globally_verified,
-                            "created_at": comp.created_at.isoformat() if comp.created_at else None
-                        })
-    elif settings.FILE_STORAGE_TYPE == "minio":
-        minio_client = get_minio_client()
+    # 로컬 스토리지는 검사하지 않음 (R2/MinIO만)
+    if settings.FILE_STORAGE_TYPE in ("r2", "minio"):
+        storage = get_storage()
         for comp in competencies:
-            if comp.file:
-                try:
-                    minio_client.stat_object(settings.MINIO_BUCKET, comp.file.file_path)
-                except S3Error as e:
-                    if e.code == "NoSuchKey":
-                        orphan_competencies.append({
-                            "competency_id": comp.competency_id,
-                            "user_id": comp.user_id,
-                            "user_name": comp.user.name if comp.user else None,
-                            "user_email": comp.user.email if comp.user else None,
-                            "item_id": comp.item_id,
-                            "item_name": comp.competency_item.item_name if comp.competency_item else None,
-                            "item_code": comp.competency_item.item_code if comp.competency_item else None,
-                            "file_id": comp.file_id,
-                            "original_filename": comp.file.original_filename if comp.file else None,
-                            "file_path": comp.file.file_path if comp.file else None,
-                            "verification_status": comp.verification_status.value if comp.verification_status else None,
-                            "is_globally_verified": comp.is_globally_verified,
-                            "created_at": comp.created_at.isoformat() if comp.created_at else None
-                        })
+            if comp.file and not await storage.exists(comp.file.file_path):
+                orphan_competencies.append({
+                    "competency_id": comp.competency_id,
+                    "user_id": comp.user_id,
+                    "user_name": comp.user.name if comp.user else None,
+                    "user_email": comp.user.email if comp.user else None,
+                    "item_id": comp.item_id,
+                    "item_name": comp.competency_item.item_name if comp.competency_item else None,
+                    "item_code": comp.competency_item.item_code if comp.competency_item else None,
+                    "file_id": comp.file_id,
+                    "original_filename": comp.file.original_filename if comp.file else None,
+                    "file_path": comp.file.file_path if comp.file else None,
+                    "verification_status": comp.verification_status.value if comp.verification_status else None,
+                    "is_globally_verified": comp.is_globally_verified,
+                    "created_at": comp.created_at.isoformat() if comp.created_at else None
+                })
 
     return {
         "total_competencies_with_files": len(competencies),
@@ -766,22 +897,8 @@ async def delete_orphan_competency(
 
         if db_file:
             is_orphan = False
-            if settings.FILE_STORAGE_TYPE == "r2":
-                r2_client = get_r2_client()
-                try:
-                    r2_client.stat_object(settings.R2_BUCKET, db_file.file_path)
-                    is_orphan = False
-                except S3Error as e:
-                    if e.code == "NoSuchKey":
-                        is_orphan = True
-            elif settings.FILE_STORAGE_TYPE == "minio":
-                minio_client = get_minio_client()
-                try:
-                    minio_client.stat_object(settings.MINIO_BUCKET, db_file.file_path)
-                    is_orphan = False
-                except S3Error as e:
-                    if e.code == "NoSuchKey":
-                        is_orphan = True
+            if settings.FILE_STORAGE_TYPE in ("r2", "minio"):
+                is_orphan = not await get_storage().exists(db_file.file_path)
 
             if not is_orphan:
                 raise HTTPException(
@@ -1,14 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.models.user import User
+from app.core.file_delivery import is_not_modified
+from app.core.security import create_stream_token, decode_token, get_current_user
+from app.models.user import User, UserStatus
 from app.models.notification import Notification
-from app.schemas.notification import NotificationResponse, NotificationUpdate
+from app.schemas.notification import NotificationResponse, NotificationUpdate, StreamTokenResponse
+from app.services.notification_counter_service import get_unread_count as read_unread_count
+from app.services.notification_counter_service import notification_events, recount_unread
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
@@ -53,18 +58,85 @@ async def get_my_notifications(
 
 @router.get("/unread-count")
 async def get_unread_count(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get count of unread notifications"""
-    result = await db.execute(
-        select(Notification).where(
-            Notification.user_id == current_user.user_id,
-            Notification.is_read == False
-        )
+    """
+    Get count of unread notifications
+
+    Read from the user's counter row. The ETag changes with the count, so
+    polling clients get 304 while nothing changed.
+    """
+    count = await read_unread_count(db, current_user.user_id)
+    headers = {
+        "ETag": f'"unread-{current_user.user_id}-{count}"',
+        "Cache-Control": "private, no-cache",
+    }
+    if is_not_modified(request, headers["ETag"], None):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse({"count": count}, headers=headers)
+
+
+@router.post("/stream-token", response_model=StreamTokenResponse)
+async def get_stream_token(current_user: User = Depends(get_current_user)):
+    """
+    Short-lived token for GET /notifications/stream
+
+    EventSource cannot send the Authorization header, so the stream is
+    opened with ?token=... from here (valid only for opening the stream).
+    """
+    return StreamTokenResponse(
+        token=create_stream_token(current_user.user_id),
+        expires_in=settings.NOTIFICATION_STREAM_TOKEN_SECONDS
+    )
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_notifications(
+    token: str = Query(..., description="Token from POST /notifications/stream-token"),
+    last_event_id: Optional[int] = Query(None, description="Resume after this notification_id"),
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Server-sent events: new notifications and unread count changes
+
+    Events:
+    - `notification` (id = notification_id): NotificationResponse
+    - `unread_count`: {"count": n}, on connect and on every change
+
+    Authenticated by a stream token in the query string (EventSource cannot
+    send headers). Reconnecting with Last-Event-ID (EventSource's automatic
+    reconnect) or ?last_event_id= resumes after that notification. The
+    stream closes every NOTIFICATION_STREAM_MAX_SECONDS; by then the token
+    has expired, so clients fetch a new one and reconnect.
+    """
+    payload = decode_token(token)
+    try:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
+        user_id = None
+    if payload.get("type") != "stream" or user_id is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid stream token")
+    user = await db.get(User, user_id)
+    if user is None or user.status != UserStatus.ACTIVE:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid stream token")
+
+    if last_event_id is None:
+        last_event_id = last_event_id_header
+
+    # The stream reads with short sessions of its own; do not hold a pooled
+    # connection for as long as the client stays connected
+    await db.close()
+    return StreamingResponse(
+        notification_events(user_id, last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Proxies must not buffer events
+        }
     )
-    notifications = result.scalars().all()
-    return {"count": len(notifications)}
 
 
 @router.put("/{notification_id}/read", response_model=NotificationResponse)
@@ -126,6 +198,7 @@ async def mark_all_as_read(
         )
         .values(is_read=True, read_at=datetime.now())
     )
+    await recount_unread(db, [current_user.user_id])
     await db.commit()
 
     return {"message": "All notifications marked as read"}
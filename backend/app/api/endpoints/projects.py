@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, cast, String
 from typing import List, Optional
 import logging
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import get_current_user, require_role
 from app.core.utils import get_user_roles
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor, keyset_condition, keyset_order_by
 from app.models.user import User, UserStatus
 from app.models.project import Project, ProjectStatus, ProjectStaff
 from app.models.application import Application, ApplicationData, ApplicationStatus, DocumentStatus, SelectionResult
@@ -42,6 +46,10 @@ from app.schemas.competency import (
     ScoringCriteriaCreate,
     CompetencyItemResponse,
 )
+from app.services.project_stats_service import recount_project_stats, select_projects_with_counts
+from app.services.notification_service import create_notifications_bulk, review_start_spec
+from app.services.proof_export_service import iter_proof_entries, stream_proof_zip
+from app.services.storage import get_storage
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -260,7 +268,7 @@ async def create_test_project_with_applications(
     from decimal import Decimal
     from app.schemas.project import calculate_display_status
     from app.models.competency import ProofRequiredLevel
-    from app.core.security import get_password_hash
+    from app.core.security import get_password_hash_async
     from app.models.application import CoachRole
     import random
     import json
@@ -439,7 +447,7 @@ async def create_test_project_with_applications(
                 test_user = User(
                     name=korean_names[i-1] if i <= len(korean_names) else f"테스트유저{i}",
                     email=email,
-                    hashed_password=get_password_hash("test1234"),
+                    hashed_password=await get_password_hash_async("test1234"),
                     phone=f"010-1234-{str(i).zfill(4)}",
                     address="서울시 테스트구",
                     roles=json.dumps(["COACH"]),
@@ -714,11 +722,13 @@ async def create_project(
 
 @router.get("", response_model=List[ProjectListResponse])
 async def list_projects(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by project status (case-insensitive)"),
     manager_id: Optional[int] = Query(None, description="Filter by project manager ID"),
     mode: Optional[str] = Query(None, description="Mode: 'participate' (recruiting only) or 'manage' (own projects)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page (replaces skip)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -735,6 +745,9 @@ async def list_projects(
     - SUPER_ADMIN: Can see all projects
     - PROJECT_MANAGER: Can see projects they manage or created
     - Others: Can see all projects (for application purposes)
+
+    **Pagination**: keyset on created_at; when more projects follow, the
+    cursor of the next page is returned in the X-Next-Cursor header.
     """
     import traceback
     from app.core.utils import get_user_roles
@@ -744,8 +757,8 @@ async def list_projects(
         user_roles = get_user_roles(current_user)
         print(f"[LIST PROJECTS] user_id={current_user.user_id}, roles={user_roles}")
 
-        # Build query
-        query = select(Project)
+        # Build query (application counts joined per project)
+        query = select_projects_with_counts()
 
         # Apply filters based on user role and mode
         from datetime import date
@@ -824,10 +837,20 @@ async def list_projects(
             query = query.where(Project.project_manager_id == manager_id)
 
         # Apply pagination
-        query = query.order_by(Project.created_at.desc()).offset(skip).limit(limit)
+        if cursor:
+            created_at, last_id = decode_cursor(cursor, expected_length=2)
+            query = query.where(keyset_condition(Project.created_at, Project.project_id, created_at, last_id))
+        else:
+            query = query.offset(skip)
+        query = query.order_by(*keyset_order_by(Project.created_at, Project.project_id)).limit(limit + 1)
 
         result = await db.execute(query)
-        projects = result.scalars().all()
+        rows = result.all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_project = rows[-1].Project
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_project.created_at, last_project.project_id)
+        projects = [row.Project for row in rows]
         print(f"[LIST PROJECTS] Found {len(projects)} projects")
 
         # Batch fetch project manager names
@@ -842,15 +865,7 @@ async def list_projects(
 
         # Build response with application counts
         response_list = []
-        for project in projects:
-            # Count applications
-            count_result = await db.execute(
-                select(func.count(Application.application_id)).where(
-                    Application.project_id == project.project_id
-                )
-            )
-            application_count = count_result.scalar()
-
+        for project, application_count, current_participants in rows:
             # display_status 계산
             display_status = calculate_display_status(
                 project.status,
@@ -858,15 +873,6 @@ async def list_projects(
                 project.recruitment_end_date
             )
 
-            # Count confirmed participants (selected applications)
-            confirmed_result = await db.execute(
-                select(func.count(Application.application_id)).where(
-                    Application.project_id == project.project_id,
-                    Application.selection_result == "selected"
-                )
-            )
-            current_participants = confirmed_result.scalar() or 0
-
             response_item = ProjectListResponse(
                 project_id=project.project_id,
                 project_name=project.project_name,
@@ -913,33 +919,15 @@ async def get_test_projects(
     from app.schemas.project import calculate_display_status
 
     # 과제명이 '[테스트]'로 시작하는 과제만 조회
+    # application_count와 current_participants는 같은 쿼리에서 집계
     result = await db.execute(
-        select(Project)
+        select_projects_with_counts()
         .where(Project.project_name.like('[테스트]%'))
         .order_by(Project.created_at.desc())
     )
-    projects = result.scalars().all()
 
-    # 각 프로젝트에 대해 application_count와 current_participants 계산
     response_list = []
-    for project in projects:
-        # 전체 응모 수
-        app_count_result = await db.execute(
-            select(func.count(Application.application_id))
-            .where(Application.project_id == project.project_id)
-        )
-        application_count = app_count_result.scalar() or 0
-
-        # 선발된 참여자 수
-        selected_count_result = await db.execute(
-            select(func.count(Application.application_id))
-            .where(
-                Application.project_id == project.project_id,
-                Application.selection_result == 'selected'
-            )
-        )
-        current_participants = selected_count_result.scalar() or 0
-
+    for project, application_count, current_participants in result.all():
         display_status = calculate_display_status(project)
 
         response_list.append(ProjectListResponse(
@@ -1029,10 +1017,11 @@ async def bulk_delete_projects(
                 WHERE related_application_id IN (SELECT application_id FROM applications WHERE project_id = :project_id)
             """), {"project_id": project_id})
 
-            # 4. Applications 삭제
+            # 4. Applications 삭제 (ORM 이벤트를 거치지 않으므로 직접 재집계)
             await db.execute(text("""
                 DELETE FROM applications WHERE project_id = :project_id
             """), {"project_id": project_id})
+            await recount_project_stats(db, [project_id])
 
             # 5. CustomQuestionAnswers 삭제
             await db.execute(text("""
@@ -1295,10 +1284,11 @@ async def delete_project(
             )
         """), {"project_id": project_id})
 
-        # 4. Applications 삭제
+        # 4. Applications 삭제 (ORM 이벤트를 거치지 않으므로 직접 재집계)
         await db.execute(text("""
             DELETE FROM applications WHERE project_id = :project_id
         """), {"project_id": project_id})
+        await recount_project_stats(db, [project_id])
 
         # 5. ScoringCriteria 삭제 (ProjectItem의 자식)
         await db.execute(text("""
@@ -2844,12 +2834,26 @@ async def freeze_applications(
 # Project Applications List (응모자 목록)
 # ============================================================================
 from app.schemas.application import ProjectApplicationListItem, ApplicantInfo
+from app.services.application_service import DocumentVerificationSummary, get_document_verification_summaries
+
+# 응모자 목록 정렬 키 (score는 final_score 우선, 없으면 auto_score)
+APPLICATION_SORT_KEYS = {
+    "submitted_at": Application.submitted_at,
+    "score": func.coalesce(Application.final_score, Application.auto_score),
+    "status": cast(Application.status, String),
+}
 
 
 @router.get("/{project_id}/applications", response_model=List[ProjectApplicationListItem])
 async def get_project_applications(
     project_id: int,
+    response: Response,
     status_filter: Optional[str] = Query(None, description="Filter by status: draft, submitted, reviewing, completed"),
+    sort_by: str = Query("submitted_at", description="Sort key: submitted_at, score, status"),
+    order: str = Query("desc", description="Sort order: asc, desc"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (omit for all applications)"),
+    cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (e.g. application_id,applicant,auto_score)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -2861,6 +2865,10 @@ async def get_project_applications(
     This endpoint returns a list of all applications for a project,
     including applicant information and document verification status.
     This is used by admins to view applicants and by reviewers for evaluation.
+
+    Runs a fixed number of queries regardless of cohort size. With `limit`,
+    the cursor of the next page is returned in the X-Next-Cursor header.
+    `score` sorts by final_score, falling back to auto_score.
     """
     from app.core.utils import get_user_roles
 
@@ -2896,79 +2904,70 @@ async def get_project_applications(
             detail="Not enough permissions to view applications"
         )
 
-    # Build query
-    query = select(Application).where(Application.project_id == project_id)
+    sort_expr = APPLICATION_SORT_KEYS.get(sort_by)
+    if sort_expr is None or order not in ("asc", "desc"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid sort. sort_by: {list(APPLICATION_SORT_KEYS)}, order: asc, desc"
+        )
+    descending = order == "desc"
+
+    selected_fields = None
+    if fields:
+        selected_fields = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = selected_fields - set(ProjectApplicationListItem.model_fields)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {sorted(unknown)}"
+            )
+        selected_fields.add("application_id")
+
+    # Applications joined to their applicants in one query
+    query = (
+        select(Application, User, sort_expr.label("sort_value"))
+        .join(User, User.user_id == Application.user_id)
+        .where(Application.project_id == project_id)
+    )
 
     # Apply status filter
     if status_filter:
         query = query.where(Application.status == status_filter)
 
-    # Order by submitted_at desc
-    query = query.order_by(Application.submitted_at.desc().nullslast(), Application.application_id.desc())
-
-    result = await db.execute(query)
-    applications = result.scalars().all()
+    if cursor:
+        cursor_sort_by, cursor_order, sort_value, last_id = decode_cursor(cursor, expected_length=4)
+        if cursor_sort_by != sort_by or cursor_order != order:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor does not match sort_by/order"
+            )
+        query = query.where(keyset_condition(sort_expr, Application.application_id, sort_value, last_id, descending))
 
-    # Build response
-    response_list = []
-    for application in applications:
-        # Get applicant info
-        user_result = await db.execute(
-            select(User).where(User.user_id == application.user_id)
-        )
-        applicant = user_result.scalar_one_or_none()
+    query = query.order_by(*keyset_order_by(sort_expr, Application.application_id, descending))
+    if limit:
+        query = query.limit(limit + 1)
 
-        if not applicant:
-            continue
+    result = await db.execute(query)
+    rows = result.all()
 
-        # Get application data for document verification status
-        app_data_result = await db.execute(
-            select(ApplicationData).where(
-                ApplicationData.application_id == application.application_id
-            )
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            sort_by, order, last.sort_value, last.Application.application_id
         )
-        app_data_items = app_data_result.scalars().all()
 
-        # Get project items for proof_required_level check
-        project_items_result = await db.execute(
-            select(ProjectItem).where(ProjectItem.project_id == project_id)
+    # Document verification rollup: one batch load of ApplicationData + project items
+    summaries = {}
+    if selected_fields is None or selected_fields & {"document_verification_status", "supplement_count"}:
+        summaries = await get_document_verification_summaries(
+            db, [row.Application.application_id for row in rows]
         )
-        project_items = {pi.item_id: pi for pi in project_items_result.scalars().all()}
-
-        # Calculate document verification status (증빙검토 상태)
-        # - NOT_REQUIRED 또는 (OPTIONAL + 파일 없음) → 검토 불필요 (approved로 취급)
-        # - 파일 첨부된 항목만 실제 검토 상태 확인
-        supplement_count = 0
-        if not app_data_items:
-            doc_verification_status = "approved"  # 항목 없으면 검토 완료로 처리
-        else:
-            effective_statuses = []
-            for item in app_data_items:
-                pi = project_items.get(item.item_id)
-                proof_level = pi.proof_required_level if pi else None
-
-                # 증빙 불필요 항목은 approved로 취급
-                if proof_level == ProofRequiredLevel.NOT_REQUIRED:
-                    effective_statuses.append("approved")
-                elif proof_level == ProofRequiredLevel.OPTIONAL and item.submitted_file_id is None:
-                    effective_statuses.append("approved")
-                else:
-                    # 실제 검토 상태 사용
-                    effective_statuses.append(item.verification_status)
-                    if item.verification_status == "supplement_requested":
-                        supplement_count += 1
-
-            if supplement_count > 0:
-                doc_verification_status = "supplement_requested"
-            elif all(s == "approved" for s in effective_statuses):
-                doc_verification_status = "approved"
-            elif any(s == "rejected" for s in effective_statuses):
-                doc_verification_status = "rejected"
-            elif any(s == "approved" for s in effective_statuses):
-                doc_verification_status = "partial"
-            else:
-                doc_verification_status = "pending"
 
+    # Build response
+    response_list = []
+    for application, applicant, _ in rows:
+        summary = summaries.get(application.application_id, DocumentVerificationSummary())
         response_item = ProjectApplicationListItem(
             application_id=application.application_id,
             project_id=application.project_id,
@@ -2988,14 +2987,60 @@ async def get_project_applications(
             last_updated=application.last_updated,
             is_frozen=application.is_frozen,
             frozen_at=application.frozen_at,
-            document_verification_status=doc_verification_status,
-            supplement_count=supplement_count
+            document_verification_status=summary.status,
+            supplement_count=summary.supplement_count,
+            document_status=application.document_status or "pending",
+            document_disqualification_reason=application.document_disqualification_reason
         )
         response_list.append(response_item)
 
+    if selected_fields is not None:
+        return JSONResponse(
+            content=jsonable_encoder([item.model_dump(include=selected_fields) for item in response_list]),
+            headers=dict(response.headers)
+        )
     return response_list
 
 
+@router.get("/{project_id}/proofs/export")
+async def export_project_proofs(
+    project_id: int,
+    from_application_id: Optional[int] = Query(None, description="Resume from this application (inclusive)"),
+    to_application_id: Optional[int] = Query(None, description="Stop after this application (inclusive)"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Download every submitted proof file of a project as one ZIP (증빙 일괄 다운로드)
+
+    **Permissions**: SUPER_ADMIN, project creator, project manager
+
+    The archive is streamed as it is built: `<application_id>_<applicant>/<item>/<file>`
+    per proof, applicants in application_id order, and a closing manifest.csv
+    with the status of every file. Resume an interrupted download with
+    `from_application_id` set to the last applicant folder received.
+    """
+    project = await get_project_or_404(project_id, db)
+    check_project_manager_permission(project, current_user)
+
+    if from_application_id is not None and to_application_id is not None and from_application_id > to_application_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="from_application_id must not be greater than to_application_id"
+        )
+
+    filename = f"project_{project_id}_proofs"
+    if from_application_id is not None or to_application_id is not None:
+        filename += f"_{from_application_id or ''}-{to_application_id or ''}"
+
+    entries = iter_proof_entries(project_id, from_application_id, to_application_id)
+    return StreamingResponse(
+        stream_proof_zip(entries, get_storage(), settings.PROOF_EXPORT_CONCURRENCY),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={filename}.zip"}
+    )
+
+
 # ============================================================================
 # Project Staff (심사자) Management Endpoints
 # ============================================================================
@@ -3482,6 +3527,19 @@ async def start_review(
     # 프로젝트 심사개시 시점 기록
     project.review_started_at = now
 
+    # 응모자 전원에게 심사개시 결과 알림 (같은 트랜잭션)
+    await create_notifications_bulk(db, [
+        review_start_spec(
+            user_id=app.user_id,
+            application_id=app.application_id,
+            project_id=project_id,
+            project_name=project.project_name,
+            is_qualified=app.document_status == DocumentStatus.APPROVED,
+            reason=app.document_disqualification_reason
+        )
+        for app in applications
+    ])
+
     await db.commit()
 
     logger.info(
@@ -17,9 +17,10 @@ from app.models.reviewer_evaluation import ReviewerEvaluation, Recommendation
 from app.services.scoring_service import (
     calculate_project_all_scores,
     finalize_project_scores,
-    calculate_qualitative_score_average
+    get_evaluation_aggregates,
+    EvaluationAggregate
 )
-from app.services.notification_service import send_selection_result_notification
+from app.services.notification_service import create_notifications_bulk, selection_result_spec
 from app.schemas.reviewer_evaluation import (
     ReviewerEvaluationCreate,
     ReviewerEvaluationUpdate,
@@ -414,19 +415,16 @@ async def recommend_selection(
     )
     applications = result.scalars().all()
 
+    # Evaluation count/average for all applications in one grouped query
+    aggregates = await get_evaluation_aggregates(db, project_id)
+
     recommendations = []
     cutoff_score = None
 
     for idx, app in enumerate(applications):
-        # Get evaluation count
-        eval_result = await db.execute(
-            select(func.count(ReviewerEvaluation.evaluation_id))
-            .where(ReviewerEvaluation.application_id == app.application_id)
-        )
-        eval_count = eval_result.scalar_one()
-
-        # Get qualitative average
-        qual_avg = await calculate_qualitative_score_average(db, app.application_id)
+        aggregate = aggregates.get(app.application_id, EvaluationAggregate())
+        eval_count = aggregate.count
+        qual_avg = aggregate.average or None
 
         recommended = idx < project.max_participants and app.final_score is not None
         if recommended and cutoff_score is None and idx == project.max_participants - 1:
@@ -538,36 +536,29 @@ async def confirm_bulk_selection(
         rejected_count += 1
         rejected_apps.append(app)
 
-    await db.commit()
-
-    # Send notifications to all applicants
-    for app in selected_apps:
-        try:
-            await send_selection_result_notification(
-                db=db,
-                user_id=app.user_id,
-                application_id=app.application_id,
-                project_id=project_id,
-                project_name=project.project_name,
-                is_selected=True,
-                message=f"축하합니다! '{project.project_name}' 과제에 선발되었습니다."
-            )
-        except Exception as e:
-            print(f"[SELECTION] Failed to send notification to user {app.user_id}: {e}")
-
-    for app in rejected_apps:
-        try:
-            await send_selection_result_notification(
-                db=db,
-                user_id=app.user_id,
-                application_id=app.application_id,
-                project_id=project_id,
-                project_name=project.project_name,
-                is_selected=False,
-                message=f"'{project.project_name}' 과제 선발 결과를 안내드립니다. 아쉽게도 이번에는 선발되지 않았습니다."
-            )
-        except Exception as e:
-            print(f"[SELECTION] Failed to send notification to user {app.user_id}: {e}")
+    # Notify all applicants in the same transaction (emails go out after commit)
+    specs = [
+        selection_result_spec(
+            user_id=app.user_id,
+            application_id=app.application_id,
+            project_id=project_id,
+            project_name=project.project_name,
+            is_selected=True,
+            message=f"축하합니다! '{project.project_name}' 과제에 선발되었습니다."
+        )
+        for app in selected_apps
+    ] + [
+        selection_result_spec(
+            user_id=app.user_id,
+            application_id=app.application_id,
+            project_id=project_id,
+            project_name=project.project_name,
+            is_selected=False,
+            message=f"'{project.project_name}' 과제 선발 결과를 안내드립니다. 아쉽게도 이번에는 선발되지 않았습니다."
+        )
+        for app in rejected_apps
+    ]
+    await create_notifications_bulk(db, specs)
 
     await db.commit()
 
@@ -691,16 +682,14 @@ async def get_applications_with_scores(
     )
     applications = result.scalars().all()
 
+    # Evaluation statistics for all applications in one grouped query
+    aggregates = await get_evaluation_aggregates(db, project_id)
+
     response = []
     for rank, app in enumerate(applications, 1):
-        # Get evaluation count and average
-        eval_result = await db.execute(
-            select(func.count(ReviewerEvaluation.evaluation_id), func.avg(ReviewerEvaluation.total_score))
-            .where(ReviewerEvaluation.application_id == app.application_id)
-        )
-        eval_row = eval_result.one()
-        eval_count = eval_row[0] or 0
-        qual_avg = float(eval_row[1]) if eval_row[1] else None
+        aggregate = aggregates.get(app.application_id, EvaluationAggregate())
+        eval_count = aggregate.count
+        qual_avg = float(aggregate.average) if aggregate.average else None
 
         response.append({
             "application_id": app.application_id,
@@ -711,6 +700,9 @@ async def get_applications_with_scores(
             "status": app.status.value,
             "auto_score": float(app.auto_score) if app.auto_score else None,
             "qualitative_avg": round(qual_avg, 2) if qual_avg else None,
+            "qualitative_min": float(aggregate.minimum) if aggregate.minimum is not None else None,
+            "qualitative_max": float(aggregate.maximum) if aggregate.maximum is not None else None,
+            "qualitative_stddev": round(float(aggregate.stddev), 2) if aggregate.stddev is not None else None,
             "final_score": float(app.final_score) if app.final_score else None,
             "selection_result": app.selection_result.value,
             "selection_reason": app.selection_reason if hasattr(app, 'selection_reason') else None,
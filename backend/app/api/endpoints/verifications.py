@@ -4,14 +4,15 @@
 - 관리자가 증빙 검증 상태 리셋
 - 다중 컨펌 시스템 (N명 이상 컨펌 시 전역 확정)
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, func, and_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select, func, and_, exists
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from typing import List, Optional
-from datetime import datetime, timezone
+from sqlalchemy.orm import selectinload, aliased
+from typing import List, Literal, Optional
+from datetime import datetime, timedelta, timezone
 
 from app.core.database import get_db
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
 from app.core.security import get_current_user, require_roles
 from app.models import (
     User, UserRole, CoachCompetency, CompetencyItem,
@@ -21,6 +22,7 @@ from app.models import (
 from app.models.project import Project
 from app.models.competency import VerificationStatus, ItemTemplate, ProjectItem, ProofRequiredLevel
 from app.services.notification_service import send_verification_supplement_notification
+from app.services.file_preview_service import PREVIEW_READY, preview_url
 from app.schemas.verification import (
     VerificationRecordResponse,
     CompetencyVerificationStatus,
@@ -28,6 +30,7 @@ from app.schemas.verification import (
     VerificationResetRequest,
     VerificationSupplementRequest,
     PendingVerificationItem,
+    PendingVerificationCounts,
     ActivityRecord
 )
 from app.schemas.competency import FileBasicInfo
@@ -95,8 +98,125 @@ async def check_and_update_global_verification(
     return competency.is_globally_verified
 
 
+PENDING_SOURCES = ('competency', 'application_data')
+
+# 검증 대상 역량 템플릿 (파일 증빙이 있는 항목)
+VERIFIABLE_TEMPLATES = [
+    ItemTemplate.FILE,
+    ItemTemplate.TEXT_FILE,
+    ItemTemplate.DEGREE,
+    ItemTemplate.COACHING_HISTORY
+]
+
+
+def _pending_competency_filters(
+    verifier_id: int,
+    item_id: Optional[int],
+    created_after: Optional[datetime],
+    created_before: Optional[datetime],
+    claimable_only: bool
+) -> list:
+    """검증 대기 CoachCompetency 조건 (목록/건수 공용)"""
+    conditions = [
+        CoachCompetency.is_globally_verified == False,
+        CoachCompetency.file_id.isnot(None),
+        CompetencyItem.template.in_(VERIFIABLE_TEMPLATES)
+    ]
+    if item_id is not None:
+        conditions.append(CoachCompetency.item_id == item_id)
+    if created_after is not None:
+        conditions.append(CoachCompetency.created_at >= created_after)
+    if created_before is not None:
+        conditions.append(CoachCompetency.created_at <= created_before)
+    if claimable_only:
+        # 본인이 아직 컨펌하지 않은 항목만
+        conditions.append(~exists().where(
+            VerificationRecord.competency_id == CoachCompetency.competency_id,
+            VerificationRecord.verifier_id == verifier_id,
+            VerificationRecord.is_valid == True
+        ))
+    return conditions
+
+
+def _pending_application_data_filters(
+    verifier_id: int,
+    project_id: Optional[int],
+    item_id: Optional[int],
+    created_after: Optional[datetime],
+    created_before: Optional[datetime],
+    claimable_only: bool
+) -> list:
+    """검증 대기 ApplicationData 조건 (목록/건수 공용)"""
+    conditions = [
+        Application.status == 'submitted',
+        ApplicationData.verification_status != 'approved',
+        ApplicationData.submitted_file_id.isnot(None)  # 파일 첨부된 것만
+    ]
+    if project_id is not None:
+        conditions.append(Application.project_id == project_id)
+    if item_id is not None:
+        conditions.append(ApplicationData.item_id == item_id)
+    if created_after is not None:
+        conditions.append(Application.submitted_at >= created_after)
+    if created_before is not None:
+        conditions.append(Application.submitted_at <= created_before)
+    if claimable_only:
+        conditions.append(~exists().where(
+            VerificationRecord.application_data_id == ApplicationData.data_id,
+            VerificationRecord.verifier_id == verifier_id,
+            VerificationRecord.is_valid == True
+        ))
+    return conditions
+
+
+def _age_window(min_age_days: Optional[int], max_age_days: Optional[int]):
+    """대기 기간(일) → (created_after, created_before)"""
+    now = datetime.now(timezone.utc)
+    created_before = now - timedelta(days=min_age_days) if min_age_days is not None else None
+    created_after = now - timedelta(days=max_age_days) if max_age_days is not None else None
+    return created_after, created_before
+
+
+def _verification_note(competency_item: Optional[CompetencyItem]) -> Optional[str]:
+    """검증 안내 추출 (역량항목 독립 필드 우선, 없으면 템플릿 fallback)"""
+    if not competency_item:
+        return None
+    note = competency_item.verification_note
+    if not note and competency_item.unified_template:
+        note = competency_item.unified_template.verification_note
+    if not note and competency_item.scoring_template:
+        note = competency_item.scoring_template.verification_note
+    return note
+
+
+def _file_basic_info(file) -> Optional[FileBasicInfo]:
+    if not file:
+        return None
+    # 미리보기가 있으면 원본 대신 썸네일/미리보기로 검토
+    has_preview = file.preview_status == PREVIEW_READY
+    return FileBasicInfo(
+        file_id=file.file_id,
+        original_filename=file.original_filename,
+        file_size=file.file_size,
+        mime_type=file.mime_type,
+        uploaded_at=file.uploaded_at,
+        content_hash=file.content_hash,
+        preview_url=preview_url(file.file_id) if has_preview else None,
+        thumbnail_url=preview_url(file.file_id, "thumb") if has_preview else None
+    )
+
+
 @router.get("/pending", response_model=List[PendingVerificationItem])
 async def get_pending_verifications(
+    response: Response,
+    source: Optional[Literal['competency', 'application_data']] = Query(None, description="Only this source"),
+    project_id: Optional[int] = Query(None, description="Only application data of this project"),
+    item_id: Optional[int] = Query(None, description="Only this competency item"),
+    min_age_days: Optional[int] = Query(None, ge=0, description="Waiting at least this many days"),
+    max_age_days: Optional[int] = Query(None, ge=0, description="Waiting at most this many days"),
+    claimable_only: bool = Query(False, description="Exclude items the caller already confirmed"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (omit for the full queue)"),
+    cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles([UserRole.VERIFIER, UserRole.PROJECT_MANAGER, UserRole.SUPER_ADMIN]))
 ):
@@ -105,228 +225,230 @@ async def get_pending_verifications(
     - CoachCompetency: 전역 검증되지 않은 증빙
     - ApplicationData: 아직 approved가 아닌 지원서 항목 (파일 첨부된 것만)
     - 현재 사용자의 컨펌 여부 포함
+
+    Competencies come first (newest first), then application data (newest
+    first). With `limit`, the cursor of the next page is returned in the
+    X-Next-Cursor header; totals are served by GET /verifications/pending/counts.
     """
     from app.models.file import File
 
+    after_source, after_id = None, None
+    if cursor:
+        after_source, after_id = decode_cursor(cursor, expected_length=2)
+        if after_source not in PENDING_SOURCES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    created_after, created_before = _age_window(min_age_days, max_age_days)
     required_count = await get_required_verifier_count(db)
+    verifier_id = current_user.user_id
     items = []
+    # limit + 1 rows tell whether another page follows
+    remaining = limit + 1 if limit else None
+
+    # 본인 컨펌 기록 (유효한 것, 항목당 최대 1건)
+    my_record = aliased(VerificationRecord)
 
     # =========================================================================
-    # 1. CoachCompetency 조회 (기존 로직)
+    # 1. CoachCompetency 조회 (프로젝트 필터가 있으면 제외)
     # =========================================================================
-    query = (
-        select(CoachCompetency)
-        .join(CompetencyItem, CoachCompetency.item_id == CompetencyItem.item_id)
-        .join(User, CoachCompetency.user_id == User.user_id)
-        .options(
-            selectinload(CoachCompetency.competency_item).selectinload(CompetencyItem.unified_template),
-            selectinload(CoachCompetency.competency_item).selectinload(CompetencyItem.scoring_template),
-            selectinload(CoachCompetency.user),
-            selectinload(CoachCompetency.verification_records),
-            selectinload(CoachCompetency.file)
-        )
-        .where(
-            and_(
-                CoachCompetency.is_globally_verified == False,
-                CoachCompetency.file_id.isnot(None),
-                CompetencyItem.template.in_([
-                    ItemTemplate.FILE,
-                    ItemTemplate.TEXT_FILE,
-                    ItemTemplate.DEGREE,
-                    ItemTemplate.COACHING_HISTORY
-                ])
-            )
-        )
-        .order_by(CoachCompetency.updated_at.desc())
-    )
-
-    result = await db.execute(query)
-    competencies = result.scalars().all()
-
-    for comp in competencies:
-        valid_records = [r for r in comp.verification_records if r.is_valid]
-        verification_count = len(valid_records)
-
-        my_record = next(
-            (r for r in valid_records if r.verifier_id == current_user.user_id),
-            None
-        )
-
-        my_verification = None
-        if my_record:
-            verifier_result = await db.execute(
-                select(User.name).where(User.user_id == my_record.verifier_id)
-            )
-            verifier_name = verifier_result.scalar_one_or_none()
-
-            my_verification = VerificationRecordResponse(
-                record_id=my_record.record_id,
-                competency_id=my_record.competency_id,
-                verifier_id=my_record.verifier_id,
-                verifier_name=verifier_name,
-                verified_at=my_record.verified_at,
-                is_valid=my_record.is_valid
+    if source in (None, 'competency') and project_id is None and after_source != 'application_data':
+        valid_count = (
+            select(func.count(VerificationRecord.record_id))
+            .where(
+                VerificationRecord.competency_id == CoachCompetency.competency_id,
+                VerificationRecord.is_valid == True
             )
-
-        file_info = None
-        if comp.file:
-            file_info = FileBasicInfo(
-                file_id=comp.file.file_id,
-                original_filename=comp.file.original_filename,
-                file_size=comp.file.file_size,
-                mime_type=comp.file.mime_type,
-                uploaded_at=comp.file.uploaded_at
+            .scalar_subquery()
+        )
+        query = (
+            select(CoachCompetency, CompetencyItem, User, File, my_record, valid_count.label("verification_count"))
+            .join(CompetencyItem, CoachCompetency.item_id == CompetencyItem.item_id)
+            .join(User, CoachCompetency.user_id == User.user_id)
+            .outerjoin(File, CoachCompetency.file_id == File.file_id)
+            .outerjoin(my_record, and_(
+                my_record.competency_id == CoachCompetency.competency_id,
+                my_record.verifier_id == verifier_id,
+                my_record.is_valid == True
+            ))
+            .options(
+                selectinload(CompetencyItem.unified_template),
+                selectinload(CompetencyItem.scoring_template)
             )
+            .where(and_(*_pending_competency_filters(
+                verifier_id, item_id, created_after, created_before, claimable_only
+            )))
+            .order_by(CoachCompetency.competency_id.desc())
+        )
+        if after_source == 'competency':
+            query = query.where(CoachCompetency.competency_id < after_id)
+        if remaining:
+            query = query.limit(remaining)
+
+        result = await db.execute(query)
+        for comp, competency_item, user, file, record, verification_count in result.all():
+            my_verification = None
+            if record:
+                my_verification = VerificationRecordResponse(
+                    record_id=record.record_id,
+                    competency_id=record.competency_id,
+                    verifier_id=record.verifier_id,
+                    verifier_name=current_user.name,
+                    verified_at=record.verified_at,
+                    is_valid=record.is_valid
+                )
 
-        # 검증 안내 추출 (역량항목 독립 필드 우선, 없으면 템플릿 fallback)
-        verification_note = None
-        if comp.competency_item:
-            verification_note = comp.competency_item.verification_note
-            if not verification_note and comp.competency_item.unified_template:
-                verification_note = comp.competency_item.unified_template.verification_note
-            if not verification_note and comp.competency_item.scoring_template:
-                verification_note = comp.competency_item.scoring_template.verification_note
-
-        items.append(PendingVerificationItem(
-            source='competency',
-            competency_id=comp.competency_id,
-            user_id=comp.user_id,
-            user_name=comp.user.name if comp.user else "Unknown",
-            user_email=comp.user.email if comp.user else "",
-            item_id=comp.item_id,
-            item_name=comp.competency_item.item_name if comp.competency_item else "Unknown",
-            item_code=comp.competency_item.item_code if comp.competency_item else "",
-            value=comp.value,
-            file_id=comp.file_id,
-            file_info=file_info,
-            created_at=comp.created_at or datetime.now(timezone.utc),
-            verification_count=verification_count,
-            required_count=required_count,
-            my_verification=my_verification,
-            verification_status=comp.verification_status.value if comp.verification_status else "pending",
-            rejection_reason=comp.rejection_reason,
-            verification_note=verification_note
-        ))
+            items.append(PendingVerificationItem(
+                source='competency',
+                competency_id=comp.competency_id,
+                user_id=comp.user_id,
+                user_name=user.name,
+                user_email=user.email,
+                item_id=comp.item_id,
+                item_name=competency_item.item_name,
+                item_code=competency_item.item_code,
+                value=comp.value,
+                file_id=comp.file_id,
+                file_info=_file_basic_info(file),
+                created_at=comp.created_at or datetime.now(timezone.utc),
+                verification_count=verification_count,
+                required_count=required_count,
+                my_verification=my_verification,
+                verification_status=comp.verification_status.value if comp.verification_status else "pending",
+                rejection_reason=comp.rejection_reason,
+                verification_note=_verification_note(competency_item)
+            ))
+        if remaining:
+            remaining -= len(items)
 
     # =========================================================================
-    # 2. ApplicationData 조회 (신규 로직)
+    # 2. ApplicationData 조회
     # - 지원서가 제출됨(submitted) 상태
     # - 검증 상태가 approved가 아님
     # - 파일이 첨부됨 (submitted_file_id is not None)
     # =========================================================================
-    app_data_query = (
-        select(ApplicationData)
-        .join(Application, ApplicationData.application_id == Application.application_id)
-        .join(Project, Application.project_id == Project.project_id)
-        .join(User, Application.user_id == User.user_id)
-        .join(CompetencyItem, ApplicationData.item_id == CompetencyItem.item_id)
-        .outerjoin(File, ApplicationData.submitted_file_id == File.file_id)
-        .options(
-            selectinload(ApplicationData.application),
-            selectinload(ApplicationData.competency_item).selectinload(CompetencyItem.unified_template),
-            selectinload(ApplicationData.competency_item).selectinload(CompetencyItem.scoring_template),
-            selectinload(ApplicationData.submitted_file),
-            selectinload(ApplicationData.verification_records)
-        )
-        .where(
-            and_(
-                Application.status == 'submitted',
-                ApplicationData.verification_status != 'approved',
-                ApplicationData.submitted_file_id.isnot(None)  # 파일 첨부된 것만
+    if source in (None, 'application_data') and (remaining is None or remaining > 0):
+        valid_count = (
+            select(func.count(VerificationRecord.record_id))
+            .where(
+                VerificationRecord.application_data_id == ApplicationData.data_id,
+                VerificationRecord.is_valid == True
             )
+            .scalar_subquery()
         )
-        .order_by(ApplicationData.data_id.desc())
-    )
-
-    app_data_result = await db.execute(app_data_query)
-    app_data_items = app_data_result.scalars().all()
-
-    for ad in app_data_items:
-        # 유효한 컨펌 수 계산
-        valid_records = [r for r in ad.verification_records if r.is_valid]
-        verification_count = len(valid_records)
-
-        # 현재 사용자의 컨펌 기록 확인
-        my_record = next(
-            (r for r in valid_records if r.verifier_id == current_user.user_id),
-            None
-        )
-
-        my_verification = None
-        if my_record:
-            verifier_result = await db.execute(
-                select(User.name).where(User.user_id == my_record.verifier_id)
+        app_data_query = (
+            select(
+                ApplicationData, Application, Project.project_name, CompetencyItem, User, File, my_record,
+                valid_count.label("verification_count")
             )
-            verifier_name = verifier_result.scalar_one_or_none()
-
-            my_verification = VerificationRecordResponse(
-                record_id=my_record.record_id,
-                application_data_id=my_record.application_data_id,
-                verifier_id=my_record.verifier_id,
-                verifier_name=verifier_name,
-                verified_at=my_record.verified_at,
-                is_valid=my_record.is_valid
+            .join(Application, ApplicationData.application_id == Application.application_id)
+            .join(Project, Application.project_id == Project.project_id)
+            .join(User, Application.user_id == User.user_id)
+            .join(CompetencyItem, ApplicationData.item_id == CompetencyItem.item_id)
+            .outerjoin(File, ApplicationData.submitted_file_id == File.file_id)
+            .outerjoin(my_record, and_(
+                my_record.application_data_id == ApplicationData.data_id,
+                my_record.verifier_id == verifier_id,
+                my_record.is_valid == True
+            ))
+            .options(
+                selectinload(CompetencyItem.unified_template),
+                selectinload(CompetencyItem.scoring_template)
             )
+            .where(and_(*_pending_application_data_filters(
+                verifier_id, project_id, item_id, created_after, created_before, claimable_only
+            )))
+            .order_by(ApplicationData.data_id.desc())
+        )
+        if after_source == 'application_data':
+            app_data_query = app_data_query.where(ApplicationData.data_id < after_id)
+        if remaining:
+            app_data_query = app_data_query.limit(remaining)
+
+        app_data_result = await db.execute(app_data_query)
+        for ad, app, project_name, competency_item, user, file, record, verification_count in app_data_result.all():
+            my_verification = None
+            if record:
+                my_verification = VerificationRecordResponse(
+                    record_id=record.record_id,
+                    application_data_id=record.application_data_id,
+                    verifier_id=record.verifier_id,
+                    verifier_name=current_user.name,
+                    verified_at=record.verified_at,
+                    is_valid=record.is_valid
+                )
 
-        # 파일 정보
-        file_info = None
-        if ad.submitted_file:
-            file_info = FileBasicInfo(
-                file_id=ad.submitted_file.file_id,
-                original_filename=ad.submitted_file.original_filename,
-                file_size=ad.submitted_file.file_size,
-                mime_type=ad.submitted_file.mime_type,
-                uploaded_at=ad.submitted_file.uploaded_at
-            )
+            items.append(PendingVerificationItem(
+                source='application_data',
+                application_data_id=ad.data_id,
+                user_id=app.user_id,
+                user_name=user.name,
+                user_email=user.email,
+                item_id=ad.item_id,
+                item_name=competency_item.item_name,
+                item_code=competency_item.item_code,
+                value=ad.submitted_value,
+                file_id=ad.submitted_file_id,
+                file_info=_file_basic_info(file),
+                created_at=app.submitted_at or datetime.now(timezone.utc),
+                verification_count=verification_count,
+                required_count=required_count,
+                my_verification=my_verification,
+                verification_status=ad.verification_status,
+                rejection_reason=ad.rejection_reason,
+                verification_note=_verification_note(competency_item),
+                # ApplicationData 전용 필드
+                application_id=ad.application_id,
+                project_id=app.project_id,
+                project_name=project_name
+            ))
+
+    if limit and len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        last_id = last.competency_id if last.source == 'competency' else last.application_data_id
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.source, last_id)
 
-        # Application과 User 정보 조회
-        app = ad.application
-        user_result = await db.execute(
-            select(User).where(User.user_id == app.user_id)
-        )
-        user = user_result.scalar_one_or_none()
+    return items
 
-        # Project 정보 조회
-        project_result = await db.execute(
-            select(Project).where(Project.project_id == app.project_id)
-        )
-        project = project_result.scalar_one_or_none()
-
-        # 검증 안내 추출 (역량항목 독립 필드 우선, 없으면 템플릿 fallback)
-        ad_verification_note = None
-        if ad.competency_item:
-            ad_verification_note = ad.competency_item.verification_note
-            if not ad_verification_note and ad.competency_item.unified_template:
-                ad_verification_note = ad.competency_item.unified_template.verification_note
-            if not ad_verification_note and ad.competency_item.scoring_template:
-                ad_verification_note = ad.competency_item.scoring_template.verification_note
-
-        items.append(PendingVerificationItem(
-            source='application_data',
-            application_data_id=ad.data_id,
-            user_id=app.user_id,
-            user_name=user.name if user else "Unknown",
-            user_email=user.email if user else "",
-            item_id=ad.item_id,
-            item_name=ad.competency_item.item_name if ad.competency_item else "Unknown",
-            item_code=ad.competency_item.item_code if ad.competency_item else "",
-            value=ad.submitted_value,
-            file_id=ad.submitted_file_id,
-            file_info=file_info,
-            created_at=app.submitted_at or datetime.now(timezone.utc),
-            verification_count=verification_count,
-            required_count=required_count,
-            my_verification=my_verification,
-            verification_status=ad.verification_status if isinstance(ad.verification_status, str) else ad.verification_status,
-            rejection_reason=ad.rejection_reason,
-            verification_note=ad_verification_note,
-            # ApplicationData 전용 필드
-            application_id=ad.application_id,
-            project_id=app.project_id,
-            project_name=project.project_name if project else "Unknown"
-        ))
 
-    return items
+@router.get("/pending/counts", response_model=PendingVerificationCounts)
+async def get_pending_verification_counts(
+    project_id: Optional[int] = Query(None, description="Only application data of this project"),
+    item_id: Optional[int] = Query(None, description="Only this competency item"),
+    min_age_days: Optional[int] = Query(None, ge=0, description="Waiting at least this many days"),
+    max_age_days: Optional[int] = Query(None, ge=0, description="Waiting at most this many days"),
+    claimable_only: bool = Query(False, description="Exclude items the caller already confirmed"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles([UserRole.VERIFIER, UserRole.PROJECT_MANAGER, UserRole.SUPER_ADMIN]))
+):
+    """검증 대기 건수 (GET /verifications/pending 과 같은 필터, 페이지와 별도 집계)"""
+    created_after, created_before = _age_window(min_age_days, max_age_days)
+
+    competency_count = 0
+    if project_id is None:
+        competency_result = await db.execute(
+            select(func.count(CoachCompetency.competency_id))
+            .join(CompetencyItem, CoachCompetency.item_id == CompetencyItem.item_id)
+            .where(and_(*_pending_competency_filters(
+                current_user.user_id, item_id, created_after, created_before, claimable_only
+            )))
+        )
+        competency_count = competency_result.scalar() or 0
+
+    app_data_result = await db.execute(
+        select(func.count(ApplicationData.data_id))
+        .join(Application, ApplicationData.application_id == Application.application_id)
+        .where(and_(*_pending_application_data_filters(
+            current_user.user_id, project_id, item_id, created_after, created_before, claimable_only
+        )))
+    )
+    application_data_count = app_data_result.scalar() or 0
+
+    return PendingVerificationCounts(
+        competency=competency_count,
+        application_data=application_data_count,
+        total=competency_count + application_data_count
+    )
 
 
 @router.get("/{competency_id}", response_model=CompetencyVerificationStatus)
@@ -427,13 +549,7 @@ async def get_verification_status(
     # Build file info if file exists
     file_info = None
     if competency.file:
-        file_info = FileBasicInfo(
-            file_id=competency.file.file_id,
-            original_filename=competency.file.original_filename,
-            file_size=competency.file.file_size,
-            mime_type=competency.file.mime_type,
-            uploaded_at=competency.file.uploaded_at
-        )
+        file_info = _file_basic_info(competency.file)
 
     # Find current user's verification record
     my_verification = None
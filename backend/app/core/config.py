@@ -22,6 +22,8 @@ class Settings(BaseSettings):
             url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
         return url
     DATABASE_ECHO: bool = False
+    # 기동 시 DB 초기화: auto (스키마 지문이 다를 때만 마이그레이션), full (항상), connect (연결만 확인)
+    DB_INIT_MODE: str = "auto"
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -32,6 +34,15 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Password hashing (bcrypt cost; hashes with another cost are upgraded on login)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64  # queued + running; beyond this → 503
+
+    # Authenticated user cache (get_current_user); 0 disables
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
     # CORS - Allow specific origins for Railway deployment
     # NOTE: Cannot use "*" with allow_credentials=True per CORS spec
     CORS_ORIGINS: str = '[]'  # Can be overridden via env variable
@@ -84,8 +95,36 @@ class Settings(BaseSettings):
             return f"{self.R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
         return ""
 
+    # Storage driver: executor threads (= pooled HTTP connections) and timeouts
+    STORAGE_IO_WORKERS: int = 8
+    STORAGE_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    STORAGE_READ_TIMEOUT_SECONDS: float = 60.0
+    # 스트리밍 업로드 파트 크기 (업로드당 최대 메모리, S3 최소 5MB)
+    STORAGE_UPLOAD_PART_SIZE_MB: int = 5
+    # 업로드 후 ETag 검증 (SSE-KMS 등 ETag가 MD5가 아닌 스토리지는 False)
+    STORAGE_VERIFY_ETAG: bool = True
+    # Presigned download URLs: validity, and how long before expiry a cached URL is dropped
+    PRESIGNED_URL_TTL_SECONDS: int = 3600
+    PRESIGNED_URL_CACHE_MARGIN_SECONDS: int = 300
+    PRESIGNED_URL_CACHE_SIZE: int = 4096
+    # Max file_ids per batch download-url request
+    DOWNLOAD_URL_BATCH_MAX: int = 200
+    # 정합성 점검 실행이 이 시간 동안 진행 기록이 없으면 중단된 것으로 간주
+    RECONCILIATION_STALE_MINUTES: int = 10
+    # 증빙 ZIP 내보내기 시 동시에 가져오는 파일 수
+    PROOF_EXPORT_CONCURRENCY: int = 4
+    # 미리보기/썸네일 생성 워커 수, 대기열 크기, 원본 최대 크기
+    PREVIEW_WORKERS: int = 2
+    PREVIEW_QUEUE_SIZE: int = 1000
+    PREVIEW_MAX_SOURCE_MB: int = 30
+
     # File Retention
     FILE_RETENTION_YEARS: int = 5
+    # 보존기간 만료 파일 삭제: 조회 배치, 트랜잭션당 삭제 건수, 삭제 사이 대기(ms)
+    FILE_PURGE_BATCH_SIZE: int = 1000
+    FILE_PURGE_CHUNK_SIZE: int = 200
+    FILE_PURGE_PAUSE_MS: int = 200
+    FILE_PURGE_STALE_MINUTES: int = 10
 
     # Review Lock Settings
     REVIEW_LOCK_EXPIRE_MINUTES: int = 30
@@ -97,6 +136,9 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
+    # Project list counts from the project_application_stats counter table
+    PROJECT_STATS_COUNTERS_ENABLED: bool = False
+
     # Email Settings (for password reset)
     # SendGrid API (recommended for Railway)
     SENDGRID_API_KEY: Optional[str] = None
@@ -108,6 +150,32 @@ class Settings(BaseSettings):
     # Common email settings
     SMTP_FROM_EMAIL: str = "noreply@coachdb.com"
     SMTP_FROM_NAME: str = "CoachDB"
+    # 메일 연결 유지: 연결 풀 크기, 유휴 연결 점검(NOOP)/종료 시간
+    SMTP_USE_TLS: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    SMTP_POOL_SIZE: int = 4
+    SMTP_KEEPALIVE_SECONDS: int = 30
+    SMTP_IDLE_TIMEOUT_SECONDS: int = 300
+    # 컴파일된 메일 템플릿 캐시 디렉터리 (비어있으면 시스템 임시 디렉터리)
+    EMAIL_TEMPLATE_CACHE_DIR: Optional[str] = None
+    # 알림 메일 발송 (outbox): 동시 발송 수, 공급자별 초당 발송 한도, 재시도
+    EMAIL_DISPATCH_CONCURRENCY: int = 4
+    EMAIL_DISPATCH_BATCH_SIZE: int = 50
+    EMAIL_DISPATCH_POLL_SECONDS: float = 5.0
+    EMAIL_SENDGRID_RATE_PER_SECOND: float = 10.0
+    EMAIL_SMTP_RATE_PER_SECOND: float = 2.0
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BASE_SECONDS: int = 30
+    EMAIL_RETRY_MAX_SECONDS: int = 3600
+    # 발송 중 프로세스가 죽으면 이 시간 뒤 다시 발송 대상
+    EMAIL_SEND_LEASE_SECONDS: int = 300
+
+    # 알림 스트림 (SSE): 다른 프로세스 변경 확인 주기, 재연결 주기(토큰 갱신), 재연결 대기
+    NOTIFICATION_STREAM_POLL_SECONDS: float = 15.0
+    NOTIFICATION_STREAM_MAX_SECONDS: int = 1800
+    NOTIFICATION_STREAM_RETRY_MS: int = 3000
+    # 스트림 연결용 토큰 유효시간 (EventSource는 헤더를 보낼 수 없어 쿼리로 전달)
+    NOTIFICATION_STREAM_TOKEN_SECONDS: int = 60
 
     # Password Reset
     PASSWORD_RESET_TOKEN_EXPIRE_HOURS: int = 24
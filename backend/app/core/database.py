@@ -1,6 +1,15 @@
+from sqlalchemy import Enum, func, select, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, Iterator, Optional
+from contextlib import contextmanager
+import asyncio
+import hashlib
+import inspect
+import os
+import subprocess
+import time
 
 from app.core.config import settings
 
@@ -43,14 +52,97 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def init_db():
-    """Initialize database - run migrations and create all tables"""
-    import subprocess
-    import os
-    from sqlalchemy import text
+# Backend directory (where alembic.ini is located)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Advisory lock serializing schema initialization between processes
+SCHEMA_INIT_LOCK_KEY = 7_301_025
+
+DB_INIT_MODES = ("auto", "full", "connect")
+
+
+@contextmanager
+def timed_phase(phase: str, timings: Dict[str, float], label: str = "[DB]") -> Iterator[None]:
+    """Record and log how long a startup phase took (ms)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = (time.perf_counter() - started) * 1000
+        print(f"{label} {phase}: {timings[phase]:.0f} ms")
+
+
+def schema_fingerprint() -> str:
+    """
+    Fingerprint of the schema this code expects
+
+    Covers the migration scripts (names and contents; hashed rather than
+    loaded through alembic, which imports every revision), the tables,
+    columns (enum members included) and indexes of the models (create_all
+    covers tables migrations do not), and the enum fixups. Stored after a
+    successful initialization; boots whose fingerprint matches skip it.
+    """
+    import app.models  # noqa: F401 - registers every table
+
+    digest = hashlib.sha256()
+    versions_dir = os.path.join(BACKEND_DIR, "alembic", "versions")
+    for name in sorted(os.listdir(versions_dir)):
+        if name.endswith(".py"):
+            with open(os.path.join(versions_dir, name), "rb") as script:
+                digest.update(name.encode("utf-8") + b"\0" + script.read() + b"\0")
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        parts = [table.name]
+        parts.extend(_column_signature(column) for column in table.columns)
+        parts.extend(sorted(f"#{index.name}" for index in table.indexes))
+        digest.update("\n".join(parts).encode("utf-8") + b"\0")
+    # A new ALTER TYPE ... ADD VALUE must run even when nothing else changed
+    digest.update(inspect.getsource(_fix_enum_values).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _column_signature(column) -> str:
+    signature = f"{column.name}:{type(column.type).__name__}:{column.nullable}"
+    if isinstance(column.type, Enum):
+        signature += f":{column.type.name}={','.join(column.type.enums)}"
+    return signature
+
+
+async def _stored_fingerprint() -> Optional[str]:
+    from app.models.system_config import SystemConfig, ConfigKeys
 
-    # First, fix any missing enum values (must be done outside transaction)
-    # This is needed because ALTER TYPE ADD VALUE cannot run in a transaction
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                select(SystemConfig.value).where(SystemConfig.key == ConfigKeys.SCHEMA_FINGERPRINT)
+            )
+            return result.scalar()
+    except DBAPIError:
+        return None  # Fresh database (no system_config yet)
+
+
+async def _store_fingerprint(fingerprint: str) -> None:
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+    from app.models.system_config import SystemConfig, ConfigKeys
+
+    stmt = pg_insert(SystemConfig).values(
+        key=ConfigKeys.SCHEMA_FINGERPRINT,
+        value=fingerprint,
+        description="적용된 DB 스키마 지문 (기동 시 마이그레이션 생략 판단)",
+    )
+    async with engine.begin() as conn:
+        await conn.execute(stmt.on_conflict_do_update(
+            index_elements=[SystemConfig.key],
+            set_={"value": stmt.excluded.value, "updated_at": func.now()}
+        ))
+
+
+def _fix_enum_values() -> None:
+    """
+    Add missing enum values and normalize project statuses
+
+    Runs on its own AUTOCOMMIT engine: ALTER TYPE ADD VALUE cannot run in a
+    transaction.
+    """
     try:
         # Use a raw connection with autocommit for enum fixes
         from sqlalchemy import create_engine
@@ -127,15 +219,16 @@ async def init_db():
     except Exception as e:
         print(f"[DB] Enum fix skipped: {e}")
 
-    # Run alembic migrations
+
+
+def _run_alembic_upgrade() -> bool:
+    """alembic upgrade head in a subprocess; returns whether it succeeded"""
     try:
-        # Get the backend directory (where alembic.ini is located)
-        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        print(f"[DB] Running alembic migrations from {backend_dir}...")
+        print(f"[DB] Running alembic migrations from {BACKEND_DIR}...")
 
         result = subprocess.run(
             ["alembic", "upgrade", "head"],
-            cwd=backend_dir,
+            cwd=BACKEND_DIR,
             capture_output=True,
             text=True,
             timeout=60
@@ -145,14 +238,78 @@ async def init_db():
             print(f"[DB] Alembic migrations completed successfully")
             if result.stdout:
                 print(f"[DB] Migration output: {result.stdout}")
-        else:
-            print(f"[DB] Alembic migration warning: {result.stderr}")
+            return True
+        print(f"[DB] Alembic migration warning: {result.stderr}")
     except Exception as e:
         print(f"[DB] Alembic migration skipped or failed: {e}")
+    return False
 
-    # Also ensure all tables exist (fallback)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+
+async def init_db(mode: Optional[str] = None, strict: bool = False) -> Dict[str, float]:
+    """
+    Prepare the database for this code version; returns phase timings (ms)
+
+    Modes (default DB_INIT_MODE):
+    - auto: full initialization only when the stored schema fingerprint
+      differs from schema_fingerprint(), i.e. after a deploy changed the
+      schema; otherwise one query after the connectivity check
+    - full: always run it (python -m app.migrate)
+    - connect: only verify connectivity (schema managed by deploys)
+
+    Full initialization fixes enum values, runs alembic upgrade head and
+    create_all (fallback), then stores the fingerprint. Processes booting
+    together take turns on an advisory lock and re-check the fingerprint
+    once they hold it, so only the first one migrates. With strict, a failed
+    alembic upgrade raises instead of being logged.
+    """
+    mode = mode or settings.DB_INIT_MODE
+    if mode not in DB_INIT_MODES:
+        raise ValueError(f"Unknown DB_INIT_MODE {mode!r} (expected one of {', '.join(DB_INIT_MODES)})")
+    timings: Dict[str, float] = {}
+
+    with timed_phase("connect", timings):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    if mode == "connect":
+        return timings
+
+    with timed_phase("fingerprint", timings):
+        expected = schema_fingerprint()
+        stored = await _stored_fingerprint()
+    if mode == "auto" and stored == expected:
+        print("[DB] Schema is up to date, migrations skipped")
+        return timings
+
+    async with engine.connect() as lock_conn:
+        with timed_phase("schema lock", timings):
+            await lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": SCHEMA_INIT_LOCK_KEY})
+            await lock_conn.commit()
+        try:
+            if mode == "auto" and await _stored_fingerprint() == expected:
+                print("[DB] Schema was migrated by another process")
+                return timings
+
+            with timed_phase("enum fixups", timings):
+                await asyncio.to_thread(_fix_enum_values)
+
+            with timed_phase("alembic upgrade", timings):
+                migrated = await asyncio.to_thread(_run_alembic_upgrade)
+            if not migrated and strict:
+                raise RuntimeError("alembic upgrade head failed")
+
+            # Also ensure all tables exist (fallback)
+            with timed_phase("create_all", timings):
+                async with engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+
+            # A failed upgrade is retried at the next boot
+            if migrated:
+                await _store_fingerprint(expected)
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEMA_INIT_LOCK_KEY})
+            await lock_conn.commit()
+
+    return timings
 
 
 async def close_db():
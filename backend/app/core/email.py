@@ -1,25 +1,25 @@
 """
 Email service for sending various notification emails
 Supports SendGrid API (recommended) and SMTP (fallback)
+
+Messages go through the process-wide transport (see email_transport), which
+keeps provider connections open between sends. Templates are compiled once
+at startup (compile_templates) with a bytecode cache, so rendering never
+touches the template files.
 """
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Optional, Dict, Any
+from typing import Awaitable, Callable, Dict, List, Optional
 from pathlib import Path
 import logging
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
 
 from app.core.config import settings
-
-# SendGrid import (optional)
-try:
-    from sendgrid import SendGridAPIClient
-    from sendgrid.helpers.mail import Mail, Email, To, Content
-    SENDGRID_AVAILABLE = True
-except ImportError:
-    SENDGRID_AVAILABLE = False
+from app.core.email_transport import (
+    SENDGRID_AVAILABLE,
+    EmailTransport,
+    OutgoingEmail,
+    get_email_transport,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,102 +27,76 @@ logger = logging.getLogger(__name__)
 TEMPLATE_DIR = Path(__file__).parent.parent / "templates" / "email"
 jinja_env = Environment(
     loader=FileSystemLoader(str(TEMPLATE_DIR)),
-    autoescape=select_autoescape(["html", "xml"])
+    autoescape=select_autoescape(["html", "xml"]),
+    # Compiled templates survive restarts; they are not re-checked against the files
+    bytecode_cache=FileSystemBytecodeCache(settings.EMAIL_TEMPLATE_CACHE_DIR) if settings.EMAIL_TEMPLATE_CACHE_DIR
+    else FileSystemBytecodeCache(),
+    auto_reload=False
 )
+_templates: Dict[str, Template] = {}
+
+
+def compile_templates() -> int:
+    """Compile every email template (app startup); returns how many"""
+    for name in jinja_env.list_templates(extensions=["html"]):
+        _templates[name] = jinja_env.get_template(name)
+    return len(_templates)
 
 
 def render_template(template_name: str, **context) -> str:
     """Render an email template with the given context"""
-    template = jinja_env.get_template(template_name)
+    template = _templates.get(template_name)
+    if template is None:
+        template = _templates[template_name] = jinja_env.get_template(template_name)
     return template.render(**context)
 
 
-async def send_email_via_sendgrid(
-    to_email: str,
-    subject: str,
-    html_content: str,
-    text_content: Optional[str] = None
-) -> bool:
-    """Send email using SendGrid API"""
-    try:
-        print(f"[EMAIL] Sending via SendGrid to {to_email}")
-
-        message = Mail(
-            from_email=Email(settings.SMTP_FROM_EMAIL, settings.SMTP_FROM_NAME),
-            to_emails=To(to_email),
-            subject=subject,
-            html_content=Content("text/html", html_content)
-        )
+def email_provider() -> str:
+    """Provider send_email() uses: "sendgrid" or "smtp" """
+    if settings.SENDGRID_API_KEY and SENDGRID_AVAILABLE:
+        return "sendgrid"
+    return "smtp"
 
-        if text_content:
-            message.add_content(Content("text/plain", text_content))
 
-        sg = SendGridAPIClient(settings.SENDGRID_API_KEY)
-        response = sg.send(message)
+async def send_emails(
+    messages: List[OutgoingEmail],
+    before_each: Optional[Callable[[], Awaitable[None]]] = None,
+    transport: Optional[EmailTransport] = None
+) -> List[Optional[str]]:
+    """
+    Send a batch of messages over one provider connection
 
-        print(f"[EMAIL] SendGrid response status: {response.status_code}")
+    Args:
+        messages: Messages to send, in order
+        before_each: Awaited before each message (e.g. a rate limiter)
+        transport: Transport to use (default: the process-wide one)
 
-        if response.status_code in [200, 201, 202]:
-            logger.info(f"Email sent via SendGrid to {to_email}: {subject}")
-            print(f"[EMAIL] Successfully sent to {to_email}")
-            return True
+    Returns:
+        None for each message sent, or its error
+    """
+    if not messages:
+        return []
+
+    if transport is None:
+        if email_provider() == "smtp" and (not settings.SMTP_USER or not settings.SMTP_PASSWORD):
+            for message in messages:
+                logger.warning(f"SMTP not configured. Email to {message.to_email} not sent.")
+                print(f"\n{'='*50}")
+                print(f"EMAIL (SMTP not configured)")
+                print(f"To: {message.to_email}")
+                print(f"Subject: {message.subject}")
+                print(f"{'='*50}\n")
+            return [None] * len(messages)  # Success for development
+        transport = get_email_transport()
+
+    results = await transport.send_many(messages, before_each)
+    for message, error in zip(messages, results):
+        if error is None:
+            logger.info(f"Email sent via {transport.provider} to {message.to_email}: {message.subject}")
         else:
-            logger.error(f"SendGrid returned status {response.status_code}")
-            print(f"[EMAIL ERROR] SendGrid status: {response.status_code}")
-            return False
-
-    except Exception as e:
-        import traceback
-        logger.error(f"SendGrid error: {str(e)}")
-        print(f"[EMAIL ERROR] SendGrid: {type(e).__name__}: {str(e)}")
-        print(f"[EMAIL ERROR] Traceback:\n{traceback.format_exc()}")
-        return False
-
-
-async def send_email_via_smtp(
-    to_email: str,
-    subject: str,
-    html_content: str,
-    text_content: Optional[str] = None
-) -> bool:
-    """Send email using SMTP (fallback)"""
-    try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = f"{settings.SMTP_FROM_NAME} <{settings.SMTP_FROM_EMAIL}>"
-        msg["To"] = to_email
-
-        if text_content:
-            msg.attach(MIMEText(text_content, "plain", "utf-8"))
-        msg.attach(MIMEText(html_content, "html", "utf-8"))
-
-        if not settings.SMTP_USER or not settings.SMTP_PASSWORD:
-            logger.warning(f"SMTP not configured. Email to {to_email} not sent.")
-            print(f"\n{'='*50}")
-            print(f"EMAIL (SMTP not configured)")
-            print(f"To: {to_email}")
-            print(f"Subject: {subject}")
-            print(f"{'='*50}\n")
-            return True  # Return True for development
-
-        print(f"[EMAIL] Sending via SMTP to {to_email}")
-        print(f"[EMAIL] SMTP: {settings.SMTP_HOST}:{settings.SMTP_PORT}, User: {settings.SMTP_USER}")
-
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
-
-        logger.info(f"Email sent via SMTP to {to_email}: {subject}")
-        print(f"[EMAIL] Successfully sent to {to_email}")
-        return True
-
-    except Exception as e:
-        import traceback
-        logger.error(f"SMTP error: {str(e)}")
-        print(f"[EMAIL ERROR] SMTP: {type(e).__name__}: {str(e)}")
-        print(f"[EMAIL ERROR] Traceback:\n{traceback.format_exc()}")
-        return False
+            logger.error(f"{transport.provider} error for {message.to_email}: {error}")
+            print(f"[EMAIL ERROR] {transport.provider}: {message.to_email}: {error}")
+    return results
 
 
 async def send_email(
@@ -143,14 +117,8 @@ async def send_email(
     Returns:
         True if email was sent successfully, False otherwise
     """
-    # Use SendGrid if configured and available
-    if settings.SENDGRID_API_KEY and SENDGRID_AVAILABLE:
-        print(f"[EMAIL] Using SendGrid API")
-        return await send_email_via_sendgrid(to_email, subject, html_content, text_content)
-
-    # Fallback to SMTP
-    print(f"[EMAIL] Using SMTP (SendGrid not configured)")
-    return await send_email_via_smtp(to_email, subject, html_content, text_content)
+    results = await send_emails([OutgoingEmail(to_email, subject, html_content, text_content)])
+    return results[0] is None
 
 
 async def send_password_reset_email(
@@ -223,16 +191,16 @@ NOTIFICATION_EMAIL_CONFIG = {
 }
 
 
-async def send_notification_email(
+def render_notification_email(
     to_email: str,
     notification_type: str,
     title: str,
     message: Optional[str] = None,
     user_name: Optional[str] = None,
     **extra_context
-) -> bool:
+) -> Optional[OutgoingEmail]:
     """
-    Send notification email based on notification type
+    Build the email for a notification; None if its type has no template
 
     Args:
         to_email: Recipient email address
@@ -247,31 +215,27 @@ async def send_notification_email(
             - deadline: Deadline for supplement
             - result: Selection result ('selected' or 'rejected')
             - status: Verification status ('approved' or 'rejected')
-
-    Returns:
-        True if email was sent successfully, False otherwise
     """
     config = NOTIFICATION_EMAIL_CONFIG.get(notification_type)
 
     if not config:
         logger.warning(f"No email template configured for notification type: {notification_type}")
-        return False
+        return None
 
     # Default action URL
-    action_url = extra_context.get("action_url", settings.FRONTEND_URL)
+    action_url = extra_context.pop("action_url", None) or settings.FRONTEND_URL
 
-    try:
-        html_content = render_template(
-            config["template"],
-            user_name=user_name,
-            title=title,
-            message=message,
-            action_url=action_url,
-            **extra_context
-        )
-
-        # Generate plain text version
-        text_content = f"""
+    html_content = render_template(
+        config["template"],
+        user_name=user_name,
+        title=title,
+        message=message,
+        action_url=action_url,
+        **extra_context
+    )
+
+    # Generate plain text version
+    text_content = f"""
 안녕하세요{', ' + user_name + '님' if user_name else ''},
 
 {title}
@@ -284,12 +248,30 @@ async def send_notification_email(
 CoachDB 팀
 """
 
-        return await send_email(
-            to_email=to_email,
-            subject=config["subject"],
-            html_content=html_content,
-            text_content=text_content
-        )
+    return OutgoingEmail(to_email, config["subject"], html_content, text_content)
+
+
+async def send_notification_email(
+    to_email: str,
+    notification_type: str,
+    title: str,
+    message: Optional[str] = None,
+    user_name: Optional[str] = None,
+    **extra_context
+) -> bool:
+    """
+    Send notification email based on notification type
+
+    See render_notification_email() for the arguments.
+
+    Returns:
+        True if email was sent successfully, False otherwise
+    """
+    try:
+        email = render_notification_email(to_email, notification_type, title, message, user_name, **extra_context)
+        if email is None:
+            return False
+        return (await send_emails([email]))[0] is None
 
     except Exception as e:
         logger.error(f"Failed to send notification email: {str(e)}")
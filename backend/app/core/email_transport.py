@@ -0,0 +1,346 @@
+"""
+Email transports - long-lived connections to the email provider
+
+Sending used to open a new SMTP/TLS session, or build a new SendGrid client
+(one HTTPS connection), for every message. A transport keeps them instead:
+- SMTPTransport: a pool of up to SMTP_POOL_SIZE logged-in connections. One
+  idle longer than SMTP_KEEPALIVE_SECONDS is probed with NOOP before reuse,
+  one idle past SMTP_IDLE_TIMEOUT_SECONDS is closed, and a reused connection
+  the server dropped is reopened and the message retried once.
+- SendGridTransport: one urllib3 keep-alive pool to the SendGrid API.
+
+send_many() sends a batch over one connection. The client libraries block,
+so each transport runs them on its own small thread pool. Settings are read
+only in create_email_transport(): tests construct a transport directly, e.g.
+SMTPTransport pointed at a local SMTP stand-in.
+"""
+import asyncio
+import json
+import smtplib
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import urllib3
+
+from app.core.config import settings
+
+# SendGrid import (optional)
+try:
+    from sendgrid.helpers.mail import Mail, Email, To, Content
+    SENDGRID_AVAILABLE = True
+except ImportError:
+    SENDGRID_AVAILABLE = False
+
+SENDGRID_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+
+
+def _is_connection_error(error: Exception) -> bool:
+    """
+    Whether an SMTP connection is unusable after `error`
+
+    Socket errors and disconnects are; other SMTP errors (a refused sender,
+    recipient or message) only fail the message. SMTPException is itself an
+    OSError, hence the order of the checks.
+    """
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+@dataclass(frozen=True)
+class OutgoingEmail:
+    to_email: str
+    subject: str
+    html_content: str
+    text_content: Optional[str] = None
+
+
+class EmailTransport(ABC):
+    """Sends messages over connections kept between calls"""
+
+    provider: str = ""
+
+    @abstractmethod
+    async def send_many(
+        self,
+        messages: List[OutgoingEmail],
+        before_each: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> List[Optional[str]]:
+        """
+        Send messages in order over one connection
+
+        before_each (e.g. a rate limiter) is awaited before every message.
+        Returns None for each message sent, or its error.
+        """
+
+    async def send(self, message: OutgoingEmail) -> Optional[str]:
+        return (await self.send_many([message]))[0]
+
+    async def close(self) -> None:
+        pass
+
+
+class SMTPTransport(EmailTransport):
+    provider = "smtp"
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        from_email: str,
+        from_name: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        pool_size: int = 4,
+        timeout: float = 30.0,
+        keepalive_seconds: float = 30.0,
+        idle_timeout_seconds: float = 300.0
+    ):
+        self.host = host
+        self.port = port
+        self.from_header = f"{from_name} <{from_email}>"
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.keepalive_seconds = keepalive_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.pool_size = pool_size
+        self.connections_opened = 0
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []  # (connection, last used)
+        self._lock = threading.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="smtp")
+
+    def _mime(self, message: OutgoingEmail) -> MIMEMultipart:
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = message.subject
+        msg["From"] = self.from_header
+        msg["To"] = message.to_email
+        if message.text_content:
+            msg.attach(MIMEText(message.text_content, "plain", "utf-8"))
+        msg.attach(MIMEText(message.html_content, "html", "utf-8"))
+        return msg
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.connections_opened += 1
+        return server
+
+    @staticmethod
+    def _quit(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _checkout(self) -> Tuple[smtplib.SMTP, bool]:
+        """An idle connection that still answers, else a new one; (connection, reused)"""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, last_used = self._idle.pop()
+            idle = time.monotonic() - last_used
+            if idle > self.idle_timeout_seconds:
+                self._quit(server)
+                continue
+            if idle > self.keepalive_seconds:
+                try:
+                    alive = server.noop()[0] == 250
+                except OSError:
+                    alive = False
+                if not alive:
+                    self._quit(server)
+                    continue
+            return server, True
+        return self._connect(), False
+
+    def _checkin(self, server: smtplib.SMTP) -> None:
+        with self._lock:
+            self._idle.append((server, time.monotonic()))
+
+    def _deliver(
+        self,
+        server: Optional[smtplib.SMTP],
+        reused: bool,
+        message: OutgoingEmail
+    ) -> Tuple[Optional[smtplib.SMTP], bool, Optional[str]]:
+        """Blocking send; returns (connection to keep using or None, reused, error)"""
+        msg = self._mime(message)
+        try:
+            if server is None:
+                server, reused = self._checkout()
+            try:
+                server.send_message(msg)
+            except OSError as e:
+                if not reused or not _is_connection_error(e):
+                    raise
+                # Dropped while idle (server timeout, network): reconnect once
+                self._quit(server)
+                server = None
+                server, reused = self._connect(), False
+                server.send_message(msg)
+            return server, reused, None
+        except OSError as e:
+            if _is_connection_error(e):
+                if server is not None:
+                    self._quit(server)
+                return None, False, f"{type(e).__name__}: {e}"
+            # Message refused; smtplib has reset the session, keep the connection
+            return server, reused, f"{type(e).__name__}: {e}"
+
+    async def send_many(
+        self,
+        messages: List[OutgoingEmail],
+        before_each: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> List[Optional[str]]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        loop = asyncio.get_running_loop()
+        results: List[Optional[str]] = []
+        server, reused = None, False
+        async with self._slots:
+            try:
+                for message in messages:
+                    if before_each is not None:
+                        await before_each()
+                    server, reused, error = await loop.run_in_executor(
+                        self._executor, self._deliver, server, reused, message
+                    )
+                    results.append(error)
+            finally:
+                if server is not None:
+                    self._checkin(server)
+        return results
+
+    async def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._quit, server)
+        self._executor.shutdown(wait=False)
+
+
+class SendGridTransport(EmailTransport):
+    provider = "sendgrid"
+
+    def __init__(
+        self,
+        api_key: str,
+        from_email: str,
+        from_name: str,
+        pool_size: int = 4,
+        timeout: float = 30.0
+    ):
+        self.from_email = from_email
+        self.from_name = from_name
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        # Only connection failures are retried: a POST that reached SendGrid
+        # may have been accepted
+        self._http = urllib3.PoolManager(
+            maxsize=pool_size,
+            timeout=urllib3.Timeout(connect=min(timeout, 10.0), read=timeout),
+            retries=urllib3.Retry(total=2, connect=2, read=0, status=0, redirect=0, backoff_factor=0.2),
+        )
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="sendgrid")
+
+    def _post(self, message: OutgoingEmail) -> Optional[str]:
+        mail = Mail(
+            from_email=Email(self.from_email, self.from_name),
+            to_emails=To(message.to_email),
+            subject=message.subject,
+            html_content=Content("text/html", message.html_content)
+        )
+        if message.text_content:
+            mail.add_content(Content("text/plain", message.text_content))
+        try:
+            response = self._http.request(
+                "POST", SENDGRID_SEND_URL,
+                body=json.dumps(mail.get()).encode("utf-8"),
+                headers=self._headers,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            return f"{type(e).__name__}: {e}"
+        if response.status in (200, 201, 202):
+            return None
+        return f"SendGrid status {response.status}: {response.data[:200].decode('utf-8', 'replace')}"
+
+    async def send_many(
+        self,
+        messages: List[OutgoingEmail],
+        before_each: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> List[Optional[str]]:
+        loop = asyncio.get_running_loop()
+        results: List[Optional[str]] = []
+        for message in messages:
+            if before_each is not None:
+                await before_each()
+            results.append(await loop.run_in_executor(self._executor, self._post, message))
+        return results
+
+    async def close(self) -> None:
+        self._http.clear()
+        self._executor.shutdown(wait=False)
+
+
+_transport: Optional[EmailTransport] = None
+
+
+def create_email_transport() -> EmailTransport:
+    """Transport for the configured provider: SendGrid if set up, else SMTP"""
+    if settings.SENDGRID_API_KEY and SENDGRID_AVAILABLE:
+        return SendGridTransport(
+            settings.SENDGRID_API_KEY,
+            settings.SMTP_FROM_EMAIL,
+            settings.SMTP_FROM_NAME,
+            pool_size=settings.SMTP_POOL_SIZE,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
+    return SMTPTransport(
+        settings.SMTP_HOST,
+        settings.SMTP_PORT,
+        settings.SMTP_FROM_EMAIL,
+        settings.SMTP_FROM_NAME,
+        username=settings.SMTP_USER,
+        password=settings.SMTP_PASSWORD,
+        use_tls=settings.SMTP_USE_TLS,
+        pool_size=settings.SMTP_POOL_SIZE,
+        timeout=settings.SMTP_TIMEOUT_SECONDS,
+        keepalive_seconds=settings.SMTP_KEEPALIVE_SECONDS,
+        idle_timeout_seconds=settings.SMTP_IDLE_TIMEOUT_SECONDS,
+    )
+
+
+def get_email_transport() -> EmailTransport:
+    """Process-wide transport (created on first use)"""
+    global _transport
+    if _transport is None:
+        _transport = create_email_transport()
+    return _transport
+
+
+async def close_email_transport() -> None:
+    """Close pooled connections (app shutdown)"""
+    global _transport
+    if _transport is not None:
+        transport, _transport = _transport, None
+        await transport.close()
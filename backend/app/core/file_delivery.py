@@ -0,0 +1,178 @@
+"""
+File delivery helpers - HTTP validators, byte ranges and zero-copy local responses
+
+Stored files never change after upload (every upload gets a new file_id and a
+unique stored name), so a strong validator can be derived from file metadata
+alone: conditional requests are answered with 304 before storage is touched.
+"""
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Mapping, Optional, Tuple
+
+import anyio
+from fastapi import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+# Read size when the server cannot sendfile
+LOCAL_READ_CHUNK_SIZE = 256 * 1024
+
+# ASGI extension letting the server sendfile() an open file descriptor
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+class RangeNotSatisfiable(Exception):
+    """Range header does not overlap the file (answer 416)"""
+
+
+def file_etag(file_id: int, size: int) -> str:
+    """Strong ETag of a stored file"""
+    return f'"{file_id}-{size}"'
+
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    """datetime → IMF-fixdate (Last-Modified)"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _etag_listed(header: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison: W/"x" matches "x"
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """True when the client's cached copy is current (answer 304)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-Modified-Since is ignored when If-None-Match is present
+        return _etag_listed(if_none_match, etag)
+    since = _parse_http_date(request.headers.get("if-modified-since"))
+    if since is None or last_modified is None:
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def range_applies(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-Range: a stale validator means "send the whole file" """
+    if_range = request.headers.get("if-range")
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        return if_range == etag  # strong comparison
+    since = _parse_http_date(if_range)
+    if since is None or last_modified is None:
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) == since
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range Range header into (start, end) inclusive
+
+    Returns None when the whole file should be sent (no header, a unit other
+    than bytes, or several ranges - serving the full body is always allowed).
+    Raises RangeNotSatisfiable when the range lies outside the file.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first == "":
+            # Suffix range: the last N bytes
+            suffix = int(last)
+            if suffix <= 0 or size == 0:
+                raise RangeNotSatisfiable()
+            return max(size - suffix, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+class LocalFileResponse(Response):
+    """
+    Response for (a byte range of) a file on local disk
+
+    Hands the open file to the server via the ASGI zero-copy send extension
+    when the server offers it (sendfile, no copies through Python); otherwise
+    reads it in LOCAL_READ_CHUNK_SIZE blocks off the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        offset: int,
+        length: int,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+    ):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.body = b""
+        headers = dict(headers or {})
+        headers["content-length"] = str(length)
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get("extensions") or {}
+        file = await anyio.to_thread.run_sync(open, self.path, "rb")
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            if ZEROCOPY_EXTENSION in extensions:
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": file,
+                    "offset": self.offset,
+                    "count": self.length,
+                    "more_body": False,
+                })
+                return
+            await anyio.to_thread.run_sync(file.seek, self.offset, os.SEEK_SET)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(file.read, min(LOCAL_READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0 or self.length == 0:
+                # Empty range, or file shorter than expected: end the body rather than hang
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await anyio.to_thread.run_sync(file.close)
@@ -0,0 +1,97 @@
+"""
+Keyset (cursor) pagination helpers
+
+A cursor is an opaque, URL-safe token holding the sort value and the tie-breaker
+id of the last row of a page. The next page is selected with a WHERE clause
+instead of OFFSET, so deep pages cost the same as the first one.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    if hasattr(value, "value"):  # Enum
+        return value.value
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode sort values (datetime, date, Decimal, Enum, JSON scalars) into a cursor"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, expected_length: Optional[int] = None) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        HTTPException 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or (expected_length is not None and len(values) != expected_length):
+            raise ValueError("unexpected cursor shape")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_condition(sort_expr, tie_expr, sort_value: Any, tie_value: Any, descending: bool = True):
+    """
+    WHERE clause selecting rows after (sort_value, tie_value)
+
+    Matches an ORDER BY of `sort_expr <dir> NULLS LAST, tie_expr <dir>`.
+    """
+    if descending:
+        tie_after = tie_expr < tie_value
+    else:
+        tie_after = tie_expr > tie_value
+
+    if sort_value is None:
+        # Already inside the NULLS LAST tail
+        return and_(sort_expr.is_(None), tie_after)
+
+    sort_after = sort_expr < sort_value if descending else sort_expr > sort_value
+    return or_(
+        sort_after,
+        and_(sort_expr == sort_value, tie_after),
+        sort_expr.is_(None),
+    )
+
+
+def keyset_order_by(sort_expr, tie_expr, descending: bool = True) -> list:
+    """ORDER BY clauses matching keyset_condition"""
+    if descending:
+        return [sort_expr.desc().nullslast(), tie_expr.desc()]
+    return [sort_expr.asc().nullslast(), tie_expr.asc()]
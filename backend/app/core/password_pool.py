@@ -0,0 +1,98 @@
+"""
+Password hash pool - bcrypt off the event loop
+
+bcrypt takes 200-300 ms per call at the default cost. Calling it inside an
+async handler stalls every other request on the worker, so hashing and
+verification run on a small dedicated thread pool (bcrypt releases the GIL).
+
+Backpressure: at most PASSWORD_HASH_MAX_PENDING calls may be queued or running;
+further calls fail fast with 503 + Retry-After instead of piling up.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+
+class PasswordHashPool:
+    """Bounded executor for bcrypt calls with queue/latency counters"""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self.pending = 0  # queued + running
+        self.running = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_ms = 0.0
+        self.total_hash_ms = 0.0
+        self.max_hash_ms = 0.0
+
+    def _timed(self, fn: Callable, submitted_at: float, *args) -> Any:
+        started_at = time.perf_counter()
+        with self._lock:
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            finished_at = time.perf_counter()
+            hash_ms = (finished_at - started_at) * 1000
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.total_wait_ms += (started_at - submitted_at) * 1000
+                self.total_hash_ms += hash_ms
+                self.max_hash_ms = max(self.max_hash_ms, hash_ms)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run fn(*args) on the pool, or raise 503 when the queue is full"""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent sign-in requests. Please try again shortly.",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.pending - self.running)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, fn, time.perf_counter(), *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "running": self.running,
+                "queue_depth": self.pending - self.running,
+                "max_queue_depth": self.max_queue_depth,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.total_wait_ms / self.completed, 2) if self.completed else 0.0,
+                "avg_hash_ms": round(self.total_hash_ms / self.completed, 2) if self.completed else 0.0,
+                "max_hash_ms": round(self.max_hash_ms, 2),
+            }
+
+
+password_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+def get_password_pool_stats() -> Dict[str, Any]:
+    """Queue depth and latency counters of the password hash pool"""
+    return password_pool.stats()
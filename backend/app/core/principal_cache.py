@@ -0,0 +1,155 @@
+"""
+Principal cache - in-process LRU/TTL cache of authenticated users
+
+get_current_user looks up a snapshot keyed by (user_id, token) before going to
+the database. A snapshot holds the user's column values and a pre-parsed
+frozenset of roles, so a hit costs no DB round trip and no JSON parsing.
+
+Snapshots are dropped when the user row changes through the ORM (role updates,
+role request approval, password resets, user deletion, profile edits), again
+after the changing transaction commits, and explicitly by endpoints that
+delete users with a bulk DELETE statement. Other worker processes only see such changes once their entry expires,
+which bounds staleness to PRINCIPAL_CACHE_TTL_SECONDS.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import User
+
+# session.info key holding user_ids to evict again after commit
+CHANGED_USERS_KEY = "principal_cache_changed_users"
+
+
+@dataclass(frozen=True)
+class PrincipalSnapshot:
+    """Cached view of an authenticated user"""
+    user_id: int
+    status: Any
+    roles: FrozenSet[str]
+    roles_json: Optional[str]
+    columns: Dict[str, Any]
+    expires_at: float
+
+
+def parse_roles(roles_json: Optional[str]) -> FrozenSet[str]:
+    """Parse User.roles (JSON array) like get_user_roles, as a frozenset"""
+    if not roles_json:
+        return frozenset()
+    try:
+        roles = json.loads(roles_json)
+    except (json.JSONDecodeError, TypeError):
+        return frozenset()
+    return frozenset(r for r in roles if isinstance(r, str)) if isinstance(roles, list) else frozenset()
+
+
+class PrincipalCache:
+    """Bounded LRU of PrincipalSnapshot with per-entry TTL"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[int, str], PrincipalSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int, token: str) -> Optional[PrincipalSnapshot]:
+        key = (user_id, token)
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is None or snapshot.expires_at <= time.monotonic():
+                if snapshot is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return snapshot
+
+    def put(self, token: str, user: User) -> PrincipalSnapshot:
+        columns = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        snapshot = PrincipalSnapshot(
+            user_id=user.user_id,
+            status=user.status,
+            roles=parse_roles(user.roles),
+            roles_json=user.roles,
+            columns=columns,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return snapshot
+        with self._lock:
+            self._entries[(user.user_id, token)] = snapshot
+            self._entries.move_to_end((user.user_id, token))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Drop every snapshot of a user (all users if user_id is None)"""
+        with self._lock:
+            self.invalidations += 1
+            if user_id is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(user_id: Optional[int] = None) -> None:
+    """Drop cached principals of a user (all users if user_id is None)"""
+    principal_cache.invalidate(user_id)
+
+
+def get_principal_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and size of the principal cache"""
+    return principal_cache.stats()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    invalidate_principal(target.user_id)
+    session = inspect(target).session
+    if session is not None:
+        session.info.setdefault(CHANGED_USERS_KEY, set()).add(target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed_users(session):
+    # A request racing the commit may have re-cached the old row; evict again
+    for user_id in session.info.pop(CHANGED_USERS_KEY, ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop(CHANGED_USERS_KEY, None)
@@ -5,9 +5,12 @@ import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.principal_cache import principal_cache, parse_roles
+from app.core.password_pool import password_pool
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -23,11 +26,30 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     # Bcrypt has a 72 byte limit
     password_bytes = password.encode('utf-8')[:72]
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a cost other than BCRYPT_ROUNDS"""
+    try:
+        # $2b$<cost>$<salt+hash>
+        return int(hashed_password.split('$')[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError, AttributeError):
+        return False
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password hash pool (raises 503 when saturated)"""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password hash pool (raises 503 when saturated)"""
+    return await password_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -50,6 +72,19 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 
+def create_stream_token(user_id: int) -> str:
+    """
+    Short-lived JWT for opening a notification stream
+
+    Browsers' EventSource cannot send an Authorization header, so the token
+    travels in the query string; it only authorizes GET
+    /notifications/stream and expires after NOTIFICATION_STREAM_TOKEN_SECONDS.
+    """
+    expire = datetime.utcnow() + timedelta(seconds=settings.NOTIFICATION_STREAM_TOKEN_SECONDS)
+    to_encode = {"sub": str(user_id), "exp": expire, "type": "stream"}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
 def decode_token(token: str) -> dict:
     """Decode and validate a JWT token"""
     try:
@@ -90,6 +125,15 @@ async def get_current_user(
     if user_id is None or token_type != "access":
         raise credentials_exception
 
+    # Cached principal: rebuild the user from the snapshot without a query
+    snapshot = principal_cache.get(user_id, token)
+    if snapshot is not None:
+        cached_user = User(**snapshot.columns)
+        make_transient_to_detached(cached_user)
+        user = await db.merge(cached_user, load=False)
+        user._principal_snapshot = snapshot
+        return user
+
     # Fetch user from database
     result = await db.execute(select(User).where(User.user_id == user_id))
     user = result.scalar_one_or_none()
@@ -97,20 +141,32 @@ async def get_current_user(
     if user is None or user.status != UserStatus.ACTIVE:
         raise credentials_exception
 
+    user._principal_snapshot = principal_cache.put(token, user)
     return user
 
 
+def get_principal_roles(user) -> frozenset:
+    """
+    Roles of a user from get_current_user as a frozenset
+
+    Uses the roles parsed into the principal snapshot unless user.roles has
+    been changed since.
+    """
+    snapshot = getattr(user, "_principal_snapshot", None)
+    if snapshot is not None and snapshot.roles_json == user.roles:
+        return snapshot.roles
+    return parse_roles(user.roles)
+
+
 def require_role(allowed_roles: list[str]):
     """
     Dependency to check if user has required role.
     Usage: current_user = Depends(require_role(["admin", "staff"]))
     """
-    from app.core.utils import get_user_roles
+    allowed = frozenset(allowed_roles)
     async def role_checker(current_user = Depends(get_current_user)):
-        # Parse user's roles safely
-        user_roles = get_user_roles(current_user)
         # Check if user has any of the allowed roles
-        if not any(role in allowed_roles for role in user_roles):
+        if allowed.isdisjoint(get_principal_roles(current_user)):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions"
@@ -125,14 +181,11 @@ def require_roles(allowed_roles: list):
     Supports both UserRole enum and string values.
     Usage: current_user = Depends(require_roles([UserRole.ADMIN, UserRole.STAFF]))
     """
-    from app.core.utils import get_user_roles
+    # Convert allowed_roles to strings (handle both enums and strings)
+    allowed_role_values = frozenset(r.value if hasattr(r, 'value') else r for r in allowed_roles)
     async def role_checker(current_user = Depends(get_current_user)):
-        # Parse user's roles safely
-        user_roles = get_user_roles(current_user)
-        # Convert allowed_roles to strings (handle both enums and strings)
-        allowed_role_values = [r.value if hasattr(r, 'value') else r for r in allowed_roles]
         # Check if user has any of the allowed roles
-        if not any(role in allowed_role_values for role in user_roles):
+        if allowed_role_values.isdisjoint(get_principal_roles(current_user)):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions"
@@ -2,10 +2,16 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import time
 import traceback
 
 from app.core.config import settings
-from app.core.database import init_db, close_db
+from app.core.database import AsyncSessionLocal, init_db, close_db, timed_phase
+from app.core.email import compile_templates
+from app.core.email_transport import close_email_transport
+from app.services.email_outbox_service import start_email_dispatcher, stop_email_dispatcher
+from app.services.file_preview_service import start_preview_workers, stop_preview_workers
+from app.services.project_stats_service import init_project_stats
 
 
 @asynccontextmanager
@@ -13,11 +19,30 @@ async def lifespan(app: FastAPI):
     """Lifespan events - startup and shutdown"""
     # Startup
     print("[START] Starting Coach Competency Database Service...")
-    await init_db()
+    started = time.perf_counter()
+    timings = {}
+    with timed_phase("database", timings, label="[START]"):
+        await init_db()
     print("[OK] Database initialized")
+    if settings.PROJECT_STATS_COUNTERS_ENABLED:
+        with timed_phase("project stats", timings, label="[START]"):
+            async with AsyncSessionLocal() as db:
+                recounted = await init_project_stats(db)
+                await db.commit()
+        print(f"[OK] Application counters recounted for {recounted} projects")
+    with timed_phase("preview workers", timings, label="[START]"):
+        await start_preview_workers()
+    with timed_phase("email templates", timings, label="[START]"):
+        print(f"[OK] {compile_templates()} email templates compiled")
+    with timed_phase("email dispatcher", timings, label="[START]"):
+        await start_email_dispatcher()
+    print(f"[OK] Startup completed in {(time.perf_counter() - started) * 1000:.0f} ms")
     yield
     # Shutdown
     print("[STOP] Shutting down...")
+    await stop_preview_workers()
+    await stop_email_dispatcher()
+    await close_email_transport()
     await close_db()
     print("[OK] Database connection closed")
 
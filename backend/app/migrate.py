@@ -0,0 +1,31 @@
+"""
+One-shot database migration for deploys
+
+    python -m app.migrate
+
+Runs the full initialization (enum fixups, alembic upgrade head, create_all)
+and records the schema fingerprint, so app workers started afterwards with
+DB_INIT_MODE=auto skip it after one query. Exits non-zero on failure.
+"""
+import asyncio
+import sys
+import time
+
+from app.core.database import close_db, init_db
+
+
+async def main() -> int:
+    started = time.perf_counter()
+    try:
+        await init_db(mode="full", strict=True)
+    except Exception as e:
+        print(f"[MIGRATE] Failed: {type(e).__name__}: {e}")
+        return 1
+    finally:
+        await close_db()
+    print(f"[MIGRATE] Completed in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
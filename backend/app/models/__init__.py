@@ -1,11 +1,13 @@
 from app.models.user import User, UserRole
-from app.models.project import Project, ProjectStaff
+from app.models.project import Project, ProjectStaff, ProjectApplicationStats
 from app.models.competency import CompetencyItem, ProjectItem, ScoringCriteria, CoachCompetency, VerificationStatus
 from app.models.application import Application, ApplicationData, CoachRole
-from app.models.notification import Notification, NotificationType
+from app.models.notification import Notification, NotificationType, NotificationCounter, EmailOutbox, EmailOutboxStatus
 from app.models.system_config import SystemConfig, ConfigKeys
 from app.models.verification import VerificationRecord
-from app.models.file import File
+from app.models.file import File, FileBlob
+from app.models.file_reconciliation import FileReconciliationRun, FileReconciliationIssue
+from app.models.file_purge import FilePurgeRun
 from app.models.review_lock import ReviewLock
 from app.models.reminder import CompetencyReminder
 from app.models.policy import DataRetentionPolicy
@@ -20,11 +22,18 @@ from app.models.scoring_template import ScoringTemplate
 from app.models.input_template import InputTemplate
 from app.models.unified_template import UnifiedTemplate
 
+# Counter maintenance hooks into every session that uses the models, so
+# scripts keep project_application_stats current like the app does
+from app.services import project_stats_service  # noqa: E402
+
+project_stats_service.register_listeners()
+
 __all__ = [
     "User",
     "UserRole",
     "Project",
     "ProjectStaff",
+    "ProjectApplicationStats",
     "CompetencyItem",
     "ProjectItem",
     "ScoringCriteria",
@@ -35,10 +44,17 @@ __all__ = [
     "VerificationStatus",
     "Notification",
     "NotificationType",
+    "NotificationCounter",
+    "EmailOutbox",
+    "EmailOutboxStatus",
     "SystemConfig",
     "ConfigKeys",
     "VerificationRecord",
     "File",
+    "FileBlob",
+    "FileReconciliationRun",
+    "FileReconciliationIssue",
+    "FilePurgeRun",
     "ReviewLock",
     "CompetencyReminder",
     "DataRetentionPolicy",
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, BigInteger, Text, Enum, Boolean, Numeric, DateTime, ForeignKey, UniqueConstraint, func
+from sqlalchemy import Column, Integer, BigInteger, Text, Enum, Boolean, Numeric, DateTime, ForeignKey, Index, UniqueConstraint, func, text
 from sqlalchemy.orm import relationship
 import enum
 
@@ -109,7 +109,7 @@ class ApplicationData(Base):
     item_id = Column(Integer, ForeignKey("competency_items.item_id"), nullable=False)
     competency_id = Column(BigInteger, ForeignKey("coach_competencies.competency_id"), nullable=True)  # Link to reused competency
     submitted_value = Column(Text, nullable=True)
-    submitted_file_id = Column(BigInteger, ForeignKey("files.file_id"), nullable=True)
+    submitted_file_id = Column(BigInteger, ForeignKey("files.file_id"), nullable=True, index=True)
     verification_status = Column(
         Enum('pending', 'approved', 'rejected', 'supplement_requested', 'supplemented',
              name='verification_status_enum'),
@@ -124,6 +124,14 @@ class ApplicationData(Base):
     supplement_deadline = Column(DateTime(timezone=True), nullable=True)  # 보충 기한
     supplement_requested_at = Column(DateTime(timezone=True), nullable=True)  # 보충 요청일
 
+    __table_args__ = (
+        # 검증 대기열 (미승인 + 파일 첨부) 부분 인덱스
+        Index(
+            'ix_application_data_pending_verification', 'data_id',
+            postgresql_where=text("verification_status <> 'approved' AND submitted_file_id IS NOT NULL")
+        ),
+    )
+
     # Relationships
     application = relationship("Application", back_populates="application_data")
     competency_item = relationship("CompetencyItem")
@@ -27,7 +27,7 @@ class Certification(Base):
     issue_date = Column(Date, nullable=True)
     expiry_date = Column(Date, nullable=True)
     certificate_number = Column(String(100), nullable=True)
-    certificate_file_id = Column(BigInteger, ForeignKey("files.file_id"), nullable=True)
+    certificate_file_id = Column(BigInteger, ForeignKey("files.file_id"), nullable=True, index=True)
     verification_status = Column(String(20), nullable=False, default="pending")  # pending, approved, rejected
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), nullable=True, onupdate=func.now())
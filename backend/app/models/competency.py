@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, BigInteger, String, Text, Enum, Boolean, Numeric, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Enum, Boolean, Numeric, DateTime, ForeignKey, Index, func, text
 from sqlalchemy.orm import relationship
 import enum
 
@@ -239,7 +239,7 @@ class CoachCompetency(Base):
     user_id = Column(BigInteger, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False, index=True)
     item_id = Column(Integer, ForeignKey("competency_items.item_id"), nullable=False)
     value = Column(Text, nullable=True)
-    file_id = Column(BigInteger, ForeignKey("files.file_id"), nullable=True)
+    file_id = Column(BigInteger, ForeignKey("files.file_id"), nullable=True, index=True)
     verification_status = Column(Enum(VerificationStatus), nullable=False, default=VerificationStatus.PENDING)
     verified_by = Column(BigInteger, ForeignKey("users.user_id"), nullable=True)
     verified_at = Column(DateTime(timezone=True), nullable=True)
@@ -252,6 +252,14 @@ class CoachCompetency(Base):
     is_globally_verified = Column(Boolean, nullable=False, default=False)  # 전역 검증 완료 여부
     globally_verified_at = Column(DateTime(timezone=True), nullable=True)  # 전역 검증 완료 시각
 
+    __table_args__ = (
+        # 검증 대기열 (전역 미검증 + 파일 첨부) 부분 인덱스
+        Index(
+            'ix_coach_competencies_pending_verification', 'competency_id',
+            postgresql_where=text('is_globally_verified = false AND file_id IS NOT NULL')
+        ),
+    )
+
     # Relationships
     user = relationship("User", back_populates="competencies", foreign_keys=[user_id])
     competency_item = relationship("CompetencyItem", back_populates="coach_competencies")
@@ -53,7 +53,7 @@ class CustomQuestionAnswer(Base):
     question_id = Column(Integer, ForeignKey("custom_questions.question_id", ondelete="CASCADE"), nullable=False, index=True)
 
     answer_text = Column(Text, nullable=True)  # 텍스트 답변
-    answer_file_id = Column(BigInteger, ForeignKey("files.file_id"), nullable=True)  # 파일 답변
+    answer_file_id = Column(BigInteger, ForeignKey("files.file_id"), nullable=True, index=True)  # 파일 답변
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -15,7 +15,7 @@ class CoachEducationHistory(Base):
     institution = Column(String(200), nullable=True)  # 교육기관
     completion_date = Column(Date, nullable=True)  # 이수일
     hours = Column(Integer, nullable=True)  # 교육시간
-    certificate_file_id = Column(BigInteger, ForeignKey("files.file_id"), nullable=True)  # 수료증 파일
+    certificate_file_id = Column(BigInteger, ForeignKey("files.file_id"), nullable=True, index=True)  # 수료증 파일
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
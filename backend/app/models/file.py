@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, String, Integer, Enum, Date, DateTime, ForeignKey, func
+from sqlalchemy import Column, BigInteger, String, Integer, Enum, Date, DateTime, ForeignKey, Index, func, text
 from sqlalchemy.orm import relationship
 import enum
 
@@ -26,9 +26,40 @@ class File(Base):
     upload_purpose = Column(Enum(UploadPurpose), nullable=False, default=UploadPurpose.OTHER)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     scheduled_deletion_date = Column(Date, nullable=True)  # For 5-year retention policy
+    # SHA-256 of the content; files with a hash share one FileBlob (file_path = blob key)
+    content_hash = Column(String(64), nullable=True, index=True)
+    # Preview/thumbnail derivatives: pending, ready, failed, unsupported (NULL = not previewable)
+    preview_status = Column(String(20), nullable=True)
 
     # Relationships
     uploader = relationship("User", back_populates="uploaded_files")
 
+    __table_args__ = (
+        # Path order in byte order (= object storage listing order), for reconciliation
+        Index("ix_files_file_path_c", text('file_path COLLATE "C"'), "file_id").ddl_if(dialect="postgresql"),
+        # Retention purge: expired files in (date, id) keyset order
+        Index("ix_files_scheduled_deletion", "scheduled_deletion_date", "file_id"),
+        # Previews still to render (re-queued at startup)
+        Index(
+            "ix_files_preview_pending", "file_id",
+            postgresql_where=text("preview_status = 'pending'")
+        ).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self):
         return f"<File(file_id={self.file_id}, original_filename={self.original_filename}, uploaded_by={self.uploaded_by})>"
+
+
+class FileBlob(Base):
+    """Content-addressed stored object shared by every File with the same content_hash"""
+
+    __tablename__ = "file_blobs"
+
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 hex
+    file_path = Column(String(1000), nullable=False)  # Storage key
+    file_size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # Number of File rows using it
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<FileBlob(content_hash={self.content_hash}, ref_count={self.ref_count})>"
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, BigInteger, Boolean, Date, String, Integer, DateTime, ForeignKey, Text, func
+
+from app.core.database import Base
+
+
+class FilePurgeRun(Base):
+    """One retention purge pass over files past scheduled_deletion_date (progress and totals)"""
+
+    __tablename__ = "file_purge_runs"
+
+    run_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    dry_run = Column(Boolean, nullable=False, default=True)  # Count only, delete nothing
+    status = Column(String(20), nullable=False, default="running")  # running, completed, failed
+    cutoff_date = Column(Date, nullable=False)  # Files with scheduled_deletion_date before this
+    started_by = Column(BigInteger, ForeignKey("users.user_id", ondelete="SET NULL"), nullable=True)
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Last progress write
+
+    # Progress / totals
+    files_scanned = Column(Integer, nullable=False, default=0)  # Expired rows examined
+    files_referenced = Column(Integer, nullable=False, default=0)  # Skipped: still in use
+    files_purged = Column(Integer, nullable=False, default=0)  # Rows deleted (dry run: would be)
+    bytes_purged = Column(BigInteger, nullable=False, default=0)  # Sum of their file_size
+    objects_deleted = Column(Integer, nullable=False, default=0)  # Storage objects removed
+    object_errors = Column(Integer, nullable=False, default=0)  # Objects that failed to delete
+    error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<FilePurgeRun(run_id={self.run_id}, dry_run={self.dry_run}, status={self.status})>"
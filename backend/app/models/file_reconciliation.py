@@ -0,0 +1,48 @@
+from sqlalchemy import Column, BigInteger, String, Integer, DateTime, ForeignKey, Text, func
+
+from app.core.database import Base
+
+
+class FileReconciliationRun(Base):
+    """One storage ↔ files table reconciliation pass (progress and totals)"""
+
+    __tablename__ = "file_reconciliation_runs"
+
+    run_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    mode = Column(String(20), nullable=False, default="full")  # full, incremental
+    status = Column(String(20), nullable=False, default="running")  # running, completed, failed
+    since = Column(DateTime(timezone=True), nullable=True)  # incremental: changes after this time
+    started_by = Column(BigInteger, ForeignKey("users.user_id", ondelete="SET NULL"), nullable=True)
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Last progress write
+
+    # Progress / totals
+    objects_scanned = Column(Integer, nullable=False, default=0)
+    rows_scanned = Column(Integer, nullable=False, default=0)
+    matched = Column(Integer, nullable=False, default=0)
+    missing_in_storage = Column(Integer, nullable=False, default=0)  # DB row, no object
+    orphan_objects = Column(Integer, nullable=False, default=0)  # Object, no DB row
+    size_mismatches = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<FileReconciliationRun(run_id={self.run_id}, mode={self.mode}, status={self.status})>"
+
+
+class FileReconciliationIssue(Base):
+    """A mismatch found by a reconciliation run"""
+
+    __tablename__ = "file_reconciliation_issues"
+
+    issue_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    run_id = Column(BigInteger, ForeignKey("file_reconciliation_runs.run_id", ondelete="CASCADE"), nullable=False, index=True)
+    kind = Column(String(30), nullable=False)  # missing_in_storage, orphan_object, size_mismatch
+    file_path = Column(String(1000), nullable=False)
+    file_id = Column(BigInteger, nullable=True)  # No FK: the row may be deleted after the run
+    db_size = Column(BigInteger, nullable=True)
+    storage_size = Column(BigInteger, nullable=True)
+    last_modified = Column(DateTime(timezone=True), nullable=True)  # Object's, when it exists
+
+    def __repr__(self):
+        return f"<FileReconciliationIssue(run_id={self.run_id}, kind={self.kind}, file_path={self.file_path})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Integer, String, Text, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Column, BigInteger, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 import enum
 
@@ -59,5 +59,65 @@ class Notification(Base):
     related_project = relationship("Project", foreign_keys=[related_project_id])
     related_competency = relationship("CoachCompetency", foreign_keys=[related_competency_id])
 
+    __table_args__ = (
+        # 안 읽은 알림 재집계용
+        Index("ix_notifications_unread", "user_id", postgresql_where=(is_read == False)),
+    )
+
     def __repr__(self):
         return f"<Notification(notification_id={self.notification_id}, user_id={self.user_id}, type={self.type}, is_read={self.is_read})>"
+
+
+class NotificationCounter(Base):
+    """사용자별 안 읽은 알림 수 (알림 변경 시 재집계)"""
+
+    __tablename__ = "notification_counters"
+
+    user_id = Column(BigInteger, ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<NotificationCounter(user_id={self.user_id}, unread_count={self.unread_count})>"
+
+
+class EmailOutboxStatus(str, enum.Enum):
+    """알림 메일 발송 상태"""
+    PENDING = "pending"   # 발송 대기 (재시도 포함)
+    SENDING = "sending"   # 발송 중 (lease 만료 시 다시 대기)
+    SENT = "sent"
+    FAILED = "failed"     # 재시도 한도 초과
+
+
+class EmailOutbox(Base):
+    """알림 메일 발송 대기열 (Notification과 같은 트랜잭션에서 기록)"""
+
+    __tablename__ = "email_outbox"
+
+    outbox_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    notification_id = Column(BigInteger, ForeignKey("notifications.notification_id", ondelete="SET NULL"), nullable=True, index=True)
+
+    # 수신자/내용 (기록 시점 기준)
+    to_email = Column(String(255), nullable=False)
+    user_name = Column(String(100), nullable=True)
+    notification_type = Column(String(50), nullable=False)
+    title = Column(String(200), nullable=False)
+    message = Column(Text, nullable=True)
+    context = Column(Text, nullable=True)  # JSON - 템플릿 추가 변수
+
+    status = Column(String(20), nullable=False, default=EmailOutboxStatus.PENDING.value)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    notification = relationship("Notification", foreign_keys=[notification_id])
+
+    __table_args__ = (
+        # Dispatcher claims due rows in order
+        Index("ix_email_outbox_due", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<EmailOutbox(outbox_id={self.outbox_id}, to_email={self.to_email}, status={self.status})>"
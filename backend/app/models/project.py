@@ -108,3 +108,18 @@ class ProjectStaff(Base):
 
     def __repr__(self):
         return f"<ProjectStaff(project_id={self.project_id}, staff_user_id={self.staff_user_id})>"
+
+
+class ProjectApplicationStats(Base):
+    """Denormalized per-project application counters (recounted on application changes)"""
+
+    __tablename__ = "project_application_stats"
+
+    project_id = Column(Integer, ForeignKey("projects.project_id", ondelete="CASCADE"), primary_key=True)
+    application_count = Column(Integer, nullable=False, default=0)  # 전체 응모 수
+    submitted_count = Column(Integer, nullable=False, default=0)    # 제출 완료 (draft 제외)
+    selected_count = Column(Integer, nullable=False, default=0)     # 선발 확정 참여자 수
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ProjectApplicationStats(project_id={self.project_id}, applications={self.application_count}, selected={self.selected_count})>"
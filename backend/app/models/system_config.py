@@ -25,3 +25,4 @@ class SystemConfig(Base):
 # 기본 설정 키 상수
 class ConfigKeys:
     REQUIRED_VERIFIER_COUNT = "required_verifier_count"  # 증빙 확정에 필요한 Verifier 수
+    SCHEMA_FINGERPRINT = "schema_fingerprint"  # 적용된 DB 스키마 지문 (기동 시 마이그레이션 생략 판단)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Boolean, DateTime, ForeignKey, func, UniqueConstraint, CheckConstraint, Index
+from sqlalchemy import Column, BigInteger, Boolean, DateTime, ForeignKey, func, text, UniqueConstraint, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -40,6 +40,15 @@ class VerificationRecord(Base):
         ),
         # ApplicationData 인덱스 추가
         Index('ix_verification_records_application_data_id', 'application_data_id'),
+        # Verifier별 유효 컨펌 인덱스 (본인 컨펌 여부 / 컨펌 가능 항목 조회)
+        Index(
+            'ix_verification_records_verifier_competency', 'verifier_id', 'competency_id',
+            postgresql_where=text('is_valid = true AND competency_id IS NOT NULL')
+        ),
+        Index(
+            'ix_verification_records_verifier_application_data', 'verifier_id', 'application_data_id',
+            postgresql_where=text('is_valid = true AND application_data_id IS NOT NULL')
+        ),
     )
 
     # Relationships
@@ -12,6 +12,9 @@ class FileBasicInfo(BaseModel):
     file_size: int
     mime_type: str
     uploaded_at: datetime
+    content_hash: Optional[str] = None  # 같은 해시 = 같은 내용 (이미 검토된 증빙 식별)
+    preview_url: Optional[str] = None  # 첫 페이지 미리보기 (준비된 경우만)
+    thumbnail_url: Optional[str] = None
 
     class Config:
         from_attributes = True
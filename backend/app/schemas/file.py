@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime, date
-from typing import Optional
+from typing import Optional, List
 
 
 class FileUploadResponse(BaseModel):
@@ -11,6 +11,7 @@ class FileUploadResponse(BaseModel):
     mime_type: str
     upload_purpose: str
     uploaded_at: datetime
+    content_hash: Optional[str] = None  # SHA-256
 
     class Config:
         from_attributes = True
@@ -23,6 +24,7 @@ class FileInfo(BaseModel):
     mime_type: str
     uploaded_at: datetime
     uploaded_by: int
+    content_hash: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -36,3 +38,78 @@ class FileDownloadInfo(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class FileDownloadUrlsRequest(BaseModel):
+    """일괄 다운로드 URL 요청"""
+    file_ids: List[int] = Field(..., min_length=1)
+
+
+class FileDownloadUrl(BaseModel):
+    file_id: int
+    download_url: str
+    filename: str
+    expires_in: Optional[int] = None  # seconds (None for local storage)
+    is_local: bool = False
+
+
+class FileDownloadUrlsResponse(BaseModel):
+    urls: List[FileDownloadUrl] = []
+    not_found: List[int] = []  # 파일 정보 또는 스토리지 객체 없음
+
+
+class FileReconciliationRunResponse(BaseModel):
+    """스토리지 ↔ DB 정합성 점검 실행 (진행 상황 포함)"""
+    run_id: int
+    mode: str  # full, incremental
+    status: str  # running, completed, failed
+    since: Optional[datetime] = None
+    started_by: Optional[int] = None
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    objects_scanned: int = 0
+    rows_scanned: int = 0
+    matched: int = 0
+    missing_in_storage: int = 0
+    orphan_objects: int = 0
+    size_mismatches: int = 0
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FilePurgeRunResponse(BaseModel):
+    """보존기간 만료 파일 삭제 실행 (진행 상황 포함)"""
+    run_id: int
+    dry_run: bool
+    status: str  # running, completed, failed
+    cutoff_date: date
+    started_by: Optional[int] = None
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    files_scanned: int = 0
+    files_referenced: int = 0  # 사용 중이라 보존
+    files_purged: int = 0  # dry run: 삭제 대상 건수
+    bytes_purged: int = 0
+    objects_deleted: int = 0
+    object_errors: int = 0
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FileReconciliationIssueResponse(BaseModel):
+    issue_id: int
+    kind: str  # missing_in_storage, orphan_object, size_mismatch
+    file_path: str
+    file_id: Optional[int] = None
+    db_size: Optional[int] = None
+    storage_size: Optional[int] = None
+    last_modified: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
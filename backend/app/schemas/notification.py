@@ -34,6 +34,12 @@ class NotificationResponse(BaseModel):
         from_attributes = True
 
 
+class StreamTokenResponse(BaseModel):
+    """알림 스트림 연결 토큰"""
+    token: str
+    expires_in: int  # seconds
+
+
 class NotificationUpdate(BaseModel):
     """알림 업데이트 스키마 (읽음 처리)"""
     is_read: bool = True
@@ -2,7 +2,7 @@
 Schemas for reviewer evaluations and scoring
 """
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from decimal import Decimal
 
@@ -83,6 +83,7 @@ class ScoreCalculationResult(BaseModel):
     calculated_count: int
     error_count: int
     errors: List[dict] = []
+    timings: Dict[str, float] = {}  # 단계별 소요 시간 (ms)
 
 
 class FinalScoreResult(BaseModel):
@@ -91,6 +92,7 @@ class FinalScoreResult(BaseModel):
     total_applications: int
     finalized_count: int
     no_evaluation_count: int
+    timings: Dict[str, float] = {}  # 단계별 소요 시간 (ms)
 
 
 class SelectionRecommendation(BaseModel):
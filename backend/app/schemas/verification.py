@@ -111,3 +111,10 @@ class PendingVerificationItem(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class PendingVerificationCounts(BaseModel):
+    """검증 대기 건수 (목록 페이지와 별도 집계)"""
+    competency: int = 0  # CoachCompetency 대기 건수
+    application_data: int = 0  # ApplicationData 대기 건수
+    total: int = 0
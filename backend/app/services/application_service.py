@@ -0,0 +1,124 @@
+"""
+Application service - shared read-side helpers for application lists
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.models.application import Application, ApplicationData
+from app.models.competency import ProjectItem, ProofRequiredLevel
+
+# Max ids per IN (...) list
+BATCH_LOAD_CHUNK_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class DocumentVerificationSummary:
+    """증빙검토 상태 요약 (계산값)"""
+    status: str = "approved"  # pending, partial, approved, rejected, supplement_requested
+    supplement_count: int = 0
+
+
+def summarize_document_verification(
+    data_items: Iterable,
+    proof_levels: Dict[int, Optional[ProofRequiredLevel]]
+) -> DocumentVerificationSummary:
+    """
+    Roll up ApplicationData verification statuses into one document status
+
+    - NOT_REQUIRED 또는 (OPTIONAL + 파일 없음) → 검토 불필요 (approved로 취급)
+    - 파일 첨부된 항목만 실제 검토 상태 확인
+
+    Args:
+        data_items: Rows with item_id, submitted_file_id and verification_status
+        proof_levels: ProjectItem.proof_required_level keyed by item_id
+
+    Returns:
+        DocumentVerificationSummary (no items → approved)
+    """
+    supplement_count = 0
+    effective_statuses: List[str] = []
+    for item in data_items:
+        proof_level = proof_levels.get(item.item_id)
+
+        # 증빙 불필요 항목은 approved로 취급
+        if proof_level == ProofRequiredLevel.NOT_REQUIRED:
+            effective_statuses.append("approved")
+        elif proof_level == ProofRequiredLevel.OPTIONAL and item.submitted_file_id is None:
+            effective_statuses.append("approved")
+        else:
+            # 실제 검토 상태 사용
+            effective_statuses.append(item.verification_status)
+            if item.verification_status == "supplement_requested":
+                supplement_count += 1
+
+    if not effective_statuses:
+        return DocumentVerificationSummary("approved", 0)  # 항목 없으면 검토 완료로 처리
+    if supplement_count > 0:
+        return DocumentVerificationSummary("supplement_requested", supplement_count)
+    if all(s == "approved" for s in effective_statuses):
+        return DocumentVerificationSummary("approved", 0)
+    if any(s == "rejected" for s in effective_statuses):
+        return DocumentVerificationSummary("rejected", 0)
+    if any(s == "approved" for s in effective_statuses):
+        return DocumentVerificationSummary("partial", 0)
+    return DocumentVerificationSummary("pending", 0)
+
+
+async def get_document_verification_summaries(
+    db: AsyncSession,
+    application_ids: Sequence[int]
+) -> Dict[int, DocumentVerificationSummary]:
+    """
+    Document verification summaries for many applications
+
+    Loads the ApplicationData status columns of all applications and the
+    proof levels of their projects' items in batch, instead of per application.
+
+    Args:
+        db: Database session
+        application_ids: Applications to summarize (may span projects)
+
+    Returns:
+        DocumentVerificationSummary keyed by application_id (every id present)
+    """
+    application_ids = list(application_ids)
+    data_by_application: Dict[int, list] = {app_id: [] for app_id in application_ids}
+    project_by_application: Dict[int, int] = {}
+
+    for offset in range(0, len(application_ids), BATCH_LOAD_CHUNK_SIZE):
+        chunk = application_ids[offset:offset + BATCH_LOAD_CHUNK_SIZE]
+        data_result = await db.execute(
+            select(
+                ApplicationData.application_id,
+                ApplicationData.item_id,
+                ApplicationData.submitted_file_id,
+                ApplicationData.verification_status,
+                Application.project_id,
+            )
+            .join(Application, Application.application_id == ApplicationData.application_id)
+            .where(ApplicationData.application_id.in_(chunk))
+        )
+        for row in data_result.all():
+            data_by_application[row.application_id].append(row)
+            project_by_application[row.application_id] = row.project_id
+
+    proof_levels_by_project: Dict[int, Dict[int, Optional[ProofRequiredLevel]]] = {}
+    project_ids = list(set(project_by_application.values()))
+    if project_ids:
+        items_result = await db.execute(
+            select(ProjectItem.project_id, ProjectItem.item_id, ProjectItem.proof_required_level)
+            .where(ProjectItem.project_id.in_(project_ids))
+        )
+        for row in items_result.all():
+            proof_levels_by_project.setdefault(row.project_id, {})[row.item_id] = row.proof_required_level
+
+    return {
+        app_id: summarize_document_verification(
+            data_items,
+            proof_levels_by_project.get(project_by_application.get(app_id), {})
+        )
+        for app_id, data_items in data_by_application.items()
+    }
@@ -0,0 +1,72 @@
+"""
+Background runs - admin jobs recorded in a runs table, one at a time
+
+File reconciliation and the retention purge record each run as a row
+(run_id, status, updated_at written with every progress update,
+finished_at, error) and execute it as a background task of the process that
+created it. BackgroundRuns holds what they share:
+- check_idle(): refuses to start while another run is active; a run without
+  progress for `stale_minutes` (e.g. its process restarted) is marked failed
+  instead
+- start(): commits the new run and starts its task, keeping the task
+  referenced until it finishes
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Type
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class RunInProgress(Exception):
+    """Another run of the same kind is still running"""
+
+    kind = "Background"
+
+    def __init__(self, run_id: int):
+        super().__init__(f"{self.kind} run {run_id} is still running")
+        self.run_id = run_id
+
+
+class BackgroundRuns:
+    """Runs of one model, executed by tasks of this process"""
+
+    def __init__(self, model, in_progress: Type[RunInProgress]):
+        self.model = model
+        self.in_progress = in_progress
+        # Running tasks of this process, by run_id
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def is_running(self, run_id: int) -> bool:
+        return run_id in self._tasks
+
+    async def check_idle(self, db: AsyncSession, stale_minutes: int) -> None:
+        """
+        Raise `in_progress` if a run is active; mark stale runs failed
+
+        The failed marks are committed with the caller's new run.
+        """
+        result = await db.execute(select(self.model).where(self.model.status == "running"))
+        stale_before = datetime.now(timezone.utc) - timedelta(minutes=stale_minutes)
+        for active in result.scalars().all():
+            updated_at = active.updated_at
+            if updated_at is not None and updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            if self.is_running(active.run_id) or (updated_at is not None and updated_at > stale_before):
+                raise self.in_progress(active.run_id)
+            active.status = "failed"
+            active.error = "Interrupted (no progress)"
+            active.finished_at = datetime.now(timezone.utc)
+
+    async def start(self, db: AsyncSession, run, execute: Callable[[int], Awaitable[None]]):
+        """Commit `run` and start `execute(run_id)` as its background task"""
+        db.add(run)
+        await db.commit()
+        await db.refresh(run)
+
+        run_id = run.run_id
+        task = asyncio.create_task(execute(run_id))
+        self._tasks[run_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(run_id, None))
+        return run
@@ -0,0 +1,324 @@
+"""
+Email outbox service - background delivery of notification emails
+
+Requests never talk to the email provider: create_notification_with_email()
+(or create_notifications_bulk() for a fan-out) writes EmailOutbox rows in the
+same transaction as their Notifications, and
+this dispatcher delivers it after commit. So a notification and its email
+are recorded together or not at all, and request latency does not depend on
+SendGrid/SMTP.
+
+The dispatcher (started in the app lifespan) claims due rows in batches with
+FOR UPDATE SKIP LOCKED, so several app processes can share one outbox. A
+claimed row is leased for EMAIL_SEND_LEASE_SECONDS; if its process dies the
+row becomes due again. A batch is rendered up front and sent as
+EMAIL_DISPATCH_CONCURRENCY groups, each over one pooled provider connection
+(see email_transport), under a per-provider rate limit. Failures are retried with exponential backoff up to
+EMAIL_MAX_ATTEMPTS; results, including Notification.email_sent, are written
+back in one transaction per batch.
+"""
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.email import email_provider, render_notification_email, send_emails
+from app.core.email_transport import OutgoingEmail
+from app.models.notification import EmailOutbox, EmailOutboxStatus, Notification
+
+_wakeup: Optional[asyncio.Event] = None
+_dispatcher: Optional[asyncio.Task] = None
+
+
+class RateLimiter:
+    """Token bucket: at most `rate` acquisitions per second (bursts up to one second's worth)"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+
+
+def _rate_limiter(provider: str) -> RateLimiter:
+    limiter = _rate_limiters.get(provider)
+    if limiter is None:
+        rate = (
+            settings.EMAIL_SENDGRID_RATE_PER_SECOND if provider == "sendgrid"
+            else settings.EMAIL_SMTP_RATE_PER_SECOND
+        )
+        limiter = _rate_limiters[provider] = RateLimiter(rate)
+    return limiter
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before attempt `attempts + 1`: base * 2^(attempts-1), capped, with jitter"""
+    delay = min(settings.EMAIL_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), settings.EMAIL_RETRY_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def wake_dispatcher() -> None:
+    """Let the dispatcher look for due rows now instead of at its next poll"""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+def enqueue_email(
+    db: AsyncSession,
+    notification: Notification,
+    to_email: str,
+    user_name: Optional[str],
+    notification_type: str,
+    title: str,
+    message: Optional[str] = None,
+    **email_context
+) -> EmailOutbox:
+    """
+    Add an outbox row for `notification` to the caller's transaction
+
+    The dispatcher is woken when the session commits.
+    """
+    outbox = EmailOutbox(
+        to_email=to_email,
+        user_name=user_name,
+        notification_type=notification_type,
+        title=title,
+        message=message,
+        context=_dump_context(email_context),
+        status=EmailOutboxStatus.PENDING.value,
+    )
+    outbox.notification = notification
+    db.add(outbox)
+    _wake_on_commit(db)
+    return outbox
+
+
+async def enqueue_emails(db: AsyncSession, emails: List[Dict[str, Any]]) -> None:
+    """
+    Batch form of enqueue_email: one INSERT for all rows
+
+    Each dict holds notification_id, to_email, user_name, notification_type,
+    title, message and context (the template context).
+    """
+    if not emails:
+        return
+    await db.execute(
+        insert(EmailOutbox),
+        [
+            {
+                **{key: value for key, value in email.items() if key != "context"},
+                "context": _dump_context(email.get("context")),
+                "status": EmailOutboxStatus.PENDING.value,
+            }
+            for email in emails
+        ]
+    )
+    _wake_on_commit(db)
+
+
+def _dump_context(email_context: Optional[Dict[str, Any]]) -> Optional[str]:
+    return json.dumps(email_context, ensure_ascii=False, default=str) if email_context else None
+
+
+def _wake_on_commit(db: AsyncSession) -> None:
+    if not event.contains(db.sync_session, "after_commit", _wake_after_commit):
+        event.listen(db.sync_session, "after_commit", _wake_after_commit, once=True)
+
+
+def _wake_after_commit(session) -> None:
+    wake_dispatcher()
+
+
+async def claim_due_emails(
+    session_factory: async_sessionmaker,
+    limit: int
+) -> List[EmailOutbox]:
+    """
+    Lease up to `limit` due rows: pending ones whose retry time has come,
+    and sending ones whose lease expired
+    """
+    now = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        due = (
+            select(EmailOutbox.outbox_id)
+            .where(
+                or_(
+                    EmailOutbox.status == EmailOutboxStatus.PENDING.value,
+                    EmailOutbox.status == EmailOutboxStatus.SENDING.value,
+                ),
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.outbox_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.outbox_id.in_(due.scalar_subquery()))
+            .values(
+                status=EmailOutboxStatus.SENDING.value,
+                attempts=EmailOutbox.attempts + 1,
+                next_attempt_at=now + timedelta(seconds=settings.EMAIL_SEND_LEASE_SECONDS),
+            )
+            .returning(EmailOutbox)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = list(result.scalars().all())
+        await db.commit()
+    return claimed
+
+
+def _render(outbox: EmailOutbox) -> Tuple[Optional[OutgoingEmail], Optional[str]]:
+    context = json.loads(outbox.context) if outbox.context else {}
+    context.setdefault("action_url", settings.FRONTEND_URL)
+    try:
+        email = render_notification_email(
+            to_email=outbox.to_email,
+            notification_type=outbox.notification_type,
+            title=outbox.title,
+            message=outbox.message,
+            user_name=outbox.user_name,
+            **context
+        )
+    except Exception as e:
+        return None, f"Render failed: {type(e).__name__}: {e}"
+    if email is None:
+        return None, f"No email template for {outbox.notification_type}"
+    return email, None
+
+
+async def _send_group(
+    group: List[Tuple[EmailOutbox, OutgoingEmail]],
+    limiter: RateLimiter
+) -> List[Tuple[EmailOutbox, bool, Optional[str]]]:
+    try:
+        errors = await send_emails([email for _, email in group], before_each=limiter.acquire)
+    except Exception as e:
+        errors = [f"{type(e).__name__}: {e}"] * len(group)
+    return [(outbox, error is None, error) for (outbox, _), error in zip(group, errors)]
+
+
+async def _record_results(
+    session_factory: async_sessionmaker,
+    results: List[Tuple[EmailOutbox, bool, Optional[str]]]
+) -> None:
+    now = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        sent_ids = [outbox.outbox_id for outbox, sent, _ in results if sent]
+        if sent_ids:
+            await db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.outbox_id.in_(sent_ids))
+                .values(status=EmailOutboxStatus.SENT.value, sent_at=now, last_error=None)
+            )
+        notification_ids = [outbox.notification_id for outbox, sent, _ in results if sent and outbox.notification_id]
+        if notification_ids:
+            await db.execute(
+                update(Notification)
+                .where(Notification.notification_id.in_(notification_ids))
+                .values(email_sent=True, email_sent_at=now)
+            )
+        for outbox, sent, error in results:
+            if sent:
+                continue
+            if outbox.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                values = {"status": EmailOutboxStatus.FAILED.value}
+                print(f"[EMAIL OUTBOX] Giving up on {outbox.outbox_id} to {outbox.to_email}: {error}")
+            else:
+                values = {
+                    "status": EmailOutboxStatus.PENDING.value,
+                    "next_attempt_at": now + retry_delay(outbox.attempts),
+                }
+            await db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.outbox_id == outbox.outbox_id)
+                .values(last_error=error, **values)
+            )
+        await db.commit()
+
+
+async def dispatch_due_emails(session_factory: async_sessionmaker = AsyncSessionLocal) -> int:
+    """Claim and send one batch of due emails; returns the number claimed"""
+    claimed = await claim_due_emails(session_factory, settings.EMAIL_DISPATCH_BATCH_SIZE)
+    if not claimed:
+        return 0
+    results = []
+    renderable = []
+    for outbox in claimed:
+        email, error = _render(outbox)
+        if email is None:
+            results.append((outbox, False, error))
+        else:
+            renderable.append((outbox, email))
+
+    # One connection per group; groups send concurrently
+    limiter = _rate_limiter(email_provider())
+    concurrency = max(1, settings.EMAIL_DISPATCH_CONCURRENCY)
+    groups = [renderable[i::concurrency] for i in range(concurrency) if renderable[i::concurrency]]
+    for sent in await asyncio.gather(*[_send_group(group, limiter) for group in groups]):
+        results.extend(sent)
+
+    await _record_results(session_factory, results)
+    return len(claimed)
+
+
+async def _dispatch_loop(session_factory: async_sessionmaker) -> None:
+    while True:
+        try:
+            claimed = await dispatch_due_emails(session_factory)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[EMAIL OUTBOX] Dispatch error: {type(e).__name__}: {e}")
+            claimed = 0
+        if claimed:
+            continue  # Possibly more due rows
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.EMAIL_DISPATCH_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def start_email_dispatcher(session_factory: async_sessionmaker = AsyncSessionLocal) -> None:
+    """Start the background dispatcher (rows left by a previous process are picked up)"""
+    global _wakeup, _dispatcher
+    if _dispatcher is not None:
+        return
+    _wakeup = asyncio.Event()
+    _dispatcher = asyncio.create_task(_dispatch_loop(session_factory))
+
+
+async def stop_email_dispatcher() -> None:
+    """Stop the dispatcher; emails being sent are retried after their lease"""
+    global _wakeup, _dispatcher
+    if _dispatcher is None:
+        return
+    _dispatcher.cancel()
+    await asyncio.gather(_dispatcher, return_exceptions=True)
+    _dispatcher = None
+    _wakeup = None
@@ -0,0 +1,287 @@
+"""
+File blob service - content-addressed, reference-counted upload storage
+
+Uploads are stored once per distinct content under a key derived from their
+SHA-256 (FileBlob). Every File row with a content_hash points at its blob's
+key and holds one reference:
+- store_upload(): hashes the local upload spool first; known content only
+  takes a reference (metadata-only insert, no storage upload), new content is
+  streamed to its content-addressed key before the reference is taken
+- release_file(): drops a File's reference; the blob row goes with the last
+  one
+- release_contents(): recounts given blobs after a batch of File rows was
+  deleted, dropping the ones left unreferenced
+- delete_files(): deletes File rows matching some criteria and releases
+  their content in one go (retention purge, user deletion)
+- reconcile_blob_refcounts(): recounts after bulk deletes of File rows
+- delete_released_objects(): deletes the objects the above released, once
+  the caller has committed
+
+Acquire and release of one hash are serialized by a transaction-scoped
+advisory lock. Releasing only drops FileBlob rows inside the caller's
+transaction; objects are deleted after it commits, under the lock again and
+only if no upload re-created the blob meanwhile. A failed commit so never
+leaves a FileBlob row whose object is gone, which the dedup path would hand
+out to later uploads. Files without a content_hash (uploaded before content
+addressing) keep their own object and are not counted.
+"""
+from dataclasses import dataclass
+from typing import BinaryIO, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Row, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.file import File, FileBlob
+from app.services.file_preview_service import PREVIEW_VARIANTS, preview_key
+from app.services.storage import StorageDriver, StorageError
+
+BLOB_KEY_PREFIX = "uploads/blobs"
+
+
+@dataclass(frozen=True)
+class StoredContent:
+    """Result of store_upload()"""
+    file_path: str
+    size: int
+    content_hash: str
+    deduplicated: bool  # True when existing content was reused
+
+
+def blob_key(content_hash: str) -> str:
+    """Storage key of a blob (fanned out by hash prefix)"""
+    return f"{BLOB_KEY_PREFIX}/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+
+
+async def _lock_content(db: AsyncSession, content_hash: str) -> None:
+    # Held until the caller's transaction ends
+    await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(content_hash))))
+
+
+async def _acquire_existing(db: AsyncSession, content_hash: str) -> Optional[str]:
+    result = await db.execute(
+        update(FileBlob)
+        .where(FileBlob.content_hash == content_hash)
+        .values(ref_count=FileBlob.ref_count + 1)
+        .returning(FileBlob.file_path)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _content_known(db: AsyncSession, content_hash: str) -> bool:
+    # On its own connection, so the caller's session opens no transaction
+    # that would stay idle during the upload
+    async with db.bind.connect() as connection:
+        result = await connection.execute(
+            select(FileBlob.content_hash).where(FileBlob.content_hash == content_hash)
+        )
+        return result.first() is not None
+
+
+async def _put_blob(
+    storage: StorageDriver,
+    key: str,
+    content_hash: str,
+    source: BinaryIO,
+    content_type: Optional[str],
+    max_size: Optional[int]
+) -> int:
+    source.seek(0)
+    stored = await storage.put_stream(key, source, content_type, max_size=max_size)
+    if stored.sha256 != content_hash:
+        raise StorageError(f"Upload changed while being stored: {key}", code="BadDigest")
+    return stored.size
+
+
+async def store_upload(
+    db: AsyncSession,
+    storage: StorageDriver,
+    source: BinaryIO,
+    content_type: Optional[str],
+    max_size: Optional[int] = None
+) -> StoredContent:
+    """
+    Store an upload content-addressed and take one reference to it
+
+    New content is uploaded before the content's lock is taken, so neither
+    the lock nor a transaction is held during the transfer. The caller adds
+    the File row (file_path, content_hash) and commits in the same
+    transaction.
+
+    Raises:
+        StorageSizeLimitExceeded: source is larger than max_size
+        StorageError: the storage write failed or did not verify
+    """
+    # The spool is local, so hashing it first is cheap next to an upload
+    digest = await storage.checksum(source, max_size)
+    content_hash = digest.sha256
+    key = blob_key(content_hash)
+
+    uploaded = not await _content_known(db, content_hash)
+    if uploaded:
+        await _put_blob(storage, key, content_hash, source, content_type, max_size)
+
+    await _lock_content(db, content_hash)
+    existing_path = await _acquire_existing(db, content_hash)
+    if existing_path is not None:
+        # Known content, or a concurrent upload of it committed first (our
+        # write went to the same key with the same bytes)
+        return StoredContent(existing_path, digest.size, content_hash, deduplicated=not uploaded)
+
+    # The blob was released, and its object deleted, since the check or
+    # since our upload: store it again, now under the lock
+    if not uploaded or not await storage.exists(key):
+        await _put_blob(storage, key, content_hash, source, content_type, max_size)
+    db.add(FileBlob(content_hash=content_hash, file_path=key, file_size=digest.size, ref_count=1))
+    await db.flush()
+    return StoredContent(key, digest.size, content_hash, deduplicated=False)
+
+
+async def release_file(db: AsyncSession, db_file: File) -> List[str]:
+    """
+    Drop a File's reference to its stored content, dropping the blob with
+    the last reference
+
+    The caller deletes the File row and commits in the same transaction,
+    then passes the returned keys to delete_released_objects(): the object
+    of a dropped blob, the own object of a file without a content_hash, and
+    the file's previews.
+    """
+    keys = []
+    if db_file.preview_status is not None:
+        keys.extend(preview_key(db_file.file_id, variant) for variant in PREVIEW_VARIANTS)
+    if not db_file.content_hash:
+        keys.append(db_file.file_path)
+        return keys
+
+    await _lock_content(db, db_file.content_hash)
+    result = await db.execute(
+        update(FileBlob)
+        .where(FileBlob.content_hash == db_file.content_hash)
+        .values(ref_count=FileBlob.ref_count - 1)
+        .returning(FileBlob.ref_count, FileBlob.file_path)
+    )
+    row = result.one_or_none()
+    if row is not None and row.ref_count <= 0:
+        await db.execute(delete(FileBlob).where(FileBlob.content_hash == db_file.content_hash))
+        keys.append(row.file_path)
+    return keys
+
+
+def _referencing_count():
+    return (
+        select(func.count(File.file_id))
+        .where(File.content_hash == FileBlob.content_hash)
+        .scalar_subquery()
+    )
+
+
+async def release_contents(db: AsyncSession, content_hashes: List[str]) -> List[str]:
+    """
+    Recount the references of some blobs after their File rows were deleted
+    in the caller's transaction, dropping blobs left unreferenced
+
+    Takes the per-hash locks (in sorted order, so concurrent batches cannot
+    deadlock). Returns the storage keys of the dropped blobs for
+    delete_released_objects() after the caller commits.
+    """
+    hashes = sorted(set(content_hashes))
+    if not hashes:
+        return []
+    for content_hash in hashes:
+        await _lock_content(db, content_hash)
+    await db.execute(
+        update(FileBlob).where(FileBlob.content_hash.in_(hashes)).values(ref_count=_referencing_count())
+    )
+    result = await db.execute(
+        delete(FileBlob)
+        .where(FileBlob.content_hash.in_(hashes), FileBlob.ref_count == 0)
+        .returning(FileBlob.file_path)
+    )
+    return list(result.scalars().all())
+
+
+async def delete_files(db: AsyncSession, *criteria) -> Tuple[Sequence[Row], List[str]]:
+    """
+    Delete the File rows matching `criteria` and release their content
+
+    Returns the deleted rows (file_id, file_path, file_size, content_hash,
+    preview_status) and the storage keys left unreferenced: own objects of
+    files uploaded before content addressing, previews, and dropped blobs.
+    The caller passes the keys to delete_released_objects() after committing.
+    """
+    result = await db.execute(
+        delete(File)
+        .where(*criteria)
+        .returning(File.file_id, File.file_path, File.file_size, File.content_hash, File.preview_status)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = result.all()
+
+    keys = []
+    for row in deleted:
+        if not row.content_hash:
+            keys.append(row.file_path)
+        if row.preview_status:
+            keys.extend(preview_key(row.file_id, variant) for variant in PREVIEW_VARIANTS)
+    keys.extend(await release_contents(db, [row.content_hash for row in deleted if row.content_hash]))
+    return deleted, keys
+
+
+async def reconcile_blob_refcounts(db: AsyncSession) -> List[str]:
+    """
+    Recount FileBlob references from the files table and drop unreferenced blobs
+
+    For bulk deletes of File rows. Returns the storage keys of the dropped
+    blobs for delete_released_objects() after the caller commits.
+    """
+    await db.execute(update(FileBlob).values(ref_count=_referencing_count()))
+    result = await db.execute(
+        delete(FileBlob).where(FileBlob.ref_count == 0).returning(FileBlob.file_path)
+    )
+    return list(result.scalars().all())
+
+
+def _blob_content_hash(key: str) -> Optional[str]:
+    """Content hash of a blob key, None for other keys"""
+    if not key.startswith(BLOB_KEY_PREFIX + "/"):
+        return None
+    return key.rsplit("/", 1)[-1]
+
+
+async def delete_released_objects(db: AsyncSession, storage: StorageDriver, keys: List[str]) -> List[str]:
+    """
+    Delete objects released by a committed transaction
+
+    Call only after the commit that dropped the rows succeeded. Blob objects
+    are deleted under their content's lock, and skipped when an upload has
+    re-created the blob since; other keys (own objects, previews) are
+    deleted as they are. Runs its own transaction on `db`.
+
+    Returns:
+        Keys that failed to delete, left as orphans for reconciliation
+    """
+    blob_keys = {}
+    other_keys = []
+    for key in dict.fromkeys(keys):
+        content_hash = _blob_content_hash(key)
+        if content_hash:
+            blob_keys[content_hash] = key
+        else:
+            other_keys.append(key)
+
+    failed = await storage.delete_many(other_keys) if other_keys else []
+    if not blob_keys:
+        return failed
+
+    hashes = sorted(blob_keys)
+    try:
+        for content_hash in hashes:
+            await _lock_content(db, content_hash)
+        result = await db.execute(select(FileBlob.content_hash).where(FileBlob.content_hash.in_(hashes)))
+        recreated = set(result.scalars().all())
+        released = [blob_keys[content_hash] for content_hash in hashes if content_hash not in recreated]
+        if released:
+            failed.extend(await storage.delete_many(released))
+    finally:
+        await db.rollback()  # read-only; ends the transaction and its locks
+    return failed
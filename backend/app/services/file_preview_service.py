@@ -0,0 +1,254 @@
+"""
+File preview service - first-page previews and thumbnails of proof documents
+
+Verifiers check certificates from a small rendering instead of downloading
+full-size scans. After upload, previewable files (images, PDFs) are queued
+for a pool of background workers, which render the first page once into
+JPEG derivatives of each PREVIEW_VARIANTS size and store them in the same
+bucket as the original under previews/<file_id>/. File.preview_status
+tracks the state:
+- pending: queued (re-queued at startup after a restart)
+- ready: derivatives stored, served by GET /files/{file_id}/preview
+- failed: rendering failed (corrupt or encrypted document)
+- unsupported: no renderer installed, or the source is too large
+
+Rendering is CPU-bound and runs on a dedicated thread pool of PREVIEW_WORKERS
+threads (Pillow and MuPDF release the GIL while decoding and resampling), so
+it never blocks the event loop or the storage executor. Pillow and PyMuPDF
+are optional: without them files are marked unsupported.
+"""
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.file import File
+from app.services.storage import StorageDriver, get_storage
+
+# Pillow / PyMuPDF import (optional)
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+    ImageOps = None
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+PREVIEW_PENDING = "pending"
+PREVIEW_READY = "ready"
+PREVIEW_FAILED = "failed"
+PREVIEW_UNSUPPORTED = "unsupported"
+
+# Variant name → longest edge in pixels
+PREVIEW_VARIANTS = {"preview": 1024, "thumb": 256}
+PREVIEW_MIME_TYPE = "image/jpeg"
+PREVIEW_KEY_PREFIX = "previews"
+JPEG_QUALITY = 80
+
+IMAGE_MIME_TYPES = frozenset({
+    "image/jpeg", "image/png", "image/gif", "image/webp", "image/bmp", "image/tiff"
+})
+PDF_MIME_TYPE = "application/pdf"
+
+_queue: Optional[asyncio.Queue] = None
+_queued: Set[int] = set()
+_workers: List[asyncio.Task] = []
+_render_executor: Optional[ThreadPoolExecutor] = None
+
+
+def preview_key(file_id: int, variant: str) -> str:
+    """Storage key of a derivative"""
+    return f"{PREVIEW_KEY_PREFIX}/{file_id}/{variant}.jpg"
+
+
+def preview_url(file_id: int, variant: str = "preview") -> str:
+    """API URL serving a derivative"""
+    url = f"/api/files/{file_id}/preview"
+    return url if variant == "preview" else f"{url}?variant={variant}"
+
+
+def is_previewable(mime_type: Optional[str]) -> bool:
+    """Whether previews can be rendered for this type with the installed libraries"""
+    if Image is None:
+        return False
+    if mime_type == PDF_MIME_TYPE:
+        return fitz is not None
+    return mime_type in IMAGE_MIME_TYPES
+
+
+def _flatten(image: "Image.Image") -> "Image.Image":
+    # JPEG has no alpha: transparent areas become white instead of black
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def render_previews(data: bytes, mime_type: str) -> Dict[str, bytes]:
+    """
+    JPEG derivatives of the first page/frame, by variant name
+
+    Blocking and CPU-bound; run it off the event loop.
+    """
+    largest = max(PREVIEW_VARIANTS.values())
+    if mime_type == PDF_MIME_TYPE:
+        with fitz.open(stream=data, filetype="pdf") as document:
+            page = document.load_page(0)
+            zoom = largest / max(page.rect.width, page.rect.height)
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+    else:
+        image = Image.open(io.BytesIO(data))
+        # JPEG: let the decoder downscale (DCT scaling) instead of decoding full size
+        image.draft("RGB", (largest, largest))
+        image = _flatten(ImageOps.exif_transpose(image))
+
+    rendered = {}
+    # Largest first: each variant is resampled from the previous one
+    for variant, edge in sorted(PREVIEW_VARIANTS.items(), key=lambda item: -item[1]):
+        image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        rendered[variant] = buffer.getvalue()
+    return rendered
+
+
+async def _read_source(storage: StorageDriver, key: str) -> bytes:
+    chunks = []
+    async for chunk in storage.iter_object(key):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def generate_previews(
+    file_id: int,
+    storage: Optional[StorageDriver] = None,
+    session_factory: async_sessionmaker = AsyncSessionLocal
+) -> Optional[str]:
+    """
+    Render and store the derivatives of a pending file
+
+    Returns the resulting preview_status, or None when the file is gone or
+    not pending.
+    """
+    async with session_factory() as db:
+        db_file = await db.get(File, file_id)
+        if db_file is None or db_file.preview_status != PREVIEW_PENDING:
+            return None
+        file_path, mime_type, file_size = db_file.file_path, db_file.mime_type, db_file.file_size
+
+    storage = storage or get_storage()
+    if not is_previewable(mime_type) or file_size > settings.PREVIEW_MAX_SOURCE_MB * 1024 * 1024:
+        preview_status = PREVIEW_UNSUPPORTED
+    else:
+        try:
+            data = await _read_source(storage, file_path)
+            rendered = await asyncio.get_running_loop().run_in_executor(
+                _render_executor, render_previews, data, mime_type
+            )
+            for variant, body in rendered.items():
+                await storage.put(preview_key(file_id, variant), io.BytesIO(body), len(body), PREVIEW_MIME_TYPE)
+            preview_status = PREVIEW_READY
+        except Exception as e:
+            print(f"[PREVIEW] File {file_id} failed: {type(e).__name__}: {e}")
+            preview_status = PREVIEW_FAILED
+
+    async with session_factory() as db:
+        result = await db.execute(
+            update(File)
+            .where(File.file_id == file_id, File.preview_status == PREVIEW_PENDING)
+            .values(preview_status=preview_status)
+        )
+        await db.commit()
+    if result.rowcount == 0:
+        # Deleted while rendering: do not leave derivatives behind
+        await delete_previews(storage, file_id)
+        return None
+    return preview_status
+
+
+async def delete_previews(storage: StorageDriver, file_id: int) -> None:
+    """Delete a file's derivatives (missing ones are ignored)"""
+    for variant in PREVIEW_VARIANTS:
+        await storage.delete(preview_key(file_id, variant))
+
+
+def enqueue_preview(file_id: int) -> bool:
+    """
+    Queue a pending file for the workers
+
+    Returns False when the workers are not running or the queue is full; the
+    file stays pending and is picked up at the next startup or preview request.
+    """
+    if _queue is None:
+        return False
+    if file_id in _queued:
+        return True
+    try:
+        _queue.put_nowait(file_id)
+    except asyncio.QueueFull:
+        return False
+    _queued.add(file_id)
+    return True
+
+
+async def _worker(queue: asyncio.Queue, session_factory: async_sessionmaker) -> None:
+    while True:
+        file_id = await queue.get()
+        try:
+            await generate_previews(file_id, session_factory=session_factory)
+        except Exception as e:
+            print(f"[PREVIEW] Worker error on file {file_id}: {e}")
+        finally:
+            _queued.discard(file_id)
+            queue.task_done()
+
+
+async def start_preview_workers(session_factory: async_sessionmaker = AsyncSessionLocal) -> None:
+    """Start the worker pool and re-queue files left pending by a restart"""
+    global _queue, _render_executor
+    if _workers:
+        return
+    _queue = asyncio.Queue(maxsize=settings.PREVIEW_QUEUE_SIZE)
+    _render_executor = ThreadPoolExecutor(
+        max_workers=settings.PREVIEW_WORKERS, thread_name_prefix="preview"
+    )
+    for _ in range(settings.PREVIEW_WORKERS):
+        _workers.append(asyncio.create_task(_worker(_queue, session_factory)))
+
+    async with session_factory() as db:
+        result = await db.execute(
+            select(File.file_id)
+            .where(File.preview_status == PREVIEW_PENDING)
+            .order_by(File.file_id)
+            .limit(settings.PREVIEW_QUEUE_SIZE)
+        )
+        pending = result.scalars().all()
+    for file_id in pending:
+        enqueue_preview(file_id)
+    if pending:
+        print(f"[PREVIEW] Re-queued {len(pending)} pending previews")
+
+
+async def stop_preview_workers() -> None:
+    """Cancel the workers (queued files stay pending)"""
+    global _queue, _render_executor
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queued.clear()
+    _queue = None
+    if _render_executor is not None:
+        _render_executor.shutdown(wait=False, cancel_futures=True)
+        _render_executor = None
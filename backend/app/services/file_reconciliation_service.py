@@ -0,0 +1,287 @@
+"""
+File reconciliation service - storage listing ↔ files table merge-join
+
+A run streams two sequences sorted by storage key, and merge-joins them:
+- the bucket listing under uploads/ (paged ListObjects)
+- the files table, in keyset batches ordered by file_path in byte order
+  (COLLATE "C", the order object stores list keys in)
+
+This finds DB rows whose object is missing, objects no row refers to, and
+size mismatches, with memory bounded by one page of each side instead of
+one stat call per row. Runs execute as background tasks (one at a time);
+counters are written to FileReconciliationRun as they go and mismatches are
+stored as FileReconciliationIssue rows.
+
+Incremental runs only judge what changed since the previous completed run:
+rows uploaded since then and objects modified since then. S3 has no
+"modified since" listing filter, so the listing itself is still walked.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy import and_, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.file import File
+from app.models.file_reconciliation import FileReconciliationIssue, FileReconciliationRun
+from app.services.background_runs import BackgroundRuns, RunInProgress
+from app.services.storage import ObjectStat, get_storage
+
+ISSUE_MISSING_IN_STORAGE = "missing_in_storage"
+ISSUE_ORPHAN_OBJECT = "orphan_object"
+ISSUE_SIZE_MISMATCH = "size_mismatch"
+
+# All uploads live under this prefix
+UPLOAD_KEY_PREFIX = "uploads/"
+
+ROW_BATCH_SIZE = 1000
+ISSUE_BATCH_SIZE = 500
+# Write counters every N joined keys
+PROGRESS_INTERVAL = 2000
+
+
+class ReconciliationInProgress(RunInProgress):
+    """Another reconciliation run is still running"""
+
+    kind = "Reconciliation"
+
+
+_runs = BackgroundRuns(FileReconciliationRun, ReconciliationInProgress)
+
+
+@dataclass(frozen=True)
+class FileRow:
+    file_id: int
+    file_path: str
+    file_size: int
+
+
+def _path_order():
+    return File.file_path.collate("C")
+
+
+async def iter_file_rows(
+    session_factory: async_sessionmaker,
+    since: Optional[datetime] = None,
+    batch_size: int = ROW_BATCH_SIZE
+) -> AsyncIterator[FileRow]:
+    """
+    File rows under UPLOAD_KEY_PREFIX ordered by (file_path byte order, file_id)
+
+    Each keyset batch uses its own short session, so a long run does not hold
+    a transaction open.
+    """
+    path = _path_order()
+    last: Optional[Tuple[str, int]] = None
+    while True:
+        query = (
+            select(File.file_id, File.file_path, File.file_size)
+            .where(File.file_path.startswith(UPLOAD_KEY_PREFIX))
+            .order_by(path, File.file_id)
+            .limit(batch_size)
+        )
+        if since is not None:
+            query = query.where(File.uploaded_at >= since)
+        if last is not None:
+            query = query.where(or_(path > last[0], and_(path == last[0], File.file_id > last[1])))
+        async with session_factory() as db:
+            rows = (await db.execute(query)).all()
+        for row in rows:
+            yield FileRow(row.file_id, row.file_path, row.file_size)
+        if len(rows) < batch_size:
+            return
+        last = (rows[-1].file_path, rows[-1].file_id)
+
+
+async def merge_join(
+    objects: AsyncIterator[ObjectStat],
+    rows: AsyncIterator[FileRow]
+) -> AsyncIterator[Tuple[Optional[ObjectStat], List[FileRow]]]:
+    """
+    Merge-join two key-sorted streams
+
+    Yields (object, rows) per distinct key: rows is empty for storage-only
+    keys and object is None for DB-only keys. Several rows can share a key
+    (deduplicated content).
+    """
+    async def advance(iterator, previous: Optional[str], key_of):
+        item = await anext(iterator, None)
+        if item is not None and previous is not None and key_of(item) < previous:
+            raise RuntimeError(f"Input not sorted: {key_of(item)!r} after {previous!r}")
+        return item
+
+    obj = await advance(objects, None, lambda o: o.key)
+    row = await advance(rows, None, lambda r: r.file_path)
+    while obj is not None or row is not None:
+        if row is None or (obj is not None and obj.key < row.file_path):
+            yield obj, []
+            obj = await advance(objects, obj.key, lambda o: o.key)
+            continue
+
+        key = row.file_path
+        group = []
+        while row is not None and row.file_path == key:
+            group.append(row)
+            row = await advance(rows, key, lambda r: r.file_path)
+        if obj is not None and obj.key == key:
+            yield obj, group
+            obj = await advance(objects, obj.key, lambda o: o.key)
+        else:
+            yield None, group
+
+
+class _RunRecorder:
+    """Counters and buffered issues of one run, written in batches"""
+
+    def __init__(self, session_factory: async_sessionmaker, run_id: int):
+        self.session_factory = session_factory
+        self.run_id = run_id
+        self.counters = {
+            "objects_scanned": 0,
+            "rows_scanned": 0,
+            "matched": 0,
+            "missing_in_storage": 0,
+            "orphan_objects": 0,
+            "size_mismatches": 0,
+        }
+        self._issues: List[dict] = []
+
+    def issue(self, kind: str, file_path: str, file_id: Optional[int] = None,
+              db_size: Optional[int] = None, obj: Optional[ObjectStat] = None) -> None:
+        counter = {
+            ISSUE_MISSING_IN_STORAGE: "missing_in_storage",
+            ISSUE_ORPHAN_OBJECT: "orphan_objects",
+            ISSUE_SIZE_MISMATCH: "size_mismatches",
+        }[kind]
+        self.counters[counter] += 1
+        self._issues.append({
+            "run_id": self.run_id,
+            "kind": kind,
+            "file_path": file_path,
+            "file_id": file_id,
+            "db_size": db_size,
+            "storage_size": obj.size if obj else None,
+            "last_modified": obj.last_modified if obj else None,
+        })
+
+    async def flush(self, **values) -> None:
+        async with self.session_factory() as db:
+            if self._issues:
+                await db.execute(insert(FileReconciliationIssue), self._issues)
+                self._issues = []
+            await db.execute(
+                update(FileReconciliationRun)
+                .where(FileReconciliationRun.run_id == self.run_id)
+                .values(**self.counters, updated_at=datetime.now(timezone.utc), **values)
+            )
+            await db.commit()
+
+    @property
+    def pending_issues(self) -> int:
+        return len(self._issues)
+
+
+async def _unreferenced(session_factory: async_sessionmaker, candidates: List[ObjectStat]) -> List[ObjectStat]:
+    """Candidates no File row refers to (incremental runs only see changed rows)"""
+    async with session_factory() as db:
+        result = await db.execute(
+            select(File.file_path).where(File.file_path.in_([obj.key for obj in candidates]))
+        )
+        referenced = set(result.scalars().all())
+    return [obj for obj in candidates if obj.key not in referenced]
+
+
+async def run_reconciliation(
+    run_id: int,
+    since: Optional[datetime] = None,
+    session_factory: async_sessionmaker = AsyncSessionLocal
+) -> None:
+    """Execute a run created by start_reconciliation (full when since is None)"""
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    recorder = _RunRecorder(session_factory, run_id)
+    candidates: List[ObjectStat] = []
+
+    async def counted_objects() -> AsyncIterator[ObjectStat]:
+        async for obj in get_storage().list_objects(UPLOAD_KEY_PREFIX):
+            recorder.counters["objects_scanned"] += 1
+            yield obj
+
+    async def counted_rows() -> AsyncIterator[FileRow]:
+        async for row in iter_file_rows(session_factory, since):
+            recorder.counters["rows_scanned"] += 1
+            yield row
+
+    async def judge_candidates() -> None:
+        for obj in await _unreferenced(session_factory, candidates):
+            recorder.issue(ISSUE_ORPHAN_OBJECT, obj.key, obj=obj)
+        candidates.clear()
+
+    try:
+        joined = 0
+        async for obj, rows in merge_join(counted_objects(), counted_rows()):
+            if obj is None:
+                for row in rows:
+                    recorder.issue(ISSUE_MISSING_IN_STORAGE, row.file_path, row.file_id, row.file_size)
+            elif not rows:
+                if since is None:
+                    recorder.issue(ISSUE_ORPHAN_OBJECT, obj.key, obj=obj)
+                elif obj.last_modified is not None and obj.last_modified >= since:
+                    candidates.append(obj)
+                    if len(candidates) >= ISSUE_BATCH_SIZE:
+                        await judge_candidates()
+            else:
+                for row in rows:
+                    if row.file_size != obj.size:
+                        recorder.issue(ISSUE_SIZE_MISMATCH, row.file_path, row.file_id, row.file_size, obj)
+                    else:
+                        recorder.counters["matched"] += 1
+
+            joined += 1
+            if joined % PROGRESS_INTERVAL == 0 or recorder.pending_issues >= ISSUE_BATCH_SIZE:
+                await recorder.flush()
+
+        if candidates:
+            await judge_candidates()
+        await recorder.flush(status="completed", finished_at=datetime.now(timezone.utc))
+    except Exception as e:
+        print(f"[RECONCILE] Run {run_id} failed: {e}")
+        await recorder.flush(status="failed", finished_at=datetime.now(timezone.utc), error=str(e))
+
+
+async def start_reconciliation(
+    db: AsyncSession,
+    incremental: bool = False,
+    started_by: Optional[int] = None,
+    session_factory: async_sessionmaker = AsyncSessionLocal
+) -> FileReconciliationRun:
+    """
+    Create a run and start it as a background task
+
+    Incremental runs cover changes since the last completed run's start (a
+    full run when there is none). Raises ReconciliationInProgress while a
+    run is active; runs without progress for RECONCILIATION_STALE_MINUTES
+    (e.g. their process restarted) are marked failed instead.
+    """
+    await _runs.check_idle(db, settings.RECONCILIATION_STALE_MINUTES)
+
+    since = None
+    if incremental:
+        last_result = await db.execute(
+            select(FileReconciliationRun.started_at)
+            .where(FileReconciliationRun.status == "completed")
+            .order_by(FileReconciliationRun.started_at.desc())
+            .limit(1)
+        )
+        since = last_result.scalar_one_or_none()
+
+    run = FileReconciliationRun(
+        mode="incremental" if since is not None else "full",
+        status="running",
+        since=since,
+        started_by=started_by,
+    )
+    return await _runs.start(db, run, lambda run_id: run_reconciliation(run_id, since, session_factory))
@@ -0,0 +1,284 @@
+"""
+File retention service - purge of files past scheduled_deletion_date
+
+A purge run walks expired files (scheduled_deletion_date on or before the
+cutoff) in keyset batches of (scheduled_deletion_date, file_id), skipping
+files still referenced by a competency, application item, custom question
+answer or certificate, or from their uploader's coach profile (file_ids
+inside its JSON columns, see profile.py). Unreferenced files are deleted in
+chunks of FILE_PURGE_CHUNK_SIZE rows, one short transaction each:
+- DELETE ... RETURNING, re-checking references at delete time
+- shared blobs are recounted and dropped with their last reference
+- after the commit, the chunk's objects (legacy paths, dropped blobs,
+  previews) are removed with one bulk delete request
+
+Runs pause FILE_PURGE_PAUSE_MS between chunks so a large backlog does not
+saturate the database, execute as background tasks (one at a time), and
+write their counters to FilePurgeRun as they go. Dry runs only count.
+"""
+import asyncio
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, exists, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.application import ApplicationData
+from app.models.certification import Certification
+from app.models.coach_profile import CoachProfile
+from app.models.competency import CoachCompetency
+from app.models.custom_question import CustomQuestionAnswer
+from app.models.education import CoachEducationHistory
+from app.models.file import File
+from app.models.file_purge import FilePurgeRun
+from app.services.background_runs import BackgroundRuns, RunInProgress
+from app.services.file_blob_service import delete_files, delete_released_objects
+from app.services.storage import StorageDriver, get_storage
+
+# Columns referencing files.file_id: referenced files are kept (coach
+# profiles reference files inside JSON and are checked separately)
+FILE_REFERENCE_COLUMNS = (
+    CoachCompetency.file_id,
+    ApplicationData.submitted_file_id,
+    CustomQuestionAnswer.answer_file_id,
+    Certification.certificate_file_id,
+    CoachEducationHistory.certificate_file_id,
+)
+
+
+class PurgeInProgress(RunInProgress):
+    """Another purge run is still running"""
+
+    kind = "Purge"
+
+
+_runs = BackgroundRuns(FilePurgeRun, PurgeInProgress)
+
+
+@dataclass(frozen=True)
+class ExpiredFile:
+    file_id: int
+    scheduled_deletion_date: date
+    file_size: int
+    referenced: bool
+
+
+def _is_referenced():
+    return or_(*[exists().where(column == File.file_id) for column in FILE_REFERENCE_COLUMNS])
+
+
+def _json_value(value: Optional[str]):
+    try:
+        return json.loads(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def profile_file_ids(profile: CoachProfile) -> Set[int]:
+    """
+    file_ids referenced from a coach profile's JSON columns: file_id of each
+    degree, certification and mentoring experience, and the historyFiles /
+    certFiles (older profiles: files) lists of each field experience
+    """
+    file_ids = set()
+    for column in (profile.degrees, profile.certifications, profile.mentoring_experiences):
+        items = _json_value(column)
+        for item in items if isinstance(items, list) else ():
+            if isinstance(item, dict) and isinstance(item.get("file_id"), int):
+                file_ids.add(item["file_id"])
+    fields = _json_value(profile.field_experiences)
+    for field in fields.values() if isinstance(fields, dict) else ():
+        if not isinstance(field, dict):
+            continue
+        for key in ("historyFiles", "certFiles", "files"):
+            ids = field.get(key)
+            if isinstance(ids, list):
+                file_ids.update(i for i in ids if isinstance(i, int))
+    return file_ids
+
+
+async def _profile_referenced(db: AsyncSession, user_ids: Iterable[int], lock: bool = False) -> Set[int]:
+    """
+    file_ids referenced from the coach profiles of `user_ids`
+
+    With lock, the profile rows stay locked until the transaction ends, so a
+    profile saved concurrently cannot attach a file that is being deleted.
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return set()
+    query = select(CoachProfile).where(CoachProfile.user_id.in_(user_ids)).order_by(CoachProfile.user_id)
+    if lock:
+        query = query.with_for_update()
+    result = await db.execute(query)
+    file_ids = set()
+    for profile in result.scalars().all():
+        file_ids |= profile_file_ids(profile)
+    return file_ids
+
+
+async def iter_expired_batches(
+    session_factory: async_sessionmaker,
+    cutoff: date,
+    batch_size: int
+) -> AsyncIterator[List[ExpiredFile]]:
+    """
+    Files with scheduled_deletion_date <= cutoff in (date, file_id) order
+
+    One short session per batch; rows deleted meanwhile do not disturb the
+    keyset position.
+    """
+    last: Optional[Tuple[date, int]] = None
+    while True:
+        query = (
+            select(
+                File.file_id, File.scheduled_deletion_date, File.file_size, File.uploaded_by,
+                _is_referenced().label("referenced")
+            )
+            .where(File.scheduled_deletion_date <= cutoff)
+            .order_by(File.scheduled_deletion_date, File.file_id)
+            .limit(batch_size)
+        )
+        if last is not None:
+            query = query.where(or_(
+                File.scheduled_deletion_date > last[0],
+                and_(File.scheduled_deletion_date == last[0], File.file_id > last[1])
+            ))
+        async with session_factory() as db:
+            rows = (await db.execute(query)).all()
+            in_profiles = await _profile_referenced(db, [row.uploaded_by for row in rows if not row.referenced])
+        if rows:
+            yield [
+                ExpiredFile(
+                    row.file_id, row.scheduled_deletion_date, row.file_size,
+                    bool(row.referenced) or row.file_id in in_profiles
+                )
+                for row in rows
+            ]
+        if len(rows) < batch_size:
+            return
+        last = (rows[-1].scheduled_deletion_date, rows[-1].file_id)
+
+
+async def purge_files(
+    session_factory: async_sessionmaker,
+    storage: StorageDriver,
+    file_ids: List[int],
+    cutoff: date
+) -> Tuple[int, int, int, int]:
+    """
+    Delete expired, unreferenced files in one transaction, then their objects
+
+    Returns (rows deleted, bytes, objects deleted, objects failed). Objects
+    failing to delete are left as orphans for reconciliation to report.
+    """
+    async with session_factory() as db:
+        # Attached to a profile since the scan: keep (profiles locked until commit)
+        result = await db.execute(select(File.uploaded_by).where(File.file_id.in_(file_ids)).distinct())
+        in_profiles = await _profile_referenced(db, result.scalars().all(), lock=True)
+        file_ids = [file_id for file_id in file_ids if file_id not in in_profiles]
+
+        deleted, keys = await delete_files(
+            db,
+            File.file_id.in_(file_ids),
+            File.scheduled_deletion_date <= cutoff,
+            ~_is_referenced(),  # Attached since the scan: keep
+        )
+        await db.commit()
+        failed = await delete_released_objects(db, storage, keys) if keys else []
+
+    return len(deleted), sum(row.file_size for row in deleted), len(keys) - len(failed), len(failed)
+
+
+async def _record_progress(session_factory: async_sessionmaker, run_id: int, counters: dict, **values) -> None:
+    async with session_factory() as db:
+        await db.execute(
+            update(FilePurgeRun)
+            .where(FilePurgeRun.run_id == run_id)
+            .values(**counters, updated_at=datetime.now(timezone.utc), **values)
+        )
+        await db.commit()
+
+
+async def run_purge(
+    run_id: int,
+    cutoff: date,
+    dry_run: bool,
+    session_factory: async_sessionmaker = AsyncSessionLocal
+) -> None:
+    """Execute a run created by start_purge"""
+    counters = {
+        "files_scanned": 0,
+        "files_referenced": 0,
+        "files_purged": 0,
+        "bytes_purged": 0,
+        "objects_deleted": 0,
+        "object_errors": 0,
+    }
+    storage = get_storage()
+    chunk_size = settings.FILE_PURGE_CHUNK_SIZE
+    pause = settings.FILE_PURGE_PAUSE_MS / 1000
+
+    try:
+        async for batch in iter_expired_batches(session_factory, cutoff, settings.FILE_PURGE_BATCH_SIZE):
+            counters["files_scanned"] += len(batch)
+            candidates = [f for f in batch if not f.referenced]
+            counters["files_referenced"] += len(batch) - len(candidates)
+
+            if dry_run:
+                counters["files_purged"] += len(candidates)
+                counters["bytes_purged"] += sum(f.file_size for f in candidates)
+                await _record_progress(session_factory, run_id, counters)
+                continue
+
+            for start in range(0, len(candidates), chunk_size):
+                chunk = candidates[start:start + chunk_size]
+                purged, size, objects, failed = await purge_files(
+                    session_factory, storage, [f.file_id for f in chunk], cutoff
+                )
+                counters["files_purged"] += purged
+                counters["files_referenced"] += len(chunk) - purged
+                counters["bytes_purged"] += size
+                counters["objects_deleted"] += objects
+                counters["object_errors"] += failed
+                await _record_progress(session_factory, run_id, counters)
+                if pause:
+                    await asyncio.sleep(pause)
+
+        await _record_progress(
+            session_factory, run_id, counters, status="completed", finished_at=datetime.now(timezone.utc)
+        )
+    except Exception as e:
+        print(f"[PURGE] Run {run_id} failed: {e}")
+        await _record_progress(
+            session_factory, run_id, counters,
+            status="failed", finished_at=datetime.now(timezone.utc), error=str(e)
+        )
+
+
+async def start_purge(
+    db: AsyncSession,
+    dry_run: bool = True,
+    cutoff: Optional[date] = None,
+    started_by: Optional[int] = None,
+    session_factory: async_sessionmaker = AsyncSessionLocal
+) -> FilePurgeRun:
+    """
+    Create a purge run and start it as a background task
+
+    cutoff defaults to today and is capped at today (files not yet due are
+    never purged). Raises PurgeInProgress while a run is active; runs without
+    progress for FILE_PURGE_STALE_MINUTES (e.g. their process restarted) are
+    marked failed instead.
+    """
+    today = date.today()
+    if cutoff is None or cutoff > today:
+        cutoff = today
+
+    await _runs.check_idle(db, settings.FILE_PURGE_STALE_MINUTES)
+    run = FilePurgeRun(dry_run=dry_run, status="running", cutoff_date=cutoff, started_by=started_by)
+    return await _runs.start(db, run, lambda run_id: run_purge(run_id, cutoff, dry_run, session_factory))
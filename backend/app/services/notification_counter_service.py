@@ -0,0 +1,239 @@
+"""
+Notification counter service - per-user unread counts and the push channel
+
+NotificationCounter holds each user's unread count, so GET
+/notifications/unread-count reads one row instead of the user's
+notifications. It is recounted for the users touched by each flush that
+creates, reads or deletes notifications (ORM events, like the project stats
+counters); bulk statements that bypass the ORM (create_notifications_bulk,
+mark-all-read, retention) call recount_unread() themselves. A recount locks
+the users' counter rows (creating missing ones) before it counts, so
+concurrent recounts for one user run in turn and the later one counts the
+notifications the earlier one committed.
+
+When such a transaction commits, open notification streams of those users
+are woken and push the new notifications and count (server-sent events).
+Wakeups only reach streams in the same process, so streams also re-check the
+counter every NOTIFICATION_STREAM_POLL_SECONDS to pick up changes committed
+by other processes.
+"""
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.notification import Notification, NotificationCounter
+from app.models.user import User
+from app.schemas.notification import NotificationResponse
+
+# session.info keys: users whose counter needs a recount at the end of the
+# flush, and users to wake once the transaction commits
+DIRTY_UNREAD_KEY = "dirty_unread_counters"
+CHANGED_UNREAD_KEY = "changed_unread_counters"
+
+# Max notifications pushed per stream wakeup (older ones are in GET /my)
+STREAM_BATCH_SIZE = 50
+
+# Open streams of this process, by user_id
+_subscribers: Dict[int, Set[asyncio.Event]] = {}
+
+
+def lock_counters_statements(user_ids: Iterable[int]) -> List:
+    """
+    Create the users' missing counter rows, then lock all of them
+
+    Locked in user_id order, so recounts of overlapping users (bulk fan-outs)
+    cannot deadlock. Without the lock, two transactions adding a
+    notification for one user would each count their own snapshot, and the
+    second upsert would store the same, one-too-low count.
+    """
+    user_ids = sorted(set(user_ids))
+    create_missing = pg_insert(NotificationCounter).from_select(
+        ["user_id"],
+        select(User.user_id).where(User.user_id.in_(user_ids)).order_by(User.user_id)
+    ).on_conflict_do_nothing(index_elements=[NotificationCounter.user_id])
+    lock = (
+        select(NotificationCounter.user_id)
+        .where(NotificationCounter.user_id.in_(user_ids))
+        .order_by(NotificationCounter.user_id)
+        .with_for_update()
+    )
+    return [create_missing, lock]
+
+
+def recount_unread_statement(user_ids: Iterable[int]):
+    """
+    Upsert recounted NotificationCounter rows for the given users
+
+    Counted from the notifications table (partial index on unread rows)
+    rather than adjusted by deltas, so a recount also repairs drift. Rows
+    whose count did not change are left alone. Run it after the
+    statements of lock_counters_statements().
+    """
+    unread = (
+        select(func.count(Notification.notification_id))
+        .where(Notification.user_id == User.user_id, Notification.is_read == False)
+        .scalar_subquery()
+    )
+    stmt = pg_insert(NotificationCounter).from_select(
+        ["user_id", "unread_count", "updated_at"],
+        select(User.user_id, unread, func.now()).where(User.user_id.in_(sorted(set(user_ids))))
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[NotificationCounter.user_id],
+        set_={"unread_count": stmt.excluded.unread_count, "updated_at": stmt.excluded.updated_at},
+        where=NotificationCounter.unread_count != stmt.excluded.unread_count
+    )
+
+
+def recount_unread_statements(user_ids: Iterable[int]) -> List:
+    """Lock the users' counters, then recount them; run in order in one transaction"""
+    user_ids = sorted(set(user_ids))
+    return lock_counters_statements(user_ids) + [recount_unread_statement(user_ids)]
+
+
+async def recount_unread(db: AsyncSession, user_ids: Iterable[int]) -> None:
+    """Recount after a statement that bypassed the ORM; streams are woken on commit"""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    for statement in recount_unread_statements(user_ids):
+        await db.execute(statement)
+    db.sync_session.info.setdefault(CHANGED_UNREAD_KEY, set()).update(user_ids)
+
+
+async def get_unread_count(db: AsyncSession, user_id: int) -> int:
+    """A user's unread count (0 without a counter row)"""
+    result = await db.execute(
+        select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
+    )
+    return result.scalar() or 0
+
+
+def mark_unread_dirty(session: Session, user_id: int) -> None:
+    """Schedule a counter recount for a user at the end of the current flush"""
+    if user_id is not None:
+        session.info.setdefault(DIRTY_UNREAD_KEY, set()).add(user_id)
+
+
+@event.listens_for(Notification, "after_insert")
+@event.listens_for(Notification, "after_delete")
+def _notification_added_or_removed(mapper, connection, target):
+    mark_unread_dirty(inspect(target).session, target.user_id)
+
+
+@event.listens_for(Notification, "after_update")
+def _notification_updated(mapper, connection, target):
+    state = inspect(target)
+    if not (state.attrs.is_read.history.has_changes() or state.attrs.user_id.history.has_changes()):
+        return
+    mark_unread_dirty(state.session, target.user_id)
+    for old_user_id in state.attrs.user_id.history.deleted or ():
+        mark_unread_dirty(state.session, old_user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _recount_dirty_unread(session, flush_context):
+    user_ids = session.info.pop(DIRTY_UNREAD_KEY, None)
+    if not user_ids:
+        return
+    # session.execute() would try to autoflush; run on the flush's connection instead
+    connection = session.connection()
+    for statement in recount_unread_statements(user_ids):
+        connection.execute(statement)
+    session.info.setdefault(CHANGED_UNREAD_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_changed_streams(session):
+    for user_id in session.info.pop(CHANGED_UNREAD_KEY, ()):
+        for wakeup in _subscribers.get(user_id, ()):
+            wakeup.set()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_changed_streams(session, previous_transaction):
+    session.info.pop(CHANGED_UNREAD_KEY, None)
+
+
+def _sse(event_name: str, data: dict, event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event_name}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def notification_events(
+    user_id: int,
+    last_event_id: Optional[int] = None,
+    session_factory: async_sessionmaker = AsyncSessionLocal
+) -> AsyncIterator[str]:
+    """
+    Server-sent events for one user's stream
+
+    - `notification` (id: notification_id): a notification created after
+      last_event_id (default: after the newest existing one)
+    - `unread_count`: {"count": n}, first on connect and then on each change
+    - comment lines as keep-alive while nothing happens
+
+    The stream ends after NOTIFICATION_STREAM_MAX_SECONDS so clients
+    reconnect (with Last-Event-ID) under a fresh access token.
+    """
+    wakeup = asyncio.Event()
+    _subscribers.setdefault(user_id, set()).add(wakeup)
+    deadline = time.monotonic() + settings.NOTIFICATION_STREAM_MAX_SECONDS
+    count: Optional[int] = None
+    try:
+        yield f"retry: {settings.NOTIFICATION_STREAM_RETRY_MS}\n\n"
+        while True:
+            wakeup.clear()  # Before reading: a commit from here on wakes the next wait
+            async with session_factory() as db:
+                if last_event_id is None:
+                    result = await db.execute(
+                        select(func.max(Notification.notification_id)).where(Notification.user_id == user_id)
+                    )
+                    last_event_id = result.scalar() or 0
+                    notifications = []
+                else:
+                    result = await db.execute(
+                        select(Notification)
+                        .where(Notification.user_id == user_id, Notification.notification_id > last_event_id)
+                        .order_by(Notification.notification_id)
+                        .limit(STREAM_BATCH_SIZE)
+                    )
+                    notifications = result.scalars().all()
+                unread = await get_unread_count(db, user_id)
+
+            for notification in notifications:
+                payload = NotificationResponse.model_validate(notification).model_dump(mode="json")
+                yield _sse("notification", payload, notification.notification_id)
+                last_event_id = notification.notification_id
+            if unread != count:
+                count = unread
+                yield _sse("unread_count", {"count": count})
+            if len(notifications) == STREAM_BATCH_SIZE:
+                continue  # More to send
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(
+                    wakeup.wait(), timeout=min(settings.NOTIFICATION_STREAM_POLL_SECONDS, remaining)
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        subscribers = _subscribers.get(user_id)
+        if subscribers is not None:
+            subscribers.discard(wakeup)
+            if not subscribers:
+                del _subscribers[user_id]
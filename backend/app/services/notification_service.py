@@ -1,20 +1,66 @@
 """
 Notification service with email integration
+
+Single notifications go through create_notification_with_email(). Cohort-wide
+announcements (selection results, review start) build one NotificationSpec
+per recipient and hand them to create_notifications_bulk(), which costs a
+fixed number of statements however many applicants a project has.
 """
-from datetime import datetime
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select
 
 from app.models.notification import Notification, NotificationType
 from app.models.user import User
-from app.core.email import send_notification_email
+from app.core.email import NOTIFICATION_EMAIL_CONFIG
+from app.services.email_outbox_service import enqueue_email, enqueue_emails
+from app.services.notification_counter_service import recount_unread
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Notifications kept per user (older ones are deleted)
+NOTIFICATION_RETENTION_COUNT = 20
+
+
+@dataclass
+class NotificationSpec:
+    """One recipient's notification in a bulk fan-out"""
+    user_id: int
+    notification_type: NotificationType
+    title: str
+    message: Optional[str] = None
+    related_application_id: Optional[int] = None
+    related_project_id: Optional[int] = None
+    related_data_id: Optional[int] = None
+    related_competency_id: Optional[int] = None
+    send_email: bool = True
+    email_context: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def type_value(self) -> str:
+        if isinstance(self.notification_type, NotificationType):
+            return self.notification_type.value
+        return self.notification_type
+
+    def as_kwargs(self) -> Dict[str, Any]:
+        """Arguments for create_notification_with_email()"""
+        return {
+            "user_id": self.user_id,
+            "notification_type": self.notification_type,
+            "title": self.title,
+            "message": self.message,
+            "related_application_id": self.related_application_id,
+            "related_project_id": self.related_project_id,
+            "related_data_id": self.related_data_id,
+            "related_competency_id": self.related_competency_id,
+            "send_email": self.send_email,
+            **self.email_context,
+        }
+
 
 async def create_notification_with_email(
     db: AsyncSession,
@@ -30,7 +76,11 @@ async def create_notification_with_email(
     **email_context
 ) -> Notification:
     """
-    Create a notification and optionally send an email
+    Create a notification and optionally queue its email
+
+    The email goes to the outbox in the caller's transaction and is delivered
+    in the background after commit (see email_outbox_service), so this never
+    waits for the email provider. Types without an email template get none.
 
     Args:
         db: Database session
@@ -54,10 +104,12 @@ async def create_notification_with_email(
     Returns:
         Created Notification object
     """
+    type_value = notification_type.value if isinstance(notification_type, NotificationType) else notification_type
+
     # Create notification
     notification = Notification(
         user_id=user_id,
-        type=notification_type.value if isinstance(notification_type, NotificationType) else notification_type,
+        type=type_value,
         title=title,
         message=message,
         related_application_id=related_application_id,
@@ -69,47 +121,114 @@ async def create_notification_with_email(
 
     db.add(notification)
 
-    # Send email if enabled
-    if send_email:
-        try:
-            # Get user info
-            result = await db.execute(
-                select(User).where(User.user_id == user_id)
+    # Queue the email in the same transaction (sent by the outbox dispatcher
+    # after commit; email_sent is set once it is delivered)
+    if send_email and type_value in NOTIFICATION_EMAIL_CONFIG:
+        result = await db.execute(
+            select(User.email, User.name).where(User.user_id == user_id)
+        )
+        user = result.one_or_none()
+
+        if user and user.email:
+            # Build action URL if not provided
+            if "action_url" not in email_context:
+                email_context["action_url"] = settings.FRONTEND_URL
+
+            enqueue_email(
+                db,
+                notification,
+                to_email=user.email,
+                user_name=user.name,
+                notification_type=type_value,
+                title=title,
+                message=message,
+                **email_context
             )
-            user = result.scalar_one_or_none()
-
-            if user and user.email:
-                # Build action URL if not provided
-                if "action_url" not in email_context:
-                    email_context["action_url"] = settings.FRONTEND_URL
-
-                email_success = await send_notification_email(
-                    to_email=user.email,
-                    notification_type=notification_type.value if isinstance(notification_type, NotificationType) else notification_type,
-                    title=title,
-                    message=message,
-                    user_name=user.name,
-                    **email_context
-                )
-
-                if email_success:
-                    notification.email_sent = True
-                    notification.email_sent_at = datetime.utcnow()
-                    logger.info(f"Notification email sent to user {user_id}: {title}")
-                else:
-                    logger.warning(f"Failed to send notification email to user {user_id}")
-            else:
-                logger.warning(f"User {user_id} has no email address")
-
-        except Exception as e:
-            logger.error(f"Error sending notification email: {str(e)}")
+        else:
+            logger.warning(f"User {user_id} has no email address")
 
     await db.flush()
     return notification
 
 
-async def send_supplement_request_notification(
+async def create_notifications_bulk(
     db: AsyncSession,
+    specs: List[NotificationSpec],
+    max_per_user: Optional[int] = NOTIFICATION_RETENTION_COUNT
+) -> List[int]:
+    """
+    Create many notifications and queue their emails in the caller's transaction
+
+    Statements issued, whatever len(specs) is:
+    - one multi-row INSERT ... RETURNING for the notifications
+    - one SELECT ... IN for the recipients' emails (only if any spec emails)
+    - one multi-row INSERT into the email outbox
+    - one DELETE trimming every recipient to max_per_user notifications
+      (None keeps everything)
+
+    Returns:
+        Created notification IDs, in the order of specs
+    """
+    if not specs:
+        return []
+
+    result = await db.execute(
+        insert(Notification).returning(Notification.notification_id, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": spec.user_id,
+                "type": spec.type_value,
+                "title": spec.title,
+                "message": spec.message,
+                "related_application_id": spec.related_application_id,
+                "related_project_id": spec.related_project_id,
+                "related_data_id": spec.related_data_id,
+                "related_competency_id": spec.related_competency_id,
+                "is_read": False,
+                "email_sent": False,
+            }
+            for spec in specs
+        ]
+    )
+    notification_ids = list(result.scalars().all())
+
+    emailed = [
+        (notification_id, spec) for notification_id, spec in zip(notification_ids, specs)
+        if spec.send_email and spec.type_value in NOTIFICATION_EMAIL_CONFIG
+    ]
+    if emailed:
+        recipients_result = await db.execute(
+            select(User.user_id, User.email, User.name)
+            .where(User.user_id.in_({spec.user_id for _, spec in emailed}))
+        )
+        recipients = {row.user_id: row for row in recipients_result.all()}
+
+        emails = []
+        for notification_id, spec in emailed:
+            recipient = recipients.get(spec.user_id)
+            if not recipient or not recipient.email:
+                logger.warning(f"User {spec.user_id} has no email address")
+                continue
+            emails.append({
+                "notification_id": notification_id,
+                "to_email": recipient.email,
+                "user_name": recipient.name,
+                "notification_type": spec.type_value,
+                "title": spec.title,
+                "message": spec.message,
+                "context": {"action_url": settings.FRONTEND_URL, **spec.email_context},
+            })
+        await enqueue_emails(db, emails)
+
+    user_ids = {spec.user_id for spec in specs}
+    if max_per_user is not None:
+        await cleanup_old_notifications_bulk(db, user_ids, max_per_user, recount=False)
+    await recount_unread(db, user_ids)
+
+    return notification_ids
+
+
+def supplement_request_spec(
     user_id: int,
     application_id: int,
     project_id: int,
@@ -118,16 +237,15 @@ async def send_supplement_request_notification(
     reason: str,
     project_name: Optional[str] = None,
     deadline: Optional[str] = None
-) -> Notification:
-    """Send notification for supplement request (서류 보충 요청)"""
+) -> NotificationSpec:
+    """Supplement request (서류 보충 요청) notification"""
     # Include project name in title for better context
     if project_name:
         title = f"[{project_name}] 서류 보충이 필요합니다: {item_name}"
     else:
         title = f"서류 보충이 필요합니다: {item_name}"
 
-    return await create_notification_with_email(
-        db=db,
+    return NotificationSpec(
         user_id=user_id,
         notification_type=NotificationType.SUPPLEMENT_REQUEST,
         title=title,
@@ -135,13 +253,83 @@ async def send_supplement_request_notification(
         related_application_id=application_id,
         related_project_id=project_id,
         related_data_id=data_id,
-        action_url=f"{settings.FRONTEND_URL}/applications/{application_id}",
-        project_name=project_name,
-        item_name=item_name,
-        deadline=deadline
+        email_context={
+            "action_url": f"{settings.FRONTEND_URL}/applications/{application_id}",
+            "project_name": project_name,
+            "item_name": item_name,
+            "deadline": deadline,
+        }
     )
 
 
+def selection_result_spec(
+    user_id: int,
+    application_id: int,
+    project_id: int,
+    project_name: str,
+    is_selected: bool,
+    message: Optional[str] = None
+) -> NotificationSpec:
+    """Selection result (선발 결과) notification"""
+    return NotificationSpec(
+        user_id=user_id,
+        notification_type=NotificationType.SELECTION_RESULT,
+        title=f"선발 결과 안내: {project_name}",
+        message=message,
+        related_application_id=application_id,
+        related_project_id=project_id,
+        email_context={
+            "action_url": f"{settings.FRONTEND_URL}/applications/{application_id}",
+            "project_name": project_name,
+            "result": "selected" if is_selected else "rejected",
+        }
+    )
+
+
+def review_start_spec(
+    user_id: int,
+    application_id: int,
+    project_id: int,
+    project_name: str,
+    is_qualified: bool,
+    reason: Optional[str] = None
+) -> NotificationSpec:
+    """Review start (심사 개시) notification - in-app only"""
+    if is_qualified:
+        message = f"'{project_name}' 과제의 심사가 개시되었습니다. 서류검토를 통과하여 심사 대상이 되었습니다."
+    else:
+        message = f"'{project_name}' 과제의 심사가 개시되어 서류탈락 처리되었습니다. {reason or ''}".rstrip()
+
+    return NotificationSpec(
+        user_id=user_id,
+        notification_type=NotificationType.PROJECT_UPDATE,
+        title=f"심사 개시 안내: {project_name}",
+        message=message,
+        related_application_id=application_id,
+        related_project_id=project_id,
+        send_email=False,
+    )
+
+
+async def send_supplement_request_notification(
+    db: AsyncSession,
+    user_id: int,
+    application_id: int,
+    project_id: int,
+    data_id: int,
+    item_name: str,
+    reason: str,
+    project_name: Optional[str] = None,
+    deadline: Optional[str] = None
+) -> int:
+    """Send notification for supplement request (서류 보충 요청); returns its ID"""
+    spec = supplement_request_spec(
+        user_id, application_id, project_id, data_id, item_name, reason, project_name, deadline
+    )
+    notification_ids = await create_notifications_bulk(db, [spec])
+    return notification_ids[0]
+
+
 async def send_verification_supplement_notification(
     db: AsyncSession,
     user_id: int,
@@ -223,21 +411,8 @@ async def send_selection_result_notification(
     message: Optional[str] = None
 ) -> Notification:
     """Send notification for selection result (선발 결과)"""
-    result = "selected" if is_selected else "rejected"
-    title = f"선발 결과 안내: {project_name}"
-
-    return await create_notification_with_email(
-        db=db,
-        user_id=user_id,
-        notification_type=NotificationType.SELECTION_RESULT,
-        title=title,
-        message=message,
-        related_application_id=application_id,
-        related_project_id=project_id,
-        action_url=f"{settings.FRONTEND_URL}/applications/{application_id}",
-        project_name=project_name,
-        result=result
-    )
+    spec = selection_result_spec(user_id, application_id, project_id, project_name, is_selected, message)
+    return await create_notification_with_email(db=db, **spec.as_kwargs())
 
 
 async def send_application_draft_notification(
@@ -293,7 +468,7 @@ async def send_application_submit_notification(
 async def cleanup_old_notifications(
     db: AsyncSession,
     user_id: int,
-    max_count: int = 20
+    max_count: int = NOTIFICATION_RETENTION_COUNT
 ) -> int:
     """
     Delete old notifications if user has more than max_count
@@ -301,35 +476,51 @@ async def cleanup_old_notifications(
     Returns:
         Number of deleted notifications
     """
-    from sqlalchemy import func, delete
+    delete_count = await cleanup_old_notifications_bulk(db, [user_id], max_count)
+    if delete_count:
+        logger.info(f"Deleted {delete_count} old notifications for user {user_id}")
+    return delete_count
 
-    # Count total notifications for user
-    count_result = await db.execute(
-        select(func.count(Notification.notification_id)).where(
-            Notification.user_id == user_id
-        )
-    )
-    total_count = count_result.scalar() or 0
 
-    if total_count <= max_count:
-        return 0
+async def cleanup_old_notifications_bulk(
+    db: AsyncSession,
+    user_ids: Iterable[int],
+    max_count: int = NOTIFICATION_RETENTION_COUNT,
+    recount: bool = True
+) -> int:
+    """
+    Keep only the newest max_count notifications of each user, in one DELETE
 
-    # Find notification IDs to keep (most recent max_count)
-    keep_query = select(Notification.notification_id).where(
-        Notification.user_id == user_id
-    ).order_by(Notification.created_at.desc()).limit(max_count)
+    Notifications are ranked per user with row_number() (newest first; ID
+    breaks ties between rows created in the same transaction). Unread
+    counters are recounted unless the caller does it (recount=False).
 
-    keep_result = await db.execute(keep_query)
-    keep_ids = [row[0] for row in keep_result.fetchall()]
+    Returns:
+        Number of deleted notifications
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return 0
 
-    # Delete old notifications
-    delete_count = total_count - max_count
-    delete_stmt = delete(Notification).where(
-        Notification.user_id == user_id,
-        Notification.notification_id.notin_(keep_ids)
+    ranked = (
+        select(
+            Notification.notification_id,
+            func.row_number().over(
+                partition_by=Notification.user_id,
+                order_by=(Notification.created_at.desc(), Notification.notification_id.desc())
+            ).label("rank")
+        )
+        .where(Notification.user_id.in_(user_ids))
+        .subquery()
     )
-
-    await db.execute(delete_stmt)
-    logger.info(f"Deleted {delete_count} old notifications for user {user_id}")
-
-    return delete_count
+    result = await db.execute(
+        delete(Notification)
+        .where(Notification.notification_id.in_(
+            select(ranked.c.notification_id).where(ranked.c.rank > max_count)
+        ))
+        .execution_options(synchronize_session=False)
+    )
+    deleted = result.rowcount or 0
+    if deleted and recount:
+        await recount_unread(db, user_ids)
+    return deleted
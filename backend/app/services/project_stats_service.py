@@ -0,0 +1,209 @@
+"""
+Project stats service - per-project application counters
+
+Counts are exposed two ways:
+- application_counts_lateral(): a LATERAL aggregate joined to a page of projects,
+  so a project list costs one query regardless of its length
+- ProjectApplicationStats: a denormalized counter table, recounted for the
+  projects touched by each flush that creates, submits, selects or deletes
+  applications (read by list_projects when PROJECT_STATS_COUNTERS_ENABLED)
+
+The counters are only maintained while PROJECT_STATS_COUNTERS_ENABLED is
+set; init_project_stats() rebuilds them at startup, so enabling the flag
+never serves counts that went stale while it was off. The flush listeners
+are registered by register_listeners() when app.models is imported, so
+scripts keep the counters current too. Raw DELETE FROM applications
+statements bypass them and call recount_project_stats() themselves.
+
+A recount first locks the projects' counter rows (creating missing ones)
+and only then counts, in a statement of its own. Concurrent recounts of a
+project so run one after another, each counting the rows the previous one
+committed, instead of the last writer storing a count from an older
+snapshot.
+"""
+from typing import Iterable, List
+
+from sqlalchemy import event, func, inspect, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.application import Application, ApplicationStatus, SelectionResult
+from app.models.project import Project, ProjectApplicationStats
+
+# session.info key holding project_ids whose counters need a recount
+DIRTY_PROJECT_STATS_KEY = "dirty_project_stats"
+
+# Application columns that affect the counters
+_COUNTED_COLUMNS = ("project_id", "status", "selection_result")
+
+
+def application_counts_lateral(name: str = "application_counts"):
+    """
+    LATERAL aggregate of one project's application counts
+
+    Join with `.outerjoin(counts, true())` to a query selecting Project; each
+    row then carries application_count, submitted_count and selected_count.
+    """
+    return (
+        select(
+            func.count(Application.application_id).label("application_count"),
+            func.count(Application.application_id).filter(
+                Application.status != ApplicationStatus.DRAFT
+            ).label("submitted_count"),
+            func.count(Application.application_id).filter(
+                Application.selection_result == SelectionResult.SELECTED
+            ).label("selected_count"),
+        )
+        .where(Application.project_id == Project.project_id)
+        .lateral(name)
+    )
+
+
+def select_projects_with_counts():
+    """
+    select(Project, application_count, current_participants) in one query
+
+    Reads the counter table when PROJECT_STATS_COUNTERS_ENABLED, otherwise
+    aggregates applications per project with a LATERAL subquery.
+    """
+    if settings.PROJECT_STATS_COUNTERS_ENABLED:
+        counts = ProjectApplicationStats.__table__
+        onclause = counts.c.project_id == Project.project_id
+    else:
+        counts = application_counts_lateral()
+        onclause = true()
+    return select(
+        Project,
+        func.coalesce(counts.c.application_count, 0).label("application_count"),
+        func.coalesce(counts.c.selected_count, 0).label("current_participants"),
+    ).outerjoin(counts, onclause)
+
+
+def recount_project_stats_statement(project_ids: Iterable[int]):
+    """
+    Upsert recounted ProjectApplicationStats rows for the given projects
+
+    Counts are taken from the applications table rather than adjusted by
+    deltas, so a recount also repairs any drift. Run it after the
+    statements of lock_project_stats_statements().
+    """
+    project_ids = list(project_ids)
+    counts = application_counts_lateral()
+    recount = (
+        select(
+            Project.project_id,
+            func.coalesce(counts.c.application_count, 0),
+            func.coalesce(counts.c.submitted_count, 0),
+            func.coalesce(counts.c.selected_count, 0),
+            func.now(),
+        )
+        .outerjoin(counts, true())
+        .where(Project.project_id.in_(project_ids))
+    )
+    stmt = pg_insert(ProjectApplicationStats).from_select(
+        ["project_id", "application_count", "submitted_count", "selected_count", "updated_at"],
+        recount
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[ProjectApplicationStats.project_id],
+        set_={
+            "application_count": stmt.excluded.application_count,
+            "submitted_count": stmt.excluded.submitted_count,
+            "selected_count": stmt.excluded.selected_count,
+            "updated_at": stmt.excluded.updated_at,
+        }
+    )
+
+
+def lock_project_stats_statements(project_ids: Iterable[int]) -> List:
+    """
+    Create the projects' missing counter rows, then lock all of them
+
+    Rows are locked in project_id order, so concurrent recounts of
+    overlapping projects cannot deadlock.
+    """
+    project_ids = sorted(set(project_ids))
+    create_missing = pg_insert(ProjectApplicationStats).from_select(
+        ["project_id"],
+        select(Project.project_id).where(Project.project_id.in_(project_ids)).order_by(Project.project_id)
+    ).on_conflict_do_nothing(index_elements=[ProjectApplicationStats.project_id])
+    lock = (
+        select(ProjectApplicationStats.project_id)
+        .where(ProjectApplicationStats.project_id.in_(project_ids))
+        .order_by(ProjectApplicationStats.project_id)
+        .with_for_update()
+    )
+    return [create_missing, lock]
+
+
+def _recount_statements(project_ids: Iterable[int]) -> List:
+    project_ids = sorted(set(project_ids))
+    return lock_project_stats_statements(project_ids) + [recount_project_stats_statement(project_ids)]
+
+
+async def recount_project_stats(db: AsyncSession, project_ids: Iterable[int]) -> None:
+    """Recount after a statement that bypassed the ORM (raw DELETE FROM applications)"""
+    project_ids = set(project_ids)
+    if not settings.PROJECT_STATS_COUNTERS_ENABLED or not project_ids:
+        return
+    for statement in _recount_statements(project_ids):
+        await db.execute(statement)
+
+
+async def init_project_stats(db: AsyncSession) -> int:
+    """
+    Recount every project's counters (startup, when the counters are enabled)
+
+    Returns the number of projects recounted.
+    """
+    result = await db.execute(select(Project.project_id))
+    project_ids = list(result.scalars().all())
+    await recount_project_stats(db, project_ids)
+    return len(project_ids)
+
+
+def mark_project_stats_dirty(session: Session, project_id: int) -> None:
+    """Schedule a counter recount for a project at the end of the current flush"""
+    if project_id is not None and settings.PROJECT_STATS_COUNTERS_ENABLED:
+        session.info.setdefault(DIRTY_PROJECT_STATS_KEY, set()).add(project_id)
+
+
+def _application_added_or_removed(mapper, connection, target):
+    mark_project_stats_dirty(inspect(target).session, target.project_id)
+
+
+def _application_updated(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[column].history.has_changes() for column in _COUNTED_COLUMNS):
+        return
+    mark_project_stats_dirty(state.session, target.project_id)
+    # 과제 이동 시 이전 과제도 재집계
+    for old_project_id in state.attrs.project_id.history.deleted or ():
+        mark_project_stats_dirty(state.session, old_project_id)
+
+
+def _recount_dirty_project_stats(session, flush_context):
+    project_ids = session.info.pop(DIRTY_PROJECT_STATS_KEY, None)
+    if not project_ids or not settings.PROJECT_STATS_COUNTERS_ENABLED:
+        return
+    # session.execute() would try to autoflush; run on the flush's connection instead
+    connection = session.connection()
+    for statement in _recount_statements(project_ids):
+        connection.execute(statement)
+
+
+_LISTENERS = (
+    (Application, "after_insert", _application_added_or_removed),
+    (Application, "after_delete", _application_added_or_removed),
+    (Application, "after_update", _application_updated),
+    (Session, "after_flush", _recount_dirty_project_stats),
+)
+
+
+def register_listeners() -> None:
+    """Maintain the counters from ORM flushes (idempotent; called by app.models)"""
+    for target, identifier, listener in _LISTENERS:
+        if not event.contains(target, identifier, listener):
+            event.listen(target, identifier, listener)
@@ -0,0 +1,279 @@
+"""
+Proof export service - streaming ZIP of a project's submitted proof files
+
+The archive is produced while it is being sent: entries are written with
+zipfile onto a write-only sink that is drained after every chunk, so neither
+memory nor disk ever holds the whole ZIP. Entries are stored uncompressed
+(proofs are PDFs and images, already compressed).
+
+Objects are fetched by up to PROOF_EXPORT_CONCURRENCY tasks (the one being
+written included), each buffering at most PREFETCH_CHUNKS chunks, so memory
+stays bounded by concurrency x chunks x chunk size regardless of file or
+project size.
+
+Applicants are exported in application_id order under "<application_id>_<name>/"
+folders, so an interrupted export can be resumed with from_application_id set
+to the last (possibly incomplete) folder received. A manifest.csv closes the
+archive with the status of every file.
+"""
+import asyncio
+import csv
+import io
+import re
+import zipfile
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.database import AsyncSessionLocal
+from app.models.application import Application, ApplicationData, ApplicationStatus
+from app.models.competency import CompetencyItem
+from app.models.file import File
+from app.models.user import User
+from app.services.storage import StorageDriver, StorageObjectNotFound
+
+# Entry rows loaded per query
+ENTRY_BATCH_SIZE = 500
+# Chunks buffered per prefetching file
+PREFETCH_CHUNKS = 8
+
+MANIFEST_NAME = "manifest.csv"
+
+_UNSAFE_PATH_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+
+
+@dataclass(frozen=True)
+class ProofEntry:
+    """One submitted proof file and where it goes in the archive"""
+    application_id: int
+    data_id: int
+    applicant_name: str
+    item_name: str
+    file_id: int
+    file_path: str
+    original_filename: str
+    uploaded_at: Optional[datetime]
+
+    @property
+    def archive_path(self) -> str:
+        applicant = _safe_name(f"{self.application_id}_{self.applicant_name}")
+        return f"{applicant}/{_safe_name(self.item_name)}/{_safe_name(self.original_filename)}"
+
+
+def _safe_name(value: Optional[str], max_length: int = 120) -> str:
+    """Path component without separators or characters archivers reject"""
+    cleaned = _UNSAFE_PATH_CHARS.sub("_", value or "").strip(" .")
+    return cleaned[:max_length] or "file"
+
+
+class _ZipSink:
+    """Write-only file object collecting zipfile output until drained"""
+
+    def __init__(self):
+        self._buffer: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._buffer.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class _ArchiveNames:
+    """Makes archive paths unique ("a.pdf", "a (2).pdf", ...)"""
+
+    def __init__(self):
+        self._used: Dict[str, int] = {}
+
+    def unique(self, path: str) -> str:
+        count = self._used.get(path, 0) + 1
+        self._used[path] = count
+        if count == 1:
+            return path
+        stem, dot, ext = path.rpartition(".")
+        if not dot or "/" in ext:
+            return f"{path} ({count})"
+        return f"{stem} ({count}).{ext}"
+
+
+async def iter_proof_entries(
+    project_id: int,
+    from_application_id: Optional[int] = None,
+    to_application_id: Optional[int] = None,
+    session_factory: async_sessionmaker = AsyncSessionLocal
+) -> AsyncIterator[ProofEntry]:
+    """
+    Submitted proof files of a project in (application_id, data_id) order
+
+    Only submitted (non-draft) applications; keyset batches with a short
+    session each, so a long export does not hold a transaction open.
+    """
+    last: Optional[Tuple[int, int]] = None
+    while True:
+        query = (
+            select(
+                ApplicationData.application_id,
+                ApplicationData.data_id,
+                User.name.label("applicant_name"),
+                CompetencyItem.item_name,
+                File.file_id,
+                File.file_path,
+                File.original_filename,
+                File.uploaded_at,
+            )
+            .join(Application, Application.application_id == ApplicationData.application_id)
+            .join(User, User.user_id == Application.user_id)
+            .join(CompetencyItem, CompetencyItem.item_id == ApplicationData.item_id)
+            .join(File, File.file_id == ApplicationData.submitted_file_id)
+            .where(
+                Application.project_id == project_id,
+                Application.status != ApplicationStatus.DRAFT,
+            )
+            .order_by(ApplicationData.application_id, ApplicationData.data_id)
+            .limit(ENTRY_BATCH_SIZE)
+        )
+        if from_application_id is not None:
+            query = query.where(ApplicationData.application_id >= from_application_id)
+        if to_application_id is not None:
+            query = query.where(ApplicationData.application_id <= to_application_id)
+        if last is not None:
+            query = query.where(or_(
+                ApplicationData.application_id > last[0],
+                and_(ApplicationData.application_id == last[0], ApplicationData.data_id > last[1])
+            ))
+        async with session_factory() as db:
+            rows = (await db.execute(query)).all()
+        for row in rows:
+            yield ProofEntry(
+                application_id=row.application_id,
+                data_id=row.data_id,
+                applicant_name=row.applicant_name,
+                item_name=row.item_name,
+                file_id=row.file_id,
+                file_path=row.file_path,
+                original_filename=row.original_filename,
+                uploaded_at=row.uploaded_at,
+            )
+        if len(rows) < ENTRY_BATCH_SIZE:
+            return
+        last = (rows[-1].application_id, rows[-1].data_id)
+
+
+async def _prefetch(storage: StorageDriver, key: str, queue: asyncio.Queue) -> None:
+    # Queue items: bytes chunks, then None (end) or the exception that stopped it
+    try:
+        async for chunk in storage.iter_object(key):
+            await queue.put(chunk)
+        await queue.put(None)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        await queue.put(e)
+
+
+def _zip_info(path: str, entry: ProofEntry) -> zipfile.ZipInfo:
+    moment = entry.uploaded_at or datetime.now()
+    if moment.year < 1980:  # ZIP timestamps start in 1980
+        moment = datetime(1980, 1, 1)
+    info = zipfile.ZipInfo(path, date_time=moment.timetuple()[:6])
+    info.compress_type = zipfile.ZIP_STORED
+    return info
+
+
+async def stream_proof_zip(
+    entries: AsyncIterator[ProofEntry],
+    storage: StorageDriver,
+    concurrency: int
+) -> AsyncIterator[bytes]:
+    """
+    ZIP archive bytes of `entries`, produced incrementally
+
+    Objects that cannot be read are skipped and reported in manifest.csv:
+    status "missing" when storage has no such object, "error" for other
+    failures (timeouts, server errors). An object failing mid-transfer is
+    kept truncated and reported as "incomplete".
+    """
+    concurrency = max(1, concurrency)
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED, allowZip64=True)
+    names = _ArchiveNames()
+    window: Deque[Tuple[ProofEntry, asyncio.Queue, asyncio.Task]] = deque()
+    manifest: List[Tuple] = []
+    source = entries.__aiter__()
+    exhausted = False
+
+    async def fill_window() -> None:
+        # window[0] is the entry being written: it counts against the limit
+        nonlocal exhausted
+        while not exhausted and len(window) < concurrency:
+            entry = await anext(source, None)
+            if entry is None:
+                exhausted = True
+                return
+            queue: asyncio.Queue = asyncio.Queue(maxsize=PREFETCH_CHUNKS)
+            window.append((entry, queue, asyncio.create_task(_prefetch(storage, entry.file_path, queue))))
+
+    try:
+        while True:
+            await fill_window()
+            if not window:
+                break
+            entry, queue, _ = window[0]
+            path = names.unique(entry.archive_path)
+
+            chunk = await queue.get()
+            if isinstance(chunk, Exception):
+                window.popleft()
+                status = "missing" if isinstance(chunk, StorageObjectNotFound) else "error"
+                if status == "error":
+                    print(f"[PROOF EXPORT] Failed to read {entry.file_path}: {type(chunk).__name__}: {chunk}")
+                manifest.append((entry.application_id, entry.applicant_name, entry.item_name, entry.file_id, path, status))
+                continue
+
+            status = "ok"
+            with archive.open(_zip_info(path, entry), mode="w") as dest:
+                while chunk is not None:
+                    if isinstance(chunk, Exception):
+                        status = "incomplete"
+                        break
+                    dest.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+                    # Keep the other fetches running while this one is written
+                    await fill_window()
+                    chunk = await queue.get()
+            window.popleft()
+            manifest.append((entry.application_id, entry.applicant_name, entry.item_name, entry.file_id, path, status))
+            data = sink.drain()
+            if data:
+                yield data
+
+        manifest_csv = io.StringIO()
+        writer = csv.writer(manifest_csv)
+        writer.writerow(["application_id", "applicant", "item", "file_id", "path", "status"])
+        writer.writerows(manifest)
+        # BOM so spreadsheet apps read the Korean names as UTF-8
+        archive.writestr(MANIFEST_NAME, "\ufeff" + manifest_csv.getvalue())
+        archive.close()
+        data = sink.drain()
+        if data:
+            yield data
+    finally:
+        for _, _, task in window:
+            task.cancel()
@@ -0,0 +1,546 @@
+"""
+Compiled scoring rules for automatic score calculation
+
+ScoringCriteria rows are stored as loosely structured text (GRADE configs are
+JSON strings, extract patterns are raw regexes). Parsing them for every
+application item made project rescoring CPU bound, so the rules of a project
+are compiled once into immutable lookup structures and cached per project.
+"""
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Optional, List, Dict, Any, Callable, Iterable, Tuple
+import logging
+import json
+import re
+
+from sqlalchemy import event
+
+from app.models.competency import ProjectItem, ScoringCriteria, MatchingType, ValueSourceType, AggregationMode
+
+logger = logging.getLogger(__name__)
+
+NUMBER_PATTERN = re.compile(r'[\d.]+')
+
+# 캐시할 최대 과제 수 (LRU)
+PROJECT_RULES_CACHE_SIZE = 64
+
+_ZERO = Decimal('0')
+
+
+def _to_decimal(value: Any) -> Decimal:
+    """Convert a JSON score value to Decimal, treating malformed values as 0"""
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError, TypeError):
+        logger.warning(f"Invalid score value in scoring config: {value!r}")
+        return _ZERO
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+@dataclass(frozen=True)
+class GradeTable:
+    """Pre-parsed GRADE config (the JSON stored in ScoringCriteria.expected_value)"""
+    grade_type: str
+    proof_penalty: Decimal
+    # file_exists
+    exists_score: Decimal = _ZERO
+    none_score: Decimal = _ZERO
+    # multi_select
+    multi_mode: str = "contains"
+    contains_grades: Tuple[Tuple[str, Decimal], ...] = ()
+    count_grades: Tuple[Tuple[Any, Decimal], ...] = ()  # sorted by min desc
+    # numeric
+    numeric_grades: Tuple[Tuple[Any, Any, Decimal], ...] = ()  # original order
+    range_mins: Tuple[float, ...] = ()  # sorted, non-overlapping ranges for bisect
+    range_maxs: Tuple[float, ...] = ()
+    range_scores: Tuple[Decimal, ...] = ()
+    use_bisect: bool = False
+    # string
+    match_mode: str = "exact"
+    string_grades: Tuple[Tuple[str, Decimal], ...] = ()  # (lowercased value, score)
+    exact_lookup: Dict[str, Decimal] = field(default_factory=dict)
+
+    def _apply_penalty(self, score: Decimal, submitted_file_id: Optional[int]) -> Decimal:
+        # 증빙 감점 적용 (음수이므로 더하면 감점)
+        if self.proof_penalty and not submitted_file_id:
+            score += self.proof_penalty
+        return score
+
+    def _match_string(self, val_lower: str) -> Optional[Decimal]:
+        """Return the score of the first grade matching a lowercased value"""
+        if self.match_mode == "contains":
+            for grade_value, score in self.string_grades:
+                if grade_value in val_lower:
+                    return score
+            return None
+        if self.match_mode == "any":
+            if val_lower and self.string_grades:
+                return self.string_grades[0][1]
+            return None
+        return self.exact_lookup.get(val_lower)
+
+    def _match_numeric(self, num_value: float) -> Decimal:
+        if self.use_bisect:
+            idx = bisect_right(self.range_mins, num_value) - 1
+            if idx >= 0 and num_value <= self.range_maxs[idx]:
+                return self.range_scores[idx]
+            return _ZERO
+        for min_val, max_val, score in self.numeric_grades:
+            if min_val <= num_value <= max_val:
+                return score
+        return _ZERO
+
+    def match(
+        self,
+        extracted_value: str,
+        submitted_file_id: Optional[int] = None,
+        submitted_value: Optional[str] = None,
+        aggregation_mode: Optional[AggregationMode] = None
+    ) -> Optional[Decimal]:
+        """
+        Match a value against this grade table
+
+        Args:
+            extracted_value: The extracted value to match
+            submitted_file_id: File ID if a file was submitted (for proof_penalty)
+            submitted_value: Raw submitted value (for multi_select JSON parsing)
+            aggregation_mode: How to handle multiple values (ANY_MATCH, BEST_MATCH, etc.)
+
+        Returns:
+            Score for matching grade, or None if no match
+        """
+        aggregation_mode = aggregation_mode or AggregationMode.FIRST
+
+        if self.grade_type == "file_exists":
+            # 파일 유무 점수
+            return self.exists_score if submitted_file_id else self.none_score
+
+        if self.grade_type == "multi_select":
+            # 복수선택 점수
+            try:
+                selected_values = json.loads(submitted_value) if submitted_value else []
+            except json.JSONDecodeError:
+                selected_values = []
+
+            base_score = _ZERO
+            if self.multi_mode == "contains":
+                # 특정값 포함 여부 (각각 가산)
+                for grade_value, score in self.contains_grades:
+                    if grade_value in selected_values:
+                        base_score += score
+            else:
+                # 선택 개수
+                count = len(selected_values)
+                for min_count, score in self.count_grades:
+                    if count >= min_count:
+                        base_score = score
+                        break
+            return base_score
+
+        if self.grade_type == "numeric":
+            if not extracted_value:
+                return None
+            try:
+                number = NUMBER_PATTERN.search(str(extracted_value))
+                if not number:
+                    return None
+                base_score = self._match_numeric(float(number.group()))
+            except (ValueError, TypeError) as e:
+                logger.debug(f"Numeric grade matching failed: {e}")
+                return None
+            return max(self._apply_penalty(base_score, submitted_file_id), _ZERO)  # 0점 미만 방지
+
+        # string matching
+        if not extracted_value:
+            return None
+
+        if aggregation_mode in (AggregationMode.ANY_MATCH, AggregationMode.BEST_MATCH):
+            # extracted_value is a JSON array of values from repeatable entries
+            try:
+                values_to_check = json.loads(extracted_value)
+                if not isinstance(values_to_check, list):
+                    values_to_check = [extracted_value]
+            except json.JSONDecodeError:
+                values_to_check = [extracted_value]
+
+            best_score = None
+            for val in values_to_check:
+                score = self._match_string(str(val).strip().lower())
+                if score is None:
+                    continue
+                if aggregation_mode == AggregationMode.ANY_MATCH:
+                    # 하나라도 매칭되면 해당 점수 반환
+                    return max(self._apply_penalty(score, submitted_file_id), _ZERO)
+                if best_score is None or score > best_score:
+                    best_score = score
+
+            if best_score is not None:
+                return max(self._apply_penalty(best_score, submitted_file_id), _ZERO)
+            return None
+
+        # 기본 처리 (FIRST 모드 또는 단일 값)
+        extracted_str = str(extracted_value).strip()
+        if self.match_mode == "any":
+            # "어떤 값이든" - 내용이 있으면 첫 번째 등급 점수 반환
+            if not extracted_str:
+                return _ZERO
+            base_score = self.string_grades[0][1] if self.string_grades else _ZERO
+        else:
+            base_score = self._match_string(extracted_str.lower())
+            if base_score is None:
+                return None
+
+        return max(self._apply_penalty(base_score, submitted_file_id), _ZERO)
+
+
+def compile_grade_table(expected_value: str) -> Optional[GradeTable]:
+    """
+    Parse a GRADE config JSON into a GradeTable
+
+    Returns:
+        Compiled table, or None if the config is not valid JSON
+    """
+    try:
+        config = json.loads(expected_value)
+    except (json.JSONDecodeError, TypeError):
+        logger.error(f"Invalid GRADE config JSON: {expected_value}")
+        return None
+    if not isinstance(config, dict):
+        logger.error(f"Invalid GRADE config JSON: {expected_value}")
+        return None
+
+    grade_type = config.get("type", "string")
+    grades = config.get("grades", [])
+    proof_penalty = _to_decimal(config.get("proofPenalty", 0) or 0)
+
+    if grade_type == "file_exists":
+        grades = grades if isinstance(grades, dict) else {}
+        return GradeTable(
+            grade_type=grade_type,
+            proof_penalty=proof_penalty,
+            exists_score=_to_decimal(grades.get("exists", 0)),
+            none_score=_to_decimal(grades.get("none", 0)),
+        )
+
+    grades = [g for g in grades if isinstance(g, dict)] if isinstance(grades, list) else []
+
+    if grade_type == "multi_select":
+        return GradeTable(
+            grade_type=grade_type,
+            proof_penalty=proof_penalty,
+            multi_mode=config.get("mode", "contains"),
+            contains_grades=tuple(
+                (str(g.get("value", "")), _to_decimal(g.get("score", 0))) for g in grades
+            ),
+            count_grades=tuple(
+                (g.get("min", 0), _to_decimal(g.get("score", 0)))
+                for g in sorted(grades, key=lambda x: x.get("min", 0), reverse=True)
+            ),
+        )
+
+    if grade_type == "numeric":
+        numeric_grades = tuple(
+            (g.get("min", float("-inf")), g.get("max", float("inf")), _to_decimal(g.get("score", 0)))
+            for g in grades
+        )
+        # Ranges are matched first-wins in config order. Bisect gives the same
+        # answer only when every bound is numeric and no two ranges overlap.
+        use_bisect = False
+        ranges: List[Tuple[Any, Any, Decimal]] = []
+        if all(_is_number(lo) and _is_number(hi) for lo, hi, _ in numeric_grades):
+            ranges = sorted(numeric_grades, key=lambda r: r[0])
+            use_bisect = all(ranges[i][1] < ranges[i + 1][0] for i in range(len(ranges) - 1))
+        return GradeTable(
+            grade_type=grade_type,
+            proof_penalty=proof_penalty,
+            numeric_grades=numeric_grades,
+            range_mins=tuple(float(r[0]) for r in ranges) if use_bisect else (),
+            range_maxs=tuple(float(r[1]) for r in ranges) if use_bisect else (),
+            range_scores=tuple(r[2] for r in ranges) if use_bisect else (),
+            use_bisect=use_bisect,
+        )
+
+    string_grades = tuple(
+        (str(g.get("value", "")).strip().lower(), _to_decimal(g.get("score", 0))) for g in grades
+    )
+    exact_lookup: Dict[str, Decimal] = {}
+    for grade_value, score in string_grades:
+        exact_lookup.setdefault(grade_value, score)  # 첫 번째 등급 우선
+    return GradeTable(
+        grade_type=grade_type,
+        proof_penalty=proof_penalty,
+        match_mode=config.get("matchMode", "exact"),
+        string_grades=string_grades,
+        exact_lookup=exact_lookup,
+    )
+
+
+def compile_legacy_matcher(expected_value: str, matching_type: MatchingType) -> Callable[[str], bool]:
+    """
+    Build a predicate for the legacy matching types (EXACT, CONTAINS, RANGE)
+
+    Behaves like scoring_service.match_value with expected_value fixed.
+    """
+    expected_str = str(expected_value).strip().lower()
+
+    def _never(submitted_value: str) -> bool:
+        return False
+
+    if matching_type == MatchingType.EXACT:
+        return lambda submitted_value: bool(submitted_value) and \
+            str(submitted_value).strip().lower() == expected_str
+
+    if matching_type == MatchingType.CONTAINS:
+        return lambda submitted_value: bool(submitted_value) and \
+            expected_str in str(submitted_value).strip().lower()
+
+    if matching_type != MatchingType.RANGE:
+        return _never
+
+    # Parse range format: "min-max" or ">=min" or "<=max"
+    try:
+        if '-' in expected_str and not expected_str.startswith('-'):
+            parts = expected_str.split('-')
+            if len(parts) != 2:
+                return _never
+            min_val, max_val = float(parts[0]), float(parts[1])
+            in_range = lambda num: min_val <= num <= max_val
+        elif expected_str.startswith('>='):
+            bound = float(expected_str[2:])
+            in_range = lambda num: num >= bound
+        elif expected_str.startswith('<='):
+            bound = float(expected_str[2:])
+            in_range = lambda num: num <= bound
+        elif expected_str.startswith('>'):
+            bound = float(expected_str[1:])
+            in_range = lambda num: num > bound
+        elif expected_str.startswith('<'):
+            bound = float(expected_str[1:])
+            in_range = lambda num: num < bound
+        else:
+            # Single number - exact match
+            bound = float(expected_str)
+            in_range = lambda num: num == bound
+    except (ValueError, TypeError):
+        return _never
+
+    def _range_matcher(submitted_value: str) -> bool:
+        if not submitted_value:
+            return False
+        number = NUMBER_PATTERN.search(str(submitted_value).strip().lower())
+        if not number:
+            return False
+        try:
+            return in_range(float(number.group()))
+        except ValueError:
+            return False
+
+    return _range_matcher
+
+
+@dataclass(frozen=True)
+class CompiledCriteria:
+    """Immutable, pre-parsed form of a ScoringCriteria row"""
+    criteria_id: Optional[int]
+    matching_type: MatchingType
+    score: Decimal
+    value_source: ValueSourceType
+    aggregation_mode: AggregationMode
+    source_field: str
+    extract_regex: Optional["re.Pattern"]
+    grade_table: Optional[GradeTable]
+    legacy_matcher: Optional[Callable[[str], bool]]
+
+
+def compile_criteria(criteria: ScoringCriteria) -> CompiledCriteria:
+    """Compile a single ScoringCriteria row"""
+    extract_regex = None
+    if criteria.extract_pattern:
+        try:
+            extract_regex = re.compile(criteria.extract_pattern)
+        except re.error as e:
+            logger.error(f"Invalid regex pattern '{criteria.extract_pattern}': {e}")
+
+    is_grade = criteria.matching_type == MatchingType.GRADE
+    return CompiledCriteria(
+        criteria_id=criteria.criteria_id,
+        matching_type=criteria.matching_type,
+        score=_to_decimal(criteria.score if criteria.score is not None else 0),
+        value_source=criteria.value_source or ValueSourceType.SUBMITTED,
+        aggregation_mode=criteria.aggregation_mode or AggregationMode.FIRST,
+        source_field=criteria.source_field or "",
+        extract_regex=extract_regex,
+        grade_table=compile_grade_table(criteria.expected_value) if is_grade else None,
+        legacy_matcher=None if is_grade else compile_legacy_matcher(criteria.expected_value, criteria.matching_type),
+    )
+
+
+def ensure_compiled(scoring_criteria: Iterable[Any]) -> List[CompiledCriteria]:
+    """Accept either ScoringCriteria rows or already compiled criteria"""
+    return [
+        c if isinstance(c, CompiledCriteria) else compile_criteria(c)
+        for c in scoring_criteria
+    ]
+
+
+@dataclass(frozen=True)
+class CompiledItem:
+    """Scoring rules of one ProjectItem"""
+    project_item_id: int
+    item_id: int
+    max_score: Optional[Decimal]
+    criteria: Tuple[CompiledCriteria, ...]
+
+
+@dataclass(frozen=True)
+class CompiledProjectRules:
+    """All scoring rules of a project, keyed by competency item_id"""
+    project_id: int
+    fingerprint: Tuple
+    items: Dict[int, CompiledItem]
+
+    @property
+    def needs_user(self) -> bool:
+        """Whether any criteria reads a User field (USER_FIELD value source)"""
+        return any(
+            c.value_source == ValueSourceType.USER_FIELD
+            for item in self.items.values()
+            for c in item.criteria
+        )
+
+
+def _rules_fingerprint(project_items: Iterable[ProjectItem]) -> Tuple:
+    """Cheap structural identity of a project's scoring configuration"""
+    return tuple(sorted(
+        (
+            pi.project_item_id,
+            pi.item_id,
+            str(pi.max_score),
+            tuple(sorted(
+                (
+                    c.criteria_id or 0,
+                    str(c.matching_type),
+                    c.expected_value,
+                    str(c.score),
+                    str(c.value_source),
+                    c.source_field,
+                    c.extract_pattern,
+                    str(c.aggregation_mode),
+                )
+                for c in (pi.scoring_criteria or [])
+            )),
+        )
+        for pi in project_items
+    ))
+
+
+def compile_project_rules(project_id: int, project_items: Iterable[ProjectItem]) -> CompiledProjectRules:
+    """Compile all scoring criteria of a project (project_items must have scoring_criteria loaded)"""
+    project_items = list(project_items)
+    items: Dict[int, CompiledItem] = {}
+    for pi in project_items:
+        if not pi.scoring_criteria:
+            continue
+        items[pi.item_id] = CompiledItem(
+            project_item_id=pi.project_item_id,
+            item_id=pi.item_id,
+            max_score=pi.max_score,
+            criteria=tuple(compile_criteria(c) for c in pi.scoring_criteria),
+        )
+    return CompiledProjectRules(
+        project_id=project_id,
+        fingerprint=_rules_fingerprint(project_items),
+        items=items,
+    )
+
+
+def compile_custom_question_rules(scoring_rules: Optional[str]) -> Tuple[Tuple[Callable[[str], bool], Decimal], ...]:
+    """
+    Compile CustomQuestion.scoring_rules ([{"expected_value": ..., "score": ...}, ...])
+
+    Returns:
+        (matcher, score) pairs in rule order; empty if the rules are missing or malformed
+    """
+    if not scoring_rules:
+        return ()
+    try:
+        rules = json.loads(scoring_rules)
+    except (json.JSONDecodeError, TypeError):
+        return ()
+    if not isinstance(rules, list):
+        return ()
+    return tuple(
+        (
+            compile_legacy_matcher(rule.get('expected_value', ''), MatchingType.EXACT),
+            _to_decimal(rule.get('score', 0)),
+        )
+        for rule in rules if isinstance(rule, dict)
+    )
+
+
+def score_custom_question_answer(
+    compiled_rules: Tuple[Tuple[Callable[[str], bool], Decimal], ...],
+    answer_text: Optional[str]
+) -> Decimal:
+    """Score of the first rule matching the answer exactly, or 0"""
+    for matcher, score in compiled_rules:
+        if matcher(answer_text or ''):
+            return score
+    return _ZERO
+
+
+# ============================================================================
+# Per-project cache
+# ============================================================================
+
+_project_rules_cache: "OrderedDict[int, CompiledProjectRules]" = OrderedDict()
+
+
+def get_project_rules(project_id: int, project_items: Iterable[ProjectItem]) -> CompiledProjectRules:
+    """
+    Return compiled rules for a project, reusing the cached copy when the
+    loaded ProjectItem/ScoringCriteria rows still match it
+
+    The fingerprint comparison keeps the cache correct across worker processes,
+    where the invalidation hooks below cannot reach.
+    """
+    project_items = list(project_items)
+    cached = _project_rules_cache.get(project_id)
+    if cached is not None and cached.fingerprint == _rules_fingerprint(project_items):
+        _project_rules_cache.move_to_end(project_id)
+        return cached
+
+    rules = compile_project_rules(project_id, project_items)
+    _project_rules_cache[project_id] = rules
+    _project_rules_cache.move_to_end(project_id)
+    while len(_project_rules_cache) > PROJECT_RULES_CACHE_SIZE:
+        _project_rules_cache.popitem(last=False)
+    return rules
+
+
+def invalidate_project_rules(project_id: Optional[int] = None) -> None:
+    """Drop cached rules for one project, or for all projects if project_id is None"""
+    if project_id is None:
+        _project_rules_cache.clear()
+    else:
+        _project_rules_cache.pop(project_id, None)
+
+
+@event.listens_for(ProjectItem, "after_insert")
+@event.listens_for(ProjectItem, "after_update")
+@event.listens_for(ProjectItem, "after_delete")
+def _on_project_item_change(mapper, connection, target):
+    invalidate_project_rules(target.project_id)
+
+
+@event.listens_for(ScoringCriteria, "after_insert")
+@event.listens_for(ScoringCriteria, "after_update")
+@event.listens_for(ScoringCriteria, "after_delete")
+def _on_scoring_criteria_change(mapper, connection, target):
+    # project_id is not on the row itself; resolving it would need a lazy load
+    invalidate_project_rules()
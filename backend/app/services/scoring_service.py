@@ -1,15 +1,18 @@
 """
 Scoring service for automatic score calculation
 """
+from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Set, Union
 import logging
 import json
 import re
+import time
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, values, column
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.application import Application, ApplicationData
 from app.models.competency import ProjectItem, ScoringCriteria, MatchingType, ValueSourceType, AggregationMode
@@ -17,13 +20,34 @@ from app.models.project import Project
 from app.models.reviewer_evaluation import ReviewerEvaluation
 from app.models.custom_question import CustomQuestion, CustomQuestionAnswer
 from app.models.user import User
+from app.services.scoring_rules import (
+    CompiledCriteria,
+    CompiledProjectRules,
+    compile_criteria,
+    compile_custom_question_rules,
+    compile_grade_table,
+    ensure_compiled,
+    get_project_rules,
+    score_custom_question_answer,
+)
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming ApplicationData for bulk rescoring
+SCORE_STREAM_CHUNK_SIZE = 1000
+# Rows per UPDATE ... FROM (VALUES ...) statement
+SCORE_WRITE_CHUNK_SIZE = 1000
+# Session.info key holding (application_id, item_id) pairs awaiting rescoring
+DIRTY_SCORES_KEY = "dirty_score_items"
+# Session.info key mapping (application_id, question_id) to the answer text before the change
+DIRTY_ANSWERS_KEY = "dirty_score_answers"
+# Session.info key holding application_ids awaiting a full calculation
+DIRTY_APPLICATIONS_KEY = "dirty_score_applications"
+
 
 def extract_value_for_scoring(
     submitted_value: str,
-    criteria: ScoringCriteria,
+    criteria: Union[ScoringCriteria, CompiledCriteria],
     user: Optional[User] = None
 ) -> str:
     """
@@ -31,36 +55,34 @@ def extract_value_for_scoring(
 
     Args:
         submitted_value: The submitted value from ApplicationData
-        criteria: ScoringCriteria with value_source and aggregation_mode settings
+        criteria: ScoringCriteria (or its compiled form) with value_source and aggregation_mode settings
         user: User object (required for USER_FIELD source)
 
     Returns:
         Extracted value string for matching (may be aggregated for repeatable items)
     """
-    value_source = criteria.value_source or ValueSourceType.SUBMITTED
-    aggregation_mode = criteria.aggregation_mode or AggregationMode.FIRST
+    if not isinstance(criteria, CompiledCriteria):
+        criteria = compile_criteria(criteria)
+    value_source = criteria.value_source
+    aggregation_mode = criteria.aggregation_mode
 
     if value_source == ValueSourceType.USER_FIELD:
         # Extract from User table field
         if not user:
             logger.warning(f"User not provided for USER_FIELD criteria {criteria.criteria_id}")
             return ""
-        source_field = criteria.source_field or ""
-        raw_value = getattr(user, source_field, "") or ""
+        raw_value = getattr(user, criteria.source_field, "") or ""
 
         # Apply extract pattern if specified (e.g., "^(.{3})" to get first 3 chars)
-        if criteria.extract_pattern and raw_value:
-            try:
-                match = re.match(criteria.extract_pattern, str(raw_value))
-                if match and match.groups():
-                    return match.group(1)
-            except re.error as e:
-                logger.error(f"Invalid regex pattern '{criteria.extract_pattern}': {e}")
+        if criteria.extract_regex is not None and raw_value:
+            match = criteria.extract_regex.match(str(raw_value))
+            if match and match.groups():
+                return match.group(1)
         return str(raw_value)
 
     elif value_source == ValueSourceType.JSON_FIELD:
         # Extract from submitted_value JSON
-        source_field = criteria.source_field or ""
+        source_field = criteria.source_field
         if not submitted_value:
             return ""
         try:
@@ -151,6 +173,9 @@ def match_grade_value(
     """
     Match grade value and return score
 
+    Parses the GRADE config on every call; scoring runs use the compiled
+    GradeTable from scoring_rules instead.
+
     Args:
         extracted_value: The extracted value to match
         expected_value: JSON config with grade definitions
@@ -161,176 +186,15 @@ def match_grade_value(
     Returns:
         Score for matching grade, or None if no match
     """
-    try:
-        config = json.loads(expected_value)
-    except json.JSONDecodeError:
-        logger.error(f"Invalid GRADE config JSON: {expected_value}")
+    grade_table = compile_grade_table(expected_value)
+    if grade_table is None:
         return None
-
-    grade_type = config.get("type", "string")
-    grades = config.get("grades", [])
-    proof_penalty = config.get("proofPenalty", 0)
-
-    base_score = Decimal('0')
-    aggregation_mode = aggregation_mode or AggregationMode.FIRST
-
-    if grade_type == "file_exists":
-        # 파일 유무 점수
-        if submitted_file_id:
-            return Decimal(str(grades.get("exists", 0)))
-        else:
-            return Decimal(str(grades.get("none", 0)))
-
-    elif grade_type == "multi_select":
-        # 복수선택 점수
-        mode = config.get("mode", "contains")
-        try:
-            selected_values = json.loads(submitted_value) if submitted_value else []
-        except json.JSONDecodeError:
-            selected_values = []
-
-        if mode == "contains":
-            # 특정값 포함 여부 (각각 가산)
-            for grade in grades:
-                grade_value = str(grade.get("value", ""))
-                if grade_value in selected_values:
-                    base_score += Decimal(str(grade.get("score", 0)))
-        else:
-            # 선택 개수
-            count = len(selected_values)
-            sorted_grades = sorted(grades, key=lambda x: x.get("min", 0), reverse=True)
-            for grade in sorted_grades:
-                if count >= grade.get("min", 0):
-                    base_score = Decimal(str(grade.get("score", 0)))
-                    break
-
-        return base_score
-
-    elif grade_type == "numeric":
-        # Numeric range matching
-        if not extracted_value:
-            return None
-        try:
-            # Extract number from value
-            numbers = re.findall(r'[\d.]+', str(extracted_value))
-            if not numbers:
-                return None
-            num_value = float(numbers[0])
-
-            for grade in grades:
-                min_val = grade.get("min", float("-inf"))
-                max_val = grade.get("max", float("inf"))
-                if min_val <= num_value <= max_val:
-                    base_score = Decimal(str(grade.get("score", 0)))
-                    break
-        except (ValueError, TypeError) as e:
-            logger.debug(f"Numeric grade matching failed: {e}")
-            return None
-
-        # 증빙 감점 적용
-        if proof_penalty and not submitted_file_id:
-            base_score += Decimal(str(proof_penalty))  # 음수이므로 더하면 감점
-
-        return max(base_score, Decimal('0'))  # 0점 미만 방지
-
-    else:  # string matching
-        if not extracted_value:
-            return None
-        match_mode = config.get("matchMode", "exact")
-
-        # Handle ANY_MATCH and BEST_MATCH aggregation modes
-        if aggregation_mode in (AggregationMode.ANY_MATCH, AggregationMode.BEST_MATCH):
-            # extracted_value is a JSON array of values from repeatable entries
-            try:
-                values_to_check = json.loads(extracted_value)
-                if not isinstance(values_to_check, list):
-                    values_to_check = [extracted_value]
-            except json.JSONDecodeError:
-                values_to_check = [extracted_value]
-
-            if aggregation_mode == AggregationMode.ANY_MATCH:
-                # 하나라도 매칭되면 해당 점수 반환
-                for val in values_to_check:
-                    val_lower = str(val).strip().lower()
-                    for grade in grades:
-                        grade_value = str(grade.get("value", "")).strip().lower()
-                        matched = False
-                        if match_mode == "contains":
-                            matched = grade_value in val_lower
-                        elif match_mode == "any":
-                            matched = bool(val_lower)
-                        else:  # exact
-                            matched = grade_value == val_lower
-                        if matched:
-                            base_score = Decimal(str(grade.get("score", 0)))
-                            # 증빙 감점 적용
-                            if proof_penalty and not submitted_file_id:
-                                base_score += Decimal(str(proof_penalty))
-                            return max(base_score, Decimal('0'))
-                return None  # 아무것도 매칭 안됨
-
-            else:  # BEST_MATCH
-                # 모든 값 중 가장 높은 점수 반환
-                best_score = None
-                for val in values_to_check:
-                    val_lower = str(val).strip().lower()
-                    for grade in grades:
-                        grade_value = str(grade.get("value", "")).strip().lower()
-                        matched = False
-                        if match_mode == "contains":
-                            matched = grade_value in val_lower
-                        elif match_mode == "any":
-                            matched = bool(val_lower)
-                        else:  # exact
-                            matched = grade_value == val_lower
-                        if matched:
-                            score = Decimal(str(grade.get("score", 0)))
-                            if best_score is None or score > best_score:
-                                best_score = score
-                            break  # 이 값에서 첫 매칭 후 다음 값으로
-
-                if best_score is not None:
-                    # 증빙 감점 적용
-                    if proof_penalty and not submitted_file_id:
-                        best_score += Decimal(str(proof_penalty))
-                    return max(best_score, Decimal('0'))
-                return None
-
-        # 기본 처리 (FIRST 모드 또는 단일 값)
-        extracted_str = str(extracted_value).strip()
-        matched = False
-
-        if match_mode == "any":
-            # "어떤 값이든" - 내용이 있으면 첫 번째 등급 점수 반환
-            if extracted_str:
-                base_score = Decimal(str(grades[0].get("score", 0))) if grades else Decimal('0')
-                matched = True
-            else:
-                return Decimal('0')
-        else:
-            extracted_lower = extracted_str.lower()
-            for grade in grades:
-                grade_value = str(grade.get("value", "")).strip().lower()
-
-                if match_mode == "contains":
-                    # 포함 매칭
-                    if grade_value in extracted_lower:
-                        base_score = Decimal(str(grade.get("score", 0)))
-                        matched = True
-                        break
-                else:
-                    # 정확히 일치 (기본)
-                    if grade_value == extracted_lower:
-                        base_score = Decimal(str(grade.get("score", 0)))
-                        matched = True
-                        break
-
-        # 증빙 감점 적용 (string 타입에도 적용)
-        if proof_penalty and not submitted_file_id:
-            base_score += Decimal(str(proof_penalty))
-
-        # 매칭된 경우 최소 0점 보장, 매칭 안된 경우 None 반환
-        return max(base_score, Decimal('0')) if matched else None
+    return grade_table.match(
+        extracted_value,
+        submitted_file_id=submitted_file_id,
+        submitted_value=submitted_value,
+        aggregation_mode=aggregation_mode
+    )
 
 
 def match_value(submitted_value: str, expected_value: str, matching_type: MatchingType) -> bool:
@@ -398,7 +262,7 @@ def match_value(submitted_value: str, expected_value: str, matching_type: Matchi
 
 def calculate_item_score(
     submitted_value: str,
-    scoring_criteria: List[ScoringCriteria],
+    scoring_criteria: Sequence[Union[ScoringCriteria, CompiledCriteria]],
     max_score: Optional[Decimal] = None,
     user: Optional[User] = None,
     submitted_file_id: Optional[int] = None
@@ -408,7 +272,7 @@ def calculate_item_score(
 
     Args:
         submitted_value: The value submitted by the applicant
-        scoring_criteria: List of scoring criteria for this item
+        scoring_criteria: List of scoring criteria for this item (ORM rows or compiled)
         max_score: Maximum score for this item (for validation)
         user: User object (required for USER_FIELD value source)
         submitted_file_id: File ID if a file was submitted (for file_exists and proof penalty)
@@ -418,13 +282,15 @@ def calculate_item_score(
     """
     total_score = Decimal('0')
 
-    for criteria in scoring_criteria:
+    for criteria in ensure_compiled(scoring_criteria):
         # Handle GRADE matching type specially
         if criteria.matching_type == MatchingType.GRADE:
+            if criteria.grade_table is None:
+                continue  # invalid GRADE config (logged at compile time)
             # Extract value based on source
             extracted = extract_value_for_scoring(submitted_value, criteria, user)
-            grade_score = match_grade_value(
-                extracted, criteria.expected_value,
+            grade_score = criteria.grade_table.match(
+                extracted,
                 submitted_file_id=submitted_file_id,
                 submitted_value=submitted_value,
                 aggregation_mode=criteria.aggregation_mode
@@ -434,8 +300,8 @@ def calculate_item_score(
                 break  # GRADE typically has one match per item
         else:
             # Legacy matching types (EXACT, CONTAINS, RANGE)
-            if match_value(submitted_value, criteria.expected_value, criteria.matching_type):
-                total_score += Decimal(str(criteria.score))
+            if criteria.legacy_matcher(submitted_value):
+                total_score += criteria.score
                 # For EXACT matching, we typically take the first match
                 if criteria.matching_type == MatchingType.EXACT:
                     break
@@ -479,22 +345,20 @@ async def calculate_application_auto_score(
     total_score = Decimal('0')
     applicant_user = application.user  # Get user for GRADE scoring with USER_FIELD source
 
-    # Build a map of item_id to project_item with scoring criteria
-    project_items_map: Dict[int, ProjectItem] = {}
-    for pi in application.project.project_items:
-        project_items_map[pi.item_id] = pi
+    # Compiled scoring rules keyed by item_id (cached per project)
+    rules = get_project_rules(application.project_id, application.project.project_items)
 
     # Calculate score for each application data item
     for app_data in application.application_data:
-        project_item = project_items_map.get(app_data.item_id)
-        if not project_item or not project_item.scoring_criteria:
+        compiled_item = rules.items.get(app_data.item_id)
+        if not compiled_item:
             continue
 
         # Calculate item score (pass user for USER_FIELD value source, file_id for proof penalty)
         item_score = calculate_item_score(
             app_data.submitted_value or '',
-            project_item.scoring_criteria,
-            project_item.max_score,
+            compiled_item.criteria,
+            compiled_item.max_score,
             applicant_user,
             app_data.submitted_file_id
         )
@@ -504,31 +368,19 @@ async def calculate_application_auto_score(
         total_score += item_score
 
     # Also calculate custom question scores if they are evaluation items
-    custom_q_result = await db.execute(
-        select(CustomQuestion)
-        .where(CustomQuestion.project_id == application.project_id)
-        .where(CustomQuestion.is_evaluation_item == True)
-    )
-    custom_questions = custom_q_result.scalars().all()
+    question_rules = await load_custom_question_rules(db, application.project_id)
 
-    if custom_questions:
+    if question_rules:
         answers_result = await db.execute(
             select(CustomQuestionAnswer)
             .where(CustomQuestionAnswer.application_id == application_id)
         )
         answers = {a.question_id: a for a in answers_result.scalars().all()}
 
-        for cq in custom_questions:
-            answer = answers.get(cq.question_id)
-            if answer and cq.scoring_rules:
-                try:
-                    rules = json.loads(cq.scoring_rules)
-                    for rule in rules:
-                        if match_value(answer.answer_text or '', rule.get('expected_value', ''), MatchingType.EXACT):
-                            total_score += Decimal(str(rule.get('score', 0)))
-                            break
-                except (json.JSONDecodeError, TypeError):
-                    pass
+        for question_id, compiled in question_rules.items():
+            answer = answers.get(question_id)
+            if answer:
+                total_score += score_custom_question_answer(compiled, answer.answer_text)
 
     # Update application auto_score
     application.auto_score = total_score
@@ -537,6 +389,253 @@ async def calculate_application_auto_score(
     return total_score
 
 
+def mark_score_dirty(db: AsyncSession, application_id: int, item_id: int) -> None:
+    """
+    Mark an (application_id, item_id) pair whose submitted data changed
+
+    The pairs are kept on the session and rescored by recompute_dirty_scores,
+    which callers run before committing.
+    """
+    db.info.setdefault(DIRTY_SCORES_KEY, set()).add((application_id, item_id))
+
+
+def mark_answer_dirty(
+    db: AsyncSession,
+    application_id: int,
+    question_id: int,
+    previous_text: Optional[str]
+) -> None:
+    """
+    Mark a custom question answer whose text changed
+
+    Answers have no stored score, so the text before the first change in this
+    session is kept and recompute_dirty_scores applies the score difference.
+    """
+    db.info.setdefault(DIRTY_ANSWERS_KEY, {}).setdefault((application_id, question_id), previous_text)
+
+
+def mark_application_dirty(db: AsyncSession, application_id: int) -> None:
+    """
+    Mark an application for a full calculate_application_auto_score
+
+    For submission, when items and answers saved as a draft were never
+    scored. recompute_dirty_scores then ignores the application's item and
+    answer marks.
+    """
+    db.info.setdefault(DIRTY_APPLICATIONS_KEY, set()).add(application_id)
+
+
+async def _add_to_auto_score(db: AsyncSession, application_id: int, delta: Decimal) -> Optional[Decimal]:
+    """
+    Add delta to auto_score in SQL, so concurrent writers of one application
+    cannot overwrite each other's change; None if auto_score is not set
+    """
+    result = await db.execute(
+        update(Application)
+        .where(Application.application_id == application_id)
+        .where(Application.auto_score.isnot(None))
+        .values(auto_score=Application.auto_score + delta)
+        .returning(Application.auto_score)
+        .execution_options(synchronize_session=False)
+    )
+    auto_score = result.scalar_one_or_none()
+    # A loaded Application takes the stored sum, not its stale value + delta
+    application = db.identity_map.get(db.identity_key(Application, application_id))
+    if application is not None and auto_score is not None:
+        set_committed_value(application, "auto_score", auto_score)
+    return auto_score
+
+
+async def apply_item_score_delta(
+    db: AsyncSession,
+    application_id: int,
+    old_score: Optional[Decimal],
+    new_score: Optional[Decimal]
+) -> Optional[Decimal]:
+    """
+    Adjust Application.auto_score by the change of one item_score
+
+    Args:
+        db: Database session
+        application_id: Application ID
+        old_score: Previous item_score (None counts as 0)
+        new_score: New item_score (None counts as 0)
+
+    Returns:
+        The adjusted auto_score, or None if auto_score was never calculated
+    """
+    delta = Decimal(str(new_score or 0)) - Decimal(str(old_score or 0))
+    return await _add_to_auto_score(db, application_id, delta)
+
+
+async def _recompute_application_items(
+    db: AsyncSession,
+    application_id: int,
+    item_ids: Set[int],
+    previous_answers: Dict[int, Optional[str]]
+) -> Optional[Decimal]:
+    """Rescore the given items and answers of one application and apply the difference to auto_score"""
+    application = await db.get(Application, application_id)
+    if not application:
+        return None
+
+    # auto_score was never calculated - a delta has nothing to apply to
+    if application.auto_score is None:
+        return await calculate_application_auto_score(db, application_id)
+
+    delta = Decimal('0')
+
+    if item_ids:
+        rules = await load_project_rules(db, application.project_id)
+        scored_item_ids = [item_id for item_id in item_ids if item_id in rules.items]
+        if scored_item_ids:
+            applicant_user = await db.get(User, application.user_id) if rules.needs_user else None
+
+            # Locked and re-read, so the delta is taken from the item_score a
+            # concurrent rescoring of the same items committed
+            result = await db.execute(
+                select(ApplicationData)
+                .where(ApplicationData.application_id == application_id)
+                .where(ApplicationData.item_id.in_(scored_item_ids))
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+            for app_data in result.scalars().all():
+                compiled_item = rules.items[app_data.item_id]
+                item_score = calculate_item_score(
+                    app_data.submitted_value or '',
+                    compiled_item.criteria,
+                    compiled_item.max_score,
+                    applicant_user,
+                    app_data.submitted_file_id
+                )
+                delta += item_score - Decimal(str(app_data.item_score or 0))
+                app_data.item_score = item_score
+
+    if previous_answers:
+        question_rules = await load_custom_question_rules(db, application.project_id)
+        scored_question_ids = [qid for qid in previous_answers if qid in question_rules]
+        if scored_question_ids:
+            result = await db.execute(
+                select(CustomQuestionAnswer.question_id, CustomQuestionAnswer.answer_text)
+                .where(CustomQuestionAnswer.application_id == application_id)
+                .where(CustomQuestionAnswer.question_id.in_(scored_question_ids))
+            )
+            current_answers = {row.question_id: row.answer_text for row in result.all()}
+            for question_id in scored_question_ids:
+                compiled = question_rules[question_id]
+                delta += (
+                    score_custom_question_answer(compiled, current_answers.get(question_id))
+                    - score_custom_question_answer(compiled, previous_answers[question_id])
+                )
+
+    await db.flush()
+    if not delta:
+        return application.auto_score
+    return await _add_to_auto_score(db, application_id, delta)
+
+
+async def recompute_dirty_scores(db: AsyncSession) -> Dict[int, Optional[Decimal]]:
+    """
+    Rescore items and answers marked dirty and update auto_score by the difference
+
+    Only the dirty items and answers are rescored; an application marked with
+    mark_application_dirty, or whose auto_score was never calculated, gets a
+    full calculate_application_auto_score instead. Differences are added to
+    auto_score in SQL, so concurrent writers do not lose each other's.
+    Scoring failures are logged and never block the caller's write.
+
+    Args:
+        db: Database session
+
+    Returns:
+        New auto_score per application_id
+    """
+    dirty = db.info.pop(DIRTY_SCORES_KEY, None) or set()
+    dirty_answers = db.info.pop(DIRTY_ANSWERS_KEY, None) or {}
+    dirty_applications = db.info.pop(DIRTY_APPLICATIONS_KEY, None) or set()
+    if not dirty and not dirty_answers and not dirty_applications:
+        return {}
+
+    await db.flush()  # new ApplicationData/answer rows must be visible to the rescoring queries
+
+    updated: Dict[int, Optional[Decimal]] = {}
+    for application_id in sorted(dirty_applications):
+        try:
+            updated[application_id] = await calculate_application_auto_score(db, application_id)
+        except Exception as e:
+            logger.error(f"Rescoring failed for application {application_id}: {e}")
+
+    items_by_application: Dict[int, Set[int]] = {}
+    for application_id, item_id in dirty:
+        items_by_application.setdefault(application_id, set()).add(item_id)
+    answers_by_application: Dict[int, Dict[int, Optional[str]]] = {}
+    for (application_id, question_id), previous_text in dirty_answers.items():
+        answers_by_application.setdefault(application_id, {})[question_id] = previous_text
+
+    for application_id in (items_by_application.keys() | answers_by_application.keys()) - dirty_applications:
+        try:
+            updated[application_id] = await _recompute_application_items(
+                db,
+                application_id,
+                items_by_application.get(application_id, set()),
+                answers_by_application.get(application_id, {})
+            )
+        except Exception as e:
+            logger.error(f"Incremental rescoring failed for application {application_id}: {e}")
+    return updated
+
+
+async def load_project_rules(db: AsyncSession, project_id: int) -> CompiledProjectRules:
+    """Load a project's items and scoring criteria once and return the compiled rules"""
+    result = await db.execute(
+        select(ProjectItem)
+        .options(selectinload(ProjectItem.scoring_criteria))
+        .where(ProjectItem.project_id == project_id)
+    )
+    return get_project_rules(project_id, result.scalars().all())
+
+
+async def load_custom_question_rules(db: AsyncSession, project_id: int) -> Dict[int, tuple]:
+    """Compiled scoring rules of a project's evaluation custom questions, keyed by question_id"""
+    result = await db.execute(
+        select(CustomQuestion.question_id, CustomQuestion.scoring_rules)
+        .where(CustomQuestion.project_id == project_id)
+        .where(CustomQuestion.is_evaluation_item == True)
+    )
+    return {
+        row.question_id: compile_custom_question_rules(row.scoring_rules)
+        for row in result.all()
+    }
+
+
+async def bulk_update_scores(db: AsyncSession, table, key_column: str, score_column: str, rows: List[tuple]) -> None:
+    """
+    Write (key, score) pairs with UPDATE ... FROM (VALUES ...) in chunks
+
+    Args:
+        db: Database session
+        table: Target Table (e.g. ApplicationData.__table__)
+        key_column: Primary key column name
+        score_column: Score column name to set
+        rows: List of (key, score) tuples
+    """
+    key_type = table.c[key_column].type
+    score_type = table.c[score_column].type
+    for offset in range(0, len(rows), SCORE_WRITE_CHUNK_SIZE):
+        chunk = rows[offset:offset + SCORE_WRITE_CHUNK_SIZE]
+        new_values = values(
+            column(key_column, key_type),
+            column(score_column, score_type),
+            name="new_scores"
+        ).data(chunk)
+        await db.execute(
+            update(table)
+            .where(table.c[key_column] == new_values.c[key_column])
+            .values({score_column: new_values.c[score_column]})
+        )
+
+
 async def calculate_project_all_scores(
     db: AsyncSession,
     project_id: int
@@ -544,45 +643,138 @@ async def calculate_project_all_scores(
     """
     Calculate auto_score for all submitted applications in a project
 
+    The project's rules are loaded and compiled once, ApplicationData rows are
+    streamed in chunks and scored in memory, and item_score/auto_score are
+    written back with bulk UPDATE ... FROM (VALUES ...) statements.
+
     Args:
         db: Database session
         project_id: Project ID
 
     Returns:
-        Summary of score calculation results
+        Summary of score calculation results (with per-phase timings in ms)
     """
-    # Get all submitted applications
-    result = await db.execute(
-        select(Application)
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    phase_started = started
+
+    # Phase 1: project tree (once)
+    rules = await load_project_rules(db, project_id)
+    question_rules = await load_custom_question_rules(db, project_id)
+
+    app_result = await db.execute(
+        select(Application.application_id, Application.user_id)
         .where(Application.project_id == project_id)
         .where(Application.status.in_(['submitted', 'reviewing', 'completed']))
     )
-    applications = result.scalars().all()
-
-    calculated_count = 0
-    error_count = 0
-    errors = []
-
-    for app in applications:
-        try:
-            await calculate_application_auto_score(db, app.application_id)
-            calculated_count += 1
-        except Exception as e:
-            error_count += 1
-            errors.append({
-                'application_id': app.application_id,
-                'error': str(e)
-            })
-            logger.error(f"Error calculating score for application {app.application_id}: {e}")
-
+    app_rows = app_result.all()
+    app_user_ids = {row.application_id: row.user_id for row in app_rows}
+
+    users: Dict[int, User] = {}
+    if rules.needs_user and app_user_ids:
+        user_ids = list(set(app_user_ids.values()))
+        for offset in range(0, len(user_ids), SCORE_STREAM_CHUNK_SIZE):
+            user_result = await db.execute(
+                select(User).where(User.user_id.in_(user_ids[offset:offset + SCORE_STREAM_CHUNK_SIZE]))
+            )
+            users.update({u.user_id: u for u in user_result.scalars().all()})
+
+    timings['load_ms'] = round((time.perf_counter() - phase_started) * 1000, 2)
+
+    # Phase 2: stream application data and score in memory
+    totals: Dict[int, Decimal] = {app_id: Decimal('0') for app_id in app_user_ids}
+    item_scores: List[tuple] = []
+    failed: Dict[int, str] = {}
+    fetch_seconds = 0.0
+    score_seconds = 0.0
+
+    if rules.items and totals:
+        phase_started = time.perf_counter()
+        stream = await db.stream(
+            select(
+                ApplicationData.data_id,
+                ApplicationData.application_id,
+                ApplicationData.item_id,
+                ApplicationData.submitted_value,
+                ApplicationData.submitted_file_id,
+            )
+            .join(Application, Application.application_id == ApplicationData.application_id)
+            .where(Application.project_id == project_id)
+            .where(Application.status.in_(['submitted', 'reviewing', 'completed']))
+            .where(ApplicationData.item_id.in_(list(rules.items.keys())))
+            .execution_options(yield_per=SCORE_STREAM_CHUNK_SIZE)
+        )
+        async for chunk in stream.partitions(SCORE_STREAM_CHUNK_SIZE):
+            scoring_started = time.perf_counter()
+            fetch_seconds += scoring_started - phase_started
+            for row in chunk:
+                if row.application_id in failed:
+                    continue
+                compiled_item = rules.items[row.item_id]
+                try:
+                    item_score = calculate_item_score(
+                        row.submitted_value or '',
+                        compiled_item.criteria,
+                        compiled_item.max_score,
+                        users.get(app_user_ids[row.application_id]),
+                        row.submitted_file_id
+                    )
+                except Exception as e:
+                    failed[row.application_id] = str(e)
+                    logger.error(f"Error calculating score for application {row.application_id}: {e}")
+                    continue
+                item_scores.append((row.application_id, row.data_id, item_score))
+                totals[row.application_id] += item_score
+            phase_started = time.perf_counter()
+            score_seconds += phase_started - scoring_started
+
+    if question_rules and totals:
+        phase_started = time.perf_counter()
+        answer_result = await db.execute(
+            select(CustomQuestionAnswer.application_id, CustomQuestionAnswer.question_id, CustomQuestionAnswer.answer_text)
+            .join(Application, Application.application_id == CustomQuestionAnswer.application_id)
+            .where(Application.project_id == project_id)
+            .where(CustomQuestionAnswer.question_id.in_(list(question_rules.keys())))
+        )
+        answer_rows = answer_result.all()
+        scoring_started = time.perf_counter()
+        fetch_seconds += scoring_started - phase_started
+        for row in answer_rows:
+            if row.application_id in totals:
+                totals[row.application_id] += score_custom_question_answer(
+                    question_rules[row.question_id], row.answer_text
+                )
+        score_seconds += time.perf_counter() - scoring_started
+
+    timings['fetch_ms'] = round(fetch_seconds * 1000, 2)
+    timings['score_ms'] = round(score_seconds * 1000, 2)
+
+    # Phase 3: bulk write-back (applications that failed keep their previous scores)
+    phase_started = time.perf_counter()
+    await bulk_update_scores(
+        db, ApplicationData.__table__, 'data_id', 'item_score',
+        [(data_id, score) for app_id, data_id, score in item_scores if app_id not in failed]
+    )
+    await bulk_update_scores(
+        db, Application.__table__, 'application_id', 'auto_score',
+        [(app_id, total) for app_id, total in totals.items() if app_id not in failed]
+    )
     await db.commit()
+    timings['write_ms'] = round((time.perf_counter() - phase_started) * 1000, 2)
+    timings['total_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+    logger.info(f"Project {project_id} rescored: {len(totals)} applications, {len(item_scores)} items, timings={timings}")
 
     return {
         'project_id': project_id,
-        'total_applications': len(applications),
-        'calculated_count': calculated_count,
-        'error_count': error_count,
-        'errors': errors
+        'total_applications': len(app_rows),
+        'calculated_count': len(app_rows) - len(failed),
+        'error_count': len(failed),
+        'errors': [
+            {'application_id': app_id, 'error': error}
+            for app_id, error in failed.items()
+        ],
+        'timings': timings
     }
 
 
@@ -609,6 +801,63 @@ async def calculate_qualitative_score_average(
     return Decimal(str(avg_score)) if avg_score else None
 
 
+@dataclass(frozen=True)
+class EvaluationAggregate:
+    """Reviewer evaluation statistics of one application"""
+    count: int = 0
+    average: Optional[Decimal] = None
+    minimum: Optional[Decimal] = None
+    maximum: Optional[Decimal] = None
+    stddev: Optional[Decimal] = None
+
+
+def _optional_decimal(value: Any) -> Optional[Decimal]:
+    return Decimal(str(value)) if value is not None else None
+
+
+async def get_evaluation_aggregates(
+    db: AsyncSession,
+    project_id: int
+) -> Dict[int, EvaluationAggregate]:
+    """
+    Reviewer evaluation statistics for all applications of a project
+
+    One GROUP BY application_id query replaces the per-application count/avg
+    lookups of the review dashboard. Applications without evaluations are
+    absent; use `aggregates.get(app_id, EvaluationAggregate())`.
+
+    Args:
+        db: Database session
+        project_id: Project ID
+
+    Returns:
+        EvaluationAggregate keyed by application_id
+    """
+    result = await db.execute(
+        select(
+            ReviewerEvaluation.application_id,
+            func.count(ReviewerEvaluation.evaluation_id).label('count'),
+            func.avg(ReviewerEvaluation.total_score).label('average'),
+            func.min(ReviewerEvaluation.total_score).label('minimum'),
+            func.max(ReviewerEvaluation.total_score).label('maximum'),
+            func.stddev_samp(ReviewerEvaluation.total_score).label('stddev'),
+        )
+        .join(Application, Application.application_id == ReviewerEvaluation.application_id)
+        .where(Application.project_id == project_id)
+        .group_by(ReviewerEvaluation.application_id)
+    )
+    return {
+        row.application_id: EvaluationAggregate(
+            count=row.count,
+            average=_optional_decimal(row.average),
+            minimum=_optional_decimal(row.minimum),
+            maximum=_optional_decimal(row.maximum),
+            stddev=_optional_decimal(row.stddev),
+        )
+        for row in result.all()
+    }
+
+
 async def calculate_final_score(
     db: AsyncSession,
     application_id: int,
@@ -679,13 +928,20 @@ async def finalize_project_scores(
     """
     Calculate final scores for all applications in a project
 
+    Reviewer averages for every application come from one grouped query, the
+    project weights are applied in memory (same formula as calculate_final_score)
+    and all final_score values are written with a bulk UPDATE.
+
     Args:
         db: Database session
         project_id: Project ID
 
     Returns:
-        Summary of finalization results
+        Summary of finalization results (with timings in ms)
     """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
     # Get project for weights
     project_result = await db.execute(
         select(Project).where(Project.project_id == project_id)
@@ -695,36 +951,46 @@ async def finalize_project_scores(
     if not project:
         raise ValueError(f"Project {project_id} not found")
 
-    # Get all applications with evaluations
+    quantitative_weight = Decimal(str(project.quantitative_weight or 70))
+    qualitative_weight = Decimal(str(project.qualitative_weight or 30))
+
+    # AVG(total_score) per application in one grouped query
+    phase_started = time.perf_counter()
     result = await db.execute(
-        select(Application)
+        select(
+            Application.application_id,
+            Application.auto_score,
+            func.avg(ReviewerEvaluation.total_score).label('qual_avg')
+        )
+        .outerjoin(ReviewerEvaluation, ReviewerEvaluation.application_id == Application.application_id)
         .where(Application.project_id == project_id)
         .where(Application.status.in_(['submitted', 'reviewing', 'completed']))
+        .group_by(Application.application_id, Application.auto_score)
     )
-    applications = result.scalars().all()
-
-    finalized_count = 0
-    no_evaluation_count = 0
+    rows = result.all()
+    timings['aggregate_ms'] = round((time.perf_counter() - phase_started) * 1000, 2)
 
-    for app in applications:
-        qual_avg = await calculate_qualitative_score_average(db, app.application_id)
-        if qual_avg is not None:
-            await calculate_final_score(
-                db,
-                app.application_id,
-                Decimal(str(project.quantitative_weight or 70)),
-                Decimal(str(project.qualitative_weight or 30))
-            )
-            finalized_count += 1
-        else:
+    final_scores: List[tuple] = []
+    for row in rows:
+        if not row.qual_avg:
             # No qualitative evaluation yet
-            no_evaluation_count += 1
+            continue
+        quant_component = (row.auto_score or Decimal('0')) * quantitative_weight / Decimal('100')
+        qual_component = Decimal(str(row.qual_avg)) * qualitative_weight / Decimal('100')
+        final_scores.append((row.application_id, quant_component + qual_component))
 
+    phase_started = time.perf_counter()
+    await bulk_update_scores(db, Application.__table__, 'application_id', 'final_score', final_scores)
     await db.commit()
+    timings['write_ms'] = round((time.perf_counter() - phase_started) * 1000, 2)
+    timings['total_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+    logger.info(f"Project {project_id} finalized: {len(final_scores)}/{len(rows)} applications, timings={timings}")
 
     return {
         'project_id': project_id,
-        'total_applications': len(applications),
-        'finalized_count': finalized_count,
-        'no_evaluation_count': no_evaluation_count
+        'total_applications': len(rows),
+        'finalized_count': len(final_scores),
+        'no_evaluation_count': len(rows) - len(final_scores),
+        'timings': timings
     }
@@ -0,0 +1,707 @@
+"""
+Storage service - async driver layer over local disk, MinIO and Cloudflare R2
+
+Endpoints talk to one process-wide StorageDriver (get_storage()) instead of
+building SDK clients per request. Every blocking call (minio SDK, file I/O)
+runs on a dedicated bounded executor so a slow object store cannot freeze the
+event loop, and is timed per operation (get_storage_stats()).
+
+Uploads are streamed (put_stream()): the source is read in fixed-size parts,
+hashed and size-checked as it goes, and sent to S3-compatible stores as a
+multipart upload, so memory per upload is bounded by the part size.
+"""
+import asyncio
+import hashlib
+import itertools
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List, Optional
+
+import urllib3
+from minio import Minio
+from minio.deleteobjects import DeleteObject
+from minio.error import S3Error
+
+from app.core.config import settings
+
+# Read size for streamed downloads
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Objects fetched per listing call
+LIST_PAGE_SIZE = 1000
+
+# S3 multipart parts must be at least 5 MiB (except the last one)
+MIN_UPLOAD_PART_SIZE = 5 * 1024 * 1024
+
+
+class StorageError(Exception):
+    """Storage backend failure (code mirrors the S3 error code when there is one)"""
+
+    def __init__(self, message: str, code: Optional[str] = None):
+        super().__init__(message)
+        self.code = code
+
+
+class StorageObjectNotFound(StorageError):
+    """The object does not exist in storage"""
+
+    def __init__(self, key: str):
+        super().__init__(f"Object not found: {key}", code="NoSuchKey")
+        self.key = key
+
+
+class StorageSizeLimitExceeded(StorageError):
+    """A streamed upload grew past its size limit (nothing is kept)"""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"Upload exceeds {max_size} bytes", code="EntityTooLarge")
+        self.max_size = max_size
+
+
+@dataclass(frozen=True)
+class ObjectStat:
+    """Object metadata returned by stat()/put()/put_stream()"""
+    key: str
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
+    sha256: Optional[str] = None  # put_stream() only
+
+
+class ChecksumReader:
+    """
+    File-like wrapper hashing what is read through it
+
+    Tracks size, SHA-256 and the S3 ETag the bytes should produce when
+    uploaded in `part_size` parts (MD5 for a single part, MD5 of the part
+    MD5s plus "-N" for multipart). Raises StorageSizeLimitExceeded as soon
+    as more than `max_size` bytes have been read.
+    """
+
+    def __init__(self, source: BinaryIO, part_size: int, max_size: Optional[int] = None):
+        self._source = source
+        self.part_size = part_size
+        self.max_size = max_size
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._part_md5 = hashlib.md5()
+        self._part_filled = 0
+        self._part_digests = []
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._source.read(size)
+        if not data:
+            return data
+        self.size += len(data)
+        if self.max_size is not None and self.size > self.max_size:
+            raise StorageSizeLimitExceeded(self.max_size)
+        self._sha256.update(data)
+        # Split MD5s at part boundaries regardless of how reads are sized
+        view = memoryview(data)
+        while view:
+            if self._part_filled == self.part_size:
+                self._part_digests.append(self._part_md5.digest())
+                self._part_md5 = hashlib.md5()
+                self._part_filled = 0
+            take = min(len(view), self.part_size - self._part_filled)
+            self._part_md5.update(view[:take])
+            self._part_filled += take
+            view = view[take:]
+        return data
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+    def expected_etag(self) -> str:
+        if not self._part_digests:
+            return self._part_md5.hexdigest()
+        digests = self._part_digests + [self._part_md5.digest()]
+        return f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+
+
+@dataclass(frozen=True)
+class PresignedUrl:
+    """A presigned download URL and its wall-clock expiry"""
+    url: str
+    expires_at: float  # time.time()
+
+    @property
+    def expires_in(self) -> int:
+        """Seconds the URL stays valid from now"""
+        return max(int(self.expires_at - time.time()), 0)
+
+
+class PresignedUrlCache:
+    """
+    Bounded LRU of presigned URLs keyed by object key
+
+    Entries are dropped `margin_seconds` before the URL itself expires, so a
+    cached URL always has at least that long left when it is handed out.
+    """
+
+    def __init__(self, max_size: int, margin_seconds: float):
+        self.max_size = max_size
+        self.margin_seconds = margin_seconds
+        self._entries: "OrderedDict[str, PresignedUrl]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[PresignedUrl]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at - self.margin_seconds <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: PresignedUrl) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class OperationStats:
+    """Per-operation call count, error count and latency"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ops: Dict[str, Dict[str, float]] = {}
+
+    def record(self, op: str, elapsed_ms: float, failed: bool) -> None:
+        with self._lock:
+            entry = self._ops.setdefault(op, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["errors"] += int(failed)
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                op: {
+                    "count": int(entry["count"]),
+                    "errors": int(entry["errors"]),
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 2) if entry["count"] else 0.0,
+                    "max_ms": round(entry["max_ms"], 2),
+                }
+                for op, entry in self._ops.items()
+            }
+
+
+class StorageDriver(ABC):
+    """Async object storage interface; keys are File.file_path values"""
+
+    name = "abstract"
+
+    def __init__(self, executor: ThreadPoolExecutor, stats: OperationStats,
+                 url_cache: Optional[PresignedUrlCache] = None):
+        self._executor = executor
+        self.stats = stats
+        self.url_cache = url_cache
+
+    async def _run(self, op: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on the storage executor, timed as `op`"""
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        failed = False
+        try:
+            return await loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+        except (StorageObjectNotFound, StorageSizeLimitExceeded):
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.stats.record(f"{self.name}.{op}", (time.perf_counter() - started_at) * 1000, failed)
+
+    @abstractmethod
+    async def put(self, key: str, data: BinaryIO, length: int, content_type: Optional[str]) -> ObjectStat:
+        """Store `length` bytes read from `data` under `key`"""
+
+    @abstractmethod
+    async def put_stream(self, key: str, source: BinaryIO, content_type: Optional[str],
+                         max_size: Optional[int] = None) -> ObjectStat:
+        """
+        Stream `source` to `key` until EOF, in bounded-size parts
+
+        Returns the stored size and SHA-256. Raises StorageSizeLimitExceeded
+        (leaving nothing behind) once more than `max_size` bytes are read.
+        """
+
+    @abstractmethod
+    async def stat(self, key: str) -> ObjectStat:
+        """Object metadata; raises StorageObjectNotFound"""
+
+    @abstractmethod
+    def iter_object(self, key: str, offset: int = 0, length: Optional[int] = None,
+                    chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Async iterator over the object's bytes (optionally a byte range)"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete an object (missing objects are ignored)"""
+
+    @abstractmethod
+    def list_objects(self, prefix: str) -> AsyncIterator[ObjectStat]:
+        """Async iterator over the objects under `prefix`, in ascending key (byte) order"""
+
+    async def delete_many(self, keys: List[str]) -> List[str]:
+        """Delete several objects; returns the keys that failed (missing ones count as deleted)"""
+        failed = []
+        for key in keys:
+            try:
+                await self.delete(key)
+            except StorageError:
+                failed.append(key)
+        return failed
+
+    async def checksum(self, source: BinaryIO, max_size: Optional[int] = None) -> ChecksumReader:
+        """
+        Read `source` to EOF off the event loop, returning its size and SHA-256
+
+        Enforces `max_size` like put_stream(). The caller rewinds `source`.
+        """
+        reader = ChecksumReader(source, STREAM_CHUNK_SIZE, max_size)
+
+        def drain() -> ChecksumReader:
+            while reader.read(STREAM_CHUNK_SIZE):
+                pass
+            return reader
+
+        return await self._run("checksum", drain)
+
+    async def open_stream(self, key: str, offset: int = 0, length: Optional[int] = None,
+                          chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        iter_object() with the first chunk already fetched
+
+        Missing objects raise StorageObjectNotFound here, before a response
+        has started, instead of in the middle of streaming it.
+        """
+        iterator = self.iter_object(key, offset=offset, length=length, chunk_size=chunk_size)
+        try:
+            first = await iterator.__anext__()
+        except StopAsyncIteration:
+            first = b""
+
+        async def stream() -> AsyncIterator[bytes]:
+            try:
+                if first:
+                    yield first
+                async for chunk in iterator:
+                    yield chunk
+            finally:
+                await iterator.aclose()
+
+        return stream()
+
+    async def exists(self, key: str) -> bool:
+        try:
+            await self.stat(key)
+            return True
+        except StorageObjectNotFound:
+            return False
+
+    async def presigned_get_url(self, key: str, expires: timedelta) -> Optional[str]:
+        """Direct download URL, or None when the backend has none (local disk)"""
+        return None
+
+    async def get_download_url(self, key: str) -> Optional[PresignedUrl]:
+        """
+        Cached presigned download URL, or None when the backend has none
+
+        On a cache miss the object is checked to exist (raises
+        StorageObjectNotFound) before a URL valid for
+        PRESIGNED_URL_TTL_SECONDS is signed and cached.
+        """
+        if self.url_cache is not None:
+            cached = self.url_cache.get(key)
+            if cached is not None:
+                return cached
+        ttl = settings.PRESIGNED_URL_TTL_SECONDS
+        await self.stat(key)
+        url = await self.presigned_get_url(key, expires=timedelta(seconds=ttl))
+        if url is None:
+            return None
+        entry = PresignedUrl(url=url, expires_at=time.time() + ttl)
+        if self.url_cache is not None:
+            self.url_cache.put(key, entry)
+        return entry
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Filesystem path of the object when it lives on local disk (sendfile-able)"""
+        return None
+
+
+class LocalStorageDriver(StorageDriver):
+    """Files on local disk; keys are paths relative to the working directory"""
+
+    name = "local"
+
+    def _put(self, key: str, data: BinaryIO, length: int) -> ObjectStat:
+        os.makedirs(os.path.dirname(key) or ".", exist_ok=True)
+        with open(key, "wb") as f:
+            remaining = length
+            while remaining > 0:
+                chunk = data.read(min(STREAM_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                f.write(chunk)
+                remaining -= len(chunk)
+        return self._stat(key)
+
+    async def put(self, key: str, data: BinaryIO, length: int, content_type: Optional[str]) -> ObjectStat:
+        return await self._run("put", self._put, key, data, length)
+
+    def _put_stream(self, key: str, reader: ChecksumReader) -> ObjectStat:
+        os.makedirs(os.path.dirname(key) or ".", exist_ok=True)
+        # Write beside the target and rename, so a failed upload leaves nothing
+        partial = f"{key}.part"
+        try:
+            with open(partial, "wb") as f:
+                while True:
+                    chunk = reader.read(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+            os.replace(partial, key)
+        except BaseException:
+            self._delete(partial)
+            raise
+        stat = self._stat(key)
+        if stat.size != reader.size:
+            self._delete(key)
+            raise StorageError(f"Stored size {stat.size} != streamed size {reader.size}", code="BadDigest")
+        return ObjectStat(key=key, size=reader.size, last_modified=stat.last_modified, sha256=reader.sha256)
+
+    async def put_stream(self, key: str, source: BinaryIO, content_type: Optional[str],
+                         max_size: Optional[int] = None) -> ObjectStat:
+        reader = ChecksumReader(source, STREAM_CHUNK_SIZE, max_size)
+        return await self._run("put_stream", self._put_stream, key, reader)
+
+    def _stat(self, key: str) -> ObjectStat:
+        try:
+            st = os.stat(key)
+        except FileNotFoundError:
+            raise StorageObjectNotFound(key)
+        return ObjectStat(
+            key=key,
+            size=st.st_size,
+            last_modified=datetime.fromtimestamp(st.st_mtime, tz=timezone.utc),
+        )
+
+    async def stat(self, key: str) -> ObjectStat:
+        return await self._run("stat", self._stat, key)
+
+    async def iter_object(self, key: str, offset: int = 0, length: Optional[int] = None,
+                          chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        try:
+            f = await self._run("open", open, key, "rb")
+        except FileNotFoundError:
+            raise StorageObjectNotFound(key)
+        try:
+            if offset:
+                await self._run("seek", f.seek, offset)
+            remaining = length
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await self._run("read", f.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await self._run("close", f.close)
+
+    def _delete(self, key: str) -> None:
+        try:
+            os.remove(key)
+        except FileNotFoundError:
+            pass
+
+    async def delete(self, key: str) -> None:
+        await self._run("delete", self._delete, key)
+
+    def _delete_many(self, keys: List[str]) -> List[str]:
+        failed = []
+        for key in keys:
+            try:
+                self._delete(key)
+            except OSError:
+                failed.append(key)
+        return failed
+
+    async def delete_many(self, keys: List[str]) -> List[str]:
+        return await self._run("delete_many", self._delete_many, keys)
+
+    def local_path(self, key: str) -> Optional[str]:
+        return key
+
+    def _list(self, prefix: str) -> List[ObjectStat]:
+        root = os.path.dirname(prefix) or "."
+        found = []
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                key = os.path.join(dirpath, filename).replace(os.sep, "/")
+                if key.startswith("./"):
+                    key = key[2:]
+                # In-progress uploads are not objects yet
+                if not key.startswith(prefix) or key.endswith(".part"):
+                    continue
+                try:
+                    found.append(self._stat(key))
+                except StorageObjectNotFound:
+                    continue
+        found.sort(key=lambda stat: stat.key)
+        return found
+
+    async def list_objects(self, prefix: str) -> AsyncIterator[ObjectStat]:
+        # A directory walk has no key order, so the local listing is built whole
+        for stat in await self._run("list", self._list, prefix):
+            yield stat
+
+
+class MinioStorageDriver(StorageDriver):
+    """S3-compatible bucket through one pooled minio client"""
+
+    name = "minio"
+
+    def __init__(self, client: Minio, bucket: str, executor: ThreadPoolExecutor, stats: OperationStats,
+                 url_cache: Optional[PresignedUrlCache] = None):
+        super().__init__(executor, stats, url_cache)
+        self.client = client
+        self.bucket = bucket
+        self._bucket_checked = False
+        self._bucket_lock = asyncio.Lock()
+
+    async def ensure_bucket(self) -> None:
+        """Create the bucket if missing; checked once per process"""
+        if self._bucket_checked:
+            return
+        async with self._bucket_lock:
+            if self._bucket_checked:
+                return
+            try:
+                if not await self._run("bucket_exists", self.client.bucket_exists, self.bucket):
+                    await self._run("make_bucket", self.client.make_bucket, self.bucket)
+            except S3Error as e:
+                print(f"Error creating bucket: {e}")
+            self._bucket_checked = True
+
+    def _translate(self, key: str, error: S3Error) -> StorageError:
+        if error.code in ("NoSuchKey", "NoSuchObject"):
+            return StorageObjectNotFound(key)
+        return StorageError(str(error), code=error.code)
+
+    async def put(self, key: str, data: BinaryIO, length: int, content_type: Optional[str]) -> ObjectStat:
+        await self.ensure_bucket()
+        try:
+            result = await self._run(
+                "put", self.client.put_object, self.bucket, key, data,
+                length=length, content_type=content_type or "application/octet-stream"
+            )
+        except S3Error as e:
+            raise self._translate(key, e)
+        return ObjectStat(key=key, size=length, etag=result.etag)
+
+    async def put_stream(self, key: str, source: BinaryIO, content_type: Optional[str],
+                         max_size: Optional[int] = None) -> ObjectStat:
+        await self.ensure_bucket()
+        part_size = max(settings.STORAGE_UPLOAD_PART_SIZE_MB * 1024 * 1024, MIN_UPLOAD_PART_SIZE)
+        reader = ChecksumReader(source, part_size, max_size)
+        try:
+            # length=-1: the SDK reads one part at a time and switches to a
+            # multipart upload past the first part (aborted on failure)
+            result = await self._run(
+                "put_stream", self.client.put_object, self.bucket, key, reader,
+                length=-1, part_size=part_size, num_parallel_uploads=1,
+                content_type=content_type or "application/octet-stream"
+            )
+        except S3Error as e:
+            raise self._translate(key, e)
+
+        # The ETag the store computed must match what we streamed (no stat round trip)
+        etag = (result.etag or "").strip('"')
+        if settings.STORAGE_VERIFY_ETAG and etag != reader.expected_etag():
+            await self.delete(key)
+            raise StorageError(
+                f"Upload verification failed for {key}: ETag {etag} != {reader.expected_etag()}",
+                code="BadDigest"
+            )
+        return ObjectStat(key=key, size=reader.size, etag=etag, sha256=reader.sha256)
+
+    async def stat(self, key: str) -> ObjectStat:
+        try:
+            result = await self._run("stat", self.client.stat_object, self.bucket, key)
+        except S3Error as e:
+            raise self._translate(key, e)
+        return ObjectStat(key=key, size=result.size, etag=result.etag, last_modified=result.last_modified)
+
+    async def iter_object(self, key: str, offset: int = 0, length: Optional[int] = None,
+                          chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        try:
+            response = await self._run(
+                "get", self.client.get_object, self.bucket, key, offset=offset, length=length or 0
+            )
+        except S3Error as e:
+            raise self._translate(key, e)
+        try:
+            while True:
+                chunk = await self._run("read", response.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            response.close()
+            response.release_conn()
+
+    async def delete(self, key: str) -> None:
+        if self.url_cache is not None:
+            self.url_cache.invalidate(key)
+        try:
+            await self._run("delete", self.client.remove_object, self.bucket, key)
+        except S3Error as e:
+            raise self._translate(key, e)
+
+    async def delete_many(self, keys: List[str]) -> List[str]:
+        if self.url_cache is not None:
+            for key in keys:
+                self.url_cache.invalidate(key)
+
+        def remove() -> List[str]:
+            # DeleteObjects requests of up to 1000 keys; the SDK sends them
+            # lazily while the error iterator is consumed
+            errors = self.client.remove_objects(self.bucket, (DeleteObject(key) for key in keys))
+            return [error.name for error in errors]
+
+        try:
+            return await self._run("delete_many", remove)
+        except S3Error as e:
+            raise self._translate(keys[0] if keys else "", e)
+
+    async def list_objects(self, prefix: str) -> AsyncIterator[ObjectStat]:
+        await self.ensure_bucket()
+        # The SDK generator pages through ListObjectsV2 lazily (already in key
+        # order); pull one page at a time on the executor
+        objects = self.client.list_objects(self.bucket, prefix=prefix, recursive=True)
+        while True:
+            try:
+                page = await self._run("list", lambda: list(itertools.islice(objects, LIST_PAGE_SIZE)))
+            except S3Error as e:
+                raise self._translate(prefix, e)
+            if not page:
+                break
+            for obj in page:
+                if obj.is_dir:
+                    continue
+                yield ObjectStat(
+                    key=obj.object_name,
+                    size=obj.size,
+                    etag=(obj.etag or "").strip('"') or None,
+                    last_modified=obj.last_modified,
+                )
+
+    async def presigned_get_url(self, key: str, expires: timedelta) -> Optional[str]:
+        # Signing is local computation, no network round trip
+        return self.client.presigned_get_object(self.bucket, key, expires=expires)
+
+
+class R2StorageDriver(MinioStorageDriver):
+    """Cloudflare R2 (S3-compatible) bucket"""
+
+    name = "r2"
+
+
+_storage_lock = threading.Lock()
+_storage: Optional[StorageDriver] = None
+_storage_stats = OperationStats()
+_presigned_url_cache = PresignedUrlCache(
+    max_size=settings.PRESIGNED_URL_CACHE_SIZE,
+    margin_seconds=settings.PRESIGNED_URL_CACHE_MARGIN_SECONDS,
+)
+
+
+def _pooled_http_client() -> urllib3.PoolManager:
+    """One connection pool sized to the executor, shared by all requests"""
+    return urllib3.PoolManager(
+        timeout=urllib3.Timeout(connect=settings.STORAGE_CONNECT_TIMEOUT_SECONDS,
+                                read=settings.STORAGE_READ_TIMEOUT_SECONDS),
+        maxsize=settings.STORAGE_IO_WORKERS,
+        retries=urllib3.Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+    )
+
+
+def create_storage() -> StorageDriver:
+    """Build the driver for FILE_STORAGE_TYPE"""
+    executor = ThreadPoolExecutor(max_workers=settings.STORAGE_IO_WORKERS, thread_name_prefix="storage")
+    if settings.FILE_STORAGE_TYPE == "r2":
+        client = Minio(
+            settings.r2_endpoint_url,
+            access_key=settings.R2_ACCESS_KEY_ID,
+            secret_key=settings.R2_SECRET_ACCESS_KEY,
+            secure=True,
+            http_client=_pooled_http_client(),
+        )
+        return R2StorageDriver(client, settings.R2_BUCKET, executor, _storage_stats, _presigned_url_cache)
+    if settings.FILE_STORAGE_TYPE == "minio":
+        client = Minio(
+            settings.MINIO_ENDPOINT,
+            access_key=settings.MINIO_ACCESS_KEY,
+            secret_key=settings.MINIO_SECRET_KEY,
+            secure=settings.MINIO_SECURE,
+            http_client=_pooled_http_client(),
+        )
+        return MinioStorageDriver(client, settings.MINIO_BUCKET, executor, _storage_stats, _presigned_url_cache)
+    return LocalStorageDriver(executor, _storage_stats)
+
+
+def get_storage() -> StorageDriver:
+    """Process-wide storage driver (created on first use)"""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage()
+    return _storage
+
+
+def get_storage_stats() -> Dict[str, Any]:
+    """Backend name and per-operation latency of the storage driver"""
+    return {
+        "backend": settings.FILE_STORAGE_TYPE,
+        "workers": settings.STORAGE_IO_WORKERS,
+        "operations": _storage_stats.snapshot(),
+        "presigned_url_cache": _presigned_url_cache.stats(),
+    }
@@ -497,7 +497,8 @@ else:
 EOF
 
 echo "=== Running migrations ==="
-alembic upgrade head || echo "[WARN] Alembic migration failed, continuing..."
+# Records the schema fingerprint: app workers then skip migrations at boot
+python -m app.migrate || echo "[WARN] Migration failed, continuing..."
 
 echo "=== Starting uvicorn ==="
 exec uvicorn app.main:app --host 0.0.0.0 --port ${PORT:-8080}
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.competency import ProofRequiredLevel
+from app.services.application_service import DocumentVerificationSummary, summarize_document_verification
+
+PROOF_LEVELS = {
+    1: ProofRequiredLevel.REQUIRED,
+    2: ProofRequiredLevel.OPTIONAL,
+    3: ProofRequiredLevel.NOT_REQUIRED,
+}
+
+
+def _item(item_id, status, file_id=10):
+    return SimpleNamespace(item_id=item_id, submitted_file_id=file_id, verification_status=status)
+
+
+@pytest.mark.parametrize("items, expected", [
+    ([], DocumentVerificationSummary("approved", 0)),
+    # Items needing no review count as approved whatever their status
+    ([_item(3, "pending"), _item(2, "pending", file_id=None)], DocumentVerificationSummary("approved", 0)),
+    ([_item(1, "approved"), _item(2, "approved")], DocumentVerificationSummary("approved", 0)),
+    ([_item(1, "pending"), _item(2, "pending")], DocumentVerificationSummary("pending", 0)),
+    ([_item(1, "approved"), _item(2, "pending")], DocumentVerificationSummary("partial", 0)),
+    ([_item(1, "rejected"), _item(2, "approved")], DocumentVerificationSummary("rejected", 0)),
+    # Supplement requests win over rejections and are counted
+    ([_item(1, "supplement_requested"), _item(2, "supplement_requested"), _item(4, "rejected")],
+     DocumentVerificationSummary("supplement_requested", 2)),
+    # Items without a project item are reviewed like required ones
+    ([_item(4, "supplemented")], DocumentVerificationSummary("pending", 0)),
+    # A supplement request on an item needing no review is ignored
+    ([_item(3, "supplement_requested"), _item(1, "approved")], DocumentVerificationSummary("approved", 0)),
+])
+def test_summarize_document_verification(items, expected):
+    assert summarize_document_verification(items, PROOF_LEVELS) == expected
@@ -0,0 +1,48 @@
+import bcrypt
+import pytest
+
+from app.api.endpoints.auth import login
+from app.core.config import settings
+from app.core.security import password_needs_rehash, verify_password
+from app.models.user import User, UserStatus
+from app.schemas.auth import UserLogin
+
+PASSWORD = "correct horse battery"
+
+
+@pytest.fixture
+def bcrypt_rounds(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    return 5
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+def test_password_needs_rehash(bcrypt_rounds):
+    assert password_needs_rehash(_hash(PASSWORD, 4))
+    assert not password_needs_rehash(_hash(PASSWORD, bcrypt_rounds))
+    assert not password_needs_rehash("not-a-bcrypt-hash")
+
+
+def test_login_rehashes_password_made_at_another_cost(run_with_db, bcrypt_rounds):
+    async def body(session_factory):
+        async with session_factory() as db:
+            db.add(User(
+                name="Coach", email="coach@example.com", hashed_password=_hash(PASSWORD, 4),
+                address="Seoul", roles='["COACH"]', status=UserStatus.ACTIVE
+            ))
+            await db.commit()
+
+        async with session_factory() as db:
+            response = await login(UserLogin(email="coach@example.com", password=PASSWORD), db)
+
+        assert response.user.email == "coach@example.com"
+        assert response.user.updated_at is not None
+        async with session_factory() as db:
+            user = await db.get(User, response.user.user_id)
+            assert not password_needs_rehash(user.hashed_password)
+            assert verify_password(PASSWORD, user.hashed_password)
+
+    run_with_db(body)
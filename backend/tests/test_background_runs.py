@@ -0,0 +1,68 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.models.file_purge import FilePurgeRun
+from app.services.background_runs import BackgroundRuns, RunInProgress
+
+
+class JobInProgress(RunInProgress):
+    kind = "Job"
+
+
+def _run(**values) -> FilePurgeRun:
+    return FilePurgeRun(dry_run=True, status="running", cutoff_date=date(2026, 1, 1), **values)
+
+
+def test_check_idle_refuses_active_runs_and_fails_stale_ones(run_with_db):
+    async def body(session_factory):
+        runs = BackgroundRuns(FilePurgeRun, JobInProgress)
+        now = datetime.now(timezone.utc)
+        async with session_factory() as db:
+            stale = _run(updated_at=now - timedelta(minutes=30))
+            db.add(stale)
+            await db.commit()
+
+            await runs.check_idle(db, stale_minutes=10)
+            await db.commit()
+            assert stale.status == "failed" and stale.error == "Interrupted (no progress)"
+
+            active = _run(updated_at=now)
+            db.add(active)
+            await db.commit()
+            with pytest.raises(JobInProgress) as raised:
+                await runs.check_idle(db, stale_minutes=10)
+            assert raised.value.run_id == active.run_id
+            assert str(raised.value) == f"Job run {active.run_id} is still running"
+
+    run_with_db(body)
+
+
+def test_start_runs_task_and_tracks_it_until_done(run_with_db):
+    async def body(session_factory):
+        runs = BackgroundRuns(FilePurgeRun, JobInProgress)
+        release = asyncio.Event()
+        started = []
+
+        async def execute(run_id):
+            started.append(run_id)
+            await release.wait()
+
+        async with session_factory() as db:
+            run = await runs.start(db, _run(), execute)
+            await asyncio.sleep(0)
+            assert started == [run.run_id] and runs.is_running(run.run_id)
+
+            # Still in this process: refused even once its progress is old
+            run.updated_at = datetime.now(timezone.utc) - timedelta(days=1)
+            await db.commit()
+            with pytest.raises(JobInProgress):
+                await runs.check_idle(db, stale_minutes=10)
+
+            release.set()
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            assert not runs.is_running(run.run_id)
+
+    run_with_db(body)
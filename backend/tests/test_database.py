@@ -0,0 +1,23 @@
+from app.core import database
+from app.models.user import User
+
+
+def test_schema_fingerprint_is_stable():
+    assert database.schema_fingerprint() == database.schema_fingerprint()
+
+
+def test_schema_fingerprint_covers_enum_members(monkeypatch):
+    before = database.schema_fingerprint()
+    status_type = User.__table__.c.status.type
+    monkeypatch.setattr(status_type, "enums", [*status_type.enums, "SUSPENDED"])
+    assert database.schema_fingerprint() != before
+
+
+def test_schema_fingerprint_covers_enum_fixups(monkeypatch):
+    before = database.schema_fingerprint()
+
+    def _fix_enum_values() -> None:
+        database.text("ALTER TYPE userstatus ADD VALUE IF NOT EXISTS 'SUSPENDED'")
+
+    monkeypatch.setattr(database, "_fix_enum_values", _fix_enum_values)
+    assert database.schema_fingerprint() != before
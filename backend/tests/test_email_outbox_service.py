@@ -0,0 +1,50 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.services import email_outbox_service
+from app.services.email_outbox_service import RateLimiter, retry_delay
+
+
+@pytest.fixture
+def retry_settings(monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_RETRY_BASE_SECONDS", 30)
+    monkeypatch.setattr(settings, "EMAIL_RETRY_MAX_SECONDS", 300)
+
+
+def test_retry_delay_doubles_up_to_the_cap(retry_settings, monkeypatch):
+    monkeypatch.setattr(email_outbox_service.random, "uniform", lambda low, high: 1.0)
+    assert [retry_delay(attempts).total_seconds() for attempts in range(0, 6)] == [30, 30, 60, 120, 240, 300]
+    assert retry_delay(50) == timedelta(seconds=300)
+
+
+def test_retry_delay_jitter_stays_within_twenty_percent(retry_settings):
+    delays = {retry_delay(2).total_seconds() for _ in range(200)}
+    assert min(delays) >= 48 and max(delays) <= 72
+    assert len(delays) > 1
+
+
+def _time_acquisitions(limiter: RateLimiter, count: int) -> float:
+    async def body():
+        started_at = time.monotonic()
+        for _ in range(count):
+            await limiter.acquire()
+        return time.monotonic() - started_at
+    return asyncio.run(body())
+
+
+def test_rate_limiter_allows_a_burst_then_paces():
+    # A burst of `rate` is free; the next 10 wait 1/rate seconds each
+    elapsed = _time_acquisitions(RateLimiter(20), 30)
+    assert 0.4 <= elapsed < 1.0
+
+
+def test_rate_limiter_burst_is_one_second_of_tokens():
+    assert _time_acquisitions(RateLimiter(50), 50) < 0.1
+
+
+def test_rate_limiter_is_disabled_at_zero_rate():
+    assert _time_acquisitions(RateLimiter(0), 1000) < 0.1
@@ -0,0 +1,111 @@
+import asyncio
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.core.email_transport import EmailTransport, OutgoingEmail, SMTPTransport
+
+REFUSED = "refused@example.com"
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.delivered = []
+        self.sessions = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == REFUSED:
+            return "550 5.1.1 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.delivered.extend(envelope.rcpt_tos)
+        self.sessions.append(server)
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def _transport(controller, **kwargs):
+    return SMTPTransport(
+        controller.hostname, controller.port, "noreply@example.com", "Coach Portal",
+        use_tls=False, timeout=5.0, **kwargs
+    )
+
+
+def _message(to_email):
+    return OutgoingEmail(to_email=to_email, subject="Hello", html_content="<p>Hello</p>", text_content="Hello")
+
+
+def test_send_many_is_abstract():
+    with pytest.raises(TypeError):
+        EmailTransport()
+
+
+def test_reuses_the_connection_between_batches(smtp_server):
+    controller, handler = smtp_server
+
+    async def body():
+        transport = _transport(controller)
+        try:
+            assert await transport.send_many([_message("a@example.com"), _message("b@example.com")]) == [None, None]
+            assert await transport.send(_message("c@example.com")) is None
+            return transport.connections_opened
+        finally:
+            await transport.close()
+
+    assert asyncio.run(body()) == 1
+    assert handler.delivered == ["a@example.com", "b@example.com", "c@example.com"]
+
+
+@pytest.mark.parametrize("keepalive_seconds", [0.0, 300.0], ids=["noop-probe", "retry-on-send"])
+def test_reconnects_after_the_server_drops_an_idle_connection(smtp_server, keepalive_seconds):
+    controller, handler = smtp_server
+
+    async def body():
+        transport = _transport(controller, keepalive_seconds=keepalive_seconds)
+        try:
+            assert await transport.send(_message("a@example.com")) is None
+            # The server times the idle connection out
+            for session in handler.sessions:
+                controller.loop.call_soon_threadsafe(session.transport.close)
+            await asyncio.sleep(0.2)
+            assert await transport.send(_message("b@example.com")) is None
+            return transport.connections_opened
+        finally:
+            await transport.close()
+
+    assert asyncio.run(body()) == 2
+    assert handler.delivered == ["a@example.com", "b@example.com"]
+
+
+def test_refused_recipient_fails_only_that_message(smtp_server):
+    controller, handler = smtp_server
+
+    async def body():
+        transport = _transport(controller)
+        try:
+            results = await transport.send_many(
+                [_message("a@example.com"), _message(REFUSED), _message("b@example.com")]
+            )
+            return results, transport.connections_opened
+        finally:
+            await transport.close()
+
+    (first, refused, last), connections_opened = asyncio.run(body())
+    assert first is None and last is None
+    assert refused.startswith("SMTPRecipientsRefused")
+    assert connections_opened == 1
+    assert handler.delivered == ["a@example.com", "b@example.com"]
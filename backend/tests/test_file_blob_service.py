@@ -0,0 +1,144 @@
+import io
+import os
+
+from sqlalchemy import select
+
+from app.models.file import File, FileBlob
+from app.models.user import User
+from app.services.file_blob_service import (
+    blob_key, delete_files, delete_released_objects, release_file, store_upload
+)
+from app.services.file_preview_service import PREVIEW_VARIANTS, preview_key
+
+CONTENT_HASH = "ab" * 32
+
+
+def _user(email: str) -> User:
+    return User(name=email, email=email, hashed_password="x", address="Seoul", roles='["COACH"]')
+
+
+def _file(user: User, name: str, **values) -> File:
+    return File(
+        original_filename=name, stored_filename=name, file_size=10, mime_type="application/pdf",
+        uploader=user, **values
+    )
+
+
+def test_delete_files_releases_shared_and_own_content(run_with_db):
+    async def body(session_factory):
+        async with session_factory() as db:
+            alice, bob = _user("alice@example.com"), _user("bob@example.com")
+            db.add_all([
+                FileBlob(content_hash=CONTENT_HASH, file_path=blob_key(CONTENT_HASH), file_size=10, ref_count=2),
+                _file(alice, "a.pdf", file_path=blob_key(CONTENT_HASH), content_hash=CONTENT_HASH),
+                _file(bob, "b.pdf", file_path=blob_key(CONTENT_HASH), content_hash=CONTENT_HASH),
+                _file(alice, "legacy.pdf", file_path="uploads/legacy.pdf", preview_status="ready"),
+            ])
+            await db.commit()
+            alice_id, bob_id = alice.user_id, bob.user_id
+
+        async with session_factory() as db:
+            deleted, keys = await delete_files(db, File.uploaded_by == alice_id)
+            await db.commit()
+            legacy_id = next(row.file_id for row in deleted if not row.content_hash)
+            assert len(deleted) == 2
+            # Bob still uses the blob: only the legacy object and its previews go
+            assert sorted(keys) == sorted(
+                ["uploads/legacy.pdf"] + [preview_key(legacy_id, variant) for variant in PREVIEW_VARIANTS]
+            )
+            blob = await db.get(FileBlob, CONTENT_HASH)
+            assert blob.ref_count == 1
+
+        async with session_factory() as db:
+            deleted, keys = await delete_files(db, File.uploaded_by == bob_id)
+            await db.commit()
+            assert keys == [blob_key(CONTENT_HASH)]
+            assert (await db.execute(select(FileBlob))).first() is None
+
+    run_with_db(body)
+
+
+def test_store_upload_uploads_new_content_outside_the_transaction(run_with_db, storage):
+    puts = []
+    put_stream = storage.put_stream
+
+    async def body(session_factory):
+        data = b"%PDF-1.4 proof"
+        async with session_factory() as db:
+            async def recording_put_stream(key, source, content_type, max_size=None):
+                puts.append((key, db.in_transaction()))
+                return await put_stream(key, source, content_type, max_size=max_size)
+
+            storage.put_stream = recording_put_stream
+            first = await store_upload(db, storage, io.BytesIO(data), "application/pdf")
+            await db.commit()
+        assert not first.deduplicated
+        assert puts == [(first.file_path, False)]  # No lock or transaction held while uploading
+        assert os.path.exists(first.file_path)
+
+        async with session_factory() as db:
+            second = await store_upload(db, storage, io.BytesIO(data), "application/pdf")
+            await db.commit()
+            blob = await db.get(FileBlob, first.content_hash)
+        assert second.deduplicated and second.file_path == first.file_path
+        assert len(puts) == 1  # Known content is not uploaded again
+        assert blob.ref_count == 2
+
+    run_with_db(body)
+
+
+async def _stored_file(session_factory, storage, user_email, data):
+    async with session_factory() as db:
+        stored = await store_upload(db, storage, io.BytesIO(data), "application/pdf")
+        db_file = _file(_user(user_email), "proof.pdf", file_path=stored.file_path, content_hash=stored.content_hash)
+        db.add(db_file)
+        await db.commit()
+        return db_file.file_id, stored
+
+
+def test_release_file_keeps_the_object_until_the_commit(run_with_db, storage):
+    async def body(session_factory):
+        data = b"%PDF-1.4 shared"
+        file_id, stored = await _stored_file(session_factory, storage, "alice@example.com", data)
+
+        # The delete fails at commit (e.g. a foreign key): row and object both survive
+        async with session_factory() as db:
+            keys = await release_file(db, await db.get(File, file_id))
+            assert keys == [stored.file_path]
+            await db.rollback()
+        async with session_factory() as db:
+            assert (await db.get(FileBlob, stored.content_hash)).ref_count == 1
+        assert os.path.exists(stored.file_path)
+
+        async with session_factory() as db:
+            db_file = await db.get(File, file_id)
+            keys = await release_file(db, db_file)
+            await db.delete(db_file)
+            await db.commit()
+            assert await delete_released_objects(db, storage, keys) == []
+            assert not db.in_transaction()
+        assert not os.path.exists(stored.file_path)
+
+    run_with_db(body)
+
+
+def test_delete_released_objects_skips_blobs_uploaded_again(run_with_db, storage):
+    async def body(session_factory):
+        data = b"%PDF-1.4 again"
+        file_id, stored = await _stored_file(session_factory, storage, "alice@example.com", data)
+
+        async with session_factory() as db:
+            db_file = await db.get(File, file_id)
+            keys = await release_file(db, db_file)
+            await db.delete(db_file)
+            await db.commit()
+
+        # Uploaded again between the commit and the object deletion
+        _, again = await _stored_file(session_factory, storage, "bob@example.com", data)
+        assert again.file_path == stored.file_path
+
+        async with session_factory() as db:
+            assert await delete_released_objects(db, storage, keys) == []
+        assert os.path.exists(stored.file_path)
+
+    run_with_db(body)
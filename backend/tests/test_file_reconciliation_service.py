@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from app.services.file_reconciliation_service import FileRow, merge_join
+from app.services.storage import ObjectStat
+
+
+async def _stream(items):
+    for item in items:
+        yield item
+
+
+def _join(keys, rows):
+    async def body():
+        objects = [ObjectStat(key=key, size=10) for key in keys]
+        return [
+            (obj.key if obj else None, [row.file_id for row in group])
+            async for obj, group in merge_join(_stream(objects), _stream(rows))
+        ]
+    return asyncio.run(body())
+
+
+def _row(file_id, path):
+    return FileRow(file_id=file_id, file_path=path, file_size=10)
+
+
+def test_merge_join_pairs_keys_and_groups_shared_paths():
+    rows = [_row(1, "a"), _row(2, "c"), _row(3, "c"), _row(4, "d")]
+    assert _join(["a", "b", "c", "e"], rows) == [
+        ("a", [1]),
+        ("b", []),      # storage only
+        ("c", [2, 3]),  # deduplicated content shares one object
+        (None, [4]),    # database only
+        ("e", []),
+    ]
+
+
+def test_merge_join_handles_empty_sides():
+    assert _join([], []) == []
+    assert _join(["a", "b"], []) == [("a", []), ("b", [])]
+    assert _join([], [_row(1, "a"), _row(2, "a")]) == [(None, [1, 2])]
+
+
+def test_merge_join_rejects_unsorted_input():
+    with pytest.raises(RuntimeError, match="not sorted"):
+        _join(["b", "a"], [])
+    with pytest.raises(RuntimeError, match="not sorted"):
+        _join([], [_row(1, "b"), _row(2, "a")])
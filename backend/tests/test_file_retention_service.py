@@ -0,0 +1,66 @@
+import json
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from app.models.coach_profile import CoachProfile
+from app.models.file import File
+from app.models.user import User
+from app.services.file_retention_service import iter_expired_batches, profile_file_ids, purge_files
+
+CUTOFF = date(2026, 1, 1)
+
+
+def test_profile_file_ids_reads_every_json_column():
+    profile = CoachProfile(
+        degrees=json.dumps([{"type": "coaching", "file_id": 1}, {"type": "other", "file_id": None}]),
+        certifications=json.dumps([{"name": "KCA", "type": "KCA", "file_id": 2}]),
+        mentoring_experiences=json.dumps([{"description": "mentoring", "file_id": 3}]),
+        field_experiences=json.dumps({
+            "business": {"historyFiles": [4, 5], "certFiles": [6]},
+            "career": {"files": [7]},
+            "youth": {"coaching_history": "text"},
+        }),
+    )
+    assert profile_file_ids(profile) == {1, 2, 3, 4, 5, 6, 7}
+
+
+def test_profile_file_ids_ignores_malformed_json():
+    profile = CoachProfile(degrees="not json", certifications="{}", field_experiences='["x"]')
+    assert profile_file_ids(profile) == set()
+
+
+def test_purge_keeps_files_referenced_from_coach_profiles(run_with_db, storage):
+    async def body(session_factory):
+        async with session_factory() as db:
+            coach = User(name="Coach", email="coach@example.com", hashed_password="x", address="Seoul", roles='["COACH"]')
+            files = [
+                File(
+                    original_filename=name, stored_filename=name, file_path=f"uploads/{name}", file_size=10,
+                    mime_type="application/pdf", uploader=coach, scheduled_deletion_date=CUTOFF - timedelta(days=1)
+                )
+                for name in ("degree.pdf", "history.pdf", "stale.pdf")
+            ]
+            db.add_all(files)
+            await db.flush()
+            degree, history, stale = (f.file_id for f in files)
+            db.add(CoachProfile(
+                user_id=coach.user_id,
+                degrees=json.dumps([{"type": "coaching", "file_id": degree}]),
+                field_experiences=json.dumps({"business": {"historyFiles": [history]}}),
+            ))
+            await db.commit()
+
+        batches = [batch async for batch in iter_expired_batches(session_factory, CUTOFF, 10)]
+        assert {f.file_id: f.referenced for batch in batches for f in batch} == {
+            degree: True, history: True, stale: False
+        }
+
+        # Re-checked at delete time as well
+        purged, _, _, _ = await purge_files(session_factory, storage, [degree, history, stale], CUTOFF)
+        assert purged == 1
+        async with session_factory() as db:
+            remaining = (await db.execute(select(File.file_id).order_by(File.file_id))).scalars().all()
+        assert remaining == [degree, history]
+
+    run_with_db(body)
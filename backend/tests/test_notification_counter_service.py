@@ -0,0 +1,38 @@
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql
+
+from app.models.notification import Notification, NotificationCounter
+from app.models.user import User
+from app.services import notification_counter_service
+from app.services.notification_counter_service import get_unread_count, recount_unread
+
+
+def test_recount_locks_the_counter_rows_before_counting():
+    create_missing, lock, recount = (
+        str(statement.compile(dialect=postgresql.dialect()))
+        for statement in notification_counter_service.recount_unread_statements(iter([2, 1]))
+    )
+    assert "ON CONFLICT (user_id) DO NOTHING" in create_missing
+    assert lock.endswith("FOR UPDATE")
+    assert "ON CONFLICT (user_id) DO UPDATE" in recount
+
+
+def test_recount_creates_and_repairs_the_counter(run_with_db):
+    async def body(session_factory):
+        async with session_factory() as db:
+            user = User(name="Coach", email="coach@example.com", hashed_password="x", address="Seoul", roles='["COACH"]')
+            db.add(user)
+            await db.flush()
+            db.add_all([
+                Notification(user_id=user.user_id, type="system", title="A"),
+                Notification(user_id=user.user_id, type="system", title="B", is_read=True),
+            ])
+            await db.commit()
+            assert await get_unread_count(db, user.user_id) == 1
+
+            await db.execute(update(NotificationCounter).values(unread_count=5))
+            await recount_unread(db, [user.user_id])
+            await db.commit()
+            assert await get_unread_count(db, user.user_id) == 1
+
+    run_with_db(body)
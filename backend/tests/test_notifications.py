@@ -0,0 +1,50 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.api.endpoints.notifications import get_stream_token, stream_notifications
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.user import User, UserStatus
+
+
+def _open_stream(session_factory, token):
+    async def open_stream():
+        async with session_factory() as db:
+            return await stream_notifications(token=token, last_event_id=None, last_event_id_header=None, db=db)
+    return open_stream()
+
+
+def test_stream_accepts_only_stream_tokens(run_with_db, monkeypatch):
+    async def body(session_factory):
+        async with session_factory() as db:
+            user = User(name="Coach", email="coach@example.com", hashed_password="x", address="Seoul", roles='["COACH"]')
+            db.add(user)
+            await db.commit()
+
+        issued = await get_stream_token(current_user=user)
+        assert issued.expires_in == settings.NOTIFICATION_STREAM_TOKEN_SECONDS
+        response = await _open_stream(session_factory, issued.token)
+        assert isinstance(response, StreamingResponse)
+        await response.body_iterator.aclose()
+
+        # An access token is not a stream token
+        with pytest.raises(HTTPException) as raised:
+            await _open_stream(session_factory, create_access_token({"sub": str(user.user_id)}))
+        assert raised.value.status_code == 401
+
+        monkeypatch.setattr(settings, "NOTIFICATION_STREAM_TOKEN_SECONDS", -1)
+        expired = await get_stream_token(current_user=user)
+        with pytest.raises(HTTPException) as raised:
+            await _open_stream(session_factory, expired.token)
+        assert raised.value.status_code == 401
+
+        async with session_factory() as db:
+            (await db.get(User, user.user_id)).status = UserStatus.DELETED
+            await db.commit()
+        monkeypatch.setattr(settings, "NOTIFICATION_STREAM_TOKEN_SECONDS", 60)
+        with pytest.raises(HTTPException) as raised:
+            await _open_stream(session_factory, (await get_stream_token(current_user=user)).token)
+        assert raised.value.status_code == 401
+
+    run_with_db(body)
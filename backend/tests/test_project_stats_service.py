@@ -0,0 +1,58 @@
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.models.application import Application
+from app.models.project import Project
+from app.models.user import User
+from app.services import project_stats_service
+
+
+def test_listeners_are_registered_by_the_models():
+    # A fresh process that only imports a model, like the scripts do
+    code = (
+        "from sqlalchemy import event\n"
+        "from sqlalchemy.orm import Session\n"
+        "import app.models.user\n"
+        "from app.services import project_stats_service as stats\n"
+        "assert event.contains(Session, 'after_flush', stats._recount_dirty_project_stats)\n"
+        "assert event.contains(app.models.Application, 'after_insert', stats._application_added_or_removed)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).resolve().parents[1])
+
+
+def test_recount_locks_the_counter_rows_before_counting():
+    create_missing, lock, recount = (
+        str(statement.compile(dialect=postgresql.dialect()))
+        for statement in project_stats_service._recount_statements([2, 1])
+    )
+    assert "ON CONFLICT (project_id) DO NOTHING" in create_missing
+    assert lock.endswith("FOR UPDATE")
+    assert "ON CONFLICT (project_id) DO UPDATE" in recount
+
+
+def test_disabled_counters_cost_nothing_on_flush(run_with_db, monkeypatch):
+    monkeypatch.setattr(settings, "PROJECT_STATS_COUNTERS_ENABLED", False)
+    statements = []
+
+    async def body(session_factory):
+        engine = session_factory.kw["bind"].sync_engine
+        event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+        async with session_factory() as db:
+            coach = User(name="Coach", email="coach@example.com", hashed_password="x", address="Seoul", roles='["COACH"]')
+            project = Project(
+                project_name="Cohort", recruitment_start_date=date(2026, 1, 1), recruitment_end_date=date(2026, 2, 1),
+                max_participants=10, creator=coach
+            )
+            db.add(Application(project=project, user=coach))
+            await db.commit()
+            assert project_stats_service.DIRTY_PROJECT_STATS_KEY not in db.sync_session.info
+
+    run_with_db(body)
+    assert statements
+    assert not any("project_application_stats" in statement for statement in statements)
@@ -0,0 +1,80 @@
+import asyncio
+import csv
+import io
+import zipfile
+from datetime import datetime
+
+from app.services.proof_export_service import MANIFEST_NAME, ProofEntry, _ArchiveNames, stream_proof_zip
+from app.services.storage import StorageError, StorageObjectNotFound
+
+
+def test_archive_names_are_made_unique():
+    names = _ArchiveNames()
+    assert names.unique("1_Kim/Item/a.pdf") == "1_Kim/Item/a.pdf"
+    assert names.unique("1_Kim/Item/a.pdf") == "1_Kim/Item/a (2).pdf"
+    assert names.unique("1_Kim/Item/a.pdf") == "1_Kim/Item/a (3).pdf"
+    assert names.unique("1_Kim/Item/README") == "1_Kim/Item/README"
+    assert names.unique("1_Kim/Item/README") == "1_Kim/Item/README (2)"
+    # A dot in a folder name is not an extension
+    assert names.unique("1_Kim/v1.2/notes") == "1_Kim/v1.2/notes"
+    assert names.unique("1_Kim/v1.2/notes") == "1_Kim/v1.2/notes (2)"
+
+
+class FakeStorage:
+    """Objects as lists of chunks; tracks how many are being read at once"""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.active = 0
+        self.max_active = 0
+
+    async def iter_object(self, key):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            content = self.objects[key]
+            if isinstance(content, Exception):
+                raise content
+            for chunk in content:
+                await asyncio.sleep(0)
+                yield chunk
+        finally:
+            self.active -= 1
+
+
+def _entry(number: int, key: str) -> ProofEntry:
+    return ProofEntry(
+        application_id=number, data_id=number, applicant_name="Kim", item_name="Item",
+        file_id=number, file_path=key, original_filename=f"{number}.pdf", uploaded_at=datetime(2026, 1, 1)
+    )
+
+
+async def _entries(entries):
+    for entry in entries:
+        yield entry
+
+
+def _export(storage, entries, concurrency):
+    async def collect():
+        return b"".join([data async for data in stream_proof_zip(_entries(entries), storage, concurrency)])
+    return zipfile.ZipFile(io.BytesIO(asyncio.run(collect())))
+
+
+def test_stream_proof_zip_reads_at_most_concurrency_objects():
+    storage = FakeStorage({f"k{i}": [b"x" * 10] * 20 for i in range(10)})
+    archive = _export(storage, [_entry(i, f"k{i}") for i in range(10)], concurrency=3)
+    assert storage.max_active == 3
+    assert len(archive.namelist()) == 11  # 10 files + manifest
+    assert archive.read("0_Kim/Item/0.pdf") == b"x" * 200
+
+
+def test_stream_proof_zip_reports_missing_and_failed_objects():
+    storage = FakeStorage({
+        "ok": [b"data"],
+        "gone": StorageObjectNotFound("gone"),
+        "broken": StorageError("503 Service Unavailable"),
+    })
+    archive = _export(storage, [_entry(1, "ok"), _entry(2, "gone"), _entry(3, "broken")], concurrency=2)
+    rows = list(csv.DictReader(io.StringIO(archive.read(MANIFEST_NAME).decode("utf-8-sig"))))
+    assert [(row["file_id"], row["status"]) for row in rows] == [("1", "ok"), ("2", "missing"), ("3", "error")]
+    assert archive.namelist() == ["1_Kim/Item/1.pdf", MANIFEST_NAME]
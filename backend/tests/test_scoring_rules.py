@@ -0,0 +1,110 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+from app.models.competency import AggregationMode
+from app.services.scoring_rules import compile_grade_table
+from app.services.scoring_service import match_grade_value
+
+DEGREE = json.dumps({
+    "type": "string",
+    "proofPenalty": -2,
+    "grades": [
+        {"value": "Doctorate", "score": 10},
+        {"value": "Master", "score": 7},
+        {"value": "master", "score": 1},  # duplicate: the first grade wins
+        {"value": "Bachelor", "score": 1},
+    ],
+})
+CONTAINS = json.dumps({
+    "type": "string",
+    "matchMode": "contains",
+    "grades": [{"value": "kca", "score": 5}, {"value": "icf", "score": 8}],
+})
+ANY = json.dumps({"type": "string", "matchMode": "any", "grades": [{"value": "", "score": 3}]})
+# Non-overlapping numeric ranges are matched by bisect
+HOURS = json.dumps({
+    "type": "numeric",
+    "proofPenalty": -3,
+    "grades": [
+        {"min": 1000, "max": 1999, "score": 10},
+        {"min": 0, "max": 499, "score": 2},
+        {"min": 500, "max": 999, "score": 5},
+        {"min": 2000, "score": 15},
+    ],
+})
+# Overlapping ranges keep the first match in config order
+OVERLAPPING = json.dumps({
+    "type": "numeric",
+    "grades": [{"min": 0, "max": 100, "score": 1}, {"min": 50, "max": 200, "score": 9}],
+})
+MULTI_CONTAINS = json.dumps({
+    "type": "multi_select",
+    "grades": [{"value": "A", "score": 2}, {"value": "B", "score": 3}],
+})
+MULTI_COUNT = json.dumps({
+    "type": "multi_select",
+    "mode": "count",
+    "grades": [{"min": 1, "score": 1}, {"min": 3, "score": 5}],
+})
+FILE_EXISTS = json.dumps({"type": "file_exists", "grades": {"exists": 4, "none": 1}})
+
+CASES = [
+    # string, exact
+    (DEGREE, "master", {"submitted_file_id": 1}, Decimal("7")),
+    (DEGREE, " MASTER ", {"submitted_file_id": 1}, Decimal("7")),
+    (DEGREE, "Master", {}, Decimal("5")),        # proof penalty without a file
+    (DEGREE, "Bachelor", {}, Decimal("0")),      # never below zero
+    (DEGREE, "Associate", {}, None),
+    (DEGREE, "", {}, None),
+    (DEGREE, json.dumps(["Bachelor", "Doctorate", "Master"]),
+     {"aggregation_mode": AggregationMode.BEST_MATCH, "submitted_file_id": 1}, Decimal("10")),
+    (DEGREE, json.dumps(["Associate", "Master", "Doctorate"]),
+     {"aggregation_mode": AggregationMode.ANY_MATCH, "submitted_file_id": 1}, Decimal("7")),
+    (DEGREE, json.dumps(["Associate"]), {"aggregation_mode": AggregationMode.BEST_MATCH}, None),
+    (DEGREE, "Doctorate", {"aggregation_mode": AggregationMode.ANY_MATCH}, Decimal("8")),
+    # string, contains / any
+    (CONTAINS, "ICF PCC", {}, Decimal("8")),
+    (CONTAINS, "KCA and ICF", {}, Decimal("5")),
+    (CONTAINS, "EMCC", {}, None),
+    (ANY, "anything", {}, Decimal("3")),
+    (ANY, "   ", {}, Decimal("0")),
+    (ANY, json.dumps(["", "x"]), {"aggregation_mode": AggregationMode.ANY_MATCH}, Decimal("3")),
+    # numeric
+    (HOURS, "1200 hours", {"submitted_file_id": 1}, Decimal("10")),
+    (HOURS, "499", {"submitted_file_id": 1}, Decimal("2")),
+    (HOURS, "499.5", {"submitted_file_id": 1}, Decimal("0")),  # between ranges
+    (HOURS, "2500", {}, Decimal("12")),
+    (HOURS, "300", {}, Decimal("0")),
+    (HOURS, "none", {}, None),
+    (HOURS, "", {}, None),
+    (OVERLAPPING, "75", {}, Decimal("1")),
+    (OVERLAPPING, "150", {}, Decimal("9")),
+    # multi_select
+    (MULTI_CONTAINS, "", {"submitted_value": json.dumps(["A", "B", "C"])}, Decimal("5")),
+    (MULTI_CONTAINS, "", {"submitted_value": "not json"}, Decimal("0")),
+    (MULTI_COUNT, "", {"submitted_value": json.dumps(["A", "B", "C", "D"])}, Decimal("5")),
+    (MULTI_COUNT, "", {"submitted_value": json.dumps(["A"])}, Decimal("1")),
+    (MULTI_COUNT, "", {"submitted_value": json.dumps([])}, Decimal("0")),
+    # file_exists
+    (FILE_EXISTS, "", {"submitted_file_id": 9}, Decimal("4")),
+    (FILE_EXISTS, "", {}, Decimal("1")),
+]
+
+
+@pytest.mark.parametrize("config, extracted_value, kwargs, expected", CASES)
+def test_grade_table_matches_like_match_grade_value(config, extracted_value, kwargs, expected):
+    assert compile_grade_table(config).match(extracted_value, **kwargs) == expected
+    assert match_grade_value(extracted_value, config, **kwargs) == expected
+
+
+def test_numeric_table_uses_bisect_only_for_disjoint_ranges():
+    assert compile_grade_table(HOURS).use_bisect
+    assert not compile_grade_table(OVERLAPPING).use_bisect
+
+
+def test_invalid_config_compiles_to_none():
+    assert compile_grade_table("not json") is None
+    assert compile_grade_table("[1, 2]") is None
+    assert match_grade_value("x", "not json") is None
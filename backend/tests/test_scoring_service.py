@@ -0,0 +1,134 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.api.endpoints.applications import (
+    _submitted_data_changed, save_application_data, save_custom_answer, submit_application
+)
+from app.models.application import Application, ApplicationData, ApplicationStatus
+from app.models.competency import CompetencyCategory, CompetencyItem, InputType, MatchingType, ProjectItem, ScoringCriteria
+from app.models.custom_question import CustomQuestion, CustomQuestionAnswer
+from app.models.project import Project
+from app.models.user import User
+from app.schemas.application import ApplicationDataSubmit, ApplicationSubmitRequest, CustomAnswerSubmit
+from app.services.scoring_service import apply_item_score_delta, mark_answer_dirty, recompute_dirty_scores
+
+
+async def _seed(db, status, auto_score):
+    coach = User(name="Coach", email=f"{status.value}@example.com", hashed_password="x", address="Seoul", roles='["COACH"]')
+    project = Project(
+        project_name="Cohort", recruitment_start_date=date(2026, 1, 1), recruitment_end_date=date(2026, 2, 1),
+        max_participants=10, creator=coach
+    )
+    question = CustomQuestion(
+        project=project, question_text="Certified?", is_evaluation_item=True,
+        scoring_rules=json.dumps([{"expected_value": "yes", "score": 5}])
+    )
+    application = Application(project=project, user=coach, status=status, auto_score=auto_score)
+    db.add_all([coach, project, question, application])
+    await db.flush()
+    db.add(CustomQuestionAnswer(
+        application_id=application.application_id, question_id=question.question_id, answer_text="no"
+    ))
+    await db.commit()
+    return coach, application.application_id, question.question_id
+
+
+def test_submitted_data_changed():
+    existing = ApplicationData(submitted_value="3", submitted_file_id=7)
+    assert not _submitted_data_changed(existing, "3", 7)
+    assert _submitted_data_changed(existing, "4", 7)
+    assert _submitted_data_changed(existing, "3", None)
+    assert not _submitted_data_changed(None, None, None)
+    assert _submitted_data_changed(None, "3", None)
+
+
+def test_answer_change_applies_score_difference(run_with_db):
+    async def body(session_factory):
+        async with session_factory() as db:
+            _, application_id, question_id = await _seed(db, ApplicationStatus.SUBMITTED, Decimal("10"))
+
+        async with session_factory() as db:
+            answer = (await db.execute(
+                select(CustomQuestionAnswer).where(CustomQuestionAnswer.application_id == application_id)
+            )).scalar_one()
+            mark_answer_dirty(db, application_id, question_id, answer.answer_text)
+            answer.answer_text = "yes"
+            # The first previous text in a session is the one the delta is taken from
+            mark_answer_dirty(db, application_id, question_id, "yes")
+            assert await recompute_dirty_scores(db) == {application_id: Decimal("15")}
+
+    run_with_db(body)
+
+
+def test_custom_answer_rescored_only_after_submission(run_with_db):
+    async def body(session_factory):
+        async with session_factory() as db:
+            coach, submitted_id, question_id = await _seed(db, ApplicationStatus.SUBMITTED, Decimal("10"))
+            drafter, draft_id, draft_question_id = await _seed(db, ApplicationStatus.DRAFT, None)
+
+        async with session_factory() as db:
+            await save_custom_answer(submitted_id, CustomAnswerSubmit(question_id=question_id, answer_text="yes"), db, coach)
+            await save_custom_answer(draft_id, CustomAnswerSubmit(question_id=draft_question_id, answer_text="yes"), db, drafter)
+
+        async with session_factory() as db:
+            assert (await db.get(Application, submitted_id)).auto_score == Decimal("15")
+            assert (await db.get(Application, draft_id)).auto_score is None
+
+    run_with_db(body)
+
+
+def test_draft_saved_then_submitted_unchanged_is_scored(run_with_db):
+    async def body(session_factory):
+        async with session_factory() as db:
+            coach, application_id, question_id = await _seed(db, ApplicationStatus.DRAFT, None)
+            application = await db.get(Application, application_id)
+            item = CompetencyItem(
+                item_name="Certificate", item_code="CERT_KSC", category=CompetencyCategory.CERTIFICATION,
+                input_type=InputType.TEXT
+            )
+            db.add(ProjectItem(
+                project_id=application.project_id, competency_item=item,
+                scoring_criteria=[ScoringCriteria(matching_type=MatchingType.EXACT, expected_value="KSC", score=10)]
+            ))
+            await db.commit()
+            item_id = item.item_id
+
+        answers = [CustomAnswerSubmit(question_id=question_id, answer_text="yes")]
+        data = [ApplicationDataSubmit(item_id=item_id, submitted_value="KSC")]
+        async with session_factory() as db:
+            await save_application_data(application_id, data[0], db, coach)
+            await save_custom_answer(application_id, answers[0], db, coach)
+        async with session_factory() as db:
+            assert (await db.get(Application, application_id)).auto_score is None  # drafts are not scored
+
+        async with session_factory() as db:
+            await submit_application(
+                application_id, ApplicationSubmitRequest(custom_answers=answers, application_data=data), db, coach
+            )
+        async with session_factory() as db:
+            assert (await db.get(Application, application_id)).auto_score == Decimal("15")
+
+    run_with_db(body)
+
+
+def test_score_delta_is_applied_to_the_stored_auto_score(run_with_db):
+    async def body(session_factory):
+        async with session_factory() as db:
+            _, application_id, _ = await _seed(db, ApplicationStatus.SUBMITTED, Decimal("10"))
+
+        async with session_factory() as db:
+            application = await db.get(Application, application_id)
+            assert application.auto_score == Decimal("10")
+            # Another request adds its own delta in the meantime
+            async with session_factory() as other:
+                await apply_item_score_delta(other, application_id, Decimal("0"), Decimal("4"))
+                await other.commit()
+
+            assert await apply_item_score_delta(db, application_id, Decimal("2"), Decimal("5")) == Decimal("17")
+            assert application.auto_score == Decimal("17")
+            await db.commit()
+
+    run_with_db(body)
@@ -76,7 +76,7 @@ export default function AppLayout({
 
   const userRoles = parseUserRoles(user?.roles)
 
-  // 알림 개수 로드 (주기적 갱신)
+  // 알림 개수 로드 (이후 알림 스트림으로 갱신)
   useEffect(() => {
     if (!user) return
 
@@ -90,9 +90,12 @@ export default function AppLayout({
     }
 
     loadUnreadCount()
-    // 30초마다 갱신
-    const interval = setInterval(loadUnreadCount, 30000)
-    return () => clearInterval(interval)
+    if (typeof EventSource === 'undefined') {
+      // SSE 미지원 브라우저: 30초마다 갱신
+      const interval = setInterval(loadUnreadCount, 30000)
+      return () => clearInterval(interval)
+    }
+    return notificationService.subscribe({ onUnreadCount: setUnreadCount })
   }, [user])
 
   // Popover 열릴 때 알림 목록 로드
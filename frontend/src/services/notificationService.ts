@@ -19,6 +19,19 @@ export interface UnreadCountResponse {
   count: number
 }
 
+export interface StreamTokenResponse {
+  token: string
+  expires_in: number
+}
+
+export interface NotificationStreamHandlers {
+  onUnreadCount: (count: number) => void
+  onNotification?: (notification: Notification) => void
+}
+
+// 스트림 재연결 대기 (토큰 발급 실패, 연결 종료 후)
+const STREAM_RECONNECT_DELAY_MS = 5000
+
 class NotificationService {
   async getMyNotifications(unreadOnly: boolean = false, limit: number = 50): Promise<Notification[]> {
     const response = await api.get<Notification[]>('/notifications/my', {
@@ -40,6 +53,69 @@ class NotificationService {
   async markAllAsRead(): Promise<void> {
     await api.put('/notifications/read-all')
   }
+
+  async getStreamToken(): Promise<string> {
+    const response = await api.post<StreamTokenResponse>('/notifications/stream-token')
+    return response.data.token
+  }
+
+  /**
+   * 알림 스트림(SSE) 구독 - 반환된 함수로 해제
+   *
+   * EventSource는 Authorization 헤더를 보낼 수 없어 단기 스트림 토큰을
+   * 쿼리로 전달한다. 끊긴 연결은 EventSource가 스스로 재연결하고, 서버가
+   * 연결을 닫아 토큰이 만료된 뒤에는 새 토큰으로 다시 연결한다.
+   */
+  subscribe(handlers: NotificationStreamHandlers): () => void {
+    let source: EventSource | null = null
+    let timer: ReturnType<typeof setTimeout> | null = null
+    let lastEventId: string | null = null
+    let closed = false
+
+    const scheduleReconnect = () => {
+      if (!closed && !timer) {
+        timer = setTimeout(connect, STREAM_RECONNECT_DELAY_MS)
+      }
+    }
+
+    const connect = async () => {
+      timer = null
+      try {
+        const token = await this.getStreamToken()
+        if (closed) return
+        const params = new URLSearchParams({ token })
+        if (lastEventId) params.set('last_event_id', lastEventId)
+        const stream = new EventSource(`${api.defaults.baseURL}/notifications/stream?${params}`)
+        source = stream
+        stream.addEventListener('unread_count', (event) => {
+          handlers.onUnreadCount(JSON.parse((event as MessageEvent).data).count)
+        })
+        stream.addEventListener('notification', (event) => {
+          const message = event as MessageEvent
+          lastEventId = message.lastEventId || lastEventId
+          handlers.onNotification?.(JSON.parse(message.data))
+        })
+        stream.onerror = () => {
+          // CONNECTING: EventSource retries by itself; CLOSED: token rejected
+          if (stream.readyState === EventSource.CLOSED) {
+            stream.close()
+            source = null
+            scheduleReconnect()
+          }
+        }
+      } catch (error) {
+        console.error('알림 스트림 연결 실패:', error)
+        scheduleReconnect()
+      }
+    }
+
+    connect()
+    return () => {
+      closed = true
+      if (timer) clearTimeout(timer)
+      source?.close()
+    }
+  }
 }
 
 export default new NotificationService()